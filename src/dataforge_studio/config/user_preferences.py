@@ -1,6 +1,16 @@
-"""User preferences management using SQLite database."""
+"""User preferences management using SQLite database.
 
-from typing import Any, Optional
+All preferences are loaded once and served from memory. Changes are
+written behind: set() updates memory immediately, and pending writes are
+flushed in one transaction after a short pause (and at exit).
+"""
+
+import atexit
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
 
 # Default preferences
 DEFAULT_PREFERENCES = {
@@ -9,9 +19,30 @@ DEFAULT_PREFERENCES = {
     "language": "fr",
     "sql_format_style": "expanded",  # compact, expanded, comma_first, ultimate
     "export_language": "python",  # python, tsql, vb, csharp
-    "query_column_names": "query, requête"  # Column names that trigger "Edit Query" in grids
+    "query_column_names": "query, requête",  # Column names that trigger "Edit Query" in grids
+    "batch_queries_per_database": "2",  # Saved queries run at once per database by "execute all"
+    "prefetch_credentials": "true",  # Read a workspace's keyring credentials once when it auto-connects
 }
 
+# Seconds without a new set() before pending writes are flushed
+WRITE_DELAY = 0.5
+
+
+def _to_storage(value: Any) -> str:
+    """Convert a value to its stored string form."""
+    return str(value).lower() if isinstance(value, bool) else str(value)
+
+
+def _from_storage(value: str) -> Any:
+    """Convert a stored string to bool, int or str."""
+    if value.lower() == 'true':
+        return True
+    elif value.lower() == 'false':
+        return False
+    elif value.isdigit():
+        return int(value)
+    return value
+
 
 class UserPreferences:
     """Singleton class to manage user preferences stored in SQLite database."""
@@ -23,20 +54,41 @@ class UserPreferences:
         """Get singleton instance."""
         if cls._instance is None:
             cls._instance = cls()
+            atexit.register(cls._instance.flush)
         return cls._instance
 
-    def __init__(self):
-        """Initialize preferences manager."""
-        # Import here to avoid circular imports
-        from ..database.config_db import get_config_db
-        self._config_db = get_config_db()
+    def __init__(self, config_db=None, write_delay: float = WRITE_DELAY):
+        """
+        Initialize preferences manager.
+
+        Args:
+            config_db: ConfigDatabase (the global one if None)
+            write_delay: Seconds to wait for more changes before writing
+        """
+        if config_db is None:
+            # Import here to avoid circular imports
+            from ..database.config_db import get_config_db
+            config_db = get_config_db()
+        self._config_db = config_db
+        self._write_delay = write_delay
+
+        self._lock = threading.Lock()
+        self._pending: Dict[str, str] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._observers: List[Callable[[str, Any], None]] = []
+
+        self._values: Dict[str, Any] = {
+            key: _from_storage(value)
+            for key, value in self._config_db.get_all_preferences().items()
+        }
         self._ensure_defaults()
 
     def _ensure_defaults(self):
         """Ensure default preferences exist in database."""
         for key, value in DEFAULT_PREFERENCES.items():
-            if self._config_db.get_preference(key) is None:
-                self._config_db.set_preference(key, str(value))
+            if key not in self._values:
+                self._values[key] = _from_storage(value)
+                self._queue_write(key, value)
 
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -49,43 +101,77 @@ class UserPreferences:
         Returns:
             Preference value (converted to appropriate type)
         """
-        value = self._config_db.get_preference(key)
-        if value is None:
-            return default
-
-        # Convert string values to appropriate types
-        if value.lower() == 'true':
-            return True
-        elif value.lower() == 'false':
-            return False
-        elif value.isdigit():
-            return int(value)
-        return value
+        return self._values.get(key, default)
 
     def set(self, key: str, value: Any):
         """
-        Set preference value and save to database.
+        Set preference value; it is saved to the database shortly after.
 
         Args:
             key: Preference key
             value: Preference value
         """
         # Convert to string for storage
-        str_value = str(value).lower() if isinstance(value, bool) else str(value)
-        self._config_db.set_preference(key, str_value)
+        str_value = _to_storage(value)
+        typed_value = _from_storage(str_value)
+        changed = self._values.get(key) != typed_value or key not in self._values
+        self._values[key] = typed_value
+        self._queue_write(key, str_value)
+        if changed:
+            self._notify_observers(key, typed_value)
 
     def get_all(self) -> dict:
         """Get all preferences."""
-        prefs = self._config_db.get_all_preferences()
-        # Convert string values to appropriate types
-        result = {}
-        for key, value in prefs.items():
-            if value.lower() == 'true':
-                result[key] = True
-            elif value.lower() == 'false':
-                result[key] = False
-            elif value.isdigit():
-                result[key] = int(value)
-            else:
-                result[key] = value
-        return result
+        return dict(self._values)
+
+    # ==================== Write-behind ====================
+
+    def _queue_write(self, key: str, str_value: str):
+        with self._lock:
+            self._pending[key] = str_value
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self._write_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> bool:
+        """
+        Write pending changes now, in one transaction.
+
+        Returns:
+            True if nothing is left to write
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return True
+            if self._config_db.set_preferences(pending):
+                return True
+            # Keep the values for the next flush, unless set again meanwhile
+            logger.error(f"Failed to save preferences: {', '.join(pending)}")
+            self._pending = {**pending, **self._pending}
+            return False
+
+    # ==================== Observers ====================
+
+    def register_observer(self, callback: Callable[[str, Any], None]):
+        """Register a callback(key, value) for preference changes."""
+        if callback not in self._observers:
+            self._observers.append(callback)
+
+    def unregister_observer(self, callback: Callable[[str, Any], None]):
+        """Unregister a preference change observer."""
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def _notify_observers(self, key: str, value: Any):
+        """Notify all observers of a preference change."""
+        for callback in list(self._observers):
+            try:
+                callback(key, value)
+            except Exception as e:
+                logger.error(f"Error notifying preferences observer: {e}")
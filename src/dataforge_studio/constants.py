@@ -12,6 +12,8 @@ CONNECTION_TIMEOUT_S = 5        # Standard DB connection test timeout
 PING_TIMEOUT_S = 3              # Quick alive-check (pre-connect)
 POOL_WAIT_TIMEOUT_S = 30        # Waiting for a connection from pool
 FTP_TEST_TIMEOUT_S = 15         # FTP connection test
+REACHABLE_TTL_S = 30            # How long a successful probe is trusted
+UNREACHABLE_TTL_S = 10          # How long a failed probe is trusted (VPN may come up)
 
 # ===========================================================================
 # Query / Data limits
@@ -30,6 +32,10 @@ SCI_NOTATION_LOWER = 0.01       # abs(value) < this → scientific notation
 # Connection pool
 # ===========================================================================
 POOL_MAX_CONNECTIONS = 5
+PROBE_WORKERS = 16              # Reachability probes run at once
+WARMUP_WORKERS = 4              # Connections pre-opened at once
+BATCH_QUERY_WORKERS = 8         # Saved queries of a batch running at once
+BATCH_QUERIES_PER_DATABASE = 2  # ... of which against the same database (preference)
 
 # ===========================================================================
 # UI Timer delays (milliseconds)
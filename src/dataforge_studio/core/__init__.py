@@ -2,6 +2,7 @@
 Core module - Shared data loading, parameter types, and script schemas.
 
 - data_loader: Load heterogeneous sources into pandas DataFrame
+- csv_sniffer: Detect encoding, delimiter, quote and header of CSV files
 - parameter_types: Script/Job parameter type system
 - script_schemas: Built-in script definitions
 
@@ -18,6 +19,11 @@ from .data_loader import (
     LARGE_DATASET_THRESHOLD,
 )
 
+from .csv_sniffer import (
+    CsvDialect,
+    sniff_csv,
+)
+
 from .parameter_types import (
     ParameterType,
     create_parameter,
@@ -47,6 +53,8 @@ __all__ = [
     'query_to_dataframe',
     'DataLoadResult',
     'LARGE_DATASET_THRESHOLD',
+    'CsvDialect',
+    'sniff_csv',
     # Parameter types
     'ParameterType',
     'create_parameter',
@@ -0,0 +1,252 @@
+"""
+CSV Sniffer - Detect the dialect of a delimited text file in one pass.
+
+A bounded byte sample is read once and yields the encoding (BOM first,
+then UTF-8, Windows-1252, Latin-1), the delimiter, the quote character and
+whether the first row is a header. Results are cached per (path, size,
+mtime), so viewers and the loader script never sniff the same file twice,
+and the file is then parsed once with pandas' C engine.
+
+The encoding only reflects the sample. Viewers replace undecodable bytes
+found later; the loader script parses with encoding_errors="strict" and
+retries with strict_fallback_encoding() so data is never stored with U+FFFD.
+
+Usage:
+    dialect = sniff_csv(path)
+    df = read_csv(path, dialect, nrows=1000)
+"""
+
+import codecs
+import csv
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Union
+
+import pandas as pd
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+# Bytes read to sniff a file
+SAMPLE_BYTES = 64 * 1024
+
+# Lines of the sample used for delimiter and header detection
+SAMPLE_LINES = 50
+
+# Candidate delimiters, in order of preference on ties
+DELIMITERS = ",;\t|"
+
+# Encodings tried on the sample after BOM detection (Latin-1 never fails)
+FALLBACK_ENCODINGS = ("utf-8", "cp1252", "latin-1")
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+_QUOTED = re.compile(r'"[^"]*"')
+_NUMBER = re.compile(r"[+-]?(?:\d+(?:[.,]\d*)?|[.,]\d+)(?:[eE][+-]?\d+)?")
+_YEAR = re.compile(r"(?:19|20)\d\d")
+
+
+@dataclass(frozen=True)
+class CsvDialect:
+    """
+    Detected format of a delimited text file.
+
+    Attributes:
+        encoding: Python codec name (utf-8-sig when the file has a BOM)
+        delimiter: Field separator
+        quotechar: Quote character
+        has_header: True if the first row holds column names
+    """
+    encoding: str = "utf-8"
+    delimiter: str = ","
+    quotechar: str = '"'
+    has_header: bool = True
+
+    def read_csv_kwargs(self) -> dict:
+        """Keyword arguments for pd.read_csv()."""
+        return {
+            "encoding": self.encoding,
+            "sep": self.delimiter,
+            "quotechar": self.quotechar,
+            "header": 0 if self.has_header else None,
+        }
+
+
+def _read_sample(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read(SAMPLE_BYTES)
+
+
+def _detect_sample_encoding(raw: bytes, complete: bool) -> str:
+    for bom, encoding in _BOMS:
+        if raw.startswith(bom):
+            return encoding
+    for encoding in FALLBACK_ENCODINGS:
+        try:
+            # A truncated sample may end inside a multi-byte character
+            codecs.getincrementaldecoder(encoding)().decode(raw, final=complete)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+def _sample_lines(raw: bytes, encoding: str, complete: bool) -> List[str]:
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(raw, final=complete)
+    lines = text.splitlines()
+    if not complete and len(lines) > 1:
+        lines = lines[:-1]  # last line is cut
+    return [line for line in lines if line.strip()][:SAMPLE_LINES]
+
+
+def _detect_delimiter(lines: List[str], candidates: str) -> str:
+    """Pick the delimiter splitting the most lines into the same field count."""
+    unquoted = [_QUOTED.sub("", line) for line in lines]
+    best, best_score = candidates[0], None
+    for order, delimiter in enumerate(candidates):
+        counts = [line.count(delimiter) for line in unquoted]
+        mode = max(set(counts), key=counts.count)
+        if mode == 0:
+            continue
+        consistency = counts.count(mode) / len(counts)
+        # "2,5" is a decimal mark, not a separator
+        between_digits = len(re.findall(rf"(?<=\d){re.escape(delimiter)}(?=\d)", "\n".join(unquoted)))
+        decimal_ratio = between_digits / max(sum(counts), 1)
+        score = (consistency, -decimal_ratio, mode, -order)
+        if best_score is None or score > best_score:
+            best, best_score = delimiter, score
+    return best
+
+
+def _detect_quotechar(lines: List[str], delimiter: str) -> str:
+    sep = re.escape(delimiter)
+    text = "\n".join(lines)
+    doubles = len(re.findall(rf'(?:^|{sep})"', text, re.MULTILINE))
+    singles = len(re.findall(rf"(?:^|{sep})'[^'\n]*'(?={sep}|$)", text, re.MULTILINE))
+    return "'" if singles > doubles else '"'
+
+
+def _is_number(value: str) -> bool:
+    return bool(_NUMBER.fullmatch(value.strip()))
+
+
+def _detect_header(lines: List[str], delimiter: str, quotechar: str) -> bool:
+    """
+    Decide whether the first row is a header.
+
+    The first row is data only when every field has the type of its
+    column (numeric or not) and at least one numeric column agrees. Years
+    are ignored: pivoted exports use them as column names. When unsure,
+    assume a header, as pandas does.
+    """
+    rows = list(csv.reader(lines, delimiter=delimiter, quotechar=quotechar))
+    if len(rows) < 2:
+        return True
+    first, data = rows[0], rows[1:]
+    numeric_match = False
+    for i, value in enumerate(first):
+        column = [row[i] for row in data if i < len(row) and row[i].strip()]
+        if not column or not value.strip():
+            continue
+        column_numeric = all(_is_number(v) for v in column)
+        if _is_number(value) != column_numeric:
+            return True
+        if column_numeric and not _YEAR.fullmatch(value.strip()):
+            numeric_match = True
+    return not numeric_match
+
+
+@lru_cache(maxsize=256)
+def _sniff(path: str, size: int, mtime_ns: int, delimiters: str) -> CsvDialect:
+    raw = _read_sample(Path(path))
+    complete = len(raw) < SAMPLE_BYTES
+    encoding = _detect_sample_encoding(raw, complete)
+    lines = _sample_lines(raw, encoding, complete)
+    if not lines:
+        return CsvDialect(encoding=encoding, delimiter=delimiters[0])
+    delimiter = _detect_delimiter(lines, delimiters)
+    quotechar = _detect_quotechar(lines, delimiter)
+    dialect = CsvDialect(
+        encoding=encoding,
+        delimiter=delimiter,
+        quotechar=quotechar,
+        has_header=_detect_header(lines, delimiter, quotechar),
+    )
+    logger.debug(f"Sniffed {path}: {dialect}")
+    return dialect
+
+
+def sniff_csv(path: Union[str, Path], delimiters: str = DELIMITERS) -> CsvDialect:
+    """
+    Detect the dialect of a delimited text file.
+
+    Args:
+        path: File path
+        delimiters: Candidate delimiters (e.g. "\\t" for .txt exports)
+
+    Returns:
+        CsvDialect (cached until the file's size or mtime changes)
+    """
+    path = Path(path)
+    stat = path.stat()
+    return _sniff(str(path.resolve()), stat.st_size, stat.st_mtime_ns, delimiters)
+
+
+def detect_encoding(path: Union[str, Path]) -> str:
+    """Detect a text file's encoding from its first bytes (see sniff_csv)."""
+    return sniff_csv(path).encoding
+
+
+def strict_fallback_encoding(encoding: str) -> Optional[str]:
+    """
+    Encoding to retry a strict parse with when bytes past the sample do not decode.
+
+    A UTF-8 sample followed by accented Windows-1252 data is the usual case;
+    other failures have no better guess (None).
+    """
+    return "cp1252" if encoding == "utf-8" else None
+
+
+def read_csv(path: Union[str, Path], dialect: Optional[CsvDialect] = None, **kwargs) -> pd.DataFrame:
+    """
+    Parse a delimited file with the C engine and a sniffed dialect.
+
+    Undecodable bytes beyond the sample are replaced rather than failing
+    the whole parse (pass encoding_errors="strict" to raise instead).
+    Extra keyword arguments go to pd.read_csv (they win over the dialect's).
+
+    Args:
+        path: File path
+        dialect: Dialect (sniffed if None)
+        **kwargs: pd.read_csv arguments (nrows, dtype, chunksize...)
+
+    Returns:
+        DataFrame, or a TextFileReader when chunksize is given
+    """
+    dialect = dialect or sniff_csv(path)
+    options = {"engine": "c", "encoding_errors": "replace", **dialect.read_csv_kwargs(), **kwargs}
+    return pd.read_csv(path, **options)
+
+
+def count_lines(path: Union[str, Path], encoding: str = "utf-8") -> int:
+    """
+    Count lines without decoding the file (newlines inside quoted fields
+    count too).
+    """
+    if encoding.startswith("utf-16"):
+        with open(path, "r", encoding=encoding, errors="replace") as f:
+            return sum(1 for _ in f)
+    count = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            count += block.count(b"\n")
+            last = block[-1:]
+    return count + (0 if last == b"\n" else 1)
@@ -19,13 +19,15 @@ Features:
 
 import json
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Callable, Union, Iterator, Any, List
 
 import pandas as pd
 
+from .csv_sniffer import count_lines, read_csv, sniff_csv
+
 logger = logging.getLogger(__name__)
 
 # Threshold for large dataset warning (number of rows)
@@ -78,96 +80,6 @@ class DataLoadResult:
         return self.row_count > LARGE_DATASET_THRESHOLD
 
 
-def _detect_encoding(file_path: Path, sample_size: int = 100000) -> str:
-    """
-    Detect file encoding by trying common encodings.
-
-    Args:
-        file_path: Path to the file
-        sample_size: Number of bytes to sample (default 100KB for better detection)
-
-    Returns:
-        Detected encoding name
-    """
-    with open(file_path, 'rb') as f:
-        raw = f.read(sample_size)
-
-    # Check for BOM markers first
-    if raw.startswith(b'\xef\xbb\xbf'):
-        return 'utf-8-sig'
-    if raw.startswith(b'\xff\xfe') or raw.startswith(b'\xfe\xff'):
-        return 'utf-16'
-
-    # Try UTF-8 first (most common)
-    try:
-        raw.decode('utf-8')
-        return 'utf-8'
-    except UnicodeDecodeError:
-        pass
-
-    # Try Windows encodings (common for French/European data)
-    for encoding in ['cp1252', 'iso-8859-1', 'latin-1']:
-        try:
-            raw.decode(encoding)
-            return encoding
-        except (UnicodeDecodeError, LookupError):
-            continue
-
-    # Fallback to latin-1 which accepts any byte sequence
-    return 'latin-1'
-
-
-def _detect_csv_separator(file_path: Path, encoding: str = 'utf-8') -> str:
-    """
-    Detect CSV separator by analyzing the first few lines.
-
-    Args:
-        file_path: Path to CSV file
-        encoding: File encoding
-
-    Returns:
-        Detected separator character
-    """
-    separators = [',', ';', '\t', '|']
-
-    try:
-        with open(file_path, 'r', encoding=encoding) as f:
-            # Read first 5 lines
-            lines = [f.readline() for _ in range(5)]
-            sample = ''.join(lines)
-
-        # Count occurrences of each separator
-        counts = {sep: sample.count(sep) for sep in separators}
-
-        # Return the separator with highest count (if significant)
-        max_sep = max(counts, key=counts.get)
-        if counts[max_sep] > 0:
-            return max_sep
-    except (ValueError, TypeError, UnicodeDecodeError):
-        pass
-
-    return ','  # Default to comma
-
-
-def _count_csv_rows(file_path: Path, encoding: str = 'utf-8') -> int:
-    """
-    Count rows in a CSV file efficiently (without loading all data).
-
-    Args:
-        file_path: Path to CSV file
-        encoding: File encoding
-
-    Returns:
-        Number of data rows (excluding header)
-    """
-    try:
-        with open(file_path, 'r', encoding=encoding) as f:
-            # Count lines and subtract 1 for header
-            return sum(1 for _ in f) - 1
-    except (ValueError, TypeError, UnicodeDecodeError):
-        return -1  # Unknown
-
-
 def csv_to_dataframe(
     path: Union[str, Path],
     encoding: Optional[str] = None,
@@ -195,20 +107,20 @@ def csv_to_dataframe(
     result = DataLoadResult()
 
     try:
-        # Auto-detect encoding if not specified
-        if encoding is None:
-            encoding = _detect_encoding(path)
-
-        result.source_info['encoding'] = encoding
-
-        # Auto-detect separator if not specified
-        if separator is None:
-            separator = _detect_csv_separator(path, encoding)
-
-        result.source_info['separator'] = separator
+        # Sniff the format once (cached), then apply explicit overrides
+        dialect = sniff_csv(path)
+        if encoding is not None:
+            dialect = replace(dialect, encoding=encoding)
+        if separator is not None:
+            dialect = replace(dialect, delimiter=separator)
+
+        result.source_info['encoding'] = dialect.encoding
+        result.source_info['separator'] = dialect.delimiter
+        result.source_info['quotechar'] = dialect.quotechar
+        result.source_info['has_header'] = dialect.has_header
 
         # Count rows first to check for large dataset
-        row_count = _count_csv_rows(path, encoding)
+        row_count = count_lines(path, dialect.encoding) - (1 if dialect.has_header else 0)
         result.source_info['total_rows'] = row_count
 
         # Check for large dataset
@@ -228,11 +140,10 @@ def csv_to_dataframe(
                     result.warning_level = LoadWarningLevel.INFO
                     return result
 
-        # Load the data
-        df = pd.read_csv(
+        # Load the data (single C-engine parse)
+        df = read_csv(
             path,
-            encoding=encoding,
-            sep=separator,
+            dialect,
             nrows=nrows,
             low_memory=False  # Avoid mixed type warnings
         )
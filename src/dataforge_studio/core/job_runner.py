@@ -0,0 +1,410 @@
+"""
+Job Runner - Execute script jobs and workflows outside the GUI process.
+
+An atomic job calls its script's entry point (e.g. data_loader.run,
+file_dispatcher.run) with the job's parameters. Entry points run in a
+process pool, so pandas-heavy scripts neither stall the Qt event loop nor
+compete for the GUI process's GIL.
+
+A workflow is resolved into a DAG of atomic jobs: inside a workflow,
+previous_job_id orders siblings ("run after"), siblings without a
+predecessor start together, and independent branches run in parallel.
+Nested workflows are flattened into the same graph.
+
+Usage:
+    tasks = build_job_plan(job, get_config_db())
+    runner = JobRunner()
+    outcomes = runner.run(tasks, on_event=callback)
+"""
+import importlib.util
+import multiprocessing
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+# Job outcome statuses
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"  # a job it depends on failed
+STATUS_CANCELLED = "cancelled"
+
+
+class JobPlanError(Exception):
+    """A job cannot be turned into an executable plan."""
+
+
+@dataclass
+class JobTask:
+    """
+    One atomic job ready to execute.
+
+    Attributes:
+        job_id: Job ID
+        name: Job name (for logs)
+        file_path: Script source file
+        entry_point: Function called in file_path
+        kwargs: Resolved parameter values passed to the entry point
+        depends_on: IDs of tasks that must succeed first
+    """
+    job_id: str
+    name: str
+    file_path: str
+    entry_point: str = "run"
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    depends_on: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class JobOutcome:
+    """Result of one task of a run."""
+    job_id: str
+    name: str
+    status: str
+    started_at: str = ""
+    duration: float = 0.0
+    result: Any = None
+    error: str = ""
+
+
+@dataclass
+class JobEvent:
+    """
+    Progress notification of a run.
+
+    kind is "started" (outcome is None) or "finished".
+    """
+    kind: str
+    task: JobTask
+    outcome: Optional[JobOutcome] = None
+
+
+# ======================================================================
+# Planning
+# ======================================================================
+
+def resolve_script_entry(script) -> Tuple[str, str]:
+    """
+    Find the source file and entry point of a Script.
+
+    Built-in scripts are matched to their YAML template (by name, alias or
+    id); other scripts use their own file_path and the "run" entry point.
+
+    Returns:
+        (file_path, entry_point)
+
+    Raises:
+        JobPlanError: If no source file can be found
+    """
+    from .script_template_loader import get_template_loader
+    loader = get_template_loader()
+    template = (loader.get_template_by_name(script.name)
+                or loader.get_template(script.name.lower().replace(" ", "_")))
+    if template is not None and template.has_file:
+        return template.file_path, template.entry_point or "run"
+    if script.file_path and os.path.isfile(script.file_path):
+        return script.file_path, "run"
+    raise JobPlanError(f"No source file for script '{script.name}'")
+
+
+def resolve_job_parameters(values: Dict[str, Any], schema: List[Dict], config_db) -> Dict[str, Any]:
+    """
+    Turn stored job values into entry point arguments.
+
+    Reference parameters hold entity IDs and are replaced by what the
+    script needs: a root folder's path, a connection's connection string
+    (with its stored credentials, as build_connection() would use them),
+    a saved query's text. Missing values fall back to schema defaults.
+
+    Args:
+        values: Job.get_parameters()
+        schema: Script.get_parameters()
+        config_db: ConfigDatabase used to look up referenced entities
+
+    Returns:
+        Dict of keyword arguments
+    """
+    from .parameter_types import ParameterType, get_default_values
+    from ..database.connection_builder import connection_string_with_credentials
+
+    kwargs = get_default_values(schema)
+    kwargs.update(values)
+    for param in schema:
+        name = param.get("name")
+        value = kwargs.get(name)
+        if not isinstance(value, str) or not value:
+            continue
+        param_type = param.get("type")
+        if param_type == ParameterType.ROOTFOLDER.value:
+            root = config_db.get_file_root(value)
+            if root is not None:
+                kwargs[name] = root.path
+        elif param_type == ParameterType.DATABASE.value:
+            conn = config_db.get_database_connection(value)
+            if conn is not None:
+                kwargs[name] = connection_string_with_credentials(conn)
+        elif param_type == ParameterType.QUERY.value:
+            query = config_db.get_saved_query(value)
+            if query is not None:
+                kwargs[name] = query.query_text
+    return kwargs
+
+
+def build_job_plan(job, config_db) -> List[JobTask]:
+    """
+    Resolve a job (atomic or workflow) into tasks with dependencies.
+
+    Disabled jobs inside a workflow are left out; their successors then
+    wait for whatever the disabled job itself waited for.
+
+    Args:
+        job: Job to run
+        config_db: ConfigDatabase
+
+    Returns:
+        Tasks in a valid execution order
+
+    Raises:
+        JobPlanError: Unknown script, missing source file, or a cycle in
+                      the previous_job_id chain of a workflow
+    """
+    children: Dict[str, List] = {}
+    if job.is_workflow():
+        for candidate in config_db.get_all_jobs():
+            if candidate.parent_job_id:
+                children.setdefault(candidate.parent_job_id, []).append(candidate)
+
+    tasks: List[JobTask] = []
+    scripts: Dict[str, Any] = {}
+
+    def add_atomic(atomic, depends_on: Set[str]) -> Set[str]:
+        if atomic.script_id not in scripts:
+            scripts[atomic.script_id] = config_db.get_script(atomic.script_id)
+        script = scripts[atomic.script_id]
+        if script is None:
+            raise JobPlanError(f"Job '{atomic.name}' references an unknown script")
+        file_path, entry_point = resolve_script_entry(script)
+        tasks.append(JobTask(
+            job_id=atomic.id,
+            name=atomic.name,
+            file_path=file_path,
+            entry_point=entry_point,
+            kwargs=resolve_job_parameters(atomic.get_parameters(), script.get_parameters(),
+                                          config_db),
+            depends_on=set(depends_on),
+        ))
+        return {atomic.id}
+
+    def expand(node, depends_on: Set[str], stack: Set[str]) -> Set[str]:
+        """Add the tasks of node; return the IDs its successors must wait for."""
+        if not node.is_workflow():
+            if not node.script_id:
+                raise JobPlanError(f"Job '{node.name}' has no script")
+            return add_atomic(node, depends_on)
+        if node.id in stack:
+            raise JobPlanError(f"Workflow '{node.name}' contains itself")
+        stack = stack | {node.id}
+
+        kids = {k.id: k for k in children.get(node.id, [])}
+        done: Dict[str, Set[str]] = {}
+        visiting: Set[str] = set()
+
+        def finish(kid) -> Set[str]:
+            """Ends of kid: what a job placed after it has to wait for."""
+            if kid.id in done:
+                return done[kid.id]
+            if kid.id in visiting:
+                raise JobPlanError(f"Cycle in the job order of workflow '{node.name}'")
+            visiting.add(kid.id)
+            previous = kids.get(kid.previous_job_id)
+            deps = finish(previous) if previous is not None else depends_on
+            done[kid.id] = expand(kid, deps, stack) if kid.enabled else set(deps)
+            return done[kid.id]
+
+        for kid in sorted(kids.values(), key=lambda k: k.name):
+            finish(kid)
+        followed = {k.previous_job_id for k in kids.values()}
+        ends = set()
+        for kid_id, kid_ends in done.items():
+            if kid_id not in followed:
+                ends |= kid_ends
+        return ends or set(depends_on)
+
+    expand(job, set(), set())
+    return tasks
+
+
+# ======================================================================
+# Execution
+# ======================================================================
+
+def run_entry_point(file_path: str, entry_point: str, kwargs: Dict[str, Any]) -> Tuple[Any, float]:
+    """
+    Load a script file and call its entry point (runs in a worker process).
+
+    Returns:
+        (return value, duration in seconds)
+    """
+    start = time.perf_counter()
+    module_name = f"_dataforge_job_{os.path.splitext(os.path.basename(file_path))[0]}"
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load script {file_path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    func = getattr(module, entry_point, None)
+    if not callable(func):
+        raise AttributeError(f"{file_path} has no entry point '{entry_point}'")
+    result = func(**kwargs)
+    return result, time.perf_counter() - start
+
+
+def _run_task(file_path: str, entry_point: str, kwargs: Dict[str, Any]) -> Tuple[bool, Any, float, str]:
+    """Pool wrapper: never raises, so every failure keeps its traceback."""
+    start = time.perf_counter()
+    try:
+        result, duration = run_entry_point(file_path, entry_point, kwargs)
+        return True, result, duration, ""
+    except BaseException:
+        return False, None, time.perf_counter() - start, traceback.format_exc()
+
+
+class JobRunner:
+    """
+    Runs a task DAG on a process pool.
+
+    A task is submitted as soon as every task it depends on succeeded;
+    dependents of a failed task are skipped. Pool processes use the
+    "spawn" start method: forking a process that has Qt loaded is unsafe.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 executor_factory: Optional[Callable[[int], Any]] = None):
+        """
+        Initialize the runner.
+
+        Args:
+            max_workers: Pool size (default: CPU count, at most 4)
+            executor_factory: Callable(max_workers) returning an Executor;
+                              defaults to a spawn-context ProcessPoolExecutor
+        """
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._executor_factory = executor_factory or self._process_pool
+        self._cancelled = False
+        self._abandon_running = False
+
+    @staticmethod
+    def _process_pool(max_workers: int):
+        return ProcessPoolExecutor(max_workers=max_workers,
+                                   mp_context=multiprocessing.get_context("spawn"))
+
+    def cancel(self, abandon_running: bool = False):
+        """
+        Stop submitting tasks; pending ones (and their dependents) are cancelled.
+
+        Args:
+            abandon_running: Also stop waiting for running tasks (app exit):
+                             they are reported as cancelled and run() returns
+                             within the poll interval, while their processes
+                             finish on their own
+        """
+        self._abandon_running = abandon_running
+        self._cancelled = True
+
+    def run(self, tasks: List[JobTask],
+            on_event: Optional[Callable[[JobEvent], None]] = None) -> Dict[str, JobOutcome]:
+        """
+        Execute tasks respecting their dependencies.
+
+        Args:
+            tasks: Tasks from build_job_plan()
+            on_event: Called (in the caller's thread) when a task starts
+                      and when it finishes
+
+        Returns:
+            job_id -> JobOutcome for every task
+        """
+        by_id = {t.job_id: t for t in tasks}
+        pending = {t.job_id: {d for d in t.depends_on if d in by_id} for t in tasks}
+        dependents: Dict[str, List[str]] = {t.job_id: [] for t in tasks}
+        for job_id, deps in pending.items():
+            for dep in deps:
+                dependents[dep].append(job_id)
+
+        outcomes: Dict[str, JobOutcome] = {}
+        running: Dict[Future, Tuple[JobTask, str]] = {}
+
+        def emit(kind, task, outcome=None):
+            if on_event is not None:
+                on_event(JobEvent(kind, task, outcome))
+
+        def finish(task, outcome):
+            outcomes[task.job_id] = outcome
+            emit("finished", task, outcome)
+            for child in dependents[task.job_id]:
+                if outcome.status == STATUS_SUCCESS:
+                    pending[child].discard(task.job_id)
+                elif child not in outcomes:
+                    pending.pop(child, None)
+                    if outcome.status == STATUS_CANCELLED:
+                        finish(by_id[child], JobOutcome(child, by_id[child].name,
+                                                        STATUS_CANCELLED))
+                    else:
+                        finish(by_id[child], JobOutcome(
+                            child, by_id[child].name, STATUS_SKIPPED,
+                            error=f"'{task.name}' did not succeed"))
+
+        def finish_pending(status, error=""):
+            # finish() also settles dependents: skip the ids it already popped
+            for job_id in list(pending):
+                if pending.pop(job_id, None) is not None and job_id not in outcomes:
+                    finish(by_id[job_id], JobOutcome(job_id, by_id[job_id].name,
+                                                     status, error=error))
+
+        executor = self._executor_factory(self.max_workers)
+        try:
+            while pending or running:
+                if self._cancelled:
+                    finish_pending(STATUS_CANCELLED)
+                    if self._abandon_running:
+                        for future in list(running):
+                            task, started_at = running.pop(future)
+                            finish(task, JobOutcome(task.job_id, task.name, STATUS_CANCELLED,
+                                                    started_at=started_at,
+                                                    error="Still running when cancelled"))
+                        break
+                for job_id in [j for j, deps in pending.items() if not deps]:
+                    task = by_id[job_id]
+                    del pending[job_id]
+                    started_at = datetime.now().isoformat()
+                    emit("started", task)
+                    future = executor.submit(_run_task, task.file_path, task.entry_point,
+                                             task.kwargs)
+                    running[future] = (task, started_at)
+                if not running:
+                    # Only tasks waiting on each other are left (not a DAG)
+                    finish_pending(STATUS_SKIPPED, "Circular dependency")
+                    break
+                completed, _ = wait(list(running), timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    task, started_at = running.pop(future)
+                    try:
+                        ok, result, duration, error = future.result()
+                    except Exception as e:  # pool broken, pickling error...
+                        ok, result, duration, error = False, None, 0.0, str(e)
+                    finish(task, JobOutcome(
+                        task.job_id, task.name,
+                        STATUS_SUCCESS if ok else STATUS_FAILED,
+                        started_at=started_at, duration=duration,
+                        result=result, error=error,
+                    ))
+        finally:
+            executor.shutdown(wait=not self._abandon_running, cancel_futures=self._cancelled)
+        return outcomes
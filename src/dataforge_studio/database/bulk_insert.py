@@ -0,0 +1,457 @@
+"""
+Bulk Insert - Fast row ingestion into SQL Server, PostgreSQL, MySQL and SQLite.
+
+BulkWriter wraps one connection and sends DataFrame chunks with the fastest
+path the driver offers:
+- SQL Server via pyodbc: fast_executemany with typed parameter sizes
+- SQL Server via python-tds: TDS bulk copy (Cursor.copy_to)
+- PostgreSQL via psycopg2: COPY ... FROM STDIN (copy_expert)
+- MySQL via pymysql: executemany, which pymysql rewrites into multi-row
+  INSERT ... VALUES statements
+- SQLite: explicit multi-row INSERT ... VALUES batches
+
+Chunks are DataFrames of strings as read from files (dtype=str,
+keep_default_na=False). Each target column has a kind (text, integer,
+float, datetime): text values are sent as-is, other kinds are converted
+and empty strings become NULL.
+
+Usage:
+    writer = BulkWriter.connect(connection_string)
+    try:
+        if not writer.table_exists("sales"):
+            writer.create_table("sales", list(df.columns), infer_column_kinds(df))
+        writer.insert("sales", df)
+        writer.commit()
+    finally:
+        writer.close()
+"""
+
+import io
+import re
+import sqlite3
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from .dialects import DialectFactory, ColumnInfo
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+# Rows read and sent per chunk
+BULK_CHUNK_ROWS = 50_000
+
+# Rows per statement for SQLite multi-row VALUES (capped by the variable limit)
+SQLITE_ROWS_PER_STATEMENT = 500
+
+# Longest text bound as NVARCHAR(n) by pyodbc/pytds; longer values use (MAX)
+NVARCHAR_MAX_SIZE = 4000
+
+# Column kinds
+KIND_TEXT = "text"
+KIND_INTEGER = "integer"
+KIND_FLOAT = "float"
+KIND_DATETIME = "datetime"
+
+SQL_TYPES = {
+    "sqlserver": {KIND_TEXT: "NVARCHAR(MAX)", KIND_INTEGER: "BIGINT",
+                  KIND_FLOAT: "FLOAT", KIND_DATETIME: "DATETIME2"},
+    "postgresql": {KIND_TEXT: "TEXT", KIND_INTEGER: "BIGINT",
+                   KIND_FLOAT: "DOUBLE PRECISION", KIND_DATETIME: "TIMESTAMP"},
+    "mysql": {KIND_TEXT: "LONGTEXT", KIND_INTEGER: "BIGINT",
+              KIND_FLOAT: "DOUBLE", KIND_DATETIME: "DATETIME(6)"},
+    # SQLite has no datetime storage class: ISO strings sort and compare fine
+    "sqlite": {KIND_TEXT: "TEXT", KIND_INTEGER: "INTEGER",
+               KIND_FLOAT: "REAL", KIND_DATETIME: "TEXT"},
+}
+
+# No leading zeros: codes such as "00123" must stay text
+_INTEGER_PATTERN = r"[+-]?(?:0|[1-9]\d{0,17})"
+_FLOAT_PATTERN = r"[+-]?(?:(?:0|[1-9]\d*)(?:\.\d+)?|\.\d+)(?:[eE][+-]?\d+)?"
+_DATETIME_PATTERN = r"\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,7})?)?)?"
+
+_INTEGER_TYPE = re.compile(r"\b(?:TINY|SMALL|MEDIUM|BIG)?INT(?:EGER)?\d?\b")
+
+
+# ======================================================================
+# Types
+# ======================================================================
+
+def infer_column_kinds(df: pd.DataFrame) -> Dict[str, str]:
+    """
+    Infer a kind per column from string values.
+
+    Empty strings are ignored; a column with no value is text. Only ISO
+    dates (YYYY-MM-DD[ HH:MM[:SS[.f]]]) count as datetimes, so regional
+    formats never get guessed the wrong way round.
+
+    Args:
+        df: DataFrame of strings
+
+    Returns:
+        Dict column name -> kind
+    """
+    kinds = {}
+    for col in df.columns:
+        values = df[col].astype(str)
+        values = values[values != ""]
+        if values.empty:
+            kinds[col] = KIND_TEXT
+        elif values.str.fullmatch(_INTEGER_PATTERN).all():
+            kinds[col] = KIND_INTEGER
+        elif values.str.fullmatch(_FLOAT_PATTERN).all():
+            kinds[col] = KIND_FLOAT
+        elif (values.str.fullmatch(_DATETIME_PATTERN).all()
+              and pd.to_datetime(values, errors="coerce", format="ISO8601").notna().all()):
+            kinds[col] = KIND_DATETIME
+        else:
+            kinds[col] = KIND_TEXT
+    return kinds
+
+
+def kind_from_type_name(type_name: str) -> str:
+    """Map a database column type to the kind its values are sent as."""
+    name = (type_name or "").upper()
+    if _INTEGER_TYPE.search(name):
+        return KIND_INTEGER
+    if any(t in name for t in ("FLOAT", "REAL", "DOUBLE")):
+        return KIND_FLOAT
+    if "DATETIME" in name or "TIMESTAMP" in name:
+        return KIND_DATETIME
+    return KIND_TEXT
+
+
+def _convert_column(values: pd.Series, kind: str) -> list:
+    """Python values for one column: typed, with NULL for empty strings."""
+    if kind == KIND_TEXT:
+        return values.tolist()
+    if kind == KIND_INTEGER:
+        return [int(v) if v != "" else None for v in values.tolist()]
+    if kind == KIND_FLOAT:
+        return [float(v) if v != "" else None for v in values.tolist()]
+    stamps = pd.to_datetime(values.mask(values == ""), format="ISO8601")
+    return [None if pd.isna(v) else v.to_pydatetime() for v in stamps]
+
+
+def _typed_rows(chunk: pd.DataFrame, kinds: Dict[str, str]) -> List[tuple]:
+    columns = [_convert_column(chunk[col], kinds.get(col, KIND_TEXT)) for col in chunk.columns]
+    return list(zip(*columns))
+
+
+def _text_lengths(chunk: pd.DataFrame) -> Dict[str, int]:
+    """Longest value per column (for parameter sizes)."""
+    return {col: int(chunk[col].str.len().max() or 0) for col in chunk.columns}
+
+
+# ======================================================================
+# Connections
+# ======================================================================
+
+def detect_dialect(conn_str: str) -> str:
+    """
+    Guess the database type of a connection string.
+
+    URLs name their scheme (postgresql://, mysql+pymysql://, sqlite:///);
+    ODBC key=value strings are SQL Server.
+
+    Raises:
+        ValueError: For Access (Dbq=) strings, which have no bulk path
+    """
+    lower = conn_str.strip().lower()
+    if lower.startswith(("postgresql://", "postgres://")):
+        return "postgresql"
+    if lower.startswith(("mysql://", "mysql+pymysql://", "mariadb://")):
+        return "mysql"
+    if lower.startswith("sqlite:///") or lower.endswith((".db", ".sqlite", ".sqlite3")):
+        return "sqlite"
+    if "dbq=" in lower:
+        raise ValueError("Bulk loading into Access databases is not supported")
+    return "sqlserver"
+
+
+def _open_connection(conn_str: str, dialect: str):
+    if dialect == "sqlserver":
+        from .sqlserver_connection import connect_sqlserver
+        return connect_sqlserver(conn_str)
+    if dialect == "postgresql":
+        import psycopg2
+        from ..utils.connection_helpers import parse_postgresql_url
+        kwargs = parse_postgresql_url(conn_str.replace("postgres://", "postgresql://", 1))
+        if not kwargs:
+            raise ValueError("Unsupported PostgreSQL connection string")
+        return psycopg2.connect(**kwargs)
+    if dialect == "mysql":
+        import pymysql
+        from ..utils.connection_helpers import parse_mysql_url
+        url = conn_str.replace("mariadb://", "mysql+pymysql://", 1)
+        if url.startswith("mysql://"):
+            url = "mysql+pymysql://" + url[len("mysql://"):]
+        kwargs = parse_mysql_url(url)
+        if not kwargs:
+            raise ValueError("Unsupported MySQL connection string")
+        return pymysql.connect(**kwargs)
+    from .connection_builder import _sqlite_path
+    # Opened by an import worker, closed by the thread that started the run
+    return sqlite3.connect(_sqlite_path(conn_str), check_same_thread=False)
+
+
+# ======================================================================
+# Writer
+# ======================================================================
+
+class BulkWriter:
+    """
+    Table DDL and bulk inserts over one connection.
+
+    Nothing is committed implicitly: callers group a truncate and the
+    inserts of a file in one transaction and commit() or rollback().
+    """
+
+    def __init__(self, connection: Any, dialect: str):
+        """
+        Initialize the writer.
+
+        Args:
+            connection: Open DBAPI connection (see BulkWriter.connect)
+            dialect: "sqlserver", "postgresql", "mysql" or "sqlite"
+        """
+        self.connection = connection
+        self.dialect = dialect
+        self._sql_dialect = DialectFactory.create(dialect, connection, self._current_database())
+
+    @classmethod
+    def connect(cls, conn_str: str) -> "BulkWriter":
+        """Open a connection for conn_str and wrap it."""
+        dialect = detect_dialect(conn_str)
+        return cls(_open_connection(conn_str, dialect), dialect)
+
+    def _current_database(self) -> Optional[str]:
+        query = {"sqlserver": "SELECT DB_NAME()", "mysql": "SELECT DATABASE()"}.get(self.dialect)
+        if query is None:
+            return None
+        cursor = self.connection.cursor()
+        cursor.execute(query)
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def quote(self, identifier: str) -> str:
+        """Quote an identifier for this database."""
+        return self._sql_dialect.quote_identifier(identifier)
+
+    def sql_type(self, kind: str) -> str:
+        """Column type used to create columns of a kind."""
+        return SQL_TYPES[self.dialect][kind]
+
+    # ==================== DDL ====================
+
+    def table_columns(self, table_name: str) -> List[ColumnInfo]:
+        """Columns of a table (empty if it does not exist)."""
+        return self._sql_dialect.get_table_columns(table_name)
+
+    def table_exists(self, table_name: str) -> bool:
+        """Check if a table exists."""
+        return bool(self.table_columns(table_name))
+
+    def create_table(self, table_name: str, columns: List[str],
+                     kinds: Optional[Dict[str, str]] = None,
+                     text_type: Optional[str] = None) -> None:
+        """
+        Create a table.
+
+        Args:
+            table_name: Table to create
+            columns: Column names
+            kinds: Optional column kinds (default: all text)
+            text_type: Optional type for text columns (default: SQL_TYPES)
+        """
+        kinds = kinds or {}
+        columns_def = ", ".join(
+            f"{self.quote(col)} {self._column_type(kinds.get(col, KIND_TEXT), text_type)}"
+            for col in columns
+        )
+        self.connection.cursor().execute(f"CREATE TABLE {self.quote(table_name)} ({columns_def})")
+
+    def add_columns(self, table_name: str, columns: List[str],
+                    kinds: Optional[Dict[str, str]] = None,
+                    text_type: Optional[str] = None) -> None:
+        """Add columns to an existing table."""
+        kinds = kinds or {}
+        cursor = self.connection.cursor()
+        for col in columns:
+            col_type = self._column_type(kinds.get(col, KIND_TEXT), text_type)
+            cursor.execute(f"ALTER TABLE {self.quote(table_name)} ADD {self.quote(col)} {col_type}")
+
+    def truncate(self, table_name: str) -> None:
+        """Delete every row of a table."""
+        verb = "DELETE FROM" if self.dialect == "sqlite" else "TRUNCATE TABLE"
+        self.connection.cursor().execute(f"{verb} {self.quote(table_name)}")
+
+    def _column_type(self, kind: str, text_type: Optional[str]) -> str:
+        if kind == KIND_TEXT and text_type:
+            return text_type
+        return self.sql_type(kind)
+
+    # ==================== Inserts ====================
+
+    def column_kinds(self, table_name: str) -> Dict[str, str]:
+        """Kinds of the existing columns of a table, from their types."""
+        return {c.name: kind_from_type_name(c.type_name) for c in self.table_columns(table_name)}
+
+    def insert(self, table_name: str, chunk: pd.DataFrame,
+               kinds: Optional[Dict[str, str]] = None) -> int:
+        """
+        Insert a chunk of rows.
+
+        Args:
+            table_name: Target table
+            chunk: DataFrame whose columns exist in the table
+            kinds: Column kinds (default: all text)
+
+        Returns:
+            Number of rows sent
+        """
+        if chunk.empty:
+            return 0
+        chunk = chunk.fillna("").astype(str)
+        kinds = kinds or {}
+        if self.dialect == "sqlserver":
+            if hasattr(self.connection, "raw_connection"):
+                self._insert_tds_bulk(table_name, chunk, kinds)
+            else:
+                self._insert_fast_executemany(table_name, chunk, kinds)
+        elif self.dialect == "postgresql":
+            self._insert_copy(table_name, chunk, kinds)
+        elif self.dialect == "mysql":
+            self._insert_executemany(table_name, chunk, kinds, "%s")
+        else:
+            self._insert_multirow(table_name, chunk, kinds)
+        return len(chunk)
+
+    def _insert_statement(self, table_name: str, columns, placeholder: str, rows: int = 1) -> str:
+        values = "(" + ", ".join([placeholder] * len(columns)) + ")"
+        return (f"INSERT INTO {self.quote(table_name)} "
+                f"({', '.join(self.quote(c) for c in columns)}) "
+                f"VALUES {', '.join([values] * rows)}")
+
+    def _insert_fast_executemany(self, table_name: str, chunk: pd.DataFrame,
+                                 kinds: Dict[str, str]) -> None:
+        """pyodbc: one round trip per chunk with sized parameter arrays."""
+        import pyodbc
+
+        lengths = _text_lengths(chunk)
+        sizes = []
+        for col in chunk.columns:
+            kind = kinds.get(col, KIND_TEXT)
+            if kind == KIND_INTEGER:
+                sizes.append((pyodbc.SQL_BIGINT, 0, 0))
+            elif kind == KIND_FLOAT:
+                sizes.append((pyodbc.SQL_DOUBLE, 0, 0))
+            elif kind == KIND_DATETIME:
+                sizes.append((pyodbc.SQL_TYPE_TIMESTAMP, 27, 7))
+            elif lengths[col] <= NVARCHAR_MAX_SIZE:
+                sizes.append((pyodbc.SQL_WVARCHAR, max(lengths[col], 1), 0))
+            else:
+                sizes.append((pyodbc.SQL_WVARCHAR, 0, 0))  # NVARCHAR(MAX)
+
+        cursor = self.connection.cursor()
+        cursor.fast_executemany = True
+        cursor.setinputsizes(sizes)
+        cursor.executemany(self._insert_statement(table_name, chunk.columns, "?"),
+                           _typed_rows(chunk, kinds))
+
+    def _insert_tds_bulk(self, table_name: str, chunk: pd.DataFrame,
+                         kinds: Dict[str, str]) -> None:
+        """python-tds: INSERT BULK stream, no per-row statement."""
+        from pytds import tds_base, tds_types
+
+        lengths = _text_lengths(chunk)
+        metadata = []
+        for col in chunk.columns:
+            kind = kinds.get(col, KIND_TEXT)
+            if kind == KIND_INTEGER:
+                col_type = tds_types.BigIntType()
+            elif kind == KIND_FLOAT:
+                col_type = tds_types.FloatType()
+            elif kind == KIND_DATETIME:
+                col_type = tds_types.DateTime2Type(precision=7)
+            elif lengths[col] <= NVARCHAR_MAX_SIZE:
+                col_type = tds_types.NVarCharType(size=NVARCHAR_MAX_SIZE)
+            else:
+                col_type = tds_types.NVarCharMaxType()
+            metadata.append(tds_base.Column(name=col, type=col_type,
+                                            flags=tds_base.Column.fNullable))
+
+        cursor = self.connection.raw_connection.cursor()
+        cursor.copy_to(table_or_view=table_name, columns=metadata,
+                       data=_typed_rows(chunk, kinds), keep_nulls=True, tablock=True)
+
+    def _insert_copy(self, table_name: str, chunk: pd.DataFrame, kinds: Dict[str, str]) -> None:
+        """psycopg2: COPY FROM STDIN in text format; PostgreSQL parses the values."""
+        columns = ", ".join(self.quote(c) for c in chunk.columns)
+        sql = f"COPY {self.quote(table_name)} ({columns}) FROM STDIN"
+        self.connection.cursor().copy_expert(sql, copy_text_buffer(chunk, kinds))
+
+    def _insert_executemany(self, table_name: str, chunk: pd.DataFrame,
+                            kinds: Dict[str, str], placeholder: str) -> None:
+        cursor = self.connection.cursor()
+        cursor.executemany(self._insert_statement(table_name, chunk.columns, placeholder),
+                           _typed_rows(chunk, kinds))
+
+    def _insert_multirow(self, table_name: str, chunk: pd.DataFrame,
+                         kinds: Dict[str, str]) -> None:
+        """SQLite: INSERT ... VALUES (...), (...), ... within the variable limit."""
+        max_variables = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+        per_statement = max(1, min(SQLITE_ROWS_PER_STATEMENT, max_variables // len(chunk.columns)))
+        rows = _typed_rows(chunk, kinds)
+        cursor = self.connection.cursor()
+
+        full = len(rows) - len(rows) % per_statement
+        if full:
+            sql = self._insert_statement(table_name, chunk.columns, "?", per_statement)
+            cursor.executemany(sql, (
+                [v for row in rows[i:i + per_statement] for v in row]
+                for i in range(0, full, per_statement)
+            ))
+        if full < len(rows):
+            rest = rows[full:]
+            sql = self._insert_statement(table_name, chunk.columns, "?", len(rest))
+            cursor.execute(sql, [v for row in rest for v in row])
+
+    # ==================== Transaction ====================
+
+    def commit(self) -> None:
+        self.connection.commit()
+
+    def rollback(self) -> None:
+        try:
+            self.connection.rollback()
+        except Exception as e:
+            logger.warning(f"Rollback failed: {e}")
+
+    def close(self) -> None:
+        try:
+            self.connection.close()
+        except Exception as e:
+            logger.debug(f"Error closing bulk connection: {e}")
+
+
+def copy_text_buffer(chunk: pd.DataFrame, kinds: Dict[str, str]) -> io.StringIO:
+    """
+    Render a chunk in PostgreSQL COPY text format.
+
+    Backslash, tab, newline and carriage return are escaped; empty values
+    of non-text columns become \\N (NULL).
+    """
+    parts = []
+    for col in chunk.columns:
+        values = chunk[col]
+        escaped = (values.str.replace("\\", "\\\\", regex=False)
+                   .str.replace("\t", "\\t", regex=False)
+                   .str.replace("\n", "\\n", regex=False)
+                   .str.replace("\r", "\\r", regex=False))
+        if kinds.get(col, KIND_TEXT) != KIND_TEXT:
+            escaped = escaped.mask(values == "", "\\N")
+        parts.append(escaped)
+    lines = parts[0].str.cat(parts[1:], sep="\t") if len(parts) > 1 else parts[0]
+    return io.StringIO("\n".join(lines.tolist()) + "\n")
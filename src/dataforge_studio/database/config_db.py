@@ -6,7 +6,7 @@ Models are defined in database/models/ package.
 """
 import logging
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 
 from .models import (
     DatabaseConnection,
@@ -21,6 +21,7 @@ from .models import (
     ImageRootfolder,
     SavedImage,
     ERDiagram,
+    SchemaSnapshot,
 )
 from .models.workspace_resource import WorkspaceFileRoot, WorkspaceDatabase, WorkspaceFTPRoot
 from .schema_manager import SchemaManager
@@ -37,6 +38,7 @@ from .repositories import (
     SavedImageRepository,
     UserPreferencesRepository,
     ERDiagramRepository,
+    SchemaSnapshotRepository,
 )
 
 logger = logging.getLogger(__name__)
@@ -54,10 +56,10 @@ class ConfigDatabase:
     CONFIG_DB_ID = "config-db-self-ref"
     CONFIG_DB_NAME = "Configuration Database"
 
-    def __init__(self):
-        # Store config in project root/_AppConfig/
+    def __init__(self, db_path: Optional[Path] = None):
+        # Store config in project root/_AppConfig/ unless given another file
         project_root = Path(__file__).parent.parent.parent.parent
-        self.db_path = project_root / "_AppConfig" / "configuration.db"
+        self.db_path = Path(db_path) if db_path else project_root / "_AppConfig" / "configuration.db"
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Initialize schema (creates tables + runs migrations)
@@ -77,6 +79,7 @@ class ConfigDatabase:
         self._image_repo = SavedImageRepository(self._pool)
         self._prefs_repo = UserPreferencesRepository(self._pool)
         self._er_diagram_repo = ERDiagramRepository(self._pool)
+        self._schema_snapshot_repo = SchemaSnapshotRepository(self._pool)
 
     # ==================== Database Connections ====================
 
@@ -155,6 +158,9 @@ class ConfigDatabase:
     def delete_job(self, job_id: str) -> bool:
         return self._job_repo.delete(job_id)
 
+    def update_job_last_run(self, job_id: str) -> bool:
+        return self._job_repo.update_last_run(job_id)
+
     # ==================== Projects ====================
 
     def get_all_projects(self, sort_by_usage: bool = True) -> List[Project]:
@@ -397,6 +403,9 @@ class ConfigDatabase:
     def set_preference(self, key: str, value: str) -> bool:
         return self._prefs_repo.set(key, value)
 
+    def set_preferences(self, values: Dict[str, str]) -> bool:
+        return self._prefs_repo.set_many(values)
+
     def get_all_preferences(self) -> dict:
         return self._prefs_repo.get_all()
 
@@ -490,12 +499,27 @@ class ConfigDatabase:
     # ==================== Image Search ====================
 
     def search_images(self, query: str, search_name: bool = True,
-                      search_categories: bool = True, search_tags: bool = True) -> List[SavedImage]:
-        return self._image_repo.search(query, search_name, search_categories, search_tags)
+                      search_categories: bool = True, search_tags: bool = True,
+                      limit: Optional[int] = None, offset: int = 0) -> List[SavedImage]:
+        return self._image_repo.search(query, search_name, search_categories, search_tags,
+                                       limit, offset)
+
+    def count_image_search(self, query: str, search_name: bool = True,
+                           search_categories: bool = True, search_tags: bool = True) -> int:
+        return self._image_repo.count_search(query, search_name, search_categories, search_tags)
 
     def get_image_physical_paths(self, rootfolder_id: str) -> List[str]:
         return self._image_repo.get_physical_paths(rootfolder_id)
 
+    def get_image_tree_entries(self) -> List[Tuple[SavedImage, bool]]:
+        return self._image_repo.get_tree_entries()
+
+    def get_image_category_entries(self) -> List[Tuple[str, SavedImage, bool]]:
+        return self._image_repo.get_category_entries()
+
+    def get_image_ids_with_metadata(self, image_ids: List[str]) -> Set[str]:
+        return self._image_repo.get_ids_with_metadata(image_ids)
+
     # ==================== ER Diagrams ====================
 
     def get_all_er_diagrams(self) -> List[ERDiagram]:
@@ -520,6 +544,62 @@ class ConfigDatabase:
                                           pos_x: float, pos_y: float, schema_name: str = ""):
         self._er_diagram_repo.update_table_position(diagram_id, table_name, pos_x, pos_y, schema_name)
 
+    # ==================== Bulk Import ====================
+
+    def import_resources(self, workspace_id: Optional[str] = None,
+                         new_workspace: Optional[Project] = None,
+                         connections: List[DatabaseConnection] = (),
+                         file_roots: List[FileRoot] = (),
+                         queries: List[SavedQuery] = (),
+                         scripts: List[Script] = (),
+                         jobs: List[Job] = (),
+                         links: Optional[Dict[str, List[tuple]]] = None) -> None:
+        """
+        Insert imported resources and their workspace links in one transaction.
+
+        Args:
+            workspace_id: Workspace receiving the links
+            new_workspace: Workspace to create first (None to link into an existing one)
+            connections, file_roots, queries, scripts, jobs: New records
+            links: Rows per kind ("databases": (id, database_name),
+                   "file_roots": (id, subfolder_path), "queries"/"scripts"/"jobs": (id,))
+
+        Raises:
+            sqlite3.Error: Nothing is written
+        """
+        links = links or {}
+        with self._pool.transaction() as conn:
+            cursor = conn.cursor()
+            if new_workspace is not None:
+                self._project_repo.insert_many(cursor, [new_workspace])
+            self._db_conn_repo.insert_many(cursor, list(connections))
+            self._file_root_repo.insert_many(cursor, list(file_roots))
+            self._query_repo.insert_many(cursor, list(queries))
+            self._script_repo.insert_many(cursor, list(scripts))
+            self._job_repo.insert_many(cursor, list(jobs))
+            if workspace_id:
+                add = self._project_repo.add_relations
+                add(cursor, "project_databases", "database_id", workspace_id,
+                    links.get("databases", []), extra_cols=", database_name")
+                add(cursor, "project_file_roots", "file_root_id", workspace_id,
+                    links.get("file_roots", []), extra_cols=", subfolder_path")
+                add(cursor, "project_queries", "query_id", workspace_id, links.get("queries", []))
+                add(cursor, "project_scripts", "script_id", workspace_id, links.get("scripts", []))
+                add(cursor, "project_jobs", "job_id", workspace_id, links.get("jobs", []))
+
+    # ==================== Schema Snapshots ====================
+
+    def get_schema_snapshot(self, connection_id: str,
+                            database_name: str = "") -> Optional[SchemaSnapshot]:
+        return self._schema_snapshot_repo.get(connection_id, database_name)
+
+    def save_schema_snapshot(self, snapshot: SchemaSnapshot) -> bool:
+        return self._schema_snapshot_repo.save(snapshot)
+
+    def delete_schema_snapshots(self, connection_id: str,
+                                database_name: Optional[str] = None) -> bool:
+        return self._schema_snapshot_repo.delete(connection_id, database_name)
+
 
 # Global configuration database instance
 def get_config_db() -> ConfigDatabase:
@@ -26,7 +26,7 @@ except ImportError:
 from .sqlserver_connection import connect_sqlserver
 from ..constants import CONNECTION_TIMEOUT_S
 from ..utils.credential_manager import CredentialManager
-from ..utils.connection_helpers import parse_postgresql_url, parse_mysql_url
+from ..utils.connection_helpers import parse_postgresql_url, parse_mysql_url, quote_credential
 
 
 class ConnectionConfigError(Exception):
@@ -52,6 +52,52 @@ def _sqlite_path(conn_str: str) -> str:
     return conn_str
 
 
+def connection_string_with_credentials(db_conn) -> str:
+    """Connection string of ``db_conn`` with its stored credentials embedded.
+
+    For consumers that only take a string (job scripts run in another
+    process): the same credentials build_connection() would inject.
+    Strings that need none, or already carry them, come back unchanged.
+    """
+    db_type = (db_conn.db_type or "").lower()
+    conn_str = db_conn.connection_string or ""
+
+    if db_type == "sqlserver":
+        # Inject stored credentials unless using Windows Authentication
+        if "trusted_connection=yes" not in conn_str.lower():
+            username, password = CredentialManager.get_credentials(db_conn.id)
+            if (username and password
+                    and "uid=" not in conn_str.lower()
+                    and "user id=" not in conn_str.lower()):
+                if not conn_str.endswith(";"):
+                    conn_str += ";"
+                conn_str += f"UID={username};PWD={password};"
+        return conn_str
+
+    if db_type == "access":
+        # Inject stored password if present and not already in the string
+        _, password = CredentialManager.get_credentials(db_conn.id)
+        if password and "Pwd=" not in conn_str:
+            if not conn_str.endswith(";"):
+                conn_str += ";"
+            conn_str += f"Pwd={password};"
+        return conn_str
+
+    scheme = {"postgresql": "postgresql://", "postgres": "postgresql://",
+              "mysql": "mysql+pymysql://", "mariadb": "mysql+pymysql://"}.get(db_type)
+    if scheme and conn_str.startswith(scheme):
+        # Keyring credentials take priority over the URL's, as in parse_*_url()
+        username, password = CredentialManager.get_credentials(db_conn.id)
+        if username or password:
+            userinfo, _, remainder = conn_str[len(scheme):].rpartition("@")
+            url_user, _, url_password = userinfo.partition(":")
+            user_part = quote_credential(username) if username else url_user
+            password_part = quote_credential(password) if password else url_password
+            credentials = f"{user_part}:{password_part}" if password_part else user_part
+            return f"{scheme}{credentials}@{remainder}"
+    return conn_str
+
+
 def build_connection(db_conn):
     """Open and return a live DBAPI connection for ``db_conn``.
 
@@ -69,16 +115,7 @@ def build_connection(db_conn):
         return sqlite3.connect(db_path, check_same_thread=False)
 
     if db_type == "sqlserver":
-        conn_str = db_conn.connection_string
-        # Inject stored credentials unless using Windows Authentication
-        if "trusted_connection=yes" not in conn_str.lower():
-            username, password = CredentialManager.get_credentials(db_conn.id)
-            if (username and password
-                    and "uid=" not in conn_str.lower()
-                    and "user id=" not in conn_str.lower()):
-                if not conn_str.endswith(";"):
-                    conn_str += ";"
-                conn_str += f"UID={username};PWD={password};"
+        conn_str = connection_string_with_credentials(db_conn)
         return connect_sqlserver(conn_str, timeout=CONNECTION_TIMEOUT_S)
 
     if db_type == "access":
@@ -89,12 +126,7 @@ def build_connection(db_conn):
             db_path = match.group(1)
         if not db_path or not Path(db_path).exists():
             raise ConnectionConfigError("db_access_file_missing", path=db_path or "?")
-        # Inject stored password if present and not already in the string
-        _, password = CredentialManager.get_credentials(db_conn.id)
-        if password and "Pwd=" not in conn_str:
-            if not conn_str.endswith(";"):
-                conn_str += ";"
-            conn_str += f"Pwd={password};"
+        conn_str = connection_string_with_credentials(db_conn)
         if pyodbc is None:
             raise ConnectionConfigError("db_pyodbc_required")
         return pyodbc.connect(conn_str, timeout=CONNECTION_TIMEOUT_S)
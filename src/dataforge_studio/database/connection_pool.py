@@ -4,6 +4,7 @@ Connection Pool Module - Manages SQLite connections with pooling and transaction
 Provides:
 - ConnectionPool: Reusable connection pool for SQLite
 - Transaction context manager for atomic operations
+- configure_connection: Standard settings of configuration DB connections
 """
 import sqlite3
 import queue
@@ -15,6 +16,25 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Page cache per connection, in KiB
+CACHE_SIZE_KB = 8 * 1024
+
+
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """
+    Apply the standard settings to a configuration DB connection.
+
+    synchronous=NORMAL is only used in WAL mode, where a power loss can
+    drop the last commits but never corrupt the database.
+    """
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal":
+        conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
 
 class ConnectionPool:
     """
@@ -25,6 +45,8 @@ class ConnectionPool:
     - Thread-safe connection management
     - Automatic connection health checks
     - Transaction support with context manager
+    - WAL-friendly settings (see configure_connection), so readers never
+      wait for a writer
 
     Usage:
         pool = ConnectionPool(db_path, max_connections=5)
@@ -58,9 +80,7 @@ class ConnectionPool:
     def _create_connection(self) -> sqlite3.Connection:
         """Create a new database connection with standard settings."""
         conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return configure_connection(conn)
 
     def _validate_connection(self, conn: sqlite3.Connection) -> bool:
         """Check if a connection is still valid."""
@@ -15,6 +15,7 @@ from .script import Script
 from .job import Job
 from .image import ImageRootfolder, SavedImage
 from .er_diagram import ERDiagram, ERDiagramTable, ERDiagramFKMidpoint, ERDiagramGroup
+from .schema_snapshot import SchemaSnapshot
 
 __all__ = [
     "DatabaseConnection",
@@ -33,4 +34,5 @@ __all__ = [
     "ERDiagramTable",
     "ERDiagramFKMidpoint",
     "ERDiagramGroup",
+    "SchemaSnapshot",
 ]
@@ -20,6 +20,7 @@ class ERDiagramTable:
     pos_y: float = 0.0
     width: float = 0.0   # 0 → auto (use widget's natural width)
     height: float = 0.0  # 0 → auto
+    pinned: bool = False  # kept in place by auto-layout
 
 
 @dataclass
@@ -129,6 +130,15 @@ class ERDiagram:
                 self.updated_at = datetime.now().isoformat()
                 return
 
+    def update_table_pinned(self, table_name: str, pinned: bool, schema_name: str = ""):
+        """Pin or unpin a table (pinned tables are not moved by auto-layout)."""
+        for t in self.tables:
+            if t.table_name == table_name and t.schema_name == schema_name:
+                if t.pinned != pinned:
+                    t.pinned = pinned
+                    self.updated_at = datetime.now().isoformat()
+                return
+
     def get_table_names(self) -> List[str]:
         """Get list of table names in the diagram."""
         return [t.table_name for t in self.tables]
@@ -0,0 +1,97 @@
+"""
+Schema Snapshot model - Persisted copy of a database catalog.
+
+A SchemaSnapshot stores what a SchemaLoader returned for one connection
+(and one database on multi-database servers): the schema tree with tables,
+columns, views and routines, plus primary and foreign keys. It is tagged
+with the loader's change marker so it can be reused until the live
+catalog changes.
+"""
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from ..schema_loaders.base import SchemaNode, SchemaNodeType, ForeignKeyInfo, PrimaryKeyInfo
+
+
+@dataclass
+class SchemaSnapshot:
+    """
+    Stored catalog of a connection/database.
+
+    Attributes:
+        connection_id: ID of the database connection
+        database_name: Database name ("" for the whole connection/server)
+        marker: Catalog change marker at capture time (None = unknown)
+        schema: Root SchemaNode as returned by the loader
+        foreign_keys: FK relationships, or None if not captured yet
+        primary_keys: PK columns, or None if not captured yet
+        captured_at: Capture timestamp
+        is_cached: True when served from the store without reloading
+                   (runtime only, not persisted)
+    """
+    connection_id: str
+    database_name: str = ""
+    marker: Optional[str] = None
+    schema: Optional[SchemaNode] = None
+    foreign_keys: Optional[List[ForeignKeyInfo]] = None
+    primary_keys: Optional[List[PrimaryKeyInfo]] = None
+    captured_at: str = ""
+    is_cached: bool = field(default=False, compare=False)
+
+    def __post_init__(self):
+        if not self.captured_at:
+            self.captured_at = datetime.now().isoformat()
+
+    def to_payload(self) -> Dict[str, Any]:
+        """Serialize schema tree and keys to JSON-compatible data."""
+        return {
+            "schema": self.schema.to_dict() if self.schema else None,
+            "foreign_keys": ([asdict(fk) for fk in self.foreign_keys]
+                             if self.foreign_keys is not None else None),
+            "primary_keys": ([asdict(pk) for pk in self.primary_keys]
+                             if self.primary_keys is not None else None),
+        }
+
+    @classmethod
+    def from_payload(cls, connection_id: str, database_name: str, marker: Optional[str],
+                     payload: Dict[str, Any], captured_at: str = "") -> "SchemaSnapshot":
+        """Rebuild a snapshot from to_payload() output."""
+        schema = payload.get("schema")
+        fks = payload.get("foreign_keys")
+        pks = payload.get("primary_keys")
+        return cls(
+            connection_id=connection_id,
+            database_name=database_name,
+            marker=marker,
+            schema=SchemaNode.from_dict(schema) if schema else None,
+            foreign_keys=[ForeignKeyInfo(**fk) for fk in fks] if fks is not None else None,
+            primary_keys=[PrimaryKeyInfo(**pk) for pk in pks] if pks is not None else None,
+            captured_at=captured_at,
+        )
+
+    def iter_nodes(self, node_type: SchemaNodeType):
+        """Yield every node of a given type in the schema tree."""
+        if self.schema is None:
+            return
+        stack = [self.schema]
+        while stack:
+            node = stack.pop()
+            if node.node_type == node_type:
+                yield node
+            stack.extend(node.children)
+
+    def table_columns(self) -> Dict[str, List[SchemaNode]]:
+        """
+        Map table names to their column nodes.
+
+        Each table is reachable by its full name ("schema.table") and by its
+        bare name, so callers that only know one of them can look it up.
+        """
+        columns: Dict[str, List[SchemaNode]] = {}
+        for table in self.iter_nodes(SchemaNodeType.TABLE):
+            columns.setdefault(table.name, table.children)
+            bare = table.metadata.get("table")
+            if bare:
+                columns.setdefault(bare, table.children)
+        return columns
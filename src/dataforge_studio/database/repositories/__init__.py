@@ -16,6 +16,7 @@ from .job_repository import JobRepository
 from .image_repository import ImageRootfolderRepository, SavedImageRepository
 from .user_preferences_repository import UserPreferencesRepository
 from .er_diagram_repository import ERDiagramRepository
+from .schema_snapshot_repository import SchemaSnapshotRepository
 
 __all__ = [
     'BaseRepository',
@@ -30,4 +31,5 @@ __all__ = [
     'SavedImageRepository',
     'UserPreferencesRepository',
     'ERDiagramRepository',
+    'SchemaSnapshotRepository',
 ]
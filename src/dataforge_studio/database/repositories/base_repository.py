@@ -118,6 +118,21 @@ class BaseRepository(ABC, Generic[T]):
             logger.error(f"Error adding {self.table_name} record: {e}")
             return False
 
+    def insert_many(self, cursor: sqlite3.Cursor, models: List[T]) -> None:
+        """
+        Insert records inside the caller's transaction.
+
+        Args:
+            cursor: Cursor of an open transaction (see ConnectionPool.transaction)
+            models: Model instances to insert
+
+        Raises:
+            sqlite3.Error: Left to the caller, which rolls back
+        """
+        if models:
+            cursor.executemany(self._get_insert_sql(),
+                               [self._model_to_insert_tuple(model) for model in models])
+
     def update(self, model: T) -> bool:
         """
         Update an existing record.
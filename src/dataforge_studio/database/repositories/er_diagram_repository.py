@@ -2,7 +2,7 @@
 ER Diagram Repository - CRUD operations for ER diagrams and their tables.
 """
 import sqlite3
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 from .base_repository import BaseRepository
@@ -56,153 +56,191 @@ class ERDiagramRepository(BaseRepository[ERDiagram]):
                 model.description, model.zoom_level, int(model.show_column_types),
                 int(model.group_fks), model.updated_at, model.id)
 
-    def _load_tables(self, diagram_id: str) -> List[ERDiagramTable]:
-        """Load tables for a diagram."""
-        with self.pool.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT table_name, schema_name, pos_x, pos_y, width, height "
-                "FROM er_diagram_tables WHERE diagram_id = ? ORDER BY table_name",
-                (diagram_id,)
-            )
-            return [
-                ERDiagramTable(
+    # ==================== Loading ====================
+
+    def _load_details(self, cursor: sqlite3.Cursor, diagrams: List[ERDiagram],
+                      scope_sql: str = "", params: tuple = ()):
+        """
+        Load tables, FK midpoints and groups of several diagrams in three queries.
+
+        Args:
+            cursor: Cursor to query with
+            diagrams: Diagrams to fill
+            scope_sql: WHERE clause (on diagram_id) narrowing the child rows
+                       to those diagrams; empty loads every diagram's rows
+            params: Parameters of scope_sql
+        """
+        by_id: Dict[str, ERDiagram] = {d.id: d for d in diagrams}
+        for d in diagrams:
+            d.tables, d.fk_midpoints, d.groups = [], [], []
+
+        cursor.execute(
+            "SELECT diagram_id, table_name, schema_name, pos_x, pos_y, width, height, pinned "
+            f"FROM er_diagram_tables {scope_sql} ORDER BY diagram_id, table_name",
+            params
+        )
+        for row in cursor.fetchall():
+            diagram = by_id.get(row['diagram_id'])
+            if diagram:
+                diagram.tables.append(ERDiagramTable(
                     table_name=row['table_name'],
                     schema_name=row['schema_name'],
                     pos_x=row['pos_x'],
                     pos_y=row['pos_y'],
                     width=row['width'] or 0.0,
                     height=row['height'] or 0.0,
-                )
-                for row in cursor.fetchall()
-            ]
+                    pinned=bool(row['pinned']),
+                ))
+
+        cursor.execute(
+            "SELECT diagram_id, from_table, from_column, to_table, to_column, mid_x, mid_y, seq "
+            f"FROM er_diagram_fk_midpoints {scope_sql} "
+            "ORDER BY diagram_id, from_table, from_column, to_table, to_column, seq",
+            params
+        )
+        for row in cursor.fetchall():
+            diagram = by_id.get(row[0])
+            if diagram:
+                diagram.fk_midpoints.append(ERDiagramFKMidpoint(
+                    from_table=row[1], from_column=row[2],
+                    to_table=row[3], to_column=row[4],
+                    mid_x=row[5], mid_y=row[6], seq=row[7]
+                ))
+
+        cursor.execute(
+            "SELECT diagram_id, id, name, x, y, width, height, color "
+            f"FROM er_diagram_groups {scope_sql} ORDER BY diagram_id, rowid",
+            params
+        )
+        for row in cursor.fetchall():
+            diagram = by_id.get(row[0])
+            if diagram:
+                diagram.groups.append(ERDiagramGroup(
+                    id=row[1], name=row[2],
+                    x=row[3], y=row[4], width=row[5], height=row[6],
+                    color=row[7], diagram_id=row[0],
+                ))
 
-    def _save_tables(self, diagram_id: str, tables: List[ERDiagramTable]):
-        """Save tables for a diagram (replace all)."""
+    def get_with_tables(self, diagram_id: str) -> Optional[ERDiagram]:
+        """Get a diagram with its tables and FK midpoints loaded."""
         with self.pool.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM er_diagram_tables WHERE diagram_id = ?", (diagram_id,))
-            now = datetime.now().isoformat()
-            for t in tables:
-                cursor.execute(
-                    "INSERT INTO er_diagram_tables "
-                    "(diagram_id, table_name, schema_name, pos_x, pos_y, width, height, created_at) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                    (diagram_id, t.table_name, t.schema_name, t.pos_x, t.pos_y,
-                     t.width, t.height, now)
-                )
-            conn.commit()
+            cursor.execute("SELECT * FROM er_diagrams WHERE id = ?", (diagram_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            diagram = self._row_to_model(row)
+            self._load_details(cursor, [diagram], "WHERE diagram_id = ?", (diagram_id,))
+        return diagram
 
-    def _load_fk_midpoints(self, diagram_id: str) -> List[ERDiagramFKMidpoint]:
-        """Load FK waypoints for a diagram, ordered by seq."""
+    def get_by_connection(self, connection_id: str) -> List[ERDiagram]:
+        """Get all diagrams for a connection, with tables and midpoints loaded."""
         with self.pool.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                "SELECT from_table, from_column, to_table, to_column, mid_x, mid_y, seq "
-                "FROM er_diagram_fk_midpoints WHERE diagram_id = ? "
-                "ORDER BY from_table, from_column, to_table, to_column, seq",
-                (diagram_id,)
+                "SELECT * FROM er_diagrams WHERE connection_id = ? ORDER BY name",
+                (connection_id,)
             )
-            return [
-                ERDiagramFKMidpoint(
-                    from_table=row[0], from_column=row[1],
-                    to_table=row[2], to_column=row[3],
-                    mid_x=row[4], mid_y=row[5], seq=row[6]
+            diagrams = [self._row_to_model(row) for row in cursor.fetchall()]
+            if diagrams:
+                self._load_details(
+                    cursor, diagrams,
+                    "WHERE diagram_id IN (SELECT id FROM er_diagrams WHERE connection_id = ?)",
+                    (connection_id,)
                 )
-                for row in cursor.fetchall()
-            ]
+        return diagrams
 
-    def _save_fk_midpoints(self, diagram_id: str, midpoints: List[ERDiagramFKMidpoint]):
-        """Save FK waypoints for a diagram (replace all)."""
+    def get_all_diagrams(self) -> List[ERDiagram]:
+        """Get all diagrams with tables and midpoints loaded."""
         with self.pool.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("DELETE FROM er_diagram_fk_midpoints WHERE diagram_id = ?", (diagram_id,))
-            for mp in midpoints:
-                cursor.execute(
-                    "INSERT INTO er_diagram_fk_midpoints "
-                    "(diagram_id, from_table, from_column, to_table, to_column, seq, mid_x, mid_y) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                    (diagram_id, mp.from_table, mp.from_column,
-                     mp.to_table, mp.to_column, mp.seq, mp.mid_x, mp.mid_y)
-                )
-            conn.commit()
+            cursor.execute("SELECT * FROM er_diagrams ORDER BY name")
+            diagrams = [self._row_to_model(row) for row in cursor.fetchall()]
+            if diagrams:
+                self._load_details(cursor, diagrams)
+        return diagrams
 
-    def _load_groups(self, diagram_id: str) -> List[ERDiagramGroup]:
-        """Load visual groups for a diagram."""
-        with self.pool.get_connection() as conn:
+    # ==================== Saving ====================
+
+    def save(self, diagram: ERDiagram) -> ERDiagram:
+        """
+        Save a diagram (insert or update) with its tables, FK midpoints and groups.
+
+        Runs as one transaction and only writes the child rows that were
+        added, changed or removed since the last save.
+        """
+        with self.pool.transaction() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "SELECT id, name, x, y, width, height, color FROM er_diagram_groups "
-                "WHERE diagram_id = ?",
-                (diagram_id,)
+            cursor.execute(self._get_update_sql(), self._model_to_update_tuple(diagram))
+            if cursor.rowcount == 0:
+                cursor.execute(self._get_insert_sql(), self._model_to_insert_tuple(diagram))
+
+            self._sync_rows(
+                cursor, "er_diagram_tables", diagram.id,
+                ("table_name", "schema_name"),
+                ("pos_x", "pos_y", "width", "height", "pinned"),
+                {(t.table_name, t.schema_name): (t.pos_x, t.pos_y, t.width, t.height, int(t.pinned))
+                 for t in diagram.tables},
+                created_at=datetime.now().isoformat(),
             )
-            return [
-                ERDiagramGroup(
-                    id=row[0], name=row[1],
-                    x=row[2], y=row[3], width=row[4], height=row[5],
-                    color=row[6], diagram_id=diagram_id,
-                )
-                for row in cursor.fetchall()
-            ]
+            self._sync_rows(
+                cursor, "er_diagram_fk_midpoints", diagram.id,
+                ("from_table", "from_column", "to_table", "to_column", "seq"),
+                ("mid_x", "mid_y"),
+                {(mp.from_table, mp.from_column, mp.to_table, mp.to_column, mp.seq): (mp.mid_x, mp.mid_y)
+                 for mp in diagram.fk_midpoints},
+            )
+            self._sync_rows(
+                cursor, "er_diagram_groups", diagram.id,
+                ("id",),
+                ("name", "x", "y", "width", "height", "color"),
+                {(g.id,): (g.name, g.x, g.y, g.width, g.height, g.color) for g in diagram.groups},
+            )
+        return diagram
 
-    def _save_groups(self, diagram_id: str, groups: List[ERDiagramGroup]):
-        """Save groups for a diagram (replace all)."""
-        with self.pool.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM er_diagram_groups WHERE diagram_id = ?", (diagram_id,))
-            for g in groups:
-                cursor.execute(
-                    "INSERT INTO er_diagram_groups "
-                    "(id, diagram_id, name, x, y, width, height, color) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                    (g.id, diagram_id, g.name, g.x, g.y, g.width, g.height, g.color)
-                )
-            conn.commit()
+    def _sync_rows(self, cursor: sqlite3.Cursor, table: str, diagram_id: str,
+                   key_columns: Tuple[str, ...], value_columns: Tuple[str, ...],
+                   rows: Dict[tuple, tuple], **insert_only) -> None:
+        """
+        Make a child table hold exactly rows for a diagram, writing only the differences.
 
-    def _load_full(self, diagram: ERDiagram):
-        """Load tables, FK midpoints and groups for a diagram."""
-        diagram.tables = self._load_tables(diagram.id)
-        diagram.fk_midpoints = self._load_fk_midpoints(diagram.id)
-        diagram.groups = self._load_groups(diagram.id)
+        Args:
+            cursor: Cursor of the save transaction
+            table: Child table (with a diagram_id column)
+            diagram_id: Diagram whose rows are synced
+            key_columns: Columns identifying a row within the diagram
+            value_columns: Columns compared and updated
+            rows: Wanted rows, as key tuple -> value tuple
+            **insert_only: Extra column values for inserted rows (e.g. created_at)
+        """
+        columns = key_columns + value_columns
+        cursor.execute(f"SELECT {', '.join(columns)} FROM {table} WHERE diagram_id = ?", (diagram_id,))
+        n = len(key_columns)
+        existing = {tuple(row[:n]): tuple(row[n:]) for row in cursor.fetchall()}
 
-    def get_with_tables(self, diagram_id: str) -> Optional[ERDiagram]:
-        """Get a diagram with its tables and FK midpoints loaded."""
-        diagram = self.get_by_id(diagram_id)
-        if diagram:
-            self._load_full(diagram)
-        return diagram
+        key_match = " AND ".join(f"{c} = ?" for c in key_columns)
+        removed = [(diagram_id, *key) for key in existing if key not in rows]
+        if removed:
+            cursor.executemany(f"DELETE FROM {table} WHERE diagram_id = ? AND {key_match}", removed)
 
-    def save(self, diagram: ERDiagram) -> ERDiagram:
-        """Save a diagram (insert or update) with its tables and FK midpoints."""
-        existing = self.get_by_id(diagram.id)
-        if existing:
-            self.update(diagram)
-        else:
-            self.add(diagram)
-        self._save_tables(diagram.id, diagram.tables)
-        self._save_fk_midpoints(diagram.id, diagram.fk_midpoints)
-        self._save_groups(diagram.id, diagram.groups)
-        return diagram
+        changed = [(*values, diagram_id, *key) for key, values in rows.items()
+                   if key in existing and existing[key] != values]
+        if changed:
+            assignments = ", ".join(f"{c} = ?" for c in value_columns)
+            cursor.executemany(
+                f"UPDATE {table} SET {assignments} WHERE diagram_id = ? AND {key_match}", changed)
 
-    def get_by_connection(self, connection_id: str) -> List[ERDiagram]:
-        """Get all diagrams for a connection, with tables and midpoints loaded."""
-        with self.pool.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM er_diagrams WHERE connection_id = ? ORDER BY name",
-                (connection_id,)
+        extra = tuple(insert_only.values())
+        added = [(diagram_id, *key, *values, *extra) for key, values in rows.items() if key not in existing]
+        if added:
+            insert_columns = ("diagram_id",) + columns + tuple(insert_only)
+            cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(insert_columns)}) "
+                f"VALUES ({', '.join('?' * len(insert_columns))})",
+                added
             )
-            diagrams = [self._row_to_model(row) for row in cursor.fetchall()]
-        for d in diagrams:
-            self._load_full(d)
-        return diagrams
 
-    def get_all_diagrams(self) -> List[ERDiagram]:
-        """Get all diagrams with tables and midpoints loaded."""
-        diagrams = self.get_all(order_by="name")
-        for d in diagrams:
-            self._load_full(d)
-        return diagrams
+    # ==================== Updates ====================
 
     def rename(self, diagram_id: str, new_name: str):
         """Rename a diagram, touching nothing else.
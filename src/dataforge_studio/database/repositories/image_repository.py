@@ -1,8 +1,9 @@
 """
 Image Repository - CRUD operations for images, rootfolders, categories, and tags.
 """
+import re
 import sqlite3
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set, Tuple
 from datetime import datetime
 import uuid
 
@@ -10,6 +11,21 @@ from .base_repository import BaseRepository
 from ..connection_pool import ConnectionPool
 from ..models import ImageRootfolder, SavedImage
 
+# Words and "quoted phrases" of a search query
+_QUERY_TERM = re.compile(r'"([^"]*)("?)|([^\s"]+)')
+
+# Characters that are part of an FTS5 token (unicode61 splits on the rest)
+_WORD = re.compile(r"\w+")
+
+# bm25() weights of image_search columns: image_id, name, filepath, categories, tags
+_BM25_WEIGHTS = "0.0, 10.0, 1.0, 5.0, 5.0"
+
+# True when the image (aliased si) has at least one category or tag
+_HAS_METADATA_SQL = """
+    (EXISTS (SELECT 1 FROM image_categories c WHERE c.image_id = si.id)
+     OR EXISTS (SELECT 1 FROM image_tags t WHERE t.image_id = si.id)) AS has_metadata
+"""
+
 
 class ImageRootfolderRepository(BaseRepository[ImageRootfolder]):
     """Repository for ImageRootfolder entities."""
@@ -55,6 +71,13 @@ class SavedImageRepository(BaseRepository[SavedImage]):
     def _row_to_model(self, row: sqlite3.Row) -> SavedImage:
         return SavedImage(**dict(row))
 
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> Tuple[SavedImage, bool]:
+        values = dict(row)
+        values.pop("category_name", None)
+        has_metadata = bool(values.pop("has_metadata"))
+        return SavedImage(**values), has_metadata
+
     def _get_insert_sql(self) -> str:
         return """
             INSERT INTO saved_images
@@ -179,6 +202,57 @@ class SavedImageRepository(BaseRepository[SavedImage]):
             rows = cursor.fetchall()
             return [row[0] for row in rows]
 
+    # ==================== Tree Loading ====================
+
+    def get_tree_entries(self) -> List[Tuple[SavedImage, bool]]:
+        """
+        Get all images with a flag telling whether they have categories or tags.
+
+        Returns:
+            (image, has_metadata) ordered by rootfolder, physical path and name
+        """
+        with self.pool.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT si.*, {_HAS_METADATA_SQL}
+                FROM saved_images si
+                ORDER BY si.rootfolder_id, si.physical_path, si.name
+            """)
+            return [self._row_to_entry(row) for row in cursor.fetchall()]
+
+    def get_category_entries(self) -> List[Tuple[str, SavedImage, bool]]:
+        """
+        Get the images of every logical category, flagged as in get_tree_entries().
+
+        Returns:
+            (category_name, image, has_metadata) ordered by category and name
+        """
+        with self.pool.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT ic.category_name, si.*, {_HAS_METADATA_SQL}
+                FROM image_categories ic
+                INNER JOIN saved_images si ON si.id = ic.image_id
+                ORDER BY ic.category_name, si.name
+            """)
+            return [(row["category_name"], *self._row_to_entry(row)) for row in cursor.fetchall()]
+
+    def get_ids_with_metadata(self, image_ids: Iterable[str]) -> Set[str]:
+        """Get which of the given images have at least one category or tag."""
+        image_ids = list(image_ids)
+        if not image_ids:
+            return set()
+
+        with self.pool.get_connection() as conn:
+            cursor = conn.cursor()
+            placeholders = ",".join("?" * len(image_ids))
+            cursor.execute(f"""
+                SELECT image_id FROM image_categories WHERE image_id IN ({placeholders})
+                UNION
+                SELECT image_id FROM image_tags WHERE image_id IN ({placeholders})
+            """, image_ids + image_ids)
+            return {row[0] for row in cursor.fetchall()}
+
     # ==================== Categories ====================
 
     def get_categories(self, image_id: str) -> List[str]:
@@ -353,19 +427,65 @@ class SavedImageRepository(BaseRepository[SavedImage]):
     # ==================== Search ====================
 
     def search(self, query: str, search_name: bool = True,
-               search_categories: bool = True, search_tags: bool = True) -> List[SavedImage]:
+               search_categories: bool = True, search_tags: bool = True,
+               limit: Optional[int] = None, offset: int = 0) -> List[SavedImage]:
         """
         Search images by name, categories, and/or tags.
 
+        Words match as prefixes ("sun" finds "sunset"); text in double
+        quotes matches as a phrase. Results are ranked by relevance (BM25,
+        name matches first).
+
         Args:
             query: Search query string
-            search_name: Include filename in search
+            search_name: Include filename and path in search
             search_categories: Include logical categories in search
             search_tags: Include tags in search
+            limit: Maximum number of results (all if None)
+            offset: Number of results to skip (pagination)
 
         Returns:
-            List of matching SavedImage objects (deduplicated)
+            List of matching SavedImage objects, best match first
         """
+        fts_query = build_fts_query(query, _search_columns(search_name, search_categories, search_tags))
+        if fts_query is None:
+            return []
+
+        with self.pool.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(f"""
+                    SELECT si.* FROM image_search s
+                    INNER JOIN saved_images si ON si.rowid = s.rowid
+                    WHERE image_search MATCH ?
+                    ORDER BY bm25(image_search, {_BM25_WEIGHTS}), si.name
+                    LIMIT ? OFFSET ?
+                """, (fts_query, -1 if limit is None else limit, offset))
+            except sqlite3.OperationalError:
+                # No FTS5 in this SQLite build
+                results = self._search_like(query, search_name, search_categories, search_tags)
+                return results[offset:None if limit is None else offset + limit]
+            return [self._row_to_model(row) for row in cursor.fetchall()]
+
+    def count_search(self, query: str, search_name: bool = True,
+                     search_categories: bool = True, search_tags: bool = True) -> int:
+        """Count the results of search() without fetching them."""
+        fts_query = build_fts_query(query, _search_columns(search_name, search_categories, search_tags))
+        if fts_query is None:
+            return 0
+
+        with self.pool.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT COUNT(*) FROM image_search WHERE image_search MATCH ?",
+                               (fts_query,))
+            except sqlite3.OperationalError:
+                return len(self._search_like(query, search_name, search_categories, search_tags))
+            return cursor.fetchone()[0]
+
+    def _search_like(self, query: str, search_name: bool = True,
+                     search_categories: bool = True, search_tags: bool = True) -> List[SavedImage]:
+        """Substring search, for SQLite builds without FTS5."""
         if not query.strip():
             return []
 
@@ -415,3 +535,44 @@ class SavedImageRepository(BaseRepository[SavedImage]):
             rows = cursor.fetchall()
 
             return [self._row_to_model(row) for row in rows]
+
+
+def _search_columns(search_name: bool, search_categories: bool, search_tags: bool) -> List[str]:
+    columns = []
+    if search_name:
+        columns += ["name", "filepath"]
+    if search_categories:
+        columns.append("categories")
+    if search_tags:
+        columns.append("tags")
+    return columns
+
+
+def build_fts_query(text: str, columns: List[str]) -> Optional[str]:
+    """
+    Turn user input into an FTS5 MATCH expression over the given columns.
+
+    Every word must match, as a prefix; "quoted text" must match as a
+    phrase (as a prefix while the closing quote is not typed yet). Words
+    with punctuation ("foo-bar.png") match their parts as a phrase. FTS5
+    operators typed by the user are treated as plain words.
+
+    Returns:
+        MATCH expression, or None if there is nothing to search
+    """
+    if not columns:
+        return None
+
+    terms = []
+    for phrase, closed, word in _QUERY_TERM.findall(text):
+        tokens = _WORD.findall(phrase or word)
+        if tokens:
+            exact = phrase and closed
+            terms.append(_fts_string(" ".join(tokens)) + ("" if exact else "*"))
+    if not terms:
+        return None
+    return f"{{{' '.join(columns)}}} : ({' AND '.join(terms)})"
+
+
+def _fts_string(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
@@ -169,6 +169,25 @@ class ProjectRepository(BaseRepository[Project]):
         except sqlite3.Error:
             return False
 
+    @staticmethod
+    def add_relations(cursor: sqlite3.Cursor, junction_table: str, resource_col: str,
+                      project_id: str, rows: List[tuple], extra_cols: str = "") -> None:
+        """
+        Add resources to a project inside the caller's transaction.
+
+        Args:
+            rows: (resource_id, *extra values) per resource, matching extra_cols
+        """
+        if not rows:
+            return
+        cols = f"project_id, {resource_col}{extra_cols}, created_at"
+        placeholders = ", ".join(["?"] * (len(rows[0]) + 2))
+        now = datetime.now().isoformat()
+        cursor.executemany(
+            f"INSERT OR IGNORE INTO {junction_table} ({cols}) VALUES ({placeholders})",
+            [(project_id, *row, now) for row in rows]
+        )
+
     def _remove_relation(self, junction_table: str, resource_col: str,
                          project_id: str, resource_id: str,
                          extra_where: str = "", extra_vals: tuple = ()) -> bool:
@@ -0,0 +1,115 @@
+"""
+Schema Snapshot Repository - Persisted database catalogs per connection/database.
+"""
+import json
+import sqlite3
+from typing import Optional
+import logging
+
+from ..connection_pool import ConnectionPool
+from ..models.schema_snapshot import SchemaSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaSnapshotRepository:
+    """
+    Repository for schema snapshots.
+
+    One row per (connection_id, database_name); the schema tree and keys
+    are stored as a single JSON payload so a snapshot loads in one read.
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        """
+        Initialize repository with connection pool.
+
+        Args:
+            pool: ConnectionPool instance for database access
+        """
+        self.pool = pool
+
+    def get(self, connection_id: str, database_name: str = "") -> Optional[SchemaSnapshot]:
+        """
+        Get the stored snapshot for a connection/database.
+
+        Args:
+            connection_id: Database connection ID
+            database_name: Database name ("" for the whole connection)
+
+        Returns:
+            SchemaSnapshot or None if none stored (or unreadable)
+        """
+        with self.pool.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT marker, payload, captured_at FROM schema_snapshots
+                WHERE connection_id = ? AND database_name = ?
+            """, (connection_id, database_name or ""))
+            row = cursor.fetchone()
+
+        if not row:
+            return None
+        try:
+            return SchemaSnapshot.from_payload(
+                connection_id, database_name or "", row["marker"],
+                json.loads(row["payload"]), row["captured_at"]
+            )
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Discarding unreadable schema snapshot for {connection_id}: {e}")
+            return None
+
+    def save(self, snapshot: SchemaSnapshot) -> bool:
+        """
+        Insert or replace a snapshot.
+
+        Args:
+            snapshot: Snapshot to store
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            payload = json.dumps(snapshot.to_payload(), default=str)
+            with self.pool.transaction() as conn:
+                conn.execute("""
+                    INSERT INTO schema_snapshots
+                    (connection_id, database_name, marker, payload, captured_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(connection_id, database_name) DO UPDATE SET
+                        marker = excluded.marker,
+                        payload = excluded.payload,
+                        captured_at = excluded.captured_at
+                """, (snapshot.connection_id, snapshot.database_name or "",
+                      snapshot.marker, payload, snapshot.captured_at))
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Error saving schema snapshot: {e}")
+            return False
+
+    def delete(self, connection_id: str, database_name: Optional[str] = None) -> bool:
+        """
+        Delete snapshots of a connection.
+
+        Args:
+            connection_id: Database connection ID
+            database_name: Only this database, or None for every snapshot
+                           of the connection
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.pool.transaction() as conn:
+                if database_name is None:
+                    conn.execute("DELETE FROM schema_snapshots WHERE connection_id = ?",
+                                 (connection_id,))
+                else:
+                    conn.execute("""
+                        DELETE FROM schema_snapshots
+                        WHERE connection_id = ? AND database_name = ?
+                    """, (connection_id, database_name))
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Error deleting schema snapshots: {e}")
+            return False
@@ -66,6 +66,29 @@ class UserPreferencesRepository:
         except sqlite3.Error:
             return False
 
+    def set_many(self, values: Dict[str, str]) -> bool:
+        """
+        Set several preference values in one transaction.
+
+        Args:
+            values: Preference values by key
+
+        Returns:
+            True if successful, False otherwise
+        """
+        now = datetime.now().isoformat()
+        try:
+            with self.pool.transaction() as conn:
+                conn.executemany("""
+                    INSERT INTO user_preferences (key, value, updated_at)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET value = excluded.value,
+                                                   updated_at = excluded.updated_at
+                """, [(key, value, now) for key, value in values.items()])
+            return True
+        except sqlite3.Error:
+            return False
+
     def delete(self, key: str) -> bool:
         """
         Delete a preference by key.
@@ -74,6 +74,27 @@ class SchemaNode:
         """Return the number of direct children."""
         return len(self.children)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the node and its subtree to plain JSON-compatible data."""
+        return {
+            "node_type": self.node_type.value,
+            "name": self.name,
+            "display_name": self.display_name,
+            "metadata": self.metadata,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SchemaNode":
+        """Rebuild a node and its subtree from to_dict() output."""
+        return cls(
+            node_type=SchemaNodeType(data["node_type"]),
+            name=data["name"],
+            display_name=data.get("display_name", ""),
+            metadata=dict(data.get("metadata") or {}),
+            children=[cls.from_dict(child) for child in data.get("children", [])],
+        )
+
 
 class SchemaLoader(ABC):
     """
@@ -162,6 +183,23 @@ class SchemaLoader(ABC):
         """
         return []
 
+    def get_change_marker(self, database_name: str = None) -> Optional[str]:
+        """
+        Get a cheap marker that changes whenever the catalog changes.
+
+        Used to decide whether a stored schema snapshot is still valid
+        without re-reading the whole catalog. Override in subclasses.
+
+        Args:
+            database_name: Database name (for multi-database systems).
+                          None means every database the loader would show.
+
+        Returns:
+            Opaque marker string, or None if change detection is unsupported
+            (snapshots are then always reloaded)
+        """
+        return None
+
     def _create_folder_node(self, folder_type: SchemaNodeType,
                             name: str, count: int = 0) -> SchemaNode:
         """Helper to create a folder node with count in display name."""
@@ -80,6 +80,30 @@ class MySQLSchemaLoader(SchemaLoader):
 
         return root
 
+    def get_change_marker(self, database_name: str = None) -> Optional[str]:
+        """Catalog change marker from information_schema.TABLES.
+
+        Table count plus the latest CREATE_TIME / UPDATE_TIME (ALTER TABLE
+        rebuilds refresh CREATE_TIME), and the number of databases and routines.
+        """
+        cursor = self.connection.cursor()
+        try:
+            where, params = self._schema_where("TABLE_SCHEMA", database_name)
+            routine_where, routine_params = self._schema_where("ROUTINE_SCHEMA", database_name)
+            schema_where, schema_params = self._schema_where("SCHEMA_NAME", database_name)
+            cursor.execute(f"""
+                SELECT (SELECT COUNT(*) FROM information_schema.SCHEMATA WHERE {schema_where}),
+                       COUNT(*), MAX(CREATE_TIME), MAX(UPDATE_TIME),
+                       (SELECT COUNT(*) FROM information_schema.ROUTINES WHERE {routine_where})
+                FROM information_schema.TABLES
+                WHERE {where}
+            """, tuple(schema_params) + tuple(routine_params) + tuple(params))
+            row = cursor.fetchone()
+            return ":".join(str(v) for v in row) if row else None
+        except DbError as e:
+            logger.warning(f"Could not read catalog change marker: {e}")
+            return None
+
     def _load_database_schema(self, database_name: str) -> SchemaNode:
         """Load schema for a single database (used by WorkspaceManager)."""
         tables = self.load_tables(only_schema=database_name)
@@ -2,7 +2,7 @@
 PostgreSQL Schema Loader - Load schema from PostgreSQL databases
 """
 
-from typing import Any, List
+from typing import Any, List, Optional
 
 from .base import SchemaLoader, SchemaNode, SchemaNodeType, ForeignKeyInfo, PrimaryKeyInfo
 
@@ -24,6 +24,37 @@ class PostgreSQLSchemaLoader(SchemaLoader):
     def __init__(self, connection: Any, db_id: str, db_name: str):
         super().__init__(connection, db_id, db_name)
 
+    def get_change_marker(self, database_name: str = None) -> Optional[str]:
+        """Catalog change marker from pg_stat counters and pg_class/pg_namespace.
+
+        Every DDL statement inserts/updates/deletes rows in pg_class,
+        pg_attribute, pg_constraint or pg_proc, which moves their tuple
+        counters. For servers running with track_counts off, the newest
+        relation, schema and routine oids (index lookups) and the relation
+        count catch CREATE and DROP without scanning pg_attribute.
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT (SELECT COALESCE(SUM(n_tup_ins + n_tup_upd + n_tup_del), 0)
+                        FROM pg_stat_sys_tables
+                        WHERE relname IN ('pg_class', 'pg_attribute',
+                                          'pg_constraint', 'pg_proc')),
+                       (SELECT MAX(oid) FROM pg_class),
+                       (SELECT COUNT(*) FROM pg_class),
+                       (SELECT MAX(oid) FROM pg_namespace),
+                       (SELECT MAX(oid) FROM pg_proc)
+            """)
+            row = cursor.fetchone()
+            return ":".join(str(v) for v in row) if row else None
+        except DbError as e:
+            logger.warning(f"Could not read catalog change marker: {e}")
+            try:
+                self.connection.rollback()
+            except DbError:
+                pass
+            return None
+
     def load_schema(self) -> SchemaNode:
         """Load complete PostgreSQL schema."""
         tables = self.load_tables()
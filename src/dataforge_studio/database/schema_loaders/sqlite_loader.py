@@ -3,7 +3,7 @@ SQLite Schema Loader - Load schema from SQLite databases
 """
 
 import sqlite3
-from typing import List
+from typing import List, Optional, Tuple
 
 from .base import SchemaLoader, SchemaNode, SchemaNodeType, ForeignKeyInfo, PrimaryKeyInfo
 
@@ -17,6 +17,15 @@ class SQLiteSchemaLoader(SchemaLoader):
     def __init__(self, connection: sqlite3.Connection, db_id: str, db_name: str):
         super().__init__(connection, db_id, db_name)
 
+    def get_change_marker(self, database_name: str = None) -> Optional[str]:
+        """Catalog change marker: PRAGMA schema_version (bumped by every DDL)."""
+        try:
+            row = self.connection.execute("PRAGMA schema_version").fetchone()
+            return str(row[0]) if row else None
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read schema_version: {e}")
+            return None
+
     def load_schema(self) -> SchemaNode:
         """Load complete SQLite schema."""
         tables = self.load_tables()
@@ -57,8 +66,14 @@ class SQLiteSchemaLoader(SchemaLoader):
             )
             table_rows = cursor.fetchall()
 
+            # Load ALL columns in one query (avoids N+1 problem)
+            columns_by_table = self._load_all_columns_bulk(cursor)
+
             for (table_name,) in table_rows:
-                columns = self.load_columns(table_name)
+                if columns_by_table is not None:
+                    columns = columns_by_table.get(table_name, [])
+                else:
+                    columns = self.load_columns(table_name)
                 table_node = self._create_table_node(
                     table_name, column_count=len(columns)
                 )
@@ -70,28 +85,57 @@ class SQLiteSchemaLoader(SchemaLoader):
 
         return tables
 
+    def _load_all_columns_bulk(self, cursor) -> Optional[dict]:
+        """Load all table columns in a single query.
+
+        Joins sqlite_master against the pragma_table_info() table-valued
+        function. Returns None if that fails (SQLite < 3.16, or a corrupt
+        object), in which case callers fall back to one PRAGMA per table.
+        """
+        columns_by_table = {}
+
+        try:
+            cursor.execute("""
+                SELECT m.name, p.name, p.type
+                FROM sqlite_master m
+                JOIN pragma_table_info(m.name) p
+                WHERE m.type = 'table'
+                ORDER BY m.name, p.cid
+            """)
+            for table_name, col_name, col_type in cursor.fetchall():
+                column_node = self._create_column_node(
+                    col_name, col_type or "TEXT", table_name
+                )
+                columns_by_table.setdefault(table_name, []).append(column_node)
+
+        except sqlite3.Error as e:
+            logger.debug(f"Bulk column loading unavailable, using PRAGMA per table: {e}")
+            return None
+
+        return columns_by_table
+
     def load_views(self) -> List[SchemaNode]:
         """Load all views."""
         cursor = self.connection.cursor()
         views = []
 
         try:
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='view' ORDER BY name"
-            )
-            view_rows = cursor.fetchall()
-
-            for (view_name,) in view_rows:
-                # Get column count for view
-                try:
-                    # Escape identifier for PRAGMA (no parameterization possible)
-                    safe_name = view_name.replace("]", "]]")
-                    cursor.execute(f"PRAGMA table_info([{safe_name}])")
-                    columns = cursor.fetchall()
-                    column_count = len(columns)
-                except sqlite3.Error:
-                    column_count = 0
-
+            try:
+                # Column counts for every view in one query
+                cursor.execute("""
+                    SELECT m.name, COUNT(p.cid)
+                    FROM sqlite_master m
+                    LEFT JOIN pragma_table_info(m.name) p
+                    WHERE m.type = 'view'
+                    GROUP BY m.name
+                    ORDER BY m.name
+                """)
+                view_rows = cursor.fetchall()
+            except sqlite3.Error:
+                # A broken view makes the bulk query fail: count per view
+                view_rows = self._load_view_counts_per_view(cursor)
+
+            for view_name, column_count in view_rows:
                 view_node = self._create_view_node(view_name, column_count=column_count)
                 views.append(view_node)
 
@@ -100,6 +144,25 @@ class SQLiteSchemaLoader(SchemaLoader):
 
         return views
 
+    def _load_view_counts_per_view(self, cursor) -> List[Tuple[str, int]]:
+        """Get (view_name, column_count) with one PRAGMA per view."""
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='view' ORDER BY name"
+        )
+        view_rows = cursor.fetchall()
+
+        counts = []
+        for (view_name,) in view_rows:
+            try:
+                # Escape identifier for PRAGMA (no parameterization possible)
+                safe_name = view_name.replace('"', '""')
+                cursor.execute(f'PRAGMA table_info("{safe_name}")')
+                column_count = len(cursor.fetchall())
+            except sqlite3.Error:
+                column_count = 0
+            counts.append((view_name, column_count))
+        return counts
+
     def load_columns(self, table_name: str, schema_name: str = None,
                      database_name: str = None) -> List[SchemaNode]:
         """Load columns for a table or view.
@@ -113,8 +176,8 @@ class SQLiteSchemaLoader(SchemaLoader):
 
         try:
             # Escape identifier for PRAGMA (no parameterization possible)
-            safe_name = table_name.replace("]", "]]")
-            cursor.execute(f"PRAGMA table_info([{safe_name}])")
+            safe_name = table_name.replace('"', '""')
+            cursor.execute(f'PRAGMA table_info("{safe_name}")')
             column_rows = cursor.fetchall()
 
             for col in column_rows:
@@ -129,46 +192,49 @@ class SQLiteSchemaLoader(SchemaLoader):
         return columns
 
     def load_foreign_keys(self, table_names=None, database_name=None):
-        """Load FK relationships from SQLite PRAGMA."""
+        """Load FK relationships with pragma_foreign_key_list() joined on sqlite_master."""
         fks = []
         try:
             cursor = self.connection.cursor()
-            # Get all tables if not specified
-            if table_names is None:
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                table_names = [row[0] for row in cursor.fetchall()]
-
-            for table in table_names:
-                cursor.execute(f"PRAGMA foreign_key_list([{table}])")
-                for row in cursor.fetchall():
-                    fks.append(ForeignKeyInfo(
-                        fk_name=f"fk_{table}_{row[3]}",
-                        from_table=table,
-                        from_column=row[3],  # from column
-                        to_table=row[2],     # referenced table
-                        to_column=row[4],    # referenced column
-                    ))
+            cursor.execute("""
+                SELECT m.name, f."from", f."table", f."to"
+                FROM sqlite_master m
+                JOIN pragma_foreign_key_list(m.name) f
+                WHERE m.type = 'table'
+                ORDER BY m.name, f.id, f.seq
+            """)
+            wanted = set(table_names) if table_names is not None else None
+            for table, from_column, to_table, to_column in cursor.fetchall():
+                if wanted is not None and table not in wanted:
+                    continue
+                fks.append(ForeignKeyInfo(
+                    fk_name=f"fk_{table}_{from_column}",
+                    from_table=table,
+                    from_column=from_column,
+                    to_table=to_table,
+                    to_column=to_column,
+                ))
         except sqlite3.Error as e:
             logger.error(f"Error loading foreign keys: {e}")
         return fks
 
     def load_primary_keys(self, table_names=None, database_name=None):
-        """Load PK columns from SQLite PRAGMA."""
+        """Load PK columns with pragma_table_info() joined on sqlite_master."""
         pks = []
         try:
             cursor = self.connection.cursor()
-            if table_names is None:
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                table_names = [row[0] for row in cursor.fetchall()]
-
-            for table in table_names:
-                cursor.execute(f"PRAGMA table_info([{table}])")
-                for row in cursor.fetchall():
-                    if row[5]:  # pk column is nonzero
-                        pks.append(PrimaryKeyInfo(
-                            table_name=table,
-                            column_name=row[1]
-                        ))
+            cursor.execute("""
+                SELECT m.name, p.name
+                FROM sqlite_master m
+                JOIN pragma_table_info(m.name) p
+                WHERE m.type = 'table' AND p.pk > 0
+                ORDER BY m.name, p.cid
+            """)
+            wanted = set(table_names) if table_names is not None else None
+            for table, column in cursor.fetchall():
+                if wanted is not None and table not in wanted:
+                    continue
+                pks.append(PrimaryKeyInfo(table_name=table, column_name=column))
         except sqlite3.Error as e:
             logger.error(f"Error loading primary keys: {e}")
         return pks
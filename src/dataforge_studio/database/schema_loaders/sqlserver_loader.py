@@ -8,7 +8,7 @@ Supports loading multiple databases from a server, including:
 - Functions (Scalar, Table-Valued, etc.)
 """
 
-from typing import List, Any, Tuple
+from typing import List, Any, Optional, Tuple
 
 from .base import SchemaLoader, SchemaNode, SchemaNodeType, ForeignKeyInfo, PrimaryKeyInfo
 
@@ -67,6 +67,35 @@ class SQLServerSchemaLoader(SchemaLoader):
                 pass
             return []
 
+    def get_change_marker(self, database_name: str = None) -> Optional[str]:
+        """Catalog change marker: object count and latest sys.objects.modify_date.
+
+        ALTER/CREATE bump modify_date and DROP lowers the count. For the whole
+        server, each database is probed on its own and the database list is
+        part of the marker: a database that cannot be read (offline, restoring,
+        access revoked) is marked as such instead of failing the others.
+        """
+        databases = [database_name] if database_name else self.get_databases()
+        if not databases:
+            return None
+
+        cursor = self.connection.cursor()
+        markers = []
+        for db in databases:
+            try:
+                cursor.execute(
+                    f"SELECT COUNT(*), MAX(modify_date) "
+                    f"FROM [{db.replace(']', ']]')}].sys.objects WHERE is_ms_shipped = 0"
+                )
+                count, modified = cursor.fetchone()
+                markers.append(f"{db}:{count}:{modified}")
+            except DbError as e:
+                logger.warning(f"Could not read catalog change marker of {db}: {e}")
+                if database_name:
+                    return None
+                markers.append(f"{db}:unavailable")
+        return "|".join(markers)
+
     def load_schema(self) -> SchemaNode:
         """
         Load complete SQL Server schema (all databases).
@@ -161,8 +190,11 @@ class SQLServerSchemaLoader(SchemaLoader):
             """)
             table_rows = cursor.fetchall()
 
+            # Load ALL columns in one query (avoids N+1 problem)
+            columns_by_table = self._load_all_columns_bulk(cursor, database_name)
+
             for schema_name, table_name in table_rows:
-                columns = self.load_columns(table_name, schema_name, database_name)
+                columns = columns_by_table.get(f"{schema_name}.{table_name}", [])
                 table_node = self._create_table_node(
                     table_name, schema_name, column_count=len(columns)
                 )
@@ -175,6 +207,38 @@ class SQLServerSchemaLoader(SchemaLoader):
 
         return tables
 
+    def _load_all_columns_bulk(self, cursor, database_name: str) -> dict:
+        """Load all table columns of a database in a single query."""
+        columns_by_table = {}
+
+        try:
+            cursor.execute(f"""
+                SELECT s.name, o.name, c.name, ty.name, c.max_length, c.precision, c.scale
+                FROM [{database_name}].sys.columns c
+                INNER JOIN [{database_name}].sys.types ty ON c.user_type_id = ty.user_type_id
+                INNER JOIN [{database_name}].sys.objects o ON c.object_id = o.object_id
+                INNER JOIN [{database_name}].sys.schemas s ON o.schema_id = s.schema_id
+                WHERE o.type = 'U'
+                ORDER BY s.name, o.name, c.column_id
+            """)
+
+            for row in cursor.fetchall():
+                schema_name, table_name, col_name, col_type, max_length, precision, scale = row
+                table_key = f"{schema_name}.{table_name}"
+                type_display = self._format_column_type(
+                    col_type, max_length, precision, scale
+                )
+                column_node = self._create_column_node(col_name, type_display, table_key)
+
+                if table_key not in columns_by_table:
+                    columns_by_table[table_key] = []
+                columns_by_table[table_key].append(column_node)
+
+        except DbError as e:
+            logger.error(f"Error bulk loading columns from {database_name}: {e}")
+
+        return columns_by_table
+
     def load_views(self, database_name: str = None) -> List[SchemaNode]:
         """Load all views from a database."""
         if database_name is None:
@@ -184,28 +248,18 @@ class SQLServerSchemaLoader(SchemaLoader):
         views = []
 
         try:
+            # Column counts aggregated in the same query (avoids N+1 problem)
             cursor.execute(f"""
-                SELECT s.name, v.name
+                SELECT s.name, v.name, COUNT(c.column_id)
                 FROM [{database_name}].sys.views v
                 INNER JOIN [{database_name}].sys.schemas s ON v.schema_id = s.schema_id
+                LEFT JOIN [{database_name}].sys.columns c ON c.object_id = v.object_id
+                GROUP BY s.name, v.name
                 ORDER BY s.name, v.name
             """)
             view_rows = cursor.fetchall()
 
-            for schema_name, view_name in view_rows:
-                # Get column count
-                try:
-                    cursor.execute(f"""
-                        SELECT COUNT(*)
-                        FROM [{database_name}].sys.columns c
-                        INNER JOIN [{database_name}].sys.views v ON c.object_id = v.object_id
-                        INNER JOIN [{database_name}].sys.schemas s ON v.schema_id = s.schema_id
-                        WHERE v.name = '{view_name}' AND s.name = '{schema_name}'
-                    """)
-                    column_count = cursor.fetchone()[0]
-                except DbError:
-                    column_count = 0
-
+            for schema_name, view_name, column_count in view_rows:
                 view_node = self._create_view_node(
                     view_name, schema_name, column_count=column_count
                 )
@@ -304,10 +358,10 @@ class SQLServerSchemaLoader(SchemaLoader):
                 INNER JOIN [{database_name}].sys.types ty ON c.user_type_id = ty.user_type_id
                 INNER JOIN [{database_name}].sys.objects o ON c.object_id = o.object_id
                 INNER JOIN [{database_name}].sys.schemas s ON o.schema_id = s.schema_id
-                WHERE o.name = '{table_name}' AND s.name = '{schema_name}'
+                WHERE o.name = ? AND s.name = ?
                   AND o.type IN ('U', 'V')
                 ORDER BY c.column_id
-            """)
+            """, (table_name, schema_name))
             column_rows = cursor.fetchall()
 
             full_table_name = f"{schema_name}.{table_name}"
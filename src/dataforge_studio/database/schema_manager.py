@@ -5,7 +5,8 @@ Extracted from config_db.py for better separation of concerns.
 Handles:
 - CREATE TABLE statements
 - Index creation
-- Schema migrations
+- Schema migrations, versioned with PRAGMA user_version
+- WAL journal mode
 - Config DB self-reference
 """
 import sqlite3
@@ -15,6 +16,7 @@ from typing import Optional
 import logging
 
 from .models import DatabaseConnection
+from .connection_pool import configure_connection
 
 logger = logging.getLogger(__name__)
 
@@ -34,8 +36,30 @@ class SchemaManager:
     CONFIG_DB_ID = "config-db-self-ref"
     CONFIG_DB_NAME = "Configuration Database"
 
-    # Current schema version (increment when adding migrations)
-    SCHEMA_VERSION = 6
+    # Migrations in order (append new ones at the end, never reorder).
+    # A database whose user_version is N has applied the first N; each
+    # migration also checks the schema itself, so running it twice is safe.
+    MIGRATIONS = (
+        "_migrate_file_roots_name",                    # 1: file_roots.name
+        "_migrate_project_databases_name",             # 2: project_databases.database_name
+        "_migrate_saved_images_structure",             # 3: saved_images structure
+        "_migrate_scripts_file_path",                  # 4: scripts.file_path
+        "_migrate_projects_auto_connect",              # 5: projects.auto_connect
+        "_migrate_saved_queries_database_name",        # 6: saved_queries.target_database_name
+        "_migrate_database_connections_color",         # 7: database_connections.color
+        "_migrate_projects_shared_path",               # 8: projects.shared_path
+        "_migrate_er_diagrams_columns",                # 9: er_diagrams display columns
+        "_migrate_fk_midpoints_seq",                   # 10: er_diagram_fk_midpoints.seq
+        "_migrate_create_er_diagram_groups",           # 11: er_diagram_groups table
+        "_migrate_er_diagram_tables_size",             # 12: er_diagram_tables width/height
+        "_migrate_create_project_er_diagrams",         # 13: project_er_diagrams table
+        "_migrate_create_schema_snapshots",            # 14: schema_snapshots table
+        "_migrate_er_diagram_tables_pinned",           # 15: er_diagram_tables.pinned
+        "_migrate_create_image_search",                # 16: image_search FTS5 index
+    )
+
+    # Current schema version (stored in PRAGMA user_version)
+    SCHEMA_VERSION = len(MIGRATIONS)
 
     def __init__(self, db_path: Path):
         """
@@ -49,334 +73,361 @@ class SchemaManager:
     def _get_connection(self) -> sqlite3.Connection:
         """Get database connection with standard settings."""
         conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return configure_connection(conn)
 
     def initialize(self):
         """
         Initialize database schema and run migrations.
 
-        Call this once during application startup.
+        Call this once during application startup. A database already at
+        SCHEMA_VERSION only gets its config DB self-reference checked.
         """
-        self._init_database()
-        self._migrate_database()
-
-    def _init_database(self):
-        """Initialize database schema with all tables."""
         conn = self._get_connection()
         cursor = conn.cursor()
 
         try:
-            # Database Connections table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS database_connections (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    db_type TEXT NOT NULL,
-                    description TEXT,
-                    connection_string TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    color TEXT
+            self._enable_wal(conn)
+            version = self.get_version(conn)
+
+            if version < self.SCHEMA_VERSION:
+                self._init_database(cursor, conn)
+                self._migrate_database(cursor, conn, version)
+            elif version > self.SCHEMA_VERSION:
+                logger.warning(
+                    f"Configuration database schema v{version} is newer than this "
+                    f"application (v{self.SCHEMA_VERSION})"
                 )
-            """)
 
-            # File Configurations table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS file_configs (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    location TEXT NOT NULL,
-                    description TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
+            # Ensure config DB self-reference exists
+            self._ensure_config_db_connection(cursor, conn)
 
-            # Saved Queries table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS saved_queries (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    description TEXT,
-                    target_database_id TEXT NOT NULL,
-                    query_text TEXT NOT NULL,
-                    category TEXT DEFAULT 'No category',
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    FOREIGN KEY (target_database_id) REFERENCES database_connections(id)
-                )
-            """)
+        finally:
+            conn.close()
 
-            # Projects table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS projects (
-                    id TEXT PRIMARY KEY,
-                    name TEXT UNIQUE NOT NULL,
-                    description TEXT,
-                    is_default INTEGER DEFAULT 0,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    last_used_at TEXT
-                )
-            """)
+    @staticmethod
+    def get_version(conn: sqlite3.Connection) -> int:
+        """Schema version of a database (0 if never versioned)."""
+        return conn.execute("PRAGMA user_version").fetchone()[0]
 
-            # File Roots table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS file_roots (
-                    id TEXT PRIMARY KEY,
-                    path TEXT NOT NULL,
-                    name TEXT,
-                    description TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
+    def _enable_wal(self, conn: sqlite3.Connection):
+        """
+        Switch the database to WAL journal mode (persists in the file).
 
-            # Project-Database junction table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS project_databases (
-                    project_id TEXT NOT NULL,
-                    database_id TEXT NOT NULL,
-                    database_name TEXT DEFAULT '',
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (project_id, database_id, database_name),
-                    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-                    FOREIGN KEY (database_id) REFERENCES database_connections(id) ON DELETE CASCADE
-                )
-            """)
+        Readers then never wait for a writer. Filesystems without shared
+        memory support keep the rollback journal.
+        """
+        mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        if mode.lower() != "wal":
+            logger.info(f"WAL journal mode unavailable, using '{mode}'")
+            return
+        # The pragma is per connection: apply it to this one too
+        conn.execute("PRAGMA synchronous = NORMAL")
+
+    def _init_database(self, cursor: sqlite3.Cursor, conn: sqlite3.Connection):
+        """Create all tables and indexes that do not exist yet."""
+        # Database Connections table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS database_connections (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                db_type TEXT NOT NULL,
+                description TEXT,
+                connection_string TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                color TEXT
+            )
+        """)
 
-            # Project-Query junction table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS project_queries (
-                    project_id TEXT NOT NULL,
-                    query_id TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (project_id, query_id),
-                    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-                    FOREIGN KEY (query_id) REFERENCES saved_queries(id) ON DELETE CASCADE
-                )
-            """)
+        # File Configurations table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS file_configs (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                location TEXT NOT NULL,
+                description TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
 
-            # Project-FileRoot junction table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS project_file_roots (
-                    project_id TEXT NOT NULL,
-                    file_root_id TEXT NOT NULL,
-                    subfolder_path TEXT,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (project_id, file_root_id, subfolder_path),
-                    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-                    FOREIGN KEY (file_root_id) REFERENCES file_roots(id) ON DELETE CASCADE
-                )
-            """)
+        # Saved Queries table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS saved_queries (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                description TEXT,
+                target_database_id TEXT NOT NULL,
+                query_text TEXT NOT NULL,
+                category TEXT DEFAULT 'No category',
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                FOREIGN KEY (target_database_id) REFERENCES database_connections(id)
+            )
+        """)
 
-            # FTP Roots table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ftp_roots (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    protocol TEXT NOT NULL CHECK(protocol IN ('ftp', 'ftps', 'sftp')),
-                    host TEXT NOT NULL,
-                    port INTEGER NOT NULL,
-                    initial_path TEXT DEFAULT '/',
-                    passive_mode INTEGER DEFAULT 1,
-                    description TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
+        # Projects table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS projects (
+                id TEXT PRIMARY KEY,
+                name TEXT UNIQUE NOT NULL,
+                description TEXT,
+                is_default INTEGER DEFAULT 0,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                last_used_at TEXT
+            )
+        """)
 
-            # Project-FTPRoot junction table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS project_ftp_roots (
-                    project_id TEXT NOT NULL,
-                    ftp_root_id TEXT NOT NULL,
-                    subfolder_path TEXT DEFAULT '',
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (project_id, ftp_root_id, subfolder_path),
-                    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-                    FOREIGN KEY (ftp_root_id) REFERENCES ftp_roots(id) ON DELETE CASCADE
-                )
-            """)
+        # File Roots table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS file_roots (
+                id TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                name TEXT,
+                description TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
 
-            # Project-Job junction table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS project_jobs (
-                    project_id TEXT NOT NULL,
-                    job_id TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (project_id, job_id),
-                    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-                    FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
-                )
-            """)
+        # Project-Database junction table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_databases (
+                project_id TEXT NOT NULL,
+                database_id TEXT NOT NULL,
+                database_name TEXT DEFAULT '',
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (project_id, database_id, database_name),
+                FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
+                FOREIGN KEY (database_id) REFERENCES database_connections(id) ON DELETE CASCADE
+            )
+        """)
 
-            # Project-Script junction table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS project_scripts (
-                    project_id TEXT NOT NULL,
-                    script_id TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (project_id, script_id),
-                    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-                    FOREIGN KEY (script_id) REFERENCES scripts(id) ON DELETE CASCADE
-                )
-            """)
+        # Project-Query junction table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_queries (
+                project_id TEXT NOT NULL,
+                query_id TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (project_id, query_id),
+                FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
+                FOREIGN KEY (query_id) REFERENCES saved_queries(id) ON DELETE CASCADE
+            )
+        """)
 
-            # Scripts table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS scripts (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL UNIQUE,
-                    description TEXT,
-                    script_type TEXT NOT NULL,
-                    file_path TEXT DEFAULT '',
-                    parameters_schema TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
+        # Project-FileRoot junction table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_file_roots (
+                project_id TEXT NOT NULL,
+                file_root_id TEXT NOT NULL,
+                subfolder_path TEXT,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (project_id, file_root_id, subfolder_path),
+                FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
+                FOREIGN KEY (file_root_id) REFERENCES file_roots(id) ON DELETE CASCADE
+            )
+        """)
 
-            # Jobs table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS jobs (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    description TEXT,
-                    job_type TEXT NOT NULL CHECK(job_type IN ('script', 'workflow')),
-                    script_id TEXT,
-                    project_id TEXT,
-                    parent_job_id TEXT,
-                    previous_job_id TEXT,
-                    parameters TEXT,
-                    enabled INTEGER DEFAULT 1,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    last_run_at TEXT,
-                    FOREIGN KEY (script_id) REFERENCES scripts(id) ON DELETE CASCADE,
-                    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-                    FOREIGN KEY (parent_job_id) REFERENCES jobs(id) ON DELETE CASCADE,
-                    FOREIGN KEY (previous_job_id) REFERENCES jobs(id) ON DELETE SET NULL
-                )
-            """)
+        # FTP Roots table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS ftp_roots (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                protocol TEXT NOT NULL CHECK(protocol IN ('ftp', 'ftps', 'sftp')),
+                host TEXT NOT NULL,
+                port INTEGER NOT NULL,
+                initial_path TEXT DEFAULT '/',
+                passive_mode INTEGER DEFAULT 1,
+                description TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
 
-            # Image Rootfolders table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS image_rootfolders (
-                    id TEXT PRIMARY KEY,
-                    path TEXT NOT NULL UNIQUE,
-                    name TEXT,
-                    description TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
+        # Project-FTPRoot junction table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_ftp_roots (
+                project_id TEXT NOT NULL,
+                ftp_root_id TEXT NOT NULL,
+                subfolder_path TEXT DEFAULT '',
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (project_id, ftp_root_id, subfolder_path),
+                FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
+                FOREIGN KEY (ftp_root_id) REFERENCES ftp_roots(id) ON DELETE CASCADE
+            )
+        """)
 
-            # Saved Images table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS saved_images (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    filepath TEXT NOT NULL UNIQUE,
-                    rootfolder_id TEXT,
-                    physical_path TEXT DEFAULT '',
-                    description TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    FOREIGN KEY (rootfolder_id) REFERENCES image_rootfolders(id) ON DELETE CASCADE
-                )
-            """)
+        # Project-Job junction table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_jobs (
+                project_id TEXT NOT NULL,
+                job_id TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (project_id, job_id),
+                FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
+                FOREIGN KEY (job_id) REFERENCES jobs(id) ON DELETE CASCADE
+            )
+        """)
 
-            # Image Categories junction table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS image_categories (
-                    image_id TEXT NOT NULL,
-                    category_name TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (image_id, category_name),
-                    FOREIGN KEY (image_id) REFERENCES saved_images(id) ON DELETE CASCADE
-                )
-            """)
+        # Project-Script junction table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS project_scripts (
+                project_id TEXT NOT NULL,
+                script_id TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (project_id, script_id),
+                FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
+                FOREIGN KEY (script_id) REFERENCES scripts(id) ON DELETE CASCADE
+            )
+        """)
 
-            # Image Tags junction table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS image_tags (
-                    image_id TEXT NOT NULL,
-                    tag_name TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (image_id, tag_name),
-                    FOREIGN KEY (image_id) REFERENCES saved_images(id) ON DELETE CASCADE
-                )
-            """)
+        # Scripts table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scripts (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL UNIQUE,
+                description TEXT,
+                script_type TEXT NOT NULL,
+                file_path TEXT DEFAULT '',
+                parameters_schema TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
 
-            # User Preferences table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_preferences (
-                    key TEXT PRIMARY KEY,
-                    value TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
+        # Jobs table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                description TEXT,
+                job_type TEXT NOT NULL CHECK(job_type IN ('script', 'workflow')),
+                script_id TEXT,
+                project_id TEXT,
+                parent_job_id TEXT,
+                previous_job_id TEXT,
+                parameters TEXT,
+                enabled INTEGER DEFAULT 1,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                last_run_at TEXT,
+                FOREIGN KEY (script_id) REFERENCES scripts(id) ON DELETE CASCADE,
+                FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
+                FOREIGN KEY (parent_job_id) REFERENCES jobs(id) ON DELETE CASCADE,
+                FOREIGN KEY (previous_job_id) REFERENCES jobs(id) ON DELETE SET NULL
+            )
+        """)
 
-            # ER Diagrams table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS er_diagrams (
-                    id TEXT PRIMARY KEY,
-                    name TEXT NOT NULL,
-                    connection_id TEXT NOT NULL,
-                    database_name TEXT DEFAULT '',
-                    description TEXT DEFAULT '',
-                    zoom_level REAL DEFAULT 1.0,
-                    show_column_types INTEGER DEFAULT 1,
-                    group_fks INTEGER DEFAULT 1,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL,
-                    FOREIGN KEY (connection_id) REFERENCES database_connections(id) ON DELETE CASCADE
-                )
-            """)
+        # Image Rootfolders table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS image_rootfolders (
+                id TEXT PRIMARY KEY,
+                path TEXT NOT NULL UNIQUE,
+                name TEXT,
+                description TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
 
-            # ER Diagram Tables (positions of tables in a diagram)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS er_diagram_tables (
-                    diagram_id TEXT NOT NULL,
-                    table_name TEXT NOT NULL,
-                    schema_name TEXT DEFAULT '',
-                    pos_x REAL DEFAULT 0.0,
-                    pos_y REAL DEFAULT 0.0,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (diagram_id, table_name, schema_name),
-                    FOREIGN KEY (diagram_id) REFERENCES er_diagrams(id) ON DELETE CASCADE
-                )
-            """)
+        # Saved Images table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS saved_images (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                filepath TEXT NOT NULL UNIQUE,
+                rootfolder_id TEXT,
+                physical_path TEXT DEFAULT '',
+                description TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                FOREIGN KEY (rootfolder_id) REFERENCES image_rootfolders(id) ON DELETE CASCADE
+            )
+        """)
 
-            # ER Diagram FK line midpoints (custom positions for relationship lines)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS er_diagram_fk_midpoints (
-                    diagram_id TEXT NOT NULL,
-                    from_table TEXT NOT NULL,
-                    from_column TEXT NOT NULL,
-                    to_table TEXT NOT NULL,
-                    to_column TEXT NOT NULL,
-                    seq INTEGER NOT NULL DEFAULT 0,
-                    mid_x REAL NOT NULL,
-                    mid_y REAL NOT NULL,
-                    PRIMARY KEY (diagram_id, from_table, from_column, to_table, to_column, seq),
-                    FOREIGN KEY (diagram_id) REFERENCES er_diagrams(id) ON DELETE CASCADE
-                )
-            """)
+        # Image Categories junction table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS image_categories (
+                image_id TEXT NOT NULL,
+                category_name TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (image_id, category_name),
+                FOREIGN KEY (image_id) REFERENCES saved_images(id) ON DELETE CASCADE
+            )
+        """)
 
-            # Create indexes
-            self._create_indexes(cursor)
+        # Image Tags junction table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS image_tags (
+                image_id TEXT NOT NULL,
+                tag_name TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (image_id, tag_name),
+                FOREIGN KEY (image_id) REFERENCES saved_images(id) ON DELETE CASCADE
+            )
+        """)
 
-            conn.commit()
+        # User Preferences table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS user_preferences (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        """)
 
-            # Ensure config DB self-reference exists
-            self._ensure_config_db_connection(cursor, conn)
+        # ER Diagrams table
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS er_diagrams (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                connection_id TEXT NOT NULL,
+                database_name TEXT DEFAULT '',
+                description TEXT DEFAULT '',
+                zoom_level REAL DEFAULT 1.0,
+                show_column_types INTEGER DEFAULT 1,
+                group_fks INTEGER DEFAULT 1,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                FOREIGN KEY (connection_id) REFERENCES database_connections(id) ON DELETE CASCADE
+            )
+        """)
 
-        finally:
-            conn.close()
+        # ER Diagram Tables (positions of tables in a diagram)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS er_diagram_tables (
+                diagram_id TEXT NOT NULL,
+                table_name TEXT NOT NULL,
+                schema_name TEXT DEFAULT '',
+                pos_x REAL DEFAULT 0.0,
+                pos_y REAL DEFAULT 0.0,
+                created_at TEXT NOT NULL,
+                PRIMARY KEY (diagram_id, table_name, schema_name),
+                FOREIGN KEY (diagram_id) REFERENCES er_diagrams(id) ON DELETE CASCADE
+            )
+        """)
+
+        # ER Diagram FK line midpoints (custom positions for relationship lines)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS er_diagram_fk_midpoints (
+                diagram_id TEXT NOT NULL,
+                from_table TEXT NOT NULL,
+                from_column TEXT NOT NULL,
+                to_table TEXT NOT NULL,
+                to_column TEXT NOT NULL,
+                seq INTEGER NOT NULL DEFAULT 0,
+                mid_x REAL NOT NULL,
+                mid_y REAL NOT NULL,
+                PRIMARY KEY (diagram_id, from_table, from_column, to_table, to_column, seq),
+                FOREIGN KEY (diagram_id) REFERENCES er_diagrams(id) ON DELETE CASCADE
+            )
+        """)
+
+        # Create indexes
+        self._create_indexes(cursor)
+
+        conn.commit()
 
     def _create_indexes(self, cursor: sqlite3.Cursor):
         """Create all database indexes."""
@@ -439,56 +490,27 @@ class SchemaManager:
             conn.commit()
             logger.info("Updated Configuration Database connection path")
 
-    def _migrate_database(self):
-        """Apply database migrations for schema updates."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        try:
-            # Migration 1: Add 'name' column to file_roots
-            self._migrate_file_roots_name(cursor, conn)
-
-            # Migration 2: Add 'database_name' column to project_databases
-            self._migrate_project_databases_name(cursor, conn)
-
-            # Migration 3: Update saved_images table structure
-            self._migrate_saved_images_structure(cursor, conn)
-
-            # Migration 4: Add 'file_path' column to scripts
-            self._migrate_scripts_file_path(cursor, conn)
-
-            # Migration 5: Add 'auto_connect' column to projects
-            self._migrate_projects_auto_connect(cursor, conn)
-
-            # Migration 6: Add 'target_database_name' column to saved_queries
-            self._migrate_saved_queries_database_name(cursor, conn)
-
-            # Migration 7: Add 'color' column to database_connections
-            self._migrate_database_connections_color(cursor, conn)
-
-            # Migration 8: Add 'shared_path' column to projects
-            self._migrate_projects_shared_path(cursor, conn)
-
-            # Migration 9: Add missing columns to er_diagrams (zoom_level + show_column_types)
-            self._migrate_er_diagrams_columns(cursor, conn)
-
-            # Migration 10: Add seq column to fk_midpoints for multi-waypoint support
-            self._migrate_fk_midpoints_seq(cursor, conn)
-
-            # Migration 11: Create er_diagram_groups table for visual grouping frames
-            self._migrate_create_er_diagram_groups(cursor, conn)
-
-            # Migration 12: Add width/height columns to er_diagram_tables
-            self._migrate_er_diagram_tables_size(cursor, conn)
+    def _migrate_database(self, cursor: sqlite3.Cursor, conn: sqlite3.Connection,
+                          from_version: int = 0):
+        """
+        Apply the migrations a database has not run yet, then record
+        SCHEMA_VERSION in user_version.
 
-            # Migration 13: Create project_er_diagrams junction table
-            self._migrate_create_project_er_diagrams(cursor, conn)
+        Args:
+            cursor: Cursor of conn
+            conn: Configuration database connection
+            from_version: Current user_version of the database
+        """
+        for number, name in enumerate(self.MIGRATIONS, start=1):
+            if number > from_version:
+                getattr(self, name)(cursor, conn)
 
-            # Ensure image indexes exist
-            self._ensure_image_indexes(cursor, conn)
+        # Ensure image indexes exist
+        self._ensure_image_indexes(cursor, conn)
 
-        finally:
-            conn.close()
+        cursor.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        conn.commit()
+        logger.info(f"Configuration database schema at v{self.SCHEMA_VERSION} (was v{from_version})")
 
     def _migrate_file_roots_name(self, cursor: sqlite3.Cursor, conn: sqlite3.Connection):
         """Migration 1: Add 'name' column to file_roots if it doesn't exist."""
@@ -685,6 +707,15 @@ class SchemaManager:
             cursor.execute("ALTER TABLE er_diagram_tables ADD COLUMN height REAL NOT NULL DEFAULT 0")
         conn.commit()
 
+    def _migrate_er_diagram_tables_pinned(self, cursor: sqlite3.Cursor, conn: sqlite3.Connection):
+        """Migration 15: Add pinned column to er_diagram_tables (kept in place by auto-layout)."""
+        cursor.execute("PRAGMA table_info(er_diagram_tables)")
+        columns = [row[1] for row in cursor.fetchall()]
+        if 'pinned' not in columns:
+            logger.info("[MIGRATION] Adding 'pinned' column to er_diagram_tables...")
+            cursor.execute("ALTER TABLE er_diagram_tables ADD COLUMN pinned INTEGER NOT NULL DEFAULT 0")
+        conn.commit()
+
     def _migrate_create_er_diagram_groups(self, cursor: sqlite3.Cursor, conn: sqlite3.Connection):
         """Migration 11: Create er_diagram_groups table for visual grouping frames."""
         cursor.execute("""
@@ -718,6 +749,23 @@ class SchemaManager:
         """)
         conn.commit()
 
+    def _migrate_create_schema_snapshots(self, cursor: sqlite3.Cursor,
+                                         conn: sqlite3.Connection):
+        """Migration 14: Create schema_snapshots so database trees and ER
+        diagrams can open from a stored catalog instead of re-querying it."""
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_snapshots (
+                connection_id TEXT NOT NULL,
+                database_name TEXT NOT NULL DEFAULT '',
+                marker TEXT,
+                payload TEXT NOT NULL,
+                captured_at TEXT NOT NULL,
+                PRIMARY KEY (connection_id, database_name),
+                FOREIGN KEY (connection_id) REFERENCES database_connections(id) ON DELETE CASCADE
+            )
+        """)
+        conn.commit()
+
     def _migrate_fk_midpoints_seq(self, cursor: sqlite3.Cursor, conn: sqlite3.Connection):
         """Migration 10: Add 'seq' column to er_diagram_fk_midpoints for multi-waypoint support."""
         cursor.execute("PRAGMA table_info(er_diagram_fk_midpoints)")
@@ -772,6 +820,78 @@ class SchemaManager:
             conn.commit()
             logger.info("[OK] Migration complete: er_diagrams now supports group_fks")
 
+    def _migrate_create_image_search(self, cursor: sqlite3.Cursor, conn: sqlite3.Connection):
+        """Migration 16: Create the image_search FTS5 index over image names,
+        paths, categories and tags, kept in sync by triggers.
+
+        Index rows share the rowid of their saved_images row. The index is
+        rebuilt when it no longer matches the images (first run, or rowids
+        renumbered by a VACUUM); this is checked whenever migrations run.
+        """
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS image_search USING fts5(
+                    image_id UNINDEXED, name, filepath, categories, tags,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text image search unavailable (FTS5 missing): {e}")
+            return
+
+        categories_sql = """(SELECT group_concat(category_name, ' ') FROM image_categories
+                              WHERE image_id = {id})"""
+        tags_sql = """(SELECT group_concat(tag_name, ' ') FROM image_tags
+                        WHERE image_id = {id})"""
+        image_rowid_sql = "(SELECT rowid FROM saved_images WHERE id = {id})"
+        triggers = {
+            "trg_image_search_insert": f"""
+                AFTER INSERT ON saved_images BEGIN
+                    INSERT INTO image_search (rowid, image_id, name, filepath, categories, tags)
+                    VALUES (new.rowid, new.id, new.name, new.filepath,
+                            {categories_sql.format(id='new.id')}, {tags_sql.format(id='new.id')});
+                END""",
+            "trg_image_search_update": """
+                AFTER UPDATE OF id, name, filepath ON saved_images BEGIN
+                    UPDATE image_search SET image_id = new.id, name = new.name, filepath = new.filepath
+                    WHERE rowid = old.rowid;
+                END""",
+            "trg_image_search_delete": """
+                AFTER DELETE ON saved_images BEGIN
+                    DELETE FROM image_search WHERE rowid = old.rowid;
+                END""",
+        }
+        for table, column, value_sql in (("image_categories", "categories", categories_sql),
+                                         ("image_tags", "tags", tags_sql)):
+            for event, ref in (("INSERT", "new"), ("DELETE", "old")):
+                image_id = f"{ref}.image_id"
+                triggers[f"trg_image_search_{table}_{event.lower()}"] = f"""
+                    AFTER {event} ON {table} BEGIN
+                        UPDATE image_search SET {column} = {value_sql.format(id=image_id)}
+                        WHERE rowid = {image_rowid_sql.format(id=image_id)};
+                    END"""
+        for name, body in triggers.items():
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+        cursor.execute("""
+            SELECT (SELECT COUNT(*) FROM saved_images),
+                   (SELECT COUNT(*) FROM image_search),
+                   (SELECT COUNT(*) FROM image_search s
+                    INNER JOIN saved_images si ON si.rowid = s.rowid AND si.id = s.image_id)
+        """)
+        images, indexed, matching = cursor.fetchone()
+        if not (images == indexed == matching):
+            logger.info(f"[MIGRATION] Rebuilding image search index ({images} images)...")
+            cursor.execute("DELETE FROM image_search")
+            cursor.execute(f"""
+                INSERT INTO image_search (rowid, image_id, name, filepath, categories, tags)
+                SELECT si.rowid, si.id, si.name, si.filepath,
+                       {categories_sql.format(id='si.id')}, {tags_sql.format(id='si.id')}
+                FROM saved_images si
+            """)
+            logger.info("[OK] Migration complete: image search index rebuilt")
+        conn.commit()
+
     def _ensure_image_indexes(self, cursor: sqlite3.Cursor, conn: sqlite3.Connection):
         """Ensure image indexes exist (for fresh installs or post-migration)."""
         try:
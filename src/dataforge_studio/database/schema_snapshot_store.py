@@ -0,0 +1,180 @@
+"""
+Schema Snapshot Store - Reuse stored catalogs until the live catalog changes.
+
+Loading a full catalog (tables, columns, views, routines, keys) is the slow
+part of expanding a database node or opening an ER diagram, especially over
+VPN. The store keeps the last loaded catalog per connection/database in the
+configuration database and only re-reads it when the loader's change marker
+(one cheap catalog query) differs from the stored one.
+
+load() runs the marker query (and the reload when needed) in the calling
+thread. GUI code shows get_cached() straight away and revalidates with
+load() in a SchemaRevalidateWorker.
+
+Usage:
+    store = get_schema_snapshot_store()
+    snapshot = store.load(loader, db_conn.id)                 # tree
+    snapshot = store.load(loader, db_conn.id, "Sales", with_keys=True)  # diagram
+    snapshot = store.get_cached(db_conn.id, "Sales")          # no live query
+"""
+import threading
+from dataclasses import replace
+from typing import Dict, Optional, Tuple
+import logging
+
+from .models.schema_snapshot import SchemaSnapshot
+from .schema_loaders.base import SchemaLoader, SchemaNode
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaSnapshotStore:
+    """
+    Two-level (memory + config DB) store of schema snapshots.
+
+    Thread-safe: loads run from connection worker threads as well as the
+    GUI thread.
+    """
+
+    def __init__(self, config_db=None):
+        """
+        Initialize the store.
+
+        Args:
+            config_db: ConfigDatabase instance (uses singleton if not provided)
+        """
+        self._config_db = config_db
+        self._memory: Dict[Tuple[str, str], SchemaSnapshot] = {}
+        self._lock = threading.RLock()
+
+    @property
+    def _db(self):
+        if self._config_db is None:
+            from .config_db import get_config_db
+            self._config_db = get_config_db()
+        return self._config_db
+
+    def get_cached(self, connection_id: str, database_name: str = "") -> Optional[SchemaSnapshot]:
+        """
+        Get the stored snapshot without touching the live database.
+
+        The snapshot may be stale: revalidate it with load().
+
+        Args:
+            connection_id: Database connection ID
+            database_name: Database name ("" for the whole connection)
+
+        Returns:
+            SchemaSnapshot copy (is_cached=True) or None if nothing is stored
+        """
+        snapshot = self._stored(connection_id, database_name or "")
+        return replace(snapshot, is_cached=True) if snapshot is not None else None
+
+    def _stored(self, connection_id: str, database_name: str) -> Optional[SchemaSnapshot]:
+        """Stored snapshot itself (memory, then config DB) - never handed out."""
+        key = (connection_id, database_name)
+        with self._lock:
+            snapshot = self._memory.get(key)
+            if snapshot is None:
+                snapshot = self._db.get_schema_snapshot(connection_id, database_name)
+                if snapshot is not None:
+                    self._memory[key] = snapshot
+            return snapshot
+
+    def load(self, loader: SchemaLoader, connection_id: str, database_name: str = "",
+             with_keys: bool = False, force: bool = False) -> SchemaSnapshot:
+        """
+        Get a snapshot that matches the live catalog.
+
+        Serves the stored snapshot when the loader's change marker is unchanged,
+        otherwise reloads the catalog through the loader and stores it.
+
+        Args:
+            loader: Schema loader bound to a live connection
+            connection_id: Database connection ID
+            database_name: Database name ("" for the whole connection/server)
+            with_keys: Also make sure primary and foreign keys are captured
+            force: Reload even if the stored snapshot looks fresh
+
+        Returns:
+            SchemaSnapshot copy (snapshot.is_cached tells whether it was reused)
+        """
+        database_name = database_name or ""
+        marker = loader.get_change_marker(database_name or None)
+
+        stored = None if force else self._stored(connection_id, database_name)
+        if (stored is not None and stored.schema is not None
+                and marker is not None and stored.marker == marker):
+            snapshot = replace(stored, is_cached=True)
+            if with_keys and (snapshot.foreign_keys is None or snapshot.primary_keys is None):
+                self._load_keys(loader, snapshot)
+                self._save(snapshot)
+            return snapshot
+
+        logger.info(f"Loading catalog for {loader.db_name}"
+                    f"{' / ' + database_name if database_name else ''}")
+        snapshot = SchemaSnapshot(
+            connection_id=connection_id,
+            database_name=database_name,
+            marker=marker,
+            schema=self._load_schema_tree(loader, database_name),
+        )
+        if with_keys:
+            self._load_keys(loader, snapshot)
+        self._save(snapshot)
+        return replace(snapshot)
+
+    def refresh_keys(self, loader: SchemaLoader, snapshot: SchemaSnapshot) -> SchemaSnapshot:
+        """Re-read primary and foreign keys of a snapshot and store them."""
+        self._load_keys(loader, snapshot)
+        self._save(snapshot)
+        return snapshot
+
+    def invalidate(self, connection_id: str, database_name: Optional[str] = None):
+        """
+        Drop stored snapshots of a connection.
+
+        Args:
+            connection_id: Database connection ID
+            database_name: Only this database, or None for all of the connection
+        """
+        with self._lock:
+            for key in list(self._memory):
+                if key[0] == connection_id and (database_name is None or key[1] == database_name):
+                    del self._memory[key]
+            self._db.delete_schema_snapshots(connection_id, database_name)
+
+    @staticmethod
+    def _load_schema_tree(loader: SchemaLoader, database_name: str) -> SchemaNode:
+        """Load the schema tree for one database, or the whole connection."""
+        if database_name and hasattr(loader, '_load_database_schema'):
+            return loader._load_database_schema(database_name)
+        return loader.load_schema()
+
+    @staticmethod
+    def _load_keys(loader: SchemaLoader, snapshot: SchemaSnapshot):
+        """Load every PK/FK of the snapshot's database into it."""
+        database_name = snapshot.database_name or None
+        snapshot.foreign_keys = loader.load_foreign_keys(None, database_name)
+        snapshot.primary_keys = loader.load_primary_keys(None, database_name)
+
+    def _save(self, snapshot: SchemaSnapshot):
+        """Store a copy of a snapshot in memory and in the config DB."""
+        with self._lock:
+            self._memory[(snapshot.connection_id, snapshot.database_name)] = replace(
+                snapshot, is_cached=False)
+        self._db.save_schema_snapshot(snapshot)
+
+
+# Singleton instance
+_store: Optional[SchemaSnapshotStore] = None
+_store_lock = threading.Lock()
+
+
+def get_schema_snapshot_store() -> SchemaSnapshotStore:
+    """Get the global schema snapshot store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SchemaSnapshotStore()
+        return _store
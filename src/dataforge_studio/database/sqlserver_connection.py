@@ -193,6 +193,11 @@ class PytdsConnectionWrapper:
     def __init__(self, real_conn):
         self._conn = real_conn
 
+    @property
+    def raw_connection(self):
+        """Underlying pytds connection (for pytds-only APIs such as copy_to)."""
+        return self._conn
+
     def cursor(self):
         return PytdsCursorWrapper(self._conn.cursor())
 
@@ -1,22 +1,36 @@
 """
-Data Loader Module - Import files into SQL Server database.
+Data Loader Module - Import files into a database.
 
 This script imports CSV/Excel/JSON files from contract/dataset folders
-into database tables.
+into database tables. Files are read in chunks and sent through the bulk
+path of the target (see database.bulk_insert) over one connection per run
+(one per worker thread with parallel_import()).
 """
+import itertools
 import shutil
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 
 import pandas as pd
 
+from dataforge_studio.core.csv_sniffer import (
+    DELIMITERS, read_csv, sniff_csv, strict_fallback_encoding
+)
+from dataforge_studio.database.bulk_insert import (
+    BulkWriter, BULK_CHUNK_ROWS, detect_dialect, infer_column_kinds
+)
+
 logger = logging.getLogger(__name__)
 
 # Default configuration
-DEFAULT_FIELD_TYPE = "NVARCHAR(MAX)"
 DEFAULT_IMPORTED_FOLDER = "_Imported"
 DEFAULT_ERROR_FOLDER = "_Error"
+DEFAULT_IMPORT_WORKERS = 4
 
 
 class DataLoader:
@@ -27,13 +41,37 @@ class DataLoader:
         connection_string: str,
         imported_folder_name: str = DEFAULT_IMPORTED_FOLDER,
         error_folder_name: str = DEFAULT_ERROR_FOLDER,
-        field_type: str = DEFAULT_FIELD_TYPE
+        field_type: Optional[str] = None,
+        infer_types: bool = False,
+        chunk_rows: int = BULK_CHUNK_ROWS
     ):
+        """
+        Initialize the loader.
+
+        Args:
+            connection_string: Target database connection string
+            imported_folder_name: Folder receiving imported files
+            error_folder_name: Folder receiving files that failed
+            field_type: Type of text columns (default: the target's
+                        unbounded text type, e.g. NVARCHAR(MAX))
+            infer_types: Create new columns as integer/float/datetime
+                         when the first chunk of a file allows it
+            chunk_rows: Rows read and sent per chunk
+        """
         self.connection_string = connection_string
         self.imported_folder_name = imported_folder_name
         self.error_folder_name = error_folder_name
         self.field_type = field_type
-        self.stats = {
+        self.infer_types = infer_types
+        self.chunk_rows = chunk_rows
+        self.stats = self._new_stats()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writers: List[BulkWriter] = []
+
+    @staticmethod
+    def _new_stats() -> dict:
+        return {
             "files_processed": 0,
             "files_imported": 0,
             "files_failed": 0,
@@ -41,6 +79,27 @@ class DataLoader:
             "tables_updated": 0
         }
 
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _get_writer(self) -> BulkWriter:
+        """Connection of the calling thread (opened on first use)."""
+        writer = getattr(self._local, "writer", None)
+        if writer is None:
+            writer = BulkWriter.connect(self.connection_string)
+            self._local.writer = writer
+            with self._lock:
+                self._writers.append(writer)
+        return writer
+
+    def _close_writers(self) -> None:
+        with self._lock:
+            writers, self._writers = self._writers, []
+            self._local = threading.local()
+        for writer in writers:
+            writer.close()
+
     def load_all_files(self, root_folder: Path) -> dict:
         """
         Load all files from contract/dataset folders into database.
@@ -48,13 +107,7 @@ class DataLoader:
         Returns:
             Statistics about the operation
         """
-        self.stats = {
-            "files_processed": 0,
-            "files_imported": 0,
-            "files_failed": 0,
-            "tables_created": 0,
-            "tables_updated": 0
-        }
+        self.stats = self._new_stats()
 
         root_folder = Path(root_folder)
         if not root_folder.exists():
@@ -65,11 +118,49 @@ class DataLoader:
             if folder.is_dir() and not folder.name.startswith("_")
         ]
 
-        for contract_folder in contract_folders:
-            self._process_contract_folder(contract_folder)
+        try:
+            for contract_folder in contract_folders:
+                self._process_contract_folder(contract_folder)
+        finally:
+            self._close_writers()
 
         return self.stats
 
+    @contextmanager
+    def parallel_import(self, max_workers: int = DEFAULT_IMPORT_WORKERS):
+        """
+        Import dataset folders concurrently as they are submitted.
+
+        Yields a submit(contract_name, dataset_folder) callable; leaving the
+        block waits for every import. Each dataset has its own table, so
+        folders never compete for one. SQLite allows a single writer: its
+        imports run one at a time.
+
+        Usage:
+            with loader.parallel_import() as submit:
+                dispatcher.dispatch_files(on_dataset_ready=submit)
+            print(loader.stats)
+        """
+        self.stats = self._new_stats()
+        if detect_dialect(self.connection_string) == "sqlite":
+            max_workers = 1
+
+        pool = ThreadPoolExecutor(max_workers=max(1, int(max_workers)),
+                                  thread_name_prefix="data_loader")
+        futures = []
+
+        def submit(contract_name: str, dataset_folder: Path) -> None:
+            futures.append(pool.submit(self._process_dataset_folder,
+                                       contract_name, Path(dataset_folder)))
+
+        try:
+            yield submit
+        finally:
+            pool.shutdown(wait=True)
+            self._close_writers()
+        for future in futures:
+            future.result()
+
     def _process_contract_folder(self, contract_folder: Path) -> None:
         """Process all dataset folders within a contract folder."""
         contract_name = contract_folder.name
@@ -94,182 +185,128 @@ class DataLoader:
         imported_folder.mkdir(exist_ok=True)
         error_folder.mkdir(exist_ok=True)
 
-        files = [f for f in dataset_folder.iterdir() if f.is_file()]
+        # Hidden files include copies still being staged by the dispatcher
+        files = [f for f in dataset_folder.iterdir() if f.is_file() and not f.name.startswith(".")]
 
         for file_path in files:
-            self.stats["files_processed"] += 1
+            self._count("files_processed")
             try:
                 self._import_file(file_path, table_name, imported_folder)
-                self.stats["files_imported"] += 1
+                self._count("files_imported")
             except Exception as e:
                 logger.error(f"Error importing file {file_path.name}: {e}")
                 self._move_to_error(file_path, error_folder)
-                self.stats["files_failed"] += 1
+                self._count("files_failed")
 
     def _import_file(self, file_path: Path, table_name: str, imported_folder: Path) -> None:
-        """Import a single file into the database table."""
-        from dataforge_studio.database.sqlserver_connection import connect_sqlserver
-
+        """Import a single file into the database table (one transaction)."""
         logger.info(f"Importing {file_path.name} into table {table_name}...")
 
-        df = self._read_file(file_path)
-
-        if df is None or df.empty:
-            raise ValueError(f"File is empty or could not be read: {file_path.name}")
-
-        with connect_sqlserver(self.connection_string) as conn:
-            cursor = conn.cursor()
-
-            table_exists = self._table_exists(cursor, table_name)
-
-            if not table_exists:
-                self._create_table(cursor, table_name, df.columns)
-                conn.commit()
-                self.stats["tables_created"] += 1
-                logger.info(f"Created table: {table_name}")
-            else:
-                self._truncate_table(cursor, table_name)
-                self._add_missing_columns(cursor, table_name, df.columns)
-                conn.commit()
-                self.stats["tables_updated"] += 1
-                logger.info(f"Updated table structure: {table_name}")
-
-            self._insert_data(cursor, table_name, df)
-            conn.commit()
-            logger.info(f"Inserted {len(df)} rows into {table_name}")
+        try:
+            self._load_file(file_path, table_name)
+        except UnicodeDecodeError as e:
+            # The encoding was sniffed from the start of the file only
+            if file_path.suffix.lower() not in (".csv", ".txt"):
+                raise
+            fallback = strict_fallback_encoding(self._csv_dialect(file_path).encoding)
+            if fallback is None:
+                raise
+            logger.warning(f"{file_path.name} is not {e.encoding} past its first lines "
+                           f"({e.reason}); reloading as {fallback}")
+            self._load_file(file_path, table_name, encoding=fallback)
 
         destination = imported_folder / file_path.name
         shutil.move(str(file_path), str(destination))
         logger.info(f"Moved to imported folder: {file_path.name}")
 
-    def _read_file(self, file_path: Path) -> pd.DataFrame:
-        """Read file into pandas DataFrame with automatic format detection."""
-        suffix = file_path.suffix.lower()
+    def _load_file(self, file_path: Path, table_name: str, encoding: Optional[str] = None) -> None:
+        """Create or reload the table from a file; rolled back if anything fails."""
+        chunks = self._iter_chunks(file_path, encoding)
+        first = next(chunks, None)
 
-        if suffix == ".csv":
-            return self._read_csv_with_detection(file_path)
-        elif suffix in [".xlsx", ".xls"]:
-            return pd.read_excel(file_path, dtype=str, keep_default_na=False)
-        elif suffix == ".json":
-            return pd.read_json(file_path, dtype=str)
-        elif suffix == ".txt":
-            return self._read_csv_with_detection(file_path, default_sep="\t")
-        else:
-            raise ValueError(f"Unsupported file format: {suffix}")
-
-    def _read_csv_with_detection(
-        self,
-        file_path: Path,
-        default_sep: Optional[str] = None
-    ) -> pd.DataFrame:
-        """Read CSV file with automatic encoding and separator detection."""
-        encodings = ['utf-8', 'utf-8-sig', 'iso-8859-1', 'windows-1252', 'cp1252', 'latin1']
-        separators = [',', ';', '\t', '|'] if default_sep is None else [default_sep]
-
-        best_result = None
-        best_column_count = 0
-        last_error = None
-
-        for encoding in encodings:
-            for sep in separators:
-                try:
-                    df = pd.read_csv(
-                        file_path,
-                        sep=sep,
-                        encoding=encoding,
-                        dtype=str,
-                        keep_default_na=False,
-                        on_bad_lines='skip',
-                        engine='python',
-                        encoding_errors='replace'
-                    )
-
-                    column_count = len(df.columns)
-
-                    if column_count > best_column_count and len(df) > 0:
-                        best_result = df
-                        best_column_count = column_count
-
-                        if column_count > 1:
-                            logger.info(
-                                f"Successfully read {file_path.name} with "
-                                f"encoding={encoding}, separator='{sep}', "
-                                f"{column_count} columns"
-                            )
-                            return df
-
-                except Exception as e:
-                    last_error = e
-                    continue
-
-        if best_result is not None and len(best_result) > 0:
-            logger.info(f"Read {file_path.name} with {best_column_count} column(s)")
-            return best_result
-
-        if last_error:
-            raise ValueError(
-                f"Could not read file {file_path.name} with any "
-                f"encoding/separator combination. Last error: {last_error}"
-            )
+        if first is None or first.empty:
+            raise ValueError(f"File is empty or could not be read: {file_path.name}")
 
-        raise ValueError(
-            f"Could not read file {file_path.name}: "
-            "file appears to be empty or malformed"
-        )
-
-    def _table_exists(self, cursor, table_name: str) -> bool:
-        """Check if table exists in database."""
-        query = """
-            SELECT COUNT(*)
-            FROM INFORMATION_SCHEMA.TABLES
-            WHERE TABLE_NAME = ?
-        """
-        cursor.execute(query, table_name)
-        count = cursor.fetchone()[0]
-        return count > 0
+        writer = self._get_writer()
+        inferred = infer_column_kinds(first) if self.infer_types else {}
+        try:
+            existing = {col.name for col in writer.table_columns(table_name)}
+            if not existing:
+                writer.create_table(table_name, list(first.columns), inferred, self.field_type)
+            else:
+                writer.truncate(table_name)
+                missing = [col for col in first.columns if col not in existing]
+                writer.add_columns(table_name, missing, inferred, self.field_type)
+                for column in missing:
+                    logger.info(f"Added column [{column}] to table {table_name}")
+
+            kinds = writer.column_kinds(table_name)
+            row_count = 0
+            for chunk in itertools.chain([first], chunks):
+                row_count += writer.insert(table_name, chunk, kinds)
+            writer.commit()
+        except Exception:
+            writer.rollback()
+            raise
+
+        if existing:
+            self._count("tables_updated")
+            logger.info(f"Updated table structure: {table_name}")
+        else:
+            self._count("tables_created")
+            logger.info(f"Created table: {table_name}")
+        logger.info(f"Inserted {row_count} rows into {table_name}")
 
     @staticmethod
-    def _quote_id(name: str) -> str:
-        """Quote a SQL Server bracket identifier, escaping ] as ]]."""
-        return f"[{name.replace(']', ']]')}]"
-
-    def _create_table(self, cursor, table_name: str, columns: List[str]) -> None:
-        """Create a new table with all columns as NVARCHAR(MAX)."""
-        columns_def = ", ".join([f"{self._quote_id(col)} {self.field_type}" for col in columns])
-        query = f"CREATE TABLE {self._quote_id(table_name)} ({columns_def})"
-        cursor.execute(query)
-
-    def _truncate_table(self, cursor, table_name: str) -> None:
-        """Empty the table."""
-        query = f"TRUNCATE TABLE {self._quote_id(table_name)}"
-        cursor.execute(query)
-
-    def _add_missing_columns(self, cursor, table_name: str, file_columns: List[str]) -> None:
-        """Add missing columns to existing table."""
-        query = """
-            SELECT COLUMN_NAME
-            FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_NAME = ?
+    def _csv_dialect(file_path: Path):
+        delimiters = "\t" if file_path.suffix.lower() == ".txt" else DELIMITERS
+        return sniff_csv(file_path, delimiters=delimiters)
+
+    def _iter_chunks(self, file_path: Path, encoding: Optional[str] = None) -> Iterator[pd.DataFrame]:
         """
-        cursor.execute(query, table_name)
-        existing_columns = set(row[0] for row in cursor.fetchall())
+        Read a file as DataFrame chunks of strings, with format detection.
 
-        for column in file_columns:
-            if column not in existing_columns:
-                alter_query = f"ALTER TABLE {self._quote_id(table_name)} ADD {self._quote_id(column)} {self.field_type}"
-                cursor.execute(alter_query)
-                logger.info(f"Added column [{column}] to table {table_name}")
+        Text files are decoded strictly: a UnicodeDecodeError surfaces
+        instead of U+FFFD reaching the table.
 
-    def _insert_data(self, cursor, table_name: str, df: pd.DataFrame) -> None:
-        """Insert data from DataFrame into table."""
-        df = df.fillna("")
+        Args:
+            file_path: File to read
+            encoding: Overrides the sniffed encoding of a text file
+        """
+        suffix = file_path.suffix.lower()
 
-        columns = ", ".join([self._quote_id(col) for col in df.columns])
-        placeholders = ", ".join(["?" for _ in df.columns])
-        query = f"INSERT INTO {self._quote_id(table_name)} ({columns}) VALUES ({placeholders})"
+        if suffix in (".csv", ".txt"):
+            dialect = self._csv_dialect(file_path)
+            if encoding:
+                dialect = replace(dialect, encoding=encoding)
+            logger.info(
+                f"Reading {file_path.name} with encoding={dialect.encoding}, "
+                f"separator={dialect.delimiter!r}, header={dialect.has_header}"
+            )
+            reader = read_csv(
+                file_path,
+                dialect,
+                dtype=str,
+                keep_default_na=False,
+                on_bad_lines='skip',
+                encoding_errors='strict',
+                chunksize=self.chunk_rows
+            )
+            for chunk in reader:
+                if not dialect.has_header:
+                    chunk.columns = [f"column_{i + 1}" for i in range(len(chunk.columns))]
+                yield chunk
+            return
+
+        if suffix in [".xlsx", ".xls"]:
+            df = pd.read_excel(file_path, dtype=str, keep_default_na=False)
+        elif suffix == ".json":
+            df = pd.read_json(file_path, dtype=str)
+        else:
+            raise ValueError(f"Unsupported file format: {suffix}")
 
-        data = [tuple(row) for row in df.values]
-        cursor.executemany(query, data)
+        for start in range(0, max(len(df), 1), self.chunk_rows):
+            yield df.iloc[start:start + self.chunk_rows]
 
     def _move_to_error(self, file_path: Path, error_folder: Path) -> None:
         """Move file to error folder."""
@@ -288,7 +325,8 @@ class DataLoader:
 def run(
     root_folder: str,
     connection_string: str,
-    dry_run: bool = False
+    dry_run: bool = False,
+    infer_types: bool = False
 ) -> dict:
     """
     Entry point for script execution.
@@ -297,11 +335,12 @@ def run(
         root_folder: Path to the root folder containing contract/dataset folders
         connection_string: Database connection string
         dry_run: If True, only simulate the operation
+        infer_types: If True, create numeric/date columns when values allow it
 
     Returns:
         Statistics dictionary
     """
-    loader = DataLoader(connection_string=connection_string)
+    loader = DataLoader(connection_string=connection_string, infer_types=infer_types)
 
     if dry_run:
         logger.info("DRY RUN - No data will be imported")
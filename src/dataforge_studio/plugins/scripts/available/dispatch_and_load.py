@@ -0,0 +1,60 @@
+"""
+Dispatch and Load Module - Dispatch landing files and import them in one run.
+
+The File Dispatcher plan runs in a thread pool; each dataset folder is
+handed to the Data Loader as soon as its last file has arrived, so imports
+overlap with the remaining moves instead of waiting for the whole dispatch.
+Dataset folders still holding files from an interrupted run are imported
+too, which makes the pipeline safe to re-run.
+"""
+import logging
+from pathlib import Path
+
+from dataforge_studio.plugins.scripts.available.data_loader import (
+    DataLoader, DEFAULT_IMPORT_WORKERS
+)
+from dataforge_studio.plugins.scripts.available.file_dispatcher import (
+    FileDispatcher, DEFAULT_MAX_WORKERS
+)
+
+logger = logging.getLogger(__name__)
+
+
+def run(
+    root_folder: str,
+    connection_string: str,
+    dry_run: bool = False,
+    infer_types: bool = False,
+    dispatch_workers: int = DEFAULT_MAX_WORKERS,
+    import_workers: int = DEFAULT_IMPORT_WORKERS
+) -> dict:
+    """
+    Entry point for script execution.
+
+    Args:
+        root_folder: Landing folder holding the contract/dataset tree
+        connection_string: Database connection string
+        dry_run: If True, only return the dispatch plan
+        infer_types: If True, create numeric/date columns when values allow it
+        dispatch_workers: Files moved concurrently
+        import_workers: Dataset folders imported concurrently
+
+    Returns:
+        {"dispatch": dispatcher statistics, "load": loader statistics}
+    """
+    dispatcher = FileDispatcher(root_folder=Path(root_folder), max_workers=dispatch_workers)
+    plan = dispatcher.build_plan()
+
+    if dry_run:
+        logger.info("DRY RUN - No files will be moved or imported")
+        summary = plan.summary()
+        summary["pending_datasets"] = [
+            f"{contract}/{folder.name}" for contract, folder in plan.pending_datasets
+        ]
+        return {"dispatch": summary, "dry_run": True}
+
+    loader = DataLoader(connection_string=connection_string, infer_types=infer_types)
+    with loader.parallel_import(import_workers) as submit:
+        dispatch_stats = dispatcher.execute_plan(plan, on_dataset_ready=submit)
+
+    return {"dispatch": dispatch_stats, "load": loader.stats}
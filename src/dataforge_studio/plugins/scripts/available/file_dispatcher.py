@@ -2,39 +2,108 @@
 File Dispatcher Module - Dispatch files to their respective dataset folders.
 
 This script moves files from a root folder to contract/dataset subfolders
-based on filename patterns.
+based on filename patterns. The folder tree is scanned once into a
+dispatch plan, then the moves run in a thread pool (plain renames on the
+same volume).
+
+Dispatching is idempotent: a dispatched file has left the root folder, and
+a cross-volume copy is staged under a hidden name and renamed into place,
+so running again after a crash finishes the remaining work. A different
+file already holding the destination name is never overwritten: the new
+one is suffixed _1, _2...
 """
+import errno
+import os
 import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+INVALID_FOLDER_NAME = "_InvalidFiles"
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass
+class DispatchMove:
+    """One planned move (contract/dataset are None for invalid files)."""
+    source: Path
+    destination: Path
+    contract: Optional[str] = None
+    dataset: Optional[str] = None
+
+    @property
+    def is_valid(self) -> bool:
+        return self.contract is not None
+
+
+@dataclass
+class DispatchPlan:
+    """
+    Moves computed from one scan of the root folder.
+
+    Attributes:
+        moves: Planned moves
+        pending_datasets: Dataset folders already holding files (e.g. left
+                          by an interrupted run), as (contract, folder)
+    """
+    moves: List[DispatchMove] = field(default_factory=list)
+    pending_datasets: List[Tuple[str, Path]] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        """Counts per outcome and per contract/dataset."""
+        datasets: Dict[str, int] = {}
+        for move in self.moves:
+            if move.is_valid:
+                key = f"{move.contract}/{move.dataset}"
+                datasets[key] = datasets.get(key, 0) + 1
+        return {
+            "dispatched": sum(datasets.values()),
+            "invalid": len(self.moves) - sum(datasets.values()),
+            "datasets": datasets,
+        }
+
 
 class FileDispatcher:
     """Handles dispatching files from root folder to contract/dataset folders."""
 
-    def __init__(self, root_folder: Path = None):
+    def __init__(self, root_folder: Path = None, max_workers: int = DEFAULT_MAX_WORKERS):
         if not root_folder:
             raise ValueError("root_folder is required")
         self.root_folder = Path(root_folder)
-        self.invalid_folder = self.root_folder / "_InvalidFiles"
+        self.invalid_folder = self.root_folder / INVALID_FOLDER_NAME
+        self.max_workers = max(1, int(max_workers))
         self.stats = {
             "dispatched": 0,
             "invalid": 0,
             "errors": 0
         }
+        # (contract name, dataset names longest first), longest contract first
+        self._index: Optional[List[Tuple[str, List[str]]]] = None
 
-    def dispatch_files(self) -> dict:
+    def dispatch_files(
+        self,
+        on_dataset_ready: Optional[Callable[[str, Path], None]] = None
+    ) -> dict:
         """
         Dispatch all files from root folder to their respective dataset folders.
 
+        Args:
+            on_dataset_ready: Called with (contract_name, dataset_folder) once
+                              every file planned for that folder has moved
+
         Returns:
             Statistics about the operation
         """
-        self.stats = {"dispatched": 0, "invalid": 0, "errors": 0}
+        return self.execute_plan(self.build_plan(), on_dataset_ready)
+
+    # ==================== Planning ====================
 
+    def build_plan(self) -> DispatchPlan:
+        """Scan the root folder once and decide where every file goes."""
         if not self.root_folder.exists():
             raise ValueError(f"Root folder does not exist: {self.root_folder}")
 
@@ -44,39 +113,39 @@ class FileDispatcher:
                 "Please create this folder before running dispatch."
             )
 
-        files = [f for f in self.root_folder.iterdir() if f.is_file()]
-
-        for file_path in files:
-            try:
-                self._dispatch_single_file(file_path)
-            except Exception as e:
-                logger.error(f"Error processing file {file_path.name}: {e}")
-                self.stats["errors"] += 1
-
-        return self.stats
-
-    def _dispatch_single_file(self, file_path: Path) -> None:
-        """Dispatch a single file to its appropriate location."""
-        filename = file_path.name
-        contract_name, dataset_name = self._parse_filename(filename)
-
-        if not contract_name or not dataset_name:
-            logger.warning(f"Could not parse filename: {filename}")
-            self._move_to_invalid(file_path)
-            return
-
-        target_folder = self.root_folder / contract_name / dataset_name
-
-        if target_folder.exists() and target_folder.is_dir():
-            destination = target_folder / filename
-            shutil.move(str(file_path), str(destination))
-            logger.info(f"Dispatched: {filename} -> {contract_name}/{dataset_name}/")
-            self.stats["dispatched"] += 1
-        else:
-            logger.warning(
-                f"Target folder does not exist for {filename}: {contract_name}/{dataset_name}"
-            )
-            self._move_to_invalid(file_path)
+        files, contract_folders = [], []
+        with os.scandir(self.root_folder) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    files.append(Path(entry.path))
+                elif entry.is_dir() and not entry.name.startswith("_"):
+                    contract_folders.append(entry.name)
+
+        plan = DispatchPlan()
+        index = []
+        for contract_name in contract_folders:
+            datasets = []
+            with os.scandir(self.root_folder / contract_name) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        datasets.append(entry.name)
+                        if _has_files(entry.path):
+                            plan.pending_datasets.append((contract_name, Path(entry.path)))
+            index.append((contract_name, sorted(datasets, key=len, reverse=True)))
+        self._index = sorted(index, key=lambda item: len(item[0]), reverse=True)
+
+        invalid_names = set(os.listdir(self.invalid_folder))
+        for file_path in sorted(files):
+            contract_name, dataset_name = self._parse_filename(file_path.name)
+            if contract_name:
+                destination = self.root_folder / contract_name / dataset_name / file_path.name
+                plan.moves.append(DispatchMove(file_path, destination, contract_name, dataset_name))
+            else:
+                logger.warning(f"Could not parse filename: {file_path.name}")
+                destination = self._unique_invalid_destination(file_path, invalid_names)
+                invalid_names.add(destination.name)
+                plan.moves.append(DispatchMove(file_path, destination))
+        return plan
 
     def _parse_filename(self, filename: str) -> Tuple[str, str]:
         """
@@ -94,28 +163,21 @@ class FileDispatcher:
         Dataset folders are sorted by name length (descending) to match
         the most specific names first (e.g., 'assessment_result' before 'assessment').
         """
-        filename_lower = filename.lower()
-
-        contract_folders = sorted(
-            self.get_contract_folders(),
-            key=lambda x: len(x.name),
-            reverse=True
-        )
+        if self._index is None:
+            self._index = [
+                (folder.name, sorted((d.name for d in self.get_dataset_folders(folder)),
+                                     key=len, reverse=True))
+                for folder in sorted(self.get_contract_folders(),
+                                     key=lambda x: len(x.name), reverse=True)
+            ]
 
-        for contract_folder in contract_folders:
-            contract_name = contract_folder.name
+        filename_lower = filename.lower()
 
+        for contract_name, dataset_names in self._index:
             if not filename_lower.startswith(contract_name.lower() + "_"):
                 continue
 
-            dataset_folders = sorted(
-                self.get_dataset_folders(contract_folder),
-                key=lambda x: len(x.name),
-                reverse=True
-            )
-
-            for dataset_folder in dataset_folders:
-                dataset_name = dataset_folder.name
+            for dataset_name in dataset_names:
                 expected_prefix = f"{contract_name}_{dataset_name}_".lower()
                 expected_prefix_with_ext = f"{contract_name}_{dataset_name}.".lower()
 
@@ -125,19 +187,113 @@ class FileDispatcher:
 
         return None, None
 
-    def _move_to_invalid(self, file_path: Path) -> None:
-        """Move file to invalid files folder."""
-        destination = self.invalid_folder / file_path.name
+    def _unique_invalid_destination(self, file_path: Path, taken: set) -> Path:
+        """Destination in the invalid folder, suffixed _1, _2... if the name is taken."""
+        name = file_path.name
+        counter = 1
+        while name in taken:
+            name = f"{file_path.stem}_{counter}{file_path.suffix}"
+            counter += 1
+        return self.invalid_folder / name
+
+    # ==================== Execution ====================
+
+    def execute_plan(
+        self,
+        plan: DispatchPlan,
+        on_dataset_ready: Optional[Callable[[str, Path], None]] = None
+    ) -> dict:
+        """
+        Run the moves of a plan in a thread pool.
+
+        Args:
+            plan: Plan from build_plan()
+            on_dataset_ready: See dispatch_files()
+
+        Returns:
+            Statistics about the operation
+        """
+        self.stats = {"dispatched": 0, "invalid": 0, "errors": 0}
+
+        remaining: Dict[Tuple[str, str], int] = {}
+        for move in plan.moves:
+            if move.is_valid:
+                key = (move.contract, move.dataset)
+                remaining[key] = remaining.get(key, 0) + 1
+
+        if on_dataset_ready is not None:
+            for contract_name, folder in plan.pending_datasets:
+                if (contract_name, folder.name) not in remaining:
+                    on_dataset_ready(contract_name, folder)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self._move_file, move): move for move in plan.moves}
+            for future in as_completed(futures):
+                move = futures[future]
+                try:
+                    future.result()
+                    if move.is_valid:
+                        logger.info(f"Dispatched: {move.source.name} -> {move.contract}/{move.dataset}/")
+                        self.stats["dispatched"] += 1
+                    else:
+                        logger.warning(f"Moved to invalid folder: {move.source.name}")
+                        self.stats["invalid"] += 1
+                except OSError as e:
+                    logger.error(f"Error processing file {move.source.name}: {e}")
+                    self.stats["errors"] += 1
+
+                if move.is_valid:
+                    key = (move.contract, move.dataset)
+                    remaining[key] -= 1
+                    if remaining[key] == 0 and on_dataset_ready is not None:
+                        on_dataset_ready(move.contract, move.destination.parent)
+
+        return self.stats
+
+    @staticmethod
+    def _move_file(move: DispatchMove) -> None:
+        """Move one file; safe to repeat after an interrupted run."""
+        source = move.source
+        destination = FileDispatcher._free_destination(source, move.destination)
+        try:
+            os.replace(source, destination)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+
+        # Other volume: copy under a hidden name, then rename into place
+        staging = destination.with_name(f".{destination.name}.part")
+        shutil.copy2(source, staging)
+        os.replace(staging, destination)
+        os.remove(source)
+
+    @staticmethod
+    def _free_destination(source: Path, destination: Path) -> Path:
+        """
+        Destination for source, suffixed _1, _2... if another file holds the name.
+
+        A file with the source's size and modification time is the copy left
+        by an interrupted cross-volume move of this very file: it is replaced.
+        """
+        try:
+            held = destination.stat()
+        except FileNotFoundError:
+            return destination
+        current = source.stat()
+        if held.st_size == current.st_size and abs(held.st_mtime - current.st_mtime) < 2:
+            return destination
+
         counter = 1
-        while destination.exists():
-            stem = file_path.stem
-            suffix = file_path.suffix
-            destination = self.invalid_folder / f"{stem}_{counter}{suffix}"
+        candidate = destination
+        while candidate.exists():
+            candidate = destination.with_name(f"{source.stem}_{counter}{source.suffix}")
             counter += 1
+        logger.warning(f"{destination.name} already in {destination.parent.name}, "
+                       f"kept as {candidate.name}")
+        return candidate
 
-        shutil.move(str(file_path), str(destination))
-        logger.warning(f"Moved to invalid folder: {file_path.name}")
-        self.stats["invalid"] += 1
+    # ==================== Folders ====================
 
     def get_contract_folders(self) -> List[Path]:
         """Get list of contract folders (excluding special folders)."""
@@ -160,22 +316,31 @@ class FileDispatcher:
         ]
 
 
-def run(root_folder: str, dry_run: bool = False) -> dict:
+def _has_files(folder: str) -> bool:
+    """True if a folder directly holds a (non-hidden) file."""
+    with os.scandir(folder) as entries:
+        return any(entry.is_file() and not entry.name.startswith(".") for entry in entries)
+
+
+def run(root_folder: str, dry_run: bool = False, max_workers: int = DEFAULT_MAX_WORKERS) -> dict:
     """
     Entry point for script execution.
 
     Args:
         root_folder: Path to the root folder containing files to dispatch
-        dry_run: If True, only simulate the operation
+        dry_run: If True, only compute and return the dispatch plan
+        max_workers: Files moved concurrently
 
     Returns:
         Statistics dictionary with dispatched, invalid, errors counts
     """
-    dispatcher = FileDispatcher(root_folder=Path(root_folder))
+    dispatcher = FileDispatcher(root_folder=Path(root_folder), max_workers=max_workers)
 
     if dry_run:
         logger.info("DRY RUN - No files will be moved")
-        # TODO: Implement dry run logic
-        return {"dispatched": 0, "invalid": 0, "errors": 0, "dry_run": True}
+        plan = dispatcher.build_plan()
+        for move in plan.moves:
+            logger.info(f"Would move {move.source.name} -> {move.destination}")
+        return {**plan.summary(), "errors": 0, "dry_run": True}
 
     return dispatcher.dispatch_files()
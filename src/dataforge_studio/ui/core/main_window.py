@@ -947,6 +947,13 @@ class DataForgeMainWindow:
             f"⚡ Auto-connexion {workspace.name}: 0/{total_connections}...", timeout=0
         )
 
+        # One pass over the keyring instead of one per connection build
+        if self.user_prefs.get("prefetch_credentials", True):
+            from ...utils.credential_manager import CredentialManager
+            CredentialManager.prefetch(
+                [db.id for db in databases] + [ftp.id for ftp in ftp_roots]
+            )
+
         # Connect databases
         db_count = 0
         for i, db in enumerate(databases):
@@ -1003,6 +1010,19 @@ class DataForgeMainWindow:
 
         # Save window geometry before anything else (cheap op, no threads involved)
         self._save_window_geometry()
+        self.user_prefs.flush()
+
+        # Drop pending thumbnail decodes and shared folder refreshes so the
+        # pool threads do not hold up exit
+        from ...utils.thumbnail_cache import shutdown_thumbnail_cache
+        shutdown_thumbnail_cache()
+        from ...utils.workspace_sharing import shutdown_shared_folder_index
+        shutdown_shared_folder_index()
+
+        # Job runs are QThreads: stop them here, Qt aborts on destroying a running one
+        for manager in (self.jobs_manager, self.scripts_manager):
+            if manager is not None:
+                manager.stop_run()
 
         # Disconnect signals first to prevent callbacks during cleanup
         self._disconnect_signals()
@@ -52,6 +52,31 @@ GENERAL_PREFERENCES = [
         "placeholder": "query, requête, sql, sql_text, ...",
         "default": "query, requête",
     },
+    {
+        "key": "batch_queries_per_database",
+        "label": "Requêtes simultanées par base",
+        "type": "choice",
+        "group": "Exécution groupée des requêtes",
+        "description": (
+            "Nombre maximum de requêtes sauvegardées exécutées en même temps sur "
+            "une même base par \"Exécuter toutes les requêtes\". Les requêtes de "
+            "bases différentes s'exécutent en parallèle."
+        ),
+        "choices": ["1", "2", "3", "4", "6", "8"],
+        "default": "2",
+    },
+    {
+        "key": "prefetch_credentials",
+        "label": "Précharger les identifiants à l'ouverture d'un espace de travail",
+        "type": "bool",
+        "group": "Identifiants",
+        "description": (
+            "Lit en une fois dans le trousseau système les identifiants de toutes "
+            "les connexions de l'espace de travail connecté au démarrage. Ils sont "
+            "ensuite gardés en mémoire pour la session (jamais sur disque)."
+        ),
+        "default": True,
+    },
 ]
 
 # Paths to config files
@@ -22,6 +22,7 @@ from ....core.data_loader import (
     excel_to_dataframe,
     LARGE_DATASET_THRESHOLD
 )
+from ....core.csv_sniffer import detect_encoding
 
 import logging
 logger = logging.getLogger(__name__)
@@ -142,44 +143,6 @@ class FileContentHandler:
             self.file_viewer_stack.setCurrentIndex(1)  # Text viewer
             return False
 
-    def _detect_encoding(self, file_path: Path) -> str:
-        """
-        Detect file encoding by trying multiple encodings.
-
-        Returns the encoding name that successfully reads the file.
-        """
-        # Try common encodings in order of likelihood
-        encodings_to_try = [
-            'utf-8-sig',  # UTF-8 with BOM (common in Windows)
-            'utf-8',      # Standard UTF-8
-            'cp1252',     # Windows Western European
-            'iso-8859-1', # Latin-1
-            'cp850',      # DOS Western European
-            'utf-16',     # UTF-16 with BOM
-        ]
-
-        # Read raw bytes to check for BOM
-        with open(file_path, 'rb') as f:
-            raw = f.read(4096)
-
-        # Check for BOM markers
-        if raw.startswith(b'\xef\xbb\xbf'):
-            return 'utf-8-sig'
-        elif raw.startswith(b'\xff\xfe') or raw.startswith(b'\xfe\xff'):
-            return 'utf-16'
-
-        # Try each encoding
-        for encoding in encodings_to_try:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    f.read()  # Try to read entire file
-                return encoding
-            except (UnicodeDecodeError, UnicodeError):
-                continue
-
-        # Fallback to latin-1 (never fails)
-        return 'iso-8859-1'
-
     def _load_csv_file(self, file_path: Path):
         """Load CSV file into grid viewer using DataFrame-Pivot pattern."""
         result = csv_to_dataframe(
@@ -196,7 +159,7 @@ class FileContentHandler:
         # Store detected values for display
         self._detected_encoding = result.source_info.get('encoding')
         self._detected_separator = result.source_info.get('separator')
-        self._detected_delimiter = '"'  # pandas default
+        self._detected_delimiter = result.source_info.get('quotechar', '"')
 
         df = result.dataframe
         if df is not None and not df.empty:
@@ -268,10 +231,10 @@ class FileContentHandler:
             return
 
         # Fallback: display as formatted JSON text
-        encoding = self._detect_encoding(file_path)
+        encoding = detect_encoding(file_path)
         self._detected_encoding = encoding
 
-        with open(file_path, 'r', encoding=encoding) as f:
+        with open(file_path, 'r', encoding=encoding, errors='replace') as f:
             content = f.read()
 
         try:
@@ -286,12 +249,12 @@ class FileContentHandler:
 
     def _load_text_file(self, file_path: Path):
         """Load text file into text viewer with proper encoding detection."""
-        encoding = self._detect_encoding(file_path)
+        encoding = detect_encoding(file_path)
         self._detected_encoding = encoding
         self._detected_separator = None
         self._detected_delimiter = None
 
-        with open(file_path, 'r', encoding=encoding) as f:
+        with open(file_path, 'r', encoding=encoding, errors='replace') as f:
             content = f.read()
 
         self.file_text_viewer.setPlainText(content)
@@ -300,12 +263,12 @@ class FileContentHandler:
 
     def _load_log_file(self, file_path: Path):
         """Load log file with themed coloring based on log levels."""
-        encoding = self._detect_encoding(file_path)
+        encoding = detect_encoding(file_path)
         self._detected_encoding = encoding
         self._detected_separator = None
         self._detected_delimiter = None
 
-        with open(file_path, 'r', encoding=encoding) as f:
+        with open(file_path, 'r', encoding=encoding, errors='replace') as f:
             lines = f.readlines()
 
         # Get theme colors for log levels
@@ -10,16 +10,23 @@ from typing import List, Optional, Dict, Any
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QScrollArea, QLabel, QPushButton
 )
-from PySide6.QtCore import Qt, Signal, QObject
+from PySide6.QtCore import Qt, Signal, QObject, QSize
 from PySide6.QtGui import QPixmap
 
 from ...widgets.form_builder import FormBuilder
 from ...widgets.dialog_helper import DialogHelper
 from ....database.config_db import get_config_db
+from ....utils.thumbnail_cache import get_thumbnail_cache
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Preview box of the image viewer
+PREVIEW_SIZE = QSize(800, 600)
+
+# Images decoded ahead of the current one, on each side
+PREFETCH_NEIGHBORS = 2
+
 
 class ImageContentHandler(QObject):
     """
@@ -55,6 +62,9 @@ class ImageContentHandler(QObject):
         # Tree items reference (for navigation sync)
         self._tree_items: Dict[str, Any] = {}
 
+        self._thumbnails = get_thumbnail_cache()
+        self._thumbnails.thumbnail_ready.connect(self._on_thumbnail_ready)
+
         # Create viewer widget
         self._setup_viewer()
 
@@ -136,31 +146,41 @@ class ImageContentHandler(QObject):
         self._form_builder.set_value("separator", f"Tags: {tags_str}")
         self._form_builder.set_value("delimiter", "-")
 
-        # Load image
+        # Load image (decoded in the background unless cached)
         filepath = Path(image_obj.filepath)
         if filepath.exists():
-            pixmap = QPixmap(str(filepath))
-            if not pixmap.isNull():
-                # Scale to fit while maintaining aspect ratio
-                scaled = pixmap.scaled(
-                    800, 600,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                self.image_preview_label.setPixmap(scaled)
-                logger.info(f"Loaded image preview: {image_obj.name}")
-                return True
+            thumbnail = self._thumbnails.request(image_obj.filepath, PREVIEW_SIZE)
+            if thumbnail is None:
+                self.image_preview_label.setText("Loading... / Chargement...")
             else:
-                self.image_preview_label.setText(
-                    "Cannot load image / Impossible de charger l'image"
-                )
-                return False
+                self.image_preview_label.setPixmap(QPixmap.fromImage(thumbnail.image))
+                logger.info(f"Loaded image preview: {image_obj.name}")
+            return True
         else:
             self.image_preview_label.setText(
                 f"File not found: {filepath}\nFichier introuvable: {filepath}"
             )
             return False
 
+    def _on_thumbnail_ready(self, path: str, box: QSize, thumbnail):
+        """Show a preview decoded in the background if it is still the current image."""
+        if box != PREVIEW_SIZE or not self._current_image_obj or self._current_image_obj.filepath != path:
+            return
+        if thumbnail is None:
+            self.image_preview_label.setText(
+                "Cannot load image / Impossible de charger l'image"
+            )
+            return
+        self.image_preview_label.setPixmap(QPixmap.fromImage(thumbnail.image))
+        logger.info(f"Loaded image preview: {self._current_image_obj.name}")
+
+    def _prefetch_neighbors(self):
+        """Decode the images around the current one so arrow-key browsing is instant."""
+        index = self._image_nav_index
+        neighbors = self._image_nav_list[index + 1:index + 1 + PREFETCH_NEIGHBORS] + \
+            self._image_nav_list[max(0, index - PREFETCH_NEIGHBORS):index][::-1]
+        self._thumbnails.prefetch([img.filepath for img in neighbors], PREVIEW_SIZE)
+
     def build_navigation_list(self, current_image, tree_view):
         """
         Build the list of images for arrow navigation.
@@ -197,6 +217,8 @@ class ImageContentHandler(QObject):
                     if img_obj.id == current_image.id:
                         self._image_nav_index = len(self._image_nav_list) - 1
 
+        self._prefetch_neighbors()
+
     def navigate(self, direction: int, tree_view=None) -> bool:
         """
         Navigate to previous (-1) or next (+1) image.
@@ -216,6 +238,7 @@ class ImageContentHandler(QObject):
             self._image_nav_index = new_index
             image_obj = self._image_nav_list[new_index]
             self.load_image(image_obj)
+            self._prefetch_neighbors()
 
             # Update tree selection
             if tree_view:
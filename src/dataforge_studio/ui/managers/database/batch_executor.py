@@ -0,0 +1,248 @@
+"""
+Batch Executor - Runs the saved queries of a batch in parallel.
+
+Each query gets its own connection (build_connection) and runs on a worker
+thread. Different databases run side by side; at most per_database queries
+run at once against the same database so one server is not flooded.
+Results come back on the GUI thread one query at a time, so each query tab
+is filled as soon as its own query is done.
+
+Usage:
+    executor = SavedQueryBatchExecutor(per_database=2)
+    executor.query_finished.connect(on_query_finished)   # (key, BatchQueryResult)
+    executor.progress.connect(on_progress)               # (done, total)
+    executor.add(tab, db_conn, statements)
+    executor.start()
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+from ....constants import BATCH_QUERIES_PER_DATABASE, BATCH_QUERY_WORKERS, QUERY_BATCH_SIZE
+from ....database.connection_builder import build_connection
+from ....utils.sql_splitter import SQLStatement
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchResultSet:
+    """
+    Rows returned by one statement of a batch query.
+
+    Attributes:
+        statement_index: Index of the statement in the query
+        statement: The statement
+        columns: Column names
+        rows: Rows fetched so far
+        cursor: Open cursor if more rows remain (last statement only)
+    """
+    statement_index: int
+    statement: SQLStatement
+    columns: List[str]
+    rows: List[list]
+    cursor: Optional[Any] = None
+
+
+@dataclass
+class BatchQueryResult:
+    """
+    Outcome of one query of a batch.
+
+    Attributes:
+        statement_count: Statements in the query
+        result_sets: Row-returning statements, in order
+        messages: Messages for the non-row statements
+        connection: Dedicated connection (open while a cursor has more rows)
+        error: Error that stopped the query
+        error_statement: Index of the failed statement (None if connecting failed)
+        cancelled: The query was dropped before it started
+    """
+    statement_count: int = 0
+    result_sets: List[BatchResultSet] = field(default_factory=list)
+    messages: List[str] = field(default_factory=list)
+    connection: Optional[Any] = None
+    error: Optional[Exception] = None
+    error_statement: Optional[int] = None
+    cancelled: bool = False
+
+
+def _use_database(cursor, db_type: str, database: str) -> None:
+    """Switch a fresh connection to the database selected in the query tab."""
+    if db_type == "sqlserver":
+        cursor.execute(f"USE [{database.replace(']', ']]')}]")
+    elif db_type in ("mysql", "mariadb"):
+        cursor.execute(f"USE `{database.replace('`', '``')}`")
+
+
+def run_statements(connection, statements: List[SQLStatement], batch_size: int = QUERY_BATCH_SIZE,
+                   db_type: str = "", database: Optional[str] = None) -> BatchQueryResult:
+    """
+    Run the statements of one query on a dedicated connection (any thread).
+
+    Result sets are fetched completely, except for the last statement which
+    only fetches its first batch and keeps its cursor open when more rows
+    remain. Execution stops at the first error.
+
+    Returns:
+        BatchQueryResult (the connection is closed unless a cursor is kept)
+    """
+    result = BatchQueryResult(statement_count=len(statements), connection=connection)
+    needs_commit = False
+    index = None
+    try:
+        if database:
+            _use_database(connection.cursor(), db_type, database)
+        for index, stmt in enumerate(statements):
+            cursor = connection.cursor()
+            cursor.execute(stmt.text)
+            if cursor.description:
+                columns = [column[0] for column in cursor.description]
+                if index == len(statements) - 1:
+                    rows = [list(row) for row in cursor.fetchmany(batch_size)]
+                    more = cursor if len(rows) == batch_size else None
+                else:
+                    rows = [list(row) for row in cursor.fetchall()]
+                    more = None
+                result.result_sets.append(BatchResultSet(index, stmt, columns, rows, more))
+            else:
+                needs_commit = True
+                if cursor.rowcount >= 0:
+                    result.messages.append(f"Statement {index + 1}: {cursor.rowcount} row(s) affected")
+        if needs_commit:
+            connection.commit()
+    except Exception as e:
+        result.error = e
+        result.error_statement = index
+
+    if not any(rs.cursor is not None for rs in result.result_sets):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        result.connection = None
+    return result
+
+
+@dataclass
+class _BatchJob:
+    key: Any
+    db_conn: Any
+    statements: List[SQLStatement]
+    database: Optional[str]
+    batch_size: int
+
+
+class SavedQueryBatchExecutor(QObject):
+    """
+    Runs queries on a thread pool, at most per_database at once per database.
+
+    All methods are called from the GUI thread.
+    """
+
+    # (key given to add(), BatchQueryResult)
+    query_finished = Signal(object, object)
+    # (queries done, total queries)
+    progress = Signal(int, int)
+    # Every query is done or cancelled
+    finished = Signal()
+
+    # Worker -> GUI thread hand-off: (database id, job, BatchQueryResult)
+    _done = Signal(str, object, object)
+
+    def __init__(self, per_database: int = BATCH_QUERIES_PER_DATABASE,
+                 max_workers: int = BATCH_QUERY_WORKERS,
+                 connect: Callable[[Any], Any] = build_connection,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.per_database = max(1, per_database)
+        self._connect = connect
+        self._queues: "OrderedDict[str, Deque[_BatchJob]]" = OrderedDict()
+        self._running: Dict[str, int] = {}
+        self._total = 0
+        self._done_count = 0
+        self._started = False
+        self._finished = False
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="query-batch")
+        self._done.connect(self._on_done)
+
+    @property
+    def total(self) -> int:
+        return self._total
+
+    @property
+    def done(self) -> int:
+        return self._done_count
+
+    def add(self, key: Any, db_conn, statements: List[SQLStatement],
+            database: Optional[str] = None, batch_size: int = QUERY_BATCH_SIZE) -> None:
+        """Queue a query; key comes back with its result."""
+        job = _BatchJob(key, db_conn, statements, database, batch_size)
+        self._queues.setdefault(db_conn.id, deque()).append(job)
+        self._total += 1
+        if self._started:
+            self._pump()
+
+    def start(self) -> None:
+        """Start running the queued queries."""
+        self._started = True
+        self.progress.emit(self._done_count, self._total)
+        if self._total == 0:
+            self._finish()
+        else:
+            self._pump()
+
+    def cancel(self) -> None:
+        """Drop the queries that have not started (running ones complete)."""
+        for queue in self._queues.values():
+            while queue:
+                self._complete(queue.popleft(), BatchQueryResult(cancelled=True))
+        self._check_finished()
+
+    def _pump(self) -> None:
+        """Start queued queries, round-robin over databases, within the per-database limit."""
+        for db_id, queue in self._queues.items():
+            while queue and self._running.get(db_id, 0) < self.per_database:
+                job = queue.popleft()
+                self._running[db_id] = self._running.get(db_id, 0) + 1
+                future = self._pool.submit(self._run, job)
+                future.add_done_callback(lambda f, db_id=db_id, job=job: self._done.emit(
+                    db_id, job, BatchQueryResult(cancelled=True) if f.cancelled() else f.result()))
+
+    def _run(self, job: _BatchJob) -> BatchQueryResult:
+        try:
+            connection = self._connect(job.db_conn)
+        except Exception as e:
+            logger.error(f"Batch: cannot connect to {getattr(job.db_conn, 'name', job.db_conn.id)}: {e}")
+            return BatchQueryResult(statement_count=len(job.statements), error=e)
+        db_type = (getattr(job.db_conn, "db_type", "") or "").lower()
+        return run_statements(connection, job.statements, job.batch_size, db_type, job.database)
+
+    def _on_done(self, db_id: str, job: _BatchJob, result: BatchQueryResult) -> None:
+        self._running[db_id] -= 1
+        self._complete(job, result)
+        self._pump()
+        self._check_finished()
+
+    def _complete(self, job: _BatchJob, result: BatchQueryResult) -> None:
+        self._done_count += 1
+        self.query_finished.emit(job.key, result)
+        self.progress.emit(self._done_count, self._total)
+
+    def _check_finished(self) -> None:
+        if self._done_count == self._total:
+            self._finish()
+
+    def _finish(self) -> None:
+        if self._finished:
+            return
+        self._finished = True
+        self._pool.shutdown(wait=False)
+        self.finished.emit()
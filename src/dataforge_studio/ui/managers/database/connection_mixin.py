@@ -4,10 +4,10 @@ Connection Mixin - Connection lifecycle management for DatabaseManager.
 
 from __future__ import annotations
 
-import re
 import logging
 import threading
-from typing import Optional, Union, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union, TYPE_CHECKING
 from pathlib import Path
 
 try:
@@ -19,7 +19,7 @@ import sqlite3
 from PySide6.QtWidgets import QTreeWidgetItem, QApplication
 from PySide6.QtCore import Qt, QTimer
 
-from .connection_worker import DatabaseConnectionWorker
+from .connection_worker import DatabaseConnectionWorker, ConnectionWarmupWorker
 from ..query_tab import QueryTab
 from ...widgets.dialog_helper import DialogHelper
 from ...core.i18n_bridge import tr
@@ -27,6 +27,9 @@ from ....database.config_db import get_config_db, DatabaseConnection
 from ....database.schema_loaders import SchemaLoaderFactory
 from ....utils.image_loader import get_database_icon_with_dot, get_auto_color
 from ....database.connection_builder import build_connection, ConnectionConfigError
+from ....utils.network_utils import (extract_host_port_from_connection_string,
+                                     probe_endpoint, probe_connections)
+from ....constants import PING_TIMEOUT_S, WARMUP_WORKERS
 
 if TYPE_CHECKING:
     pass
@@ -230,8 +233,8 @@ class DatabaseConnectionMixin:
 
         self._set_status_message(tr("db_connecting_to", name=db_conn.name))
 
-        # Create and start worker
-        worker = DatabaseConnectionWorker(db_conn, self)
+        # Create and start worker (reusing a pre-opened connection if any)
+        worker = DatabaseConnectionWorker(db_conn, self, connection=self._take_warm_connection(db_conn.id))
 
         # Connect signals with lambdas that capture the context
         worker.connection_success.connect(
@@ -289,8 +292,8 @@ class DatabaseConnectionMixin:
         loading_item.setForeground(0, Qt.GlobalColor.gray)
         loading_item.setData(0, Qt.ItemDataRole.UserRole, {"type": "loading"})
 
-        # Create and start worker
-        worker = DatabaseConnectionWorker(db_conn, self)
+        # Create and start worker (reusing a pre-opened connection if any)
+        worker = DatabaseConnectionWorker(db_conn, self, connection=self._take_warm_connection(db_conn.id))
 
         # Connect signals with silent handlers
         worker.connection_success.connect(
@@ -395,10 +398,16 @@ class DatabaseConnectionMixin:
         QTimer.singleShot(0, lambda item=server_item: item.setExpanded(True))
         self._set_status_message(tr("db_connected_to", name=db_conn.name))
 
-    def _is_server_reachable(self, db_conn: DatabaseConnection, timeout: int = 3) -> bool:
-        """Quick TCP ping to check if the database server is reachable."""
-        import socket
+    def _is_server_reachable(self, db_conn: DatabaseConnection, timeout: int = PING_TIMEOUT_S,
+                             max_age: float = None) -> bool:
+        """
+        Quick TCP ping to check if the database server is reachable.
 
+        Args:
+            db_conn: Connection configuration
+            timeout: Timeout in seconds
+            max_age: Oldest cached probe accepted (0 = probe again, see probe_endpoint)
+        """
         if db_conn.db_type == "sqlite":
             # SQLite is local — always reachable if file exists
             conn_str = db_conn.connection_string
@@ -406,37 +415,12 @@ class DatabaseConnectionMixin:
                 return Path(conn_str[10:]).exists()
             return True
 
-        # Extract host and port from connection string
-        conn_str = db_conn.connection_string
-        host, port = None, None
-
-        if db_conn.db_type == "sqlserver":
-            # ODBC style: Server=host,port or Server=host
-            match = re.search(r'Server=([^;,]+)(?:,(\d+))?', conn_str, re.IGNORECASE)
-            if match:
-                host = match.group(1)
-                port = int(match.group(2)) if match.group(2) else 1433
-        elif db_conn.db_type == "postgresql":
-            # postgresql://host:port/db
-            match = re.search(r'://([^/:]+)(?::(\d+))?', conn_str)
-            if match:
-                host = match.group(1)
-                port = int(match.group(2)) if match.group(2) else 5432
-        elif db_conn.db_type == "mysql":
-            match = re.search(r'://([^/:]+)(?::(\d+))?', conn_str)
-            if match:
-                host = match.group(1)
-                port = int(match.group(2)) if match.group(2) else 3306
-
+        host, port = extract_host_port_from_connection_string(db_conn.connection_string, db_conn.db_type)
         if not host:
             return True  # Can't determine host — assume reachable
 
-        try:
-            sock = socket.create_connection((host, port), timeout=timeout)
-            sock.close()
-            return True
-        except (socket.timeout, ConnectionRefusedError, OSError):
-            return False
+        reachable, _ = probe_endpoint(host, port, timeout, icmp=False, max_age=max_age)
+        return reachable
 
     def _on_connection_error(self, server_item: QTreeWidgetItem, db_conn: DatabaseConnection,
                               error_message: str):
@@ -457,8 +441,8 @@ class DatabaseConnectionMixin:
 
         self._set_status_message(tr("status_ready"))
 
-        # Check if server is reachable
-        if self._is_server_reachable(db_conn):
+        # Check if server is reachable (fresh probe: the connection just failed)
+        if self._is_server_reachable(db_conn, max_age=0):
             # Server responds — auto-reconnect silently
             self._set_status_message(tr("db_reconnecting", name=db_conn.name) if tr("db_reconnecting") != "db_reconnecting" else f"Reconnexion a {db_conn.name}...")
             server_item.setExpanded(True)
@@ -538,6 +522,91 @@ class DatabaseConnectionMixin:
             logger.error(f"Failed to reconnect to {db_conn.name}: {e}")
             return None
 
+    # ==================== Warm-up ====================
+
+    def warm_up_connections(self, db_conns: List[DatabaseConnection]):
+        """
+        Pre-open connections to the reachable servers among db_conns, in the background.
+
+        Used while a workspace tree is built: expanding a node or running a
+        saved query then finds its connection already open. File databases
+        and connections already open or opening are skipped.
+        """
+        candidates = [
+            c for c in db_conns
+            if c.db_type not in ("sqlite", "access")
+            and c.id not in self.connections
+            and c.id not in self._warm_connections
+            and c.id not in self._pending_workers
+        ]
+        if not candidates:
+            return
+
+        worker = ConnectionWarmupWorker(candidates, self)
+        worker.connection_ready.connect(self._on_warm_connection_ready)
+        worker.finished.connect(lambda w=worker: self._forget_warmup_worker(w))
+        self._warmup_workers.append(worker)
+        worker.start()
+
+    def _forget_warmup_worker(self, worker):
+        if worker in self._warmup_workers:
+            self._warmup_workers.remove(worker)
+        worker.deleteLater()
+
+    def _on_warm_connection_ready(self, db_id: str, connection):
+        """Keep a pre-opened connection, unless one was opened in the meantime."""
+        if db_id in self.connections or db_id in self._warm_connections or db_id in self._pending_workers:
+            threading.Thread(target=connection.close, daemon=True).start()
+            return
+        self._warm_connections[db_id] = connection
+
+    def _take_warm_connection(self, db_id: str):
+        """Remove and return the pre-opened connection of a database, if any."""
+        return self._warm_connections.pop(db_id, None)
+
+    def _open_connections(self, db_conns: List[DatabaseConnection]) -> Dict[str, object]:
+        """
+        Open connections to several databases at once.
+
+        Pre-opened connections are used first; the other servers are probed
+        in parallel and the reachable ones connected WARMUP_WORKERS at a
+        time. Opened connections are registered like reconnect_database().
+
+        Returns:
+            {connection id: connection} for the databases that could be opened
+        """
+        opened = {}
+        to_open = []
+        for db_conn in db_conns:
+            warm = self._take_warm_connection(db_conn.id)
+            if warm is not None:
+                opened[db_conn.id] = warm
+            else:
+                to_open.append(db_conn)
+
+        reachability = probe_connections(to_open, timeout=PING_TIMEOUT_S)
+        reachable = []
+        for db_conn in to_open:
+            if reachability[db_conn.id][0]:
+                reachable.append(db_conn)
+            else:
+                logger.warning(f"Server not reachable: {db_conn.name}")
+
+        if reachable:
+            with ThreadPoolExecutor(max_workers=min(WARMUP_WORKERS, len(reachable)),
+                                    thread_name_prefix="connect") as pool:
+                futures = {c.id: pool.submit(build_connection, c) for c in reachable}
+            for db_conn in reachable:
+                try:
+                    opened[db_conn.id] = futures[db_conn.id].result()
+                except Exception as e:
+                    logger.error(f"Failed to connect to {db_conn.name}: {e}")
+
+        for db_id, connection in opened.items():
+            self.connections[db_id] = connection
+            self._update_query_tabs_connection(db_id, connection)
+        return opened
+
     def cleanup(self):
         """
         Cleanup all resources - stop background loaders in query tabs.
@@ -545,6 +614,15 @@ class DatabaseConnectionMixin:
         """
         import warnings
 
+        # Stop warm-up workers; connections they still open are closed by them
+        for worker in list(self._warmup_workers):
+            worker.cancel()
+            try:
+                worker.connection_ready.disconnect()
+            except (RuntimeError, TypeError):
+                pass
+        self._warmup_workers.clear()
+
         # Cancel all pending connection workers first
         for worker_id, worker in list(self._pending_workers.items()):
             try:
@@ -584,8 +662,9 @@ class DatabaseConnectionMixin:
                     pass  # Ignore errors during shutdown
 
         # Close connections in background thread to not block UI
-        connections_to_close = list(self.connections.values())
+        connections_to_close = list(self.connections.values()) + list(self._warm_connections.values())
         self.connections.clear()
+        self._warm_connections.clear()
 
         def close_connections():
             for conn in connections_to_close:
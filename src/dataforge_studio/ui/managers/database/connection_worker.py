@@ -5,15 +5,17 @@ Database Connection Worker - Background thread for database connections.
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from PySide6.QtCore import Signal, QThread
 
 from ....database.config_db import DatabaseConnection
 from ....database.schema_loaders import SchemaLoaderFactory
+from ....database.schema_snapshot_store import get_schema_snapshot_store
 from ....database.connection_builder import build_connection, ConnectionConfigError
-from ....utils.network_utils import check_server_reachable
+from ....utils.network_utils import check_server_reachable, probe_connections
 from ....utils.connection_error_handler import format_connection_error, get_server_unreachable_message
-from ....constants import PING_TIMEOUT_S
+from ....constants import PING_TIMEOUT_S, WARMUP_WORKERS
 from ...core.i18n_bridge import tr
 
 logger = logging.getLogger(__name__)
@@ -56,6 +58,43 @@ class ViewColumnsWorker(QThread):
             self.load_failed.emit(str(e))
 
 
+class SchemaRevalidateWorker(QThread):
+    """Check a stored schema snapshot against the live catalog off the UI thread.
+
+    The tree or diagram is first built from the stored snapshot; this worker
+    then runs the change-marker query and, if the catalog changed, reloads it
+    so the caller can rebuild from the fresh snapshot.
+    """
+
+    snapshot_changed = Signal(object)   # SchemaSnapshot (reloaded)
+    revalidate_failed = Signal(str)
+
+    def __init__(self, db_conn: DatabaseConnection, connection,
+                 database_name: str = "", with_keys: bool = False, parent=None):
+        super().__init__(parent)
+        self.db_conn = db_conn
+        self.connection = connection
+        self.database_name = database_name
+        self.with_keys = with_keys
+
+    def run(self):
+        try:
+            loader = SchemaLoaderFactory.create(
+                self.db_conn.db_type, self.connection,
+                self.db_conn.id, self.database_name or self.db_conn.name
+            )
+            if loader is None:
+                return
+            snapshot = get_schema_snapshot_store().load(
+                loader, self.db_conn.id, self.database_name, with_keys=self.with_keys
+            )
+            if not snapshot.is_cached:
+                self.snapshot_changed.emit(snapshot)
+        except Exception as e:
+            logger.warning(f"Could not revalidate schema of {self.db_conn.name}: {e}")
+            self.revalidate_failed.emit(str(e))
+
+
 class DatabaseConnectionWorker(QThread):
     """
     Worker thread for database connection operations.
@@ -68,16 +107,24 @@ class DatabaseConnectionWorker(QThread):
     connection_error = Signal(str)  # error message
     status_update = Signal(str)  # status message for UI
 
-    def __init__(self, db_conn: DatabaseConnection, parent=None):
+    def __init__(self, db_conn: DatabaseConnection, parent=None, connection=None):
+        """
+        Args:
+            db_conn: Connection configuration
+            parent: Parent QObject
+            connection: Already open connection (e.g. pre-opened by
+                        ConnectionWarmupWorker); only the schema is loaded
+        """
         super().__init__(parent)
         self.db_conn = db_conn
+        self._connection = connection
         self._cancelled = False
 
     def run(self):
         """Execute connection in background thread."""
         try:
             # Check server reachability for remote databases
-            if self.db_conn.db_type not in ("sqlite", "access"):
+            if self._connection is None and self.db_conn.db_type not in ("sqlite", "access"):
                 self.status_update.emit(tr("db_checking_connection", name=self.db_conn.name))
 
                 reachable, vpn_message = check_server_reachable(
@@ -100,7 +147,7 @@ class DatabaseConnectionWorker(QThread):
             self.status_update.emit(tr("db_connecting_to", name=self.db_conn.name))
 
             # Create connection
-            connection = self._create_connection()
+            connection = self._connection or self._create_connection()
             if connection is None:
                 return
 
@@ -115,8 +162,9 @@ class DatabaseConnectionWorker(QThread):
             )
 
             if loader:
-                schema = loader.load_schema()
-                self.connection_success.emit(connection, schema)
+                # Stored snapshot when the catalog is unchanged, full load otherwise
+                snapshot = get_schema_snapshot_store().load(loader, self.db_conn.id)
+                self.connection_success.emit(connection, snapshot.schema)
             else:
                 self.connection_error.emit(tr("db_type_not_supported", db_type=self.db_conn.db_type))
 
@@ -142,3 +190,55 @@ class DatabaseConnectionWorker(QThread):
     def cancel(self):
         """Request cancellation."""
         self._cancelled = True
+
+
+class ConnectionWarmupWorker(QThread):
+    """
+    Pre-open connections to the reachable servers of a set of connections.
+
+    Every server is probed in parallel (one timeout in total when a VPN is
+    down), then the reachable ones are connected WARMUP_WORKERS at a time.
+    Connections that fail are only logged: the regular connection path
+    reports errors when the user actually opens the node.
+    """
+
+    connection_ready = Signal(str, object)  # db_conn.id, connection
+
+    def __init__(self, db_conns: list, parent=None, max_workers: int = WARMUP_WORKERS):
+        super().__init__(parent)
+        self.db_conns = list(db_conns)
+        self.max_workers = max_workers
+        self._cancelled = False
+
+    def run(self):
+        reachability = probe_connections(self.db_conns, timeout=PING_TIMEOUT_S)
+        reachable = [c for c in self.db_conns if reachability.get(c.id, (False, None))[0]]
+        if not reachable or self._cancelled:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(reachable)),
+                                thread_name_prefix="warmup") as pool:
+            futures = {pool.submit(build_connection, c): c for c in reachable}
+            for future in as_completed(futures):
+                db_conn = futures[future]
+                try:
+                    connection = future.result()
+                except Exception as e:
+                    logger.debug(f"Warm-up connection to {db_conn.name} failed: {e}")
+                    continue
+                if self._cancelled:
+                    _close_quietly(connection)
+                    continue
+                logger.debug(f"Warm-up connection ready: {db_conn.name}")
+                self.connection_ready.emit(db_conn.id, connection)
+
+    def cancel(self):
+        """Request cancellation (connections opened afterwards are closed)."""
+        self._cancelled = True
+
+
+def _close_quietly(connection) -> None:
+    try:
+        connection.close()
+    except Exception:
+        pass
@@ -10,10 +10,11 @@ from typing import Optional, TYPE_CHECKING
 from PySide6.QtWidgets import QTabWidget
 
 from ..query_tab import QueryTab
+from .batch_executor import SavedQueryBatchExecutor
 from ...widgets.dialog_helper import DialogHelper
 from ...core.i18n_bridge import tr
 from ....database.dialects import DialectFactory, DatabaseDialect
-from ....constants import QUERY_PREVIEW_LIMIT
+from ....constants import QUERY_PREVIEW_LIMIT, BATCH_QUERIES_PER_DATABASE
 
 if TYPE_CHECKING:
     from ....database.config_db import DatabaseConnection
@@ -580,7 +581,20 @@ class DatabaseQueryGenMixin:
                 DialogHelper.error(f"Connection error: {e}", parent=self)
                 return
 
-        # Get target database name
+        query_tab = self._open_saved_query_tab(
+            saved_query, connection, db_conn, target_tab_widget, workspace_id
+        )
+        try:
+            query_tab._execute_as_query()
+        except Exception as e:
+            logger.error(f"Error executing saved query '{saved_query.name}': {e}")
+            DialogHelper.error(f"Error executing query: {e}", parent=self)
+
+        logger.info(f"Executed saved query: {saved_query.name}")
+
+    def _open_saved_query_tab(self, saved_query, connection, db_conn,
+                              target_tab_widget=None, workspace_id=None) -> QueryTab:
+        """Open a QueryTab holding a saved query (not executed)."""
         target_db = getattr(saved_query, 'target_database_name', None) or None
         tab_name = saved_query.name
 
@@ -602,19 +616,12 @@ class DatabaseQueryGenMixin:
         tab_widget = target_tab_widget if target_tab_widget else self.tab_widget
         self._add_query_tab_to_widget(tab_widget, query_tab, tab_name, db_conn)
 
-        # Set query text and execute
         query_tab.set_query_text(saved_query.query_text or "")
-        try:
-            query_tab._execute_as_query()
-        except Exception as e:
-            logger.error(f"Error executing saved query '{saved_query.name}': {e}")
-            DialogHelper.error(f"Error executing query: {e}", parent=self)
-
-        logger.info(f"Executed saved query: {saved_query.name}")
+        return query_tab
 
     def execute_saved_queries_batch(self, queries: list, target_tab_widget=None,
                                     workspace_id: str = None) -> dict:
-        """Execute several saved queries in one go, deduping connection errors.
+        """Execute several saved queries in one go, in parallel across databases.
 
         When the user kicks off "execute all queries in this category" without
         a working VPN, every query would otherwise wait for its own DB ping
@@ -623,8 +630,14 @@ class DatabaseQueryGenMixin:
         and skips the queries whose database is unreachable — emitting a single
         summary dialog at the end listing the failed databases.
 
+        Every query gets its tab right away and runs on a SavedQueryBatchExecutor
+        worker with its own connection, at most "batch_queries_per_database" at
+        once per database. Each tab is filled as soon as its query finishes and
+        one progress dialog covers the whole batch.
+
         Returns:
             {"executed": int, "skipped": int, "failed_dbs": [(name, count), ...]}
+            ("executed" counts the queries started)
         """
         # Group queries by db_id (preserves first-seen order)
         from collections import OrderedDict
@@ -641,18 +654,18 @@ class DatabaseQueryGenMixin:
         skipped = 0
         failed_dbs = []  # list of (db_name, skipped_count)
 
+        # Connect ONCE per database, all of them at the same time
+        db_conns = {db_id: self._get_connection_by_id(db_id) for db_id in groups}
+        self._open_connections([
+            db_conn for db_id, db_conn in db_conns.items()
+            if db_conn and not self.connections.get(db_id)
+        ])
+
+        executor = SavedQueryBatchExecutor(per_database=self._batch_queries_per_database())
         for db_id, db_queries in groups.items():
-            db_conn = self._get_connection_by_id(db_id)
+            db_conn = db_conns[db_id]
             db_name = db_conn.name if db_conn else db_id
-
-            # Resolve / reconnect ONCE per database
             connection = self.connections.get(db_id)
-            if not connection and db_conn:
-                try:
-                    connection = self.reconnect_database(db_id)
-                except Exception as e:
-                    logger.warning(f"Batch: reconnect to '{db_name}' failed: {e}")
-                    connection = None
 
             if not connection or not db_conn:
                 # All queries pointing to this DB are skipped without retrying
@@ -660,13 +673,19 @@ class DatabaseQueryGenMixin:
                 skipped += len(db_queries)
                 continue
 
-            # DB is reachable — execute every query of this group. The inner
-            # call reuses the live connection and bypasses the reconnect path.
+            # DB is reachable — open a tab per query and queue it
             for q in db_queries:
                 try:
-                    self.execute_saved_query(
-                        q, target_tab_widget=target_tab_widget, workspace_id=workspace_id
+                    query_tab = self._open_saved_query_tab(
+                        q, connection, db_conn, target_tab_widget, workspace_id
                     )
+                    statements = query_tab._prepare_batch_execution()
+                    if statements is None:
+                        # Session variables: must run on the tab's own connection
+                        query_tab._execute_as_query()
+                    else:
+                        executor.add(query_tab, db_conn, statements, database=query_tab.current_database
+                                     if db_conn.db_type in ("sqlserver", "mysql", "mariadb") else None)
                     executed += 1
                 except Exception as e:
                     logger.error(f"Batch: execute query '{getattr(q, 'name', '?')}' failed: {e}")
@@ -692,4 +711,63 @@ class DatabaseQueryGenMixin:
                 parent=self,
             )
 
+        self._run_batch_executor(executor)
         return {"executed": executed, "skipped": skipped, "failed_dbs": failed_dbs}
+
+    def _batch_queries_per_database(self) -> int:
+        """Queries a batch runs at once per database (user preference)."""
+        try:
+            from ....config.user_preferences import UserPreferences
+            return max(1, int(UserPreferences.instance().get(
+                "batch_queries_per_database", BATCH_QUERIES_PER_DATABASE)))
+        except (TypeError, ValueError):
+            return BATCH_QUERIES_PER_DATABASE
+
+    def _run_batch_executor(self, executor: SavedQueryBatchExecutor):
+        """Start a batch, streaming results into their tabs under one progress dialog."""
+        if executor.total == 0:
+            executor.deleteLater()
+            return
+
+        from PySide6.QtWidgets import QProgressDialog
+
+        progress = QProgressDialog(
+            tr("queries_batch_progress", done=0, total=executor.total),
+            tr("btn_cancel"), 0, executor.total, self
+        )
+        progress.setMinimumDuration(500)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+
+        # Keep the executor alive until the batch is done
+        running = getattr(self, "_batch_executors", None)
+        if running is None:
+            running = self._batch_executors = set()
+        running.add(executor)
+
+        def on_query_finished(query_tab, result):
+            try:
+                query_tab._apply_batch_result(result)
+            except RuntimeError:
+                # Tab closed while its query ran
+                if result.connection is not None:
+                    try:
+                        result.connection.close()
+                    except Exception:
+                        pass
+
+        def on_progress(done, total):
+            progress.setLabelText(tr("queries_batch_progress", done=done, total=total))
+            progress.setValue(done)
+
+        def on_finished():
+            running.discard(executor)
+            progress.close()
+            progress.deleteLater()
+            executor.deleteLater()
+
+        executor.query_finished.connect(on_query_finished)
+        executor.progress.connect(on_progress)
+        executor.finished.connect(on_finished)
+        progress.canceled.connect(executor.cancel)
+        executor.start()
@@ -14,6 +14,7 @@ from PySide6.QtGui import QCursor
 from ...core.i18n_bridge import tr
 from ....database.config_db import DatabaseConnection
 from ....database.schema_loaders import SchemaLoaderFactory, SchemaNode, SchemaNodeType
+from ....database.schema_snapshot_store import get_schema_snapshot_store
 from ....utils.image_loader import get_icon
 
 if TYPE_CHECKING:
@@ -183,7 +184,7 @@ class DatabaseSchemaMixin:
             # Get or create connection
             connection = self.connections.get(db_conn.id)
             if not connection:
-                connection = self._create_connection(db_conn)
+                connection = self._take_warm_connection(db_conn.id) or self._create_connection(db_conn)
                 if connection is None:
                     # Remove loading indicator on failure
                     while parent_item.childCount() > 0:
@@ -210,16 +211,20 @@ class DatabaseSchemaMixin:
             # Specific database requested (SQL Server / MySQL): load just that DB.
             # If no database_name is given (server-level attach), load the full
             # server schema so all databases appear — consistent with Resources.
-            if database_name and hasattr(loader, '_load_database_schema'):
-                db_schema = loader._load_database_schema(database_name)
-                # Populate with just this database's contents (Tables, Views, etc.)
-                self._populate_tree_from_schema(parent_item, db_schema, db_conn)
-                return True
+            if not (database_name and hasattr(loader, '_load_database_schema')):
+                database_name = ""
+
+            # A stored snapshot is shown at once and checked in the background;
+            # only the very first load of a database waits for the catalog.
+            store = get_schema_snapshot_store()
+            snapshot = store.get_cached(db_conn.id, database_name)
+            if snapshot is not None and snapshot.schema is not None:
+                self._populate_tree_from_schema(parent_item, snapshot.schema, db_conn)
+                self._revalidate_schema_item(parent_item, db_conn, connection, database_name)
             else:
-                # Full server schema (all databases)
-                schema = loader.load_schema()
+                schema = store.load(loader, db_conn.id, database_name).schema
                 self._populate_tree_from_schema(parent_item, schema, db_conn)
-                return True
+            return True
 
         except Exception as e:
             logger.error(f"Error loading specific database schema: {e}")
@@ -230,3 +235,30 @@ class DatabaseSchemaMixin:
 
         finally:
             QApplication.restoreOverrideCursor()
+
+    def _revalidate_schema_item(self, parent_item: QTreeWidgetItem, db_conn: DatabaseConnection,
+                                connection, database_name: str):
+        """Repopulate a node built from a stored snapshot if the catalog has changed."""
+        from .connection_worker import SchemaRevalidateWorker
+
+        worker = SchemaRevalidateWorker(db_conn, connection, database_name, parent=self)
+        # Keep a reference: a QThread garbage-collected mid-run takes the app with it
+        self._schema_workers = getattr(self, '_schema_workers', [])
+        self._schema_workers.append(worker)
+
+        def changed(snapshot):
+            try:
+                while parent_item.childCount() > 0:
+                    parent_item.removeChild(parent_item.child(0))
+            except RuntimeError:
+                return          # node destroyed while the query was running
+            self._populate_tree_from_schema(parent_item, snapshot.schema, db_conn)
+
+        def finished(w=worker):
+            if w in self._schema_workers:
+                self._schema_workers.remove(w)
+            w.deleteLater()
+
+        worker.snapshot_changed.connect(changed)
+        worker.finished.connect(finished)
+        worker.start()
@@ -157,7 +157,7 @@ class DatabaseWorkspaceMixin:
 
         Requires a live connection — used by the 'link all databases' action.
         """
-        connection = self.connections.get(db_conn.id)
+        connection = self.connections.get(db_conn.id) or self._take_warm_connection(db_conn.id)
         if connection is None:
             # Fast reachability check to avoid a long blocking timeout.
             if hasattr(self, "_is_server_reachable") and not self._is_server_reachable(db_conn):
@@ -79,6 +79,8 @@ class DatabaseManager(
         self._workspace_filter: Optional[str] = None
         self._current_item = None
         self._pending_workers: Dict[str, DatabaseConnectionWorker] = {}  # Track active connection workers
+        self._warm_connections: Dict[str, object] = {}  # Pre-opened, not yet used (see warm_up_connections)
+        self._warmup_workers: list = []
         self._workspace_manager: Optional["WorkspaceManager"] = None
         self._detached_windows: Dict[int, object] = {}  # Track detached query windows
 
@@ -2,6 +2,7 @@
 ER Diagram Export - PNG and SVG export utilities.
 """
 
+from contextlib import nullcontext
 from pathlib import Path
 from PySide6.QtWidgets import QGraphicsScene
 from PySide6.QtGui import QPainter, QImage, QColor
@@ -11,6 +12,12 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _full_detail(scene: QGraphicsScene):
+    """Exports always show every column, whatever the view's zoom level."""
+    full_detail = getattr(scene, 'full_detail', None)
+    return full_detail() if full_detail else nullcontext()
+
+
 def export_to_png(scene: QGraphicsScene, file_path: str, margin: int = 20) -> bool:
     """Export the scene to a PNG file."""
     try:
@@ -22,7 +29,8 @@ def export_to_png(scene: QGraphicsScene, file_path: str, margin: int = 20) -> bo
 
         painter = QPainter(image)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        scene.render(painter, QRectF(image.rect()), rect)
+        with _full_detail(scene):
+            scene.render(painter, QRectF(image.rect()), rect)
         painter.end()
 
         image.save(file_path)
@@ -50,7 +58,8 @@ def export_to_svg(scene: QGraphicsScene, file_path: str, margin: int = 20) -> bo
 
         painter = QPainter(generator)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        scene.render(painter, QRectF(0, 0, rect.width(), rect.height()), rect)
+        with _full_detail(scene):
+            scene.render(painter, QRectF(0, 0, rect.width(), rect.height()), rect)
         painter.end()
 
         logger.info(f"Exported ER diagram to SVG: {file_path}")
@@ -0,0 +1,659 @@
+"""
+ER Diagram Layout Engine - FK-aware automatic placement of tables.
+
+Two modes, both pure NumPy (no Qt) so they can run in a worker thread:
+
+- force_directed_layout(): spring embedder (Fruchterman-Reingold). FK
+  links attract, every table repels every other one. Repulsion is exact
+  for small diagrams and uses a vectorized Barnes-Hut quadtree above
+  EXACT_REPULSION_MAX tables, so each iteration stays O(n log n).
+- layered_layout(): Sugiyama-style hierarchy. Referenced tables sit above
+  the tables pointing at them; crossings are reduced with barycenter sweeps.
+
+Both keep pinned tables where they are, keep tables of a same group
+together, and finish with an overlap-removal pass on the real table sizes.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+# Free space kept between two tables (px)
+TABLE_GAP = 40
+# Exact O(n²) repulsion up to this many tables, Barnes-Hut above
+EXACT_REPULSION_MAX = 4000
+# Rows of the pairwise matrix computed at once by the exact repulsion
+EXACT_BLOCK = 64
+# Barnes-Hut opening angle (cell size / distance) and maximum quadtree depth
+BH_THETA = 0.8
+BH_MAX_DEPTH = 10
+# Force-directed iterations
+FORCE_ITERATIONS = 120
+# Pull of a table towards the centre of its group (relative to FK springs)
+GROUP_PULL = 0.6
+# Layered mode: barycenter sweeps and vertical gap between layers
+LAYER_SWEEPS = 8
+LAYER_GAP = 120
+
+
+ProgressCallback = Callable[[int, int, str], None]
+
+
+class LayoutCancelled(Exception):
+    """Raised when a layout run is cancelled through is_cancelled()."""
+
+
+@dataclass
+class LayoutGraph:
+    """
+    Input of a layout run.
+
+    Attributes:
+        sizes: table name -> (width, height)
+        edges: FK links as (from_table, to_table), i.e. (child, referenced)
+        positions: table name -> current top-left (x, y)
+        pinned: tables that must not move
+        groups: table name -> group id (tables kept together)
+    """
+    sizes: Dict[str, Tuple[float, float]]
+    edges: List[Tuple[str, str]] = field(default_factory=list)
+    positions: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    pinned: Set[str] = field(default_factory=set)
+    groups: Dict[str, str] = field(default_factory=dict)
+
+
+class _Run:
+    """Progress reporting and cancellation shared by both modes."""
+
+    def __init__(self, progress: Optional[ProgressCallback],
+                 is_cancelled: Optional[Callable[[], bool]]):
+        self._progress = progress
+        self._is_cancelled = is_cancelled
+
+    def step(self, current: int, total: int, message: str):
+        if self._is_cancelled is not None and self._is_cancelled():
+            raise LayoutCancelled()
+        if self._progress is not None:
+            self._progress(current, total, message)
+
+
+# ======================================================================
+# Shared helpers
+# ======================================================================
+
+def _arrays(graph: LayoutGraph):
+    """Names, sizes (n, 2), current centres (n, 2), pinned mask, edge index pairs."""
+    names = list(graph.sizes)
+    index = {name: i for i, name in enumerate(names)}
+    sizes = np.array([graph.sizes[n] for n in names], dtype=float).reshape(-1, 2)
+    topleft = np.array([graph.positions.get(n, (0.0, 0.0)) for n in names],
+                       dtype=float).reshape(-1, 2)
+    centres = topleft + sizes / 2
+    pinned = np.array([n in graph.pinned for n in names], dtype=bool)
+    pairs = {(index[a], index[b]) for a, b in graph.edges
+             if a in index and b in index and a != b}
+    edges = np.array(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+    return names, sizes, centres, pinned, edges
+
+
+def _group_index(graph: LayoutGraph, names: List[str]) -> np.ndarray:
+    """Group number per table (-1 = no group)."""
+    ids: Dict[str, int] = {}
+    out = np.full(len(names), -1, dtype=np.int64)
+    for i, name in enumerate(names):
+        gid = graph.groups.get(name)
+        if gid is not None:
+            out[i] = ids.setdefault(gid, len(ids))
+    return out
+
+
+def _ragged_arange(counts: np.ndarray) -> np.ndarray:
+    """Concatenation of arange(c) for every c in counts."""
+    total = int(counts.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.arange(total, dtype=np.int64) - starts
+
+
+def _result(names, centres, sizes) -> Dict[str, Tuple[float, float]]:
+    topleft = centres - sizes / 2
+    return {name: (float(x), float(y)) for name, (x, y) in zip(names, topleft)}
+
+
+def _anchor(centres, sizes, reference_topleft, movable):
+    """Translate movable tables so their bounding box starts at reference_topleft."""
+    if not movable.any():
+        return centres
+    topleft = (centres - sizes / 2)[movable].min(axis=0)
+    centres = centres.copy()
+    centres[movable] += reference_topleft - topleft
+    return centres
+
+
+def _close_pairs(centres: np.ndarray, cell: float):
+    """
+    Index pairs (i < j) of tables whose centres lie in the same or in
+    adjacent grid cells - the only pairs that can overlap when cell is at
+    least the largest table extent plus the gap.
+    """
+    n = len(centres)
+    grid = np.floor((centres - centres.min(axis=0)) / cell).astype(np.int64)
+    stride = int(grid[:, 1].max()) + 3
+    key = grid[:, 0] * stride + grid[:, 1] + 1
+    order = np.argsort(key, kind='stable')
+    sorted_key = key[order]
+    first, second = [], []
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        target = key + dx * stride + dy
+        lo = np.searchsorted(sorted_key, target, 'left')
+        count = np.searchsorted(sorted_key, target, 'right') - lo
+        i = np.repeat(np.arange(n), count)
+        j = order[np.repeat(lo, count) + _ragged_arange(count)]
+        if dx == 0 and dy == 0:
+            keep = i < j
+            i, j = i[keep], j[keep]
+        first.append(i)
+        second.append(j)
+    ii, jj = np.concatenate(first), np.concatenate(second)
+    swap = ii > jj
+    ii[swap], jj[swap] = jj[swap], ii[swap]
+    return ii, jj
+
+
+def remove_overlaps(centres: np.ndarray, sizes: np.ndarray, fixed: np.ndarray,
+                    gap: float = TABLE_GAP, max_sweeps: int = 60) -> np.ndarray:
+    """
+    Push apart overlapping tables along the axis of least overlap.
+
+    Args:
+        centres: (n, 2) table centres
+        sizes: (n, 2) table sizes
+        fixed: (n,) mask of tables that must not move
+        gap: Free space to keep between tables
+        max_sweeps: Upper bound on resolution passes
+
+    Returns:
+        New (n, 2) centres
+    """
+    centres = centres.astype(float).copy()
+    n = len(centres)
+    if n < 2:
+        return centres
+    cell = float(sizes.max()) + gap
+
+    for _ in range(max_sweeps):
+        ii, jj = _close_pairs(centres, cell)
+        d = centres[jj] - centres[ii]
+        ox = (sizes[ii, 0] + sizes[jj, 0]) / 2 + gap - np.abs(d[:, 0])
+        oy = (sizes[ii, 1] + sizes[jj, 1]) / 2 + gap - np.abs(d[:, 1])
+        hit = (ox > 0) & (oy > 0) & ~(fixed[ii] & fixed[jj])
+        if not hit.any():
+            break
+        ii, jj, d, ox, oy = ii[hit], jj[hit], d[hit], ox[hit], oy[hit]
+        along_x = ox < oy
+        # Direction of the push: from i towards j. One extra pixel so damped
+        # pushes still converge instead of creeping towards the gap.
+        push = np.zeros((len(ii), 2))
+        push[along_x, 0] = (ox[along_x] + 1) * np.where(d[along_x, 0] >= 0, 1.0, -1.0)
+        push[~along_x, 1] = (oy[~along_x] + 1) * np.where(d[~along_x, 1] >= 0, 1.0, -1.0)
+
+        # Split the push between both tables unless one of them is fixed
+        share_i = np.where(fixed[ii], 0.0, np.where(fixed[jj], 1.0, 0.5))
+        delta = np.zeros_like(centres)
+        np.add.at(delta, ii, -push * share_i[:, None])
+        np.add.at(delta, jj, push * (1.0 - share_i)[:, None])
+        # Damp accumulated pushes so a crowded table does not overshoot
+        hits = np.bincount(np.concatenate([ii, jj]), minlength=n)
+        delta /= np.maximum(hits, 1)[:, None] ** 0.5
+        centres += delta
+    return centres
+
+
+# ======================================================================
+# Force-directed mode
+# ======================================================================
+
+def _repulsion_exact(pos: np.ndarray, k2: float) -> np.ndarray:
+    """
+    Exact pairwise repulsion k²/d, vectorized.
+
+    Computed in float32, EXACT_BLOCK rows at a time, so the pairwise
+    arrays stay in the CPU cache; the result is within 1e-4 of float64,
+    far below a pixel once the step is clamped by the temperature.
+    """
+    n = len(pos)
+    x = pos[:, 0].astype(np.float32)
+    y = pos[:, 1].astype(np.float32)
+    k2 = np.float32(k2)
+    force = np.empty((n, 2))
+    for start in range(0, n, EXACT_BLOCK):
+        stop = min(start + EXACT_BLOCK, n)
+        dx = x[start:stop, None] - x[None, :]
+        dy = y[start:stop, None] - y[None, :]
+        weight = dx * dx
+        weight += dy * dy
+        np.maximum(weight, 1e-6, out=weight)
+        np.divide(k2, weight, out=weight)
+        rows = np.arange(stop - start)
+        weight[rows, rows + start] = 0.0
+        force[start:stop, 0] = np.einsum('ij,ij->i', dx, weight)
+        force[start:stop, 1] = np.einsum('ij,ij->i', dy, weight)
+    return force
+
+
+def _repulsion_barnes_hut(pos: np.ndarray, k2: float, theta: float = BH_THETA,
+                          max_depth: Optional[int] = None) -> np.ndarray:
+    """
+    Barnes-Hut approximation of the k²/d repulsion.
+
+    The quadtree is built level by level from integer cell coordinates
+    (np.unique per level) and traversed for all tables at once: the
+    frontier is an array of (table, cell) pairs; a cell far enough away
+    (size / distance < theta) acts as a single mass at its centre of mass,
+    closer cells are opened into their children, and leaf cells are
+    resolved body by body.
+    """
+    n = len(pos)
+    force = np.zeros_like(pos)
+    if max_depth is None:
+        # Tables bunch up as the layout converges: size the tree for about
+        # one table per leaf of a uniform spread, so clusters still split
+        max_depth = int(np.clip(np.ceil(np.log(max(n, 4)) / np.log(4)) + 2, 2, BH_MAX_DEPTH))
+    lo = pos.min(axis=0)
+    span = float(max((pos.max(axis=0) - lo).max(), 1e-6)) * (1 + 1e-9)
+    cells = 1 << max_depth
+    grid = np.minimum(((pos - lo) / span * cells).astype(np.int64), cells - 1)
+
+    # Per level: sorted cell keys, cell of each table, mass, centre of mass
+    levels = []
+    for level in range(1, max_depth + 1):
+        shift = max_depth - level
+        key = ((grid[:, 0] >> shift) << level) | (grid[:, 1] >> shift)
+        uniq, inv, counts = np.unique(key, return_inverse=True, return_counts=True)
+        com = np.empty((len(uniq), 2))
+        com[:, 0] = np.bincount(inv, weights=pos[:, 0]) / counts
+        com[:, 1] = np.bincount(inv, weights=pos[:, 1]) / counts
+        levels.append((uniq, inv.reshape(-1), counts, com))
+
+    # Children of each cell, as a CSR table into the next level
+    children = []
+    for level in range(1, max_depth):
+        uniq, _, _, _ = levels[level - 1]
+        child_keys = levels[level][0]
+        cx, cy = child_keys >> (level + 1), child_keys & ((1 << (level + 1)) - 1)
+        parent_key = ((cx >> 1) << level) | (cy >> 1)
+        parent = np.searchsorted(uniq, parent_key)
+        order = np.argsort(parent, kind='stable')
+        count = np.bincount(parent, minlength=len(uniq))
+        start = np.cumsum(count) - count
+        children.append((order, start, count))
+
+    # Bodies of each leaf cell
+    leaf_inv = levels[-1][1]
+    leaf_order = np.argsort(leaf_inv, kind='stable')
+    leaf_count = levels[-1][2]
+    leaf_start = np.cumsum(leaf_count) - leaf_count
+
+    def accumulate(nodes, delta, weight):
+        force[:, 0] += np.bincount(nodes, weights=delta[:, 0] * weight, minlength=n)
+        force[:, 1] += np.bincount(nodes, weights=delta[:, 1] * weight, minlength=n)
+
+    m1 = len(levels[0][0])
+    nodes = np.repeat(np.arange(n), m1)
+    cell = np.tile(np.arange(m1), n)
+    for level in range(1, max_depth + 1):
+        if len(nodes) == 0:
+            break
+        _, inv, counts, com = levels[level - 1]
+        delta = pos[nodes] - com[cell]
+        dist2 = np.maximum(np.einsum('ij,ij->i', delta, delta), 1e-6)
+        size = span / (1 << level)
+        far = (inv[nodes] != cell) & (size * size < theta * theta * dist2)
+        if far.any():
+            accumulate(nodes[far], delta[far], k2 * counts[cell[far]] / dist2[far])
+        nodes, cell = nodes[~far], cell[~far]
+
+        if level == max_depth:
+            reps = leaf_count[cell]
+            body_nodes = np.repeat(nodes, reps)
+            bodies = leaf_order[np.repeat(leaf_start[cell], reps) + _ragged_arange(reps)]
+            keep = bodies != body_nodes
+            body_nodes, bodies = body_nodes[keep], bodies[keep]
+            delta = pos[body_nodes] - pos[bodies]
+            dist2 = np.maximum(np.einsum('ij,ij->i', delta, delta), 1e-6)
+            accumulate(body_nodes, delta, k2 / dist2)
+        else:
+            order, start, count = children[level - 1]
+            reps = count[cell]
+            nodes = np.repeat(nodes, reps)
+            cell = order[np.repeat(start[cell], reps) + _ragged_arange(reps)]
+    return force
+
+
+def force_directed_layout(graph: LayoutGraph, iterations: int = FORCE_ITERATIONS,
+                          progress: Optional[ProgressCallback] = None,
+                          is_cancelled: Optional[Callable[[], bool]] = None
+                          ) -> Dict[str, Tuple[float, float]]:
+    """
+    Spring-embedder layout.
+
+    Args:
+        graph: Tables, FK links, pins and groups
+        iterations: Number of simulation steps
+        progress: Optional callback(current, total, message)
+        is_cancelled: Optional callable; the run raises LayoutCancelled
+                      as soon as it returns True
+
+    Returns:
+        table name -> new top-left (x, y)
+    """
+    run = _Run(progress, is_cancelled)
+    names, sizes, centres, pinned, edges = _arrays(graph)
+    n = len(names)
+    if n == 0:
+        return {}
+    movable = ~pinned
+    reference = (centres - sizes / 2)[movable].min(axis=0) if movable.any() else np.zeros(2)
+
+    # Ideal distance between linked tables: their typical footprint
+    radius = np.hypot(sizes[:, 0], sizes[:, 1]) / 2
+    k = float(np.mean(radius)) * 2 + TABLE_GAP
+    k2 = k * k
+
+    # Start from a spread-out grid when the current layout is degenerate
+    pos = centres.copy()
+    rng = np.random.default_rng(0)
+    if movable.sum() > 1 and np.ptp(pos[movable], axis=0).max() < k:
+        cols = max(1, int(np.ceil(np.sqrt(n))))
+        grid = np.stack([np.arange(n) % cols, np.arange(n) // cols], axis=1) * k
+        origin = pos[pinned].mean(axis=0) if pinned.any() else np.zeros(2)
+        pos[movable] = grid[movable] + origin
+    pos[movable] += rng.uniform(-1, 1, size=(int(movable.sum()), 2))
+
+    groups = _group_index(graph, names)
+    n_groups = int(groups.max()) + 1
+    grouped = groups >= 0
+    use_exact = n <= EXACT_REPULSION_MAX
+
+    # Maximum displacement per step, cooled linearly
+    start_temperature = k * max(2.0, np.sqrt(n) / 2)
+    for it in range(iterations):
+        temperature = start_temperature * (1 - it / iterations) + k * 0.02
+        if it % 10 == 0:
+            run.step(it, iterations, "force")
+
+        force = _repulsion_exact(pos, k2) if use_exact else _repulsion_barnes_hut(pos, k2)
+
+        if len(edges):
+            d = pos[edges[:, 1]] - pos[edges[:, 0]]
+            dist = np.maximum(np.hypot(d[:, 0], d[:, 1]), 1e-3)
+            pull = d * (dist / k)[:, None]
+            np.add.at(force, edges[:, 0], pull)
+            np.add.at(force, edges[:, 1], -pull)
+
+        if n_groups:
+            gsum = np.zeros((n_groups, 2))
+            np.add.at(gsum, groups[grouped], pos[grouped])
+            gcount = np.bincount(groups[grouped], minlength=n_groups)[:, None]
+            gcentre = gsum / np.maximum(gcount, 1)
+            d = gcentre[groups[grouped]] - pos[grouped]
+            dist = np.hypot(d[:, 0], d[:, 1])
+            force[grouped] += d * (GROUP_PULL * dist / k)[:, None]
+
+        # Weak gravity keeps disconnected components from drifting apart
+        force -= (pos - pos.mean(axis=0)) * 0.01
+
+        length = np.maximum(np.hypot(force[:, 0], force[:, 1]), 1e-9)
+        step = np.minimum(length, temperature) / length
+        pos[movable] += force[movable] * step[movable, None]
+
+    run.step(iterations, iterations, "overlaps")
+    pos = _anchor(pos, sizes, reference, movable) if not pinned.any() else pos
+    pos[pinned] = centres[pinned]
+    pos = remove_overlaps(pos, sizes, pinned)
+    return _result(names, pos, sizes)
+
+
+# ======================================================================
+# Layered mode
+# ======================================================================
+
+def _break_cycles(n: int, arcs: Set[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+    """Reverse DFS back arcs so the graph becomes acyclic."""
+    succ: Dict[int, List[int]] = {i: [] for i in range(n)}
+    for a, b in sorted(arcs):
+        succ[a].append(b)
+    state = [0] * n  # 0 = new, 1 = on stack, 2 = done
+    reversed_arcs = set()
+    for root in range(n):
+        if state[root]:
+            continue
+        stack = [(root, iter(succ[root]))]
+        state[root] = 1
+        while stack:
+            node, it = stack[-1]
+            nxt = next(it, None)
+            if nxt is None:
+                state[node] = 2
+                stack.pop()
+            elif state[nxt] == 1:
+                reversed_arcs.add((node, nxt))
+            elif state[nxt] == 0:
+                state[nxt] = 1
+                stack.append((nxt, iter(succ[nxt])))
+    return {(b, a) if (a, b) in reversed_arcs else (a, b) for a, b in arcs}
+
+
+def _assign_layers(n: int, arcs: Set[Tuple[int, int]]) -> List[int]:
+    """Longest-path layering: every arc goes at least one layer down."""
+    indegree = [0] * n
+    succ: Dict[int, List[int]] = {i: [] for i in range(n)}
+    for a, b in arcs:
+        succ[a].append(b)
+        indegree[b] += 1
+    layer = [0] * n
+    queue = [i for i in range(n) if indegree[i] == 0]
+    while queue:
+        node = queue.pop()
+        for nxt in succ[node]:
+            layer[nxt] = max(layer[nxt], layer[node] + 1)
+            indegree[nxt] -= 1
+            if indegree[nxt] == 0:
+                queue.append(nxt)
+    return layer
+
+
+def layered_layout(graph: LayoutGraph,
+                   progress: Optional[ProgressCallback] = None,
+                   is_cancelled: Optional[Callable[[], bool]] = None
+                   ) -> Dict[str, Tuple[float, float]]:
+    """
+    Sugiyama-style hierarchical layout.
+
+    Referenced tables are placed above the tables that reference them.
+    Steps: cycle removal, longest-path layering, dummy nodes on long links,
+    barycenter crossing reduction, then x placement pulled towards linked
+    tables while keeping the order. Tables without any FK are laid out in
+    a grid below the hierarchy.
+
+    Args:
+        graph: Tables, FK links, pins and groups
+        progress: Optional callback(current, total, message)
+        is_cancelled: Optional callable; the run raises LayoutCancelled
+                      as soon as it returns True
+
+    Returns:
+        table name -> new top-left (x, y)
+    """
+    run = _Run(progress, is_cancelled)
+    names, sizes, centres, pinned, edges = _arrays(graph)
+    n = len(names)
+    if n == 0:
+        return {}
+    movable = ~pinned
+    reference = (centres - sizes / 2)[movable].min(axis=0) if movable.any() else np.zeros(2)
+    groups = _group_index(graph, names)
+    total_steps = LAYER_SWEEPS + 3
+
+    # Arcs go from the referenced table (above) to the referencing one (below)
+    arcs = {(int(b), int(a)) for a, b in edges}
+    linked = np.zeros(n, dtype=bool)
+    for a, b in arcs:
+        linked[a] = linked[b] = True
+
+    run.step(0, total_steps, "layers")
+    arcs = _break_cycles(n, arcs)
+    layer_of = _assign_layers(n, arcs)
+
+    # Long arcs are split with dummy nodes (width 0) so ordering sees them
+    node_layer = list(layer_of)
+    node_width = [float(w) for w in sizes[:, 0]]
+    node_group = [int(g) for g in groups]
+    up: Dict[int, List[int]] = {}
+    down: Dict[int, List[int]] = {}
+
+    def link(a, b):
+        down.setdefault(a, []).append(b)
+        up.setdefault(b, []).append(a)
+
+    for a, b in sorted(arcs):
+        prev = a
+        for lyr in range(layer_of[a] + 1, layer_of[b]):
+            dummy = len(node_layer)
+            node_layer.append(lyr)
+            node_width.append(0.0)
+            node_group.append(-1)
+            link(prev, dummy)
+            prev = dummy
+        link(prev, b)
+
+    n_layers = max((node_layer[i] for i in range(n) if linked[i]), default=-1) + 1
+    layers: List[List[int]] = [[] for _ in range(n_layers)]
+    for node, lyr in enumerate(node_layer):
+        if node >= n or linked[node]:
+            layers[lyr].append(node)
+    # Start from a group-then-name order so groups begin contiguous
+    for lyr in layers:
+        lyr.sort(key=lambda v: (node_group[v], names[v] if v < n else ""))
+
+    position = {}
+
+    def index_layer(lyr):
+        for i, v in enumerate(lyr):
+            position[v] = i
+
+    for lyr in layers:
+        index_layer(lyr)
+
+    def reorder(lyr, neighbours):
+        """Sort a layer by neighbour barycenter; groups move as one block."""
+        bary = {}
+        for v in lyr:
+            adj = neighbours.get(v)
+            bary[v] = (sum(position[u] for u in adj) / len(adj)) if adj else position[v]
+        group_key: Dict[int, float] = {}
+        for g in {node_group[v] for v in lyr if node_group[v] >= 0}:
+            members = [bary[v] for v in lyr if node_group[v] == g]
+            group_key[g] = sum(members) / len(members)
+        lyr.sort(key=lambda v: (group_key.get(node_group[v], bary[v]), bary[v]))
+        index_layer(lyr)
+
+    for sweep in range(LAYER_SWEEPS):
+        run.step(1 + sweep, total_steps, "crossings")
+        if sweep % 2 == 0:
+            for lyr in layers[1:]:
+                reorder(lyr, up)
+        else:
+            for lyr in reversed(layers[:-1]):
+                reorder(lyr, down)
+
+    # x placement: pack each layer, then pull nodes towards their neighbours
+    run.step(LAYER_SWEEPS + 1, total_steps, "coordinates")
+    gap = TABLE_GAP
+    x = {}
+    for lyr in layers:
+        cursor = 0.0
+        for v in lyr:
+            x[v] = cursor + node_width[v] / 2
+            cursor += node_width[v] + gap
+        shift = cursor / 2
+        for v in lyr:
+            x[v] -= shift
+
+    def compact(lyr):
+        """Resolve overlaps inside a layer without changing its order."""
+        for i in range(1, len(lyr)):
+            a, b = lyr[i - 1], lyr[i]
+            min_x = x[a] + (node_width[a] + node_width[b]) / 2 + gap
+            if x[b] < min_x:
+                x[b] = min_x
+        for i in range(len(lyr) - 2, -1, -1):
+            a, b = lyr[i], lyr[i + 1]
+            max_x = x[b] - (node_width[a] + node_width[b]) / 2 - gap
+            if x[a] > max_x:
+                x[a] = max_x
+
+    for it in range(4):
+        neighbours = up if it % 2 == 0 else down
+        for lyr in (layers if it % 2 == 0 else reversed(layers)):
+            for v in lyr:
+                adj = neighbours.get(v)
+                if adj:
+                    x[v] = (x[v] + sum(x[u] for u in adj) / len(adj)) / 2
+            compact(lyr)
+
+    # y placement: one band per layer, as tall as its tallest table
+    heights = [0.0] * n_layers
+    for v in range(n):
+        if linked[v]:
+            heights[layer_of[v]] = max(heights[layer_of[v]], float(sizes[v, 1]))
+    tops = np.concatenate([[0.0], np.cumsum(np.array(heights) + LAYER_GAP)])
+
+    pos = np.zeros((n, 2))
+    for v in range(n):
+        if linked[v]:
+            pos[v] = (x[v], tops[layer_of[v]] + sizes[v, 1] / 2)
+
+    # Unlinked tables: grid below the hierarchy, grouped tables first
+    run.step(LAYER_SWEEPS + 2, total_steps, "unlinked")
+    loose = sorted((v for v in range(n) if not linked[v]),
+                   key=lambda v: (groups[v] < 0, groups[v], names[v]))
+    if loose:
+        cols = max(1, int(np.ceil(np.sqrt(len(loose)))))
+        cell_w = float(sizes[loose, 0].max()) + gap
+        cell_h = float(sizes[loose, 1].max()) + gap
+        left = (min((x[v] - node_width[v] / 2 for v in range(n) if linked[v]), default=0.0))
+        top = float(tops[-1]) if n_layers else 0.0
+        for i, v in enumerate(loose):
+            pos[v] = (left + (i % cols) * cell_w + sizes[v, 0] / 2,
+                      top + (i // cols) * cell_h + sizes[v, 1] / 2)
+
+    run.step(LAYER_SWEEPS + 3, total_steps, "overlaps")
+    pos = _anchor(pos, sizes, reference, movable)
+    pos[pinned] = centres[pinned]
+    pos = remove_overlaps(pos, sizes, pinned)
+    return _result(names, pos, sizes)
+
+
+LAYOUT_MODES = {
+    "force": force_directed_layout,
+    "layered": layered_layout,
+}
+
+
+def compute_layout(graph: LayoutGraph, mode: str = "force",
+                   progress: Optional[ProgressCallback] = None,
+                   is_cancelled: Optional[Callable[[], bool]] = None
+                   ) -> Dict[str, Tuple[float, float]]:
+    """Run a layout mode by name ("force" or "layered")."""
+    try:
+        layout = LAYOUT_MODES[mode]
+    except KeyError:
+        raise ValueError(f"Unknown layout mode: {mode}")
+    return layout(graph, progress=progress, is_cancelled=is_cancelled)
@@ -0,0 +1,58 @@
+"""
+Layout Worker - Runs the ER auto-layout engine off the GUI thread.
+"""
+
+from PySide6.QtCore import QThread, Signal
+
+from .layout_engine import LayoutGraph, LayoutCancelled, compute_layout
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class LayoutWorker(QThread):
+    """Worker thread computing table positions for an ER diagram."""
+
+    progress = Signal(int, int, str)  # current, total, step
+    # Not named "finished": QThread.finished is what releases the worker
+    layout_ready = Signal(dict)  # table_name -> (x, y)
+    error = Signal(str)  # error message
+
+    def __init__(self, graph: LayoutGraph, mode: str = "force", parent=None):
+        """
+        Initialize worker.
+
+        Args:
+            graph: Snapshot of the diagram (ERDiagramScene.layout_graph())
+            mode: "force" or "layered"
+            parent: Owner keeping the thread alive until it has finished
+        """
+        super().__init__(parent)
+        self.graph = graph
+        self.mode = mode
+        self._cancelled = False
+
+    def run(self):
+        """Compute the layout."""
+        try:
+            positions = compute_layout(
+                self.graph, self.mode,
+                progress=self._report,
+                is_cancelled=lambda: self._cancelled,
+            )
+            if not self._cancelled:
+                self.layout_ready.emit(positions)
+        except LayoutCancelled:
+            logger.debug("ER auto-layout cancelled")
+        except Exception as e:
+            logger.error(f"ER auto-layout failed: {e}")
+            if not self._cancelled:
+                self.error.emit(str(e))
+
+    def _report(self, current: int, total: int, step: str):
+        if not self._cancelled:
+            self.progress.emit(current, total, step)
+
+    def cancel(self):
+        """Request cancellation; the engine stops at its next checkpoint."""
+        self._cancelled = True
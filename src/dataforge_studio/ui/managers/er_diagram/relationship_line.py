@@ -121,6 +121,7 @@ class ERRelationshipLine(QGraphicsPathItem):
         self._read_only = False
         self._label: Optional[QGraphicsTextItem] = None
         self._show_label = False
+        self._low_detail = False  # zoomed out: no label, no count badge
 
         self.setZValue(0)
         self.setAcceptHoverEvents(True)
@@ -545,18 +546,19 @@ class ERRelationshipLine(QGraphicsPathItem):
         """Recompute path when tables move.
 
         - If user hasn't modified the path: regenerate entirely via _init_vertices.
-          Then the scene will redistribute anchors via _compute_line_offsets.
+          Inside an ERDiagramScene the scene does it, coalesced per frame.
         - If user has modified: preserve waypoints but realign adjacent ones for orthogonality.
         """
         if len(self._vertices) < 2:
             return
 
         if not self._user_modified:
+            scene = self.scene()
+            if scene is not None and hasattr(scene, 'schedule_reroute'):
+                # The scene reroutes lines around moved tables once per frame
+                return
             self._init_vertices()
             self._rebuild_path()
-            # Trigger scene-wide redistribution (once per drag event, done synchronously)
-            if self.scene() and hasattr(self.scene(), '_compute_line_offsets'):
-                self.scene()._compute_line_offsets()
             return
 
         from_side, to_side = self._get_sides()
@@ -587,7 +589,7 @@ class ERRelationshipLine(QGraphicsPathItem):
 
     def set_show_label(self, show: bool):
         self._show_label = show
-        if show:
+        if show and not self._low_detail:
             self._ensure_label()
             if self._label:
                 self._label.setVisible(True)
@@ -595,6 +597,14 @@ class ERRelationshipLine(QGraphicsPathItem):
         elif self._label:
             self._label.setVisible(False)
 
+    def set_low_detail(self, low: bool):
+        """Zoomed-out rendering: hide the FK label and the count badge."""
+        if low == self._low_detail:
+            return
+        self._low_detail = low
+        self.set_show_label(self._show_label)
+        self.update()
+
     def _ensure_label(self):
         if self._label is None and self.scene() and self.fk_name:
             self._label = QGraphicsTextItem()
@@ -706,7 +716,7 @@ class ERRelationshipLine(QGraphicsPathItem):
             self._draw_arrow(painter, prev, last, color)
 
             # Badge with count when multiple FKs are grouped on this line
-            if n_pairs >= 2 and hasattr(self, '_mid_seg_center'):
+            if n_pairs >= 2 and not self._low_detail and hasattr(self, '_mid_seg_center'):
                 self._draw_count_badge(painter, self._mid_seg_center, n_pairs, color, palette)
 
     def _draw_count_badge(self, painter: QPainter, center: QPointF, count: int,
@@ -2,14 +2,17 @@
 ER Diagram Scene - QGraphicsScene orchestrating tables and relationships.
 """
 
-from typing import Dict, List, Optional, Any
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Any
 from PySide6.QtWidgets import QGraphicsScene, QGraphicsItem
 from PySide6.QtGui import QColor
-from PySide6.QtCore import Signal, QObject
+from PySide6.QtCore import Qt, Signal, QObject, QRectF, QTimer
 
 from .table_item import ERTableItem
 from .relationship_line import ERRelationshipLine
 from .group_item import ERGroupItem
+from .layout_engine import LayoutGraph, compute_layout
 from ....database.schema_loaders.base import ForeignKeyInfo, PrimaryKeyInfo
 
 import logging
@@ -23,10 +26,19 @@ class ERDiagramScene(QGraphicsScene):
     Manages:
     - Adding/removing tables
     - Auto-detecting FK relationships
-    - Auto-layout for initial placement
+    - Auto-layout (force-directed or layered, see layout_engine)
     - Position tracking for save
+    - Level of detail: off-screen or zoomed-out tables drop their widget
     """
 
+    # Below this zoom factor tables are drawn as plain boxes and FK labels hidden
+    LOW_DETAIL_SCALE = 0.45
+    # Scene margin (px) kept detailed around the visible rect while panning
+    DETAIL_MARGIN = 200
+    # Moves are rerouted at most once per frame, then fully once they settle
+    REROUTE_INTERVAL_MS = 16
+    SETTLE_INTERVAL_MS = 250
+
     # Signal emitted when a table position changes (for auto-save)
     table_moved = Signal(str, float, float)  # table_name, x, y
 
@@ -50,6 +62,24 @@ class ERDiagramScene(QGraphicsScene):
         self._table_items: Dict[str, ERTableItem] = {}  # table_name -> ERTableItem
         self._relationship_lines: List[ERRelationshipLine] = []
         self._group_items: Dict[str, ERGroupItem] = {}  # group_id -> ERGroupItem
+        # Adjacency index: id(ERTableItem) -> lines anchored on that table
+        self._lines_by_table: Dict[int, List[ERRelationshipLine]] = defaultdict(list)
+
+        # Coalesced rerouting of lines around moved tables
+        self._dirty_tables: Dict[int, ERTableItem] = {}
+        self._reroute_timer = QTimer(self)
+        self._reroute_timer.setSingleShot(True)
+        self._reroute_timer.setInterval(self.REROUTE_INTERVAL_MS)
+        self._reroute_timer.timeout.connect(self._flush_reroute)
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(self.SETTLE_INTERVAL_MS)
+        self._settle_timer.timeout.connect(self._compute_line_offsets)
+
+        # Level of detail (None = every table detailed, no view applied yet)
+        self._low_detail = False
+        self._detailed_tables: Optional[set] = None
+        self._detail_state: Optional[tuple] = None  # last (visible_rect, scale)
 
         # Background
         from ...core.theme_bridge import ThemeBridge
@@ -60,7 +90,8 @@ class ERDiagramScene(QGraphicsScene):
                   pk_columns: List[str], fk_columns: List[str],
                   schema_name: str = "",
                   pos_x: float = 0.0, pos_y: float = 0.0,
-                  width: float = 0.0, height: float = 0.0) -> ERTableItem:
+                  width: float = 0.0, height: float = 0.0,
+                  pinned: bool = False) -> ERTableItem:
         """Add a table to the diagram. width/height=0 means "keep natural size"."""
         if table_name in self._table_items:
             return self._table_items[table_name]
@@ -76,10 +107,15 @@ class ERDiagramScene(QGraphicsScene):
         item.setPos(pos_x, pos_y)
         if width > 0 and height > 0:
             item.set_size(width, height)
+        if pinned:
+            item.set_pinned(True)
         item.signals.position_changed.connect(self.table_moved.emit)
+        item.signals.position_changed.connect(lambda *_, it=item: self.schedule_reroute(it))
 
         self.addItem(item)
         self._table_items[table_name] = item
+        if self._detail_state is not None:
+            self.update_visible_detail(*self._detail_state)
         return item
 
     def get_table_sizes(self) -> Dict[str, tuple]:
@@ -104,7 +140,12 @@ class ERDiagramScene(QGraphicsScene):
         for line in lines_to_remove:
             self.removeItem(line)
             self._relationship_lines.remove(line)
+            self._unindex_line(line)
 
+        self._lines_by_table.pop(id(item), None)
+        self._dirty_tables.pop(id(item), None)
+        if self._detailed_tables is not None:
+            self._detailed_tables.discard(item)
         self.removeItem(item)
 
     def add_relationships(self, foreign_keys: List[ForeignKeyInfo]):
@@ -143,8 +184,7 @@ class ERDiagramScene(QGraphicsScene):
                         is_dark=self.is_dark,
                         column_pairs=pairs,
                     )
-                    self.addItem(line)
-                    self._relationship_lines.append(line)
+                    self._add_line(line)
         else:
             # Group by fk_name only (composite FKs combined, separate FKs stay separate)
             groups: OrderedDict = OrderedDict()
@@ -169,11 +209,66 @@ class ERDiagramScene(QGraphicsScene):
                         is_dark=self.is_dark,
                         column_pairs=pairs
                     )
-                    self.addItem(line)
-                    self._relationship_lines.append(line)
+                    self._add_line(line)
 
         self._compute_line_offsets()
 
+    def _add_line(self, line: ERRelationshipLine):
+        """Add a relationship line to the scene and the adjacency index."""
+        self.addItem(line)
+        self._relationship_lines.append(line)
+        self._lines_by_table[id(line.from_table)].append(line)
+        if line.to_table is not line.from_table:
+            self._lines_by_table[id(line.to_table)].append(line)
+        if self._low_detail:
+            line.set_low_detail(True)
+
+    def _unindex_line(self, line: ERRelationshipLine):
+        for table in (line.from_table, line.to_table):
+            lines = self._lines_by_table.get(id(table))
+            if lines and line in lines:
+                lines.remove(line)
+
+    def lines_of(self, table: ERTableItem) -> List[ERRelationshipLine]:
+        """Relationship lines anchored on a table (adjacency index lookup)."""
+        return list(self._lines_by_table.get(id(table), ()))
+
+    def tables_in_rect(self, rect: QRectF) -> List[ERTableItem]:
+        """Tables whose bounds intersect rect, via the scene's BSP index."""
+        return [
+            item for item in self.items(rect, Qt.ItemSelectionMode.IntersectsItemBoundingRect,
+                                        Qt.SortOrder.AscendingOrder)
+            if isinstance(item, ERTableItem)
+        ]
+
+    # ==================================================================
+    # Incremental rerouting
+    # ==================================================================
+
+    def schedule_reroute(self, table: ERTableItem):
+        """Queue a reroute of the lines around a moved/resized table.
+
+        Drag events arrive far faster than frames are drawn, and each one used
+        to re-route every line of the scene. Moves are now collected and
+        flushed once per frame, limited to the neighbourhood of the moved
+        tables; a full pass runs once the moves settle so the final layout
+        is exactly the one a full reroute gives.
+        """
+        if not self._lines_by_table.get(id(table)):
+            return
+        self._dirty_tables[id(table)] = table
+        if not self._reroute_timer.isActive():
+            self._reroute_timer.start()
+
+    def _flush_reroute(self):
+        """Reroute the lines around every table moved since the last frame."""
+        if not self._dirty_tables:
+            return
+        tables = list(self._dirty_tables.values())
+        self._dirty_tables.clear()
+        self._compute_line_offsets(tables)
+        self._settle_timer.start()
+
     # ==================================================================
     # Auto-routing — rules R1..R5 are specified in docs/ER_DIAGRAMS_ROUTING.md
     # ==================================================================
@@ -187,19 +282,42 @@ class ERDiagramScene(QGraphicsScene):
     # spreads them on its lateral sides instead of crowding a single side.
     LATERAL_SPREAD_MIN = 2
 
-    def _compute_line_offsets(self):
-        """Route every auto line: choose sides, place anchors, rebuild paths.
+    def _compute_line_offsets(self, tables: Optional[Iterable[ERTableItem]] = None):
+        """Route auto lines: choose sides, place anchors, rebuild paths.
 
         Implements docs/ER_DIAGRAMS_ROUTING.md — R1 straight > L > Z,
         R2 inclusion-constrained anchors, R3 form/side choice, R4 homogeneous
         distribution per sub-segment, R5 crossing-free ordering on an edge.
+
+        Args:
+            tables: Moved tables. When given, only the lines anchored on these
+                    tables or on their direct neighbours are rerouted; anchors
+                    on tables further away are left in place. None = all lines.
         """
+        self._settle_timer.stop()
         auto_lines = [ln for ln in self._relationship_lines if not ln._user_modified]
         if not auto_lines:
             return
-        line_sides, pin_coord = self._assign_sides(auto_lines)
-        self._place_anchors(auto_lines, line_sides, pin_coord)
-        self._rebuild_all(auto_lines, line_sides)
+        if tables is None:
+            line_sides, pin_coord = self._assign_sides(auto_lines)
+            self._place_anchors(auto_lines, line_sides, pin_coord)
+            self._rebuild_all(auto_lines, line_sides)
+            return
+
+        # Tables whose edges get re-laid out: the moved ones and their neighbours
+        owned = {}
+        for table in tables:
+            for ln in self._lines_by_table.get(id(table), ()):
+                if not ln._user_modified:
+                    owned[id(ln.from_table)] = ln.from_table
+                    owned[id(ln.to_table)] = ln.to_table
+        if not owned:
+            return
+        subset_ids = {id(ln) for tid in owned for ln in self._lines_by_table.get(tid, ())}
+        lines = [ln for ln in auto_lines if id(ln) in subset_ids]
+        line_sides, pin_coord = self._assign_sides(lines, context=auto_lines)
+        self._place_anchors(lines, line_sides, pin_coord, owned=set(owned))
+        self._rebuild_all(lines, line_sides)
 
     # ------------------------------------------------------------------
     # Geometry helpers
@@ -291,7 +409,7 @@ class ERDiagramScene(QGraphicsScene):
     # R1 / R2 / R3 — side assignment
     # ------------------------------------------------------------------
 
-    def _assign_sides(self, auto_lines):
+    def _assign_sides(self, auto_lines, context=None):
         """Choose the form and the two sides of every auto line.
 
         Straight candidates are accepted optimistically, then demoted to an L
@@ -299,12 +417,14 @@ class ERDiagramScene(QGraphicsScene):
         the per-edge anchor count, which itself depends on the chosen sides, so
         the assignment is iterated until it stabilises.
 
+        `context` (incremental reroute) is every auto line of the scene: lines
+        outside `auto_lines` keep their sides but still count towards degrees
+        and per-edge anchor counts.
+
         Returns (line_sides, pin_coord):
           line_sides[id(line)] = (from_side, to_side)
           pin_coord[id(line)]  = imposed coordinate, for straight links only
         """
-        from collections import defaultdict
-
         # Pairs carrying many composite FKs keep the legacy spread across two
         # sides of the target — see _assign_sides_multi_fk.
         pair_lines = defaultdict(list)
@@ -320,9 +440,18 @@ class ERDiagramScene(QGraphicsScene):
 
         # Interim R3.2 criterion: a busy source spreads its links sideways
         out_degree = defaultdict(int)
-        for ln in auto_lines:
+        for ln in (context or auto_lines):
             out_degree[id(ln.from_table)] += 1
 
+        # Anchors of lines that are not rerouted stay where they are
+        fixed_counts = defaultdict(int)
+        if context:
+            routed = {id(ln) for ln in auto_lines}
+            for ln in context:
+                if id(ln) not in routed and ln._from_side and ln._to_side:
+                    fixed_counts[(id(ln.from_table), ln._from_side)] += 1
+                    fixed_counts[(id(ln.to_table), ln._to_side)] += 1
+
         candidate = {id(ln): self._straight_candidate(ln.from_table, ln.to_table)
                      for ln in simple_lines}
         keep_straight = {id(ln): candidate[id(ln)] is not None for ln in simple_lines}
@@ -344,7 +473,7 @@ class ERDiagramScene(QGraphicsScene):
 
         def demote(sides, pins):
             """Drop straight links whose anchor would land in a corner."""
-            counts = defaultdict(int)
+            counts = defaultdict(int, fixed_counts)
             for ln in auto_lines:
                 fs, ts = sides[id(ln)]
                 counts[(id(ln.from_table), fs)] += 1
@@ -447,16 +576,18 @@ class ERDiagramScene(QGraphicsScene):
     # R2 / R4 / R5 — anchor placement
     # ------------------------------------------------------------------
 
-    def _place_anchors(self, auto_lines, line_sides, pin_coord):
+    def _place_anchors(self, auto_lines, line_sides, pin_coord, owned=None):
         """Place both endpoints of every auto line on their table edges.
 
         Parallel-sided links (straight / Z) keep the master-slave scheme: the
         busier edge lays its anchors out and the other end matches that
         coordinate. Perpendicular links (L) have their anchors on two different
         axes, so each end is laid out independently on its own edge.
-        """
-        from collections import defaultdict
 
+        `owned` (incremental reroute) restricts edge layout to these table ids;
+        an end on any other table is the slave of a parallel link, or keeps
+        its current anchor.
+        """
         id_to_table = {id(t): t for t in self._table_items.values()}
 
         parallel = {}
@@ -475,6 +606,9 @@ class ERDiagramScene(QGraphicsScene):
             if not parallel[id(ln)]:
                 continue
             fs, ts = line_sides[id(ln)]
+            if owned is not None and (id(ln.from_table) in owned) != (id(ln.to_table) in owned):
+                master_is_from[id(ln)] = id(ln.from_table) in owned
+                continue
             master_is_from[id(ln)] = (counts[(id(ln.from_table), fs)]
                                       >= counts[(id(ln.to_table), ts)])
 
@@ -488,8 +622,11 @@ class ERDiagramScene(QGraphicsScene):
                 else:
                     edge_entries[(id(ln.to_table), ts)].append((ln, False))
             else:
-                edge_entries[(id(ln.from_table), fs)].append((ln, True))
-                edge_entries[(id(ln.to_table), ts)].append((ln, False))
+                for table, side, is_from in ((ln.from_table, fs, True), (ln.to_table, ts, False)):
+                    if owned is None or id(table) in owned:
+                        edge_entries[(id(table), side)].append((ln, is_from))
+                    else:
+                        self._keep_anchor(ln, table, side, is_from)
 
         for (tid, side), entries in edge_entries.items():
             table = id_to_table.get(tid)
@@ -498,6 +635,26 @@ class ERDiagramScene(QGraphicsScene):
 
         self._place_slaves(auto_lines, line_sides, parallel, master_is_from)
 
+    @staticmethod
+    def _keep_anchor(ln, table, side, is_from):
+        """Leave an anchor where it is if it still sits on `side` of `table`,
+        otherwise move it to the middle of that edge."""
+        vidx = 0 if is_from else -1
+        pt = ln._vertices[vidx]
+        p = table.scenePos()
+        x0, y0 = p.x(), p.y()
+        x1, y1 = x0 + table.width, y0 + table.height
+        if side == 'left':
+            on_edge = abs(pt.x() - x0) < 0.5 and y0 <= pt.y() <= y1
+        elif side == 'right':
+            on_edge = abs(pt.x() - x1) < 0.5 and y0 <= pt.y() <= y1
+        elif side == 'top':
+            on_edge = abs(pt.y() - y0) < 0.5 and x0 <= pt.x() <= x1
+        else:
+            on_edge = abs(pt.y() - y1) < 0.5 and x0 <= pt.x() <= x1
+        if not on_edge:
+            ln._vertices[vidx] = table.get_connection_point(side)
+
     def _layout_edge(self, table, side, entries, pin_coord):
         """R2 + R4 + R5 — place all the anchors carried by one edge.
 
@@ -613,8 +770,6 @@ class ERDiagramScene(QGraphicsScene):
         Z-paths sharing the same pair and sides get their middle segment
         staggered so they do not overlap.
         """
-        from collections import defaultdict
-
         zpath_groups = defaultdict(list)
         for ln in auto_lines:
             fs, ts = line_sides[id(ln)]
@@ -657,21 +812,88 @@ class ERDiagramScene(QGraphicsScene):
             ln._rebuild_path()
 
 
-    def auto_layout(self):
-        """Arrange tables in a grid layout."""
-        tables = list(self._table_items.values())
-        if not tables:
+    # Padding between a group frame and the tables fitted inside it
+    GROUP_PADDING = 20
+
+    def auto_layout(self, mode: str = "force"):
+        """Arrange tables with the layout engine (synchronous).
+
+        Used for the initial placement of a new diagram; the manager runs
+        larger, user-requested layouts in a LayoutWorker instead.
+        """
+        if not self._table_items:
             return
+        graph = self.layout_graph()
+        self.apply_layout(compute_layout(graph, mode), graph.groups)
+
+    def layout_graph(self) -> LayoutGraph:
+        """Snapshot the tables, FK links, pins and groups for the layout engine."""
+        groups = {}
+        for group_id, group in self._group_items.items():
+            for item, _ in group._tables_inside():
+                groups.setdefault(item.table_name, group_id)
+        return LayoutGraph(
+            sizes={name: (item.width, item.height) for name, item in self._table_items.items()},
+            edges=[(ln.from_table.table_name, ln.to_table.table_name)
+                   for ln in self._relationship_lines],
+            positions=self.get_table_positions(),
+            pinned={name for name, item in self._table_items.items() if item.pinned},
+            groups=groups,
+        )
+
+    def apply_layout(self, positions: Dict[str, tuple],
+                     groups: Optional[Dict[str, str]] = None):
+        """Move tables to computed positions and reroute every line once.
+
+        Args:
+            positions: table_name -> (x, y) top-left, as returned by the engine
+            groups: table_name -> group_id used for the layout; group frames
+                    are refitted around their tables. None = current members.
+        """
+        if groups is None:
+            groups = self.layout_graph().groups
+        for name, (x, y) in positions.items():
+            item = self._table_items.get(name)
+            if item is not None and not item.pinned:
+                item.setPos(x, y)
+
+        members: Dict[str, List[ERTableItem]] = defaultdict(list)
+        for name, group_id in groups.items():
+            item = self._table_items.get(name)
+            if item is not None and group_id in self._group_items:
+                members[group_id].append(item)
+        for group_id, tables in members.items():
+            self._fit_group(self._group_items[group_id], tables)
+
+        # One full pass instead of the per-move incremental reroutes
+        self._reroute_timer.stop()
+        self._dirty_tables.clear()
+        self._compute_line_offsets()
 
-        # Simple grid layout
-        cols = max(1, int(len(tables) ** 0.5))
-        spacing_x = 300
-        spacing_y = 350
+    def _fit_group(self, group: ERGroupItem, tables: List[ERTableItem]):
+        """Resize and move a group frame so it wraps the given tables."""
+        pad = self.GROUP_PADDING
+        left = min(t.pos().x() for t in tables) - pad
+        top = min(t.pos().y() for t in tables) - pad - ERGroupItem.TITLE_HEIGHT
+        right = max(t.pos().x() + t.width for t in tables) + pad
+        bottom = max(t.pos().y() + t.height for t in tables) + pad
+        group.prepareGeometryChange()
+        group.width = right - left
+        group.height = bottom - top
+        group.setRect(0, 0, group.width, group.height)
+        group.setPos(left, top)
+        group.signals.geometry_changed.emit(group.group_id, left, top,
+                                            group.width, group.height)
+
+    def set_table_pinned(self, table_name: str, pinned: bool):
+        """Pin/unpin a table: pinned tables are left in place by auto-layout."""
+        item = self._table_items.get(table_name)
+        if item is not None:
+            item.set_pinned(pinned)
 
-        for i, item in enumerate(tables):
-            row = i // cols
-            col = i % cols
-            item.setPos(col * spacing_x + 50, row * spacing_y + 50)
+    def get_pinned_tables(self) -> List[str]:
+        """Names of the pinned tables."""
+        return [name for name, item in self._table_items.items() if item.pinned]
 
     def get_table_positions(self) -> Dict[str, tuple]:
         """Get current positions of all tables.
@@ -765,6 +987,68 @@ class ERDiagramScene(QGraphicsScene):
         for line in self._relationship_lines:
             line._rebuild_path()
 
+    # ------------------------------------------------------------------
+    # Level of detail
+    # ------------------------------------------------------------------
+
+    def update_visible_detail(self, visible_rect: QRectF, scale: float):
+        """Apply the level of detail for what a view currently shows.
+
+        Tables outside the visible rect (plus DETAIL_MARGIN) and every table
+        below LOW_DETAIL_SCALE are drawn as plain boxes: their column widget
+        is hidden, which is what makes large diagrams slow to pan and zoom.
+        FK labels and count badges are dropped when zoomed out.
+
+        Args:
+            visible_rect: Scene rect shown by the view
+            scale: Current view zoom factor
+        """
+        self._detail_state = (QRectF(visible_rect), scale)
+        low = scale < self.LOW_DETAIL_SCALE
+        if low != self._low_detail:
+            self._low_detail = low
+            for line in self._relationship_lines:
+                line.set_low_detail(low)
+
+        if low:
+            detailed = set()
+        else:
+            m = self.DETAIL_MARGIN
+            detailed = set(self.tables_in_rect(visible_rect.adjusted(-m, -m, m, m)))
+        self._apply_detailed_tables(detailed)
+
+    def _apply_detailed_tables(self, detailed: Optional[set]):
+        """Switch tables between widget and box rendering (None = all widgets)."""
+        previous = self._detailed_tables
+        if previous is None:
+            previous = set(self._table_items.values())
+        target = set(self._table_items.values()) if detailed is None else detailed
+        for item in previous - target:
+            item.set_detailed(False)
+        for item in target - previous:
+            item.set_detailed(True)
+        self._detailed_tables = detailed
+
+    @property
+    def low_detail(self) -> bool:
+        """True when the scene is drawn zoomed out (boxes, no FK labels)."""
+        return self._low_detail
+
+    @contextmanager
+    def full_detail(self):
+        """Render every table and label in full (exports), then restore."""
+        state = self._detail_state
+        if self._low_detail:
+            self._low_detail = False
+            for line in self._relationship_lines:
+                line.set_low_detail(False)
+        self._apply_detailed_tables(None)
+        try:
+            yield
+        finally:
+            if state is not None:
+                self.update_visible_detail(*state)
+
     def set_show_fk_names(self, show: bool):
         """Show or hide FK names on all relationship lines."""
         for line in self._relationship_lines:
@@ -814,9 +1098,14 @@ class ERDiagramScene(QGraphicsScene):
 
     def clear_all(self):
         """Remove all items from the scene."""
+        self._reroute_timer.stop()
+        self._settle_timer.stop()
         self._table_items.clear()
         self._relationship_lines.clear()
         self._group_items.clear()
+        self._lines_by_table.clear()
+        self._dirty_tables.clear()
+        self._detailed_tables = None
         self.clear()
 
     # ------------------------------------------------------------------
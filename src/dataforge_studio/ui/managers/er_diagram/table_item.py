@@ -254,6 +254,8 @@ class ERTableItem(QGraphicsRectItem):
         self.setZValue(1)
 
         self._read_only = False
+        self._detailed = True  # False = drawn as a plain box (level of detail)
+        self.pinned = False  # True = kept in place by auto-layout
 
         # Resize state
         self._resize_mode = None  # None | 'v' | 'h' | 'both'
@@ -299,6 +301,23 @@ class ERTableItem(QGraphicsRectItem):
             self.setRect(0, 0, new_width, self.height)
             self.signals.position_changed.emit(self.table_name, self.pos().x(), self.pos().y())
 
+    def set_detailed(self, detailed: bool):
+        """Show the column widget, or draw a plain box with the table name.
+
+        Hiding the proxy is what saves time: the scene no longer lays out,
+        styles and paints a QListWidget for tables the user cannot read.
+        """
+        if detailed == self._detailed:
+            return
+        self._detailed = detailed
+        self._proxy.setVisible(detailed)
+        self.update()
+
+    def set_pinned(self, pinned: bool):
+        """Pin the table so auto-layout leaves it where it is."""
+        self.pinned = pinned
+        self.update()
+
     def boundingRect(self):
         """Include a small margin for resize grip areas (bottom + right)."""
         m = self.RESIZE_MARGIN
@@ -316,11 +335,21 @@ class ERTableItem(QGraphicsRectItem):
         from ...core.theme_bridge import ThemeBridge
         palette = ThemeBridge.get_instance().get_er_diagram_colors()
 
+        if not self._detailed:
+            self._paint_box(painter, palette)
+
         if self.isSelected():
             painter.setPen(QPen(QColor(palette["header_bg"]), 2, Qt.PenStyle.DashLine))
             painter.setBrush(Qt.BrushStyle.NoBrush)
             painter.drawRect(QRectF(0, 0, self.width, self.height))
 
+        if self.pinned:
+            # Pin marker in the right margin, next to the header
+            m = self.RESIZE_MARGIN
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(palette["header_bg"]))
+            painter.drawEllipse(QRectF(self.width + 2, 2, m - 4, m - 4))
+
         if self._read_only:
             return
 
@@ -336,6 +365,22 @@ class ERTableItem(QGraphicsRectItem):
         ])
         painter.drawPolygon(handle)
 
+    def _paint_box(self, painter, palette):
+        """Low-detail rendering: frame, header band and name, no columns."""
+        header_h = min(26.0, self.height)
+        painter.setPen(QPen(QColor(palette["border"]), 1))
+        painter.setBrush(QColor(palette["bg"]))
+        painter.drawRect(QRectF(0, 0, self.width, self.height))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(palette["header_bg"]))
+        painter.drawRect(QRectF(0, 0, self.width, header_h))
+        painter.setPen(QColor(palette["header_fg"]))
+        font = QFont("Segoe UI", 9)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.drawText(QRectF(4, 0, self.width - 8, header_h),
+                         Qt.AlignmentFlag.AlignCenter, self.table_name)
+
     def hoverMoveEvent(self, event):
         """Change cursor near resize edges (bottom, right, corner)."""
         mode = self._resize_mode_at(event.pos())
@@ -12,7 +12,7 @@ from PySide6.QtWidgets import (
     QTreeWidget, QTreeWidgetItem, QPushButton, QFileDialog, QLabel,
     QComboBox, QMessageBox
 )
-from PySide6.QtCore import Qt, Signal, QPointF
+from PySide6.QtCore import Qt, Signal, QPointF, QRectF
 from PySide6.QtGui import QWheelEvent, QKeyEvent, QAction
 
 from ..widgets.toolbar_builder import ToolbarBuilder
@@ -21,6 +21,7 @@ from ..core.i18n_bridge import tr
 from ...database.config_db import get_config_db
 from ...database.models import ERDiagram, ERDiagramTable
 from ...database.schema_loaders import SchemaLoaderFactory, ForeignKeyInfo, PrimaryKeyInfo
+from ...database.schema_snapshot_store import get_schema_snapshot_store
 
 from .er_diagram.scene import ERDiagramScene
 from .er_diagram.dialogs import NewDiagramDialog, TablePickerDialog
@@ -32,10 +33,33 @@ logger = logging.getLogger(__name__)
 
 
 class ZoomableGraphicsView(QGraphicsView):
-    """QGraphicsView with mouse wheel zoom and delete support."""
+    """QGraphicsView with mouse wheel zoom and delete support.
+
+    Reports its visible rect and zoom to the scene after every scroll, zoom
+    or resize so off-screen and zoomed-out tables render as plain boxes.
+    """
 
     delete_requested = Signal(list)  # list of table_name strings
 
+    def update_scene_detail(self):
+        """Push the visible scene rect and zoom level to the scene."""
+        scene = self.scene()
+        if scene is not None and hasattr(scene, 'update_visible_detail'):
+            rect = self.mapToScene(self.viewport().rect()).boundingRect()
+            scene.update_visible_detail(rect, self.transform().m11())
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        super().scrollContentsBy(dx, dy)
+        self.update_scene_detail()
+
+    def fitInView(self, *args, **kwargs):
+        super().fitInView(*args, **kwargs)
+        self.update_scene_detail()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_scene_detail()
+
     def wheelEvent(self, event: QWheelEvent):
         if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
             factor = 1.15
@@ -43,6 +67,7 @@ class ZoomableGraphicsView(QGraphicsView):
                 self.scale(factor, factor)
             else:
                 self.scale(1 / factor, 1 / factor)
+            self.update_scene_detail()
             event.accept()
         else:
             # Plain wheel → forward to scene (scrolls table columns or pans view)
@@ -169,6 +194,10 @@ class ZoomableGraphicsView(QGraphicsView):
                 tbl = tbl.parentItem()
             if isinstance(tbl, ERTableItem):
                 menu = QMenu(self)
+                pin_action = QAction(tr("er_unpin_table" if tbl.pinned else "er_pin_table"), self)
+                pin_action.triggered.connect(lambda: self._toggle_pinned(tbl))
+                menu.addAction(pin_action)
+                menu.addSeparator()
                 action = QAction(tr("er_remove_table"), self)
                 action.triggered.connect(lambda: self.delete_requested.emit([tbl.table_name]))
                 menu.addAction(action)
@@ -352,7 +381,7 @@ class ZoomableGraphicsView(QGraphicsView):
         if len(verts) < 4:
             return
         scene = line.scene()
-        if not scene or not hasattr(scene, '_table_items'):
+        if not scene or not hasattr(scene, 'tables_in_rect'):
             return
 
         GAP = 25
@@ -369,7 +398,9 @@ class ZoomableGraphicsView(QGraphicsView):
             next_pt = verts[corner_idx + 1] if is_from else verts[corner_idx - 1]
 
             moved = False
-            for t in scene._table_items.values():
+            # Only tables whose padded zone can touch the segment (BSP lookup)
+            seg_rect = QRectF(corner, next_pt).normalized().adjusted(-GAP, -GAP, GAP, GAP)
+            for t in scene.tables_in_rect(seg_rect):
                 tpos = t.scenePos()
                 tw, th = t.width, t.height
                 left, right = tpos.x() - GAP, tpos.x() + tw + GAP
@@ -463,6 +494,17 @@ class ZoomableGraphicsView(QGraphicsView):
         line._rebuild_path()
         line.notify_routing_changed()
 
+    def _toggle_pinned(self, table_item):
+        """Pin/unpin a table so auto-layout keeps it in place."""
+        pinned = not table_item.pinned
+        table_item.set_pinned(pinned)
+        mgr = self._find_manager()
+        if mgr and mgr._current_diagram:
+            mgr._current_diagram.update_table_pinned(
+                table_item.table_name, pinned, table_item.schema_name
+            )
+            mgr.mark_dirty()
+
     def _rename_group(self, group_item):
         """Prompt the user for a new title for the group."""
         from PySide6.QtWidgets import QInputDialog
@@ -526,6 +568,8 @@ class ZoomableGraphicsView(QGraphicsView):
             if not rect.isEmpty():
                 self.fitInView(rect.adjusted(-50, -50, 50, 50),
                                Qt.AspectRatioMode.KeepAspectRatio)
+            else:
+                self.update_scene_detail()
 
 
 class ERDiagramManager(QWidget):
@@ -553,6 +597,8 @@ class ERDiagramManager(QWidget):
         # behind the user's back.
         self._dirty = False
         self._loading = False
+        self._layout_worker = None  # running auto-layout (LayoutWorker)
+        self._revalidate_workers: List[Any] = []  # SchemaRevalidateWorker in flight
         self._workspace_manager = None
         # Tab widgets we have rendered previews into, so a save can refresh them
         self._preview_tab_widgets: List[Any] = []
@@ -621,6 +667,8 @@ class ERDiagramManager(QWidget):
         toolbar_builder.add_separator()
         toolbar_builder.add_button("Add Group", self._add_group, icon="folder")
         toolbar_builder.add_button("Reset Layout", self._reset_layout, icon="refresh")
+        toolbar_builder.add_button("Auto Layout", self._auto_layout, icon="view",
+                                   tooltip=tr("er_auto_layout_tooltip"))
         toolbar_builder.add_separator()
         toolbar_builder.add_button("Delete", self._delete_diagram, icon="delete")
 
@@ -1017,10 +1065,25 @@ class ERDiagramManager(QWidget):
             DialogHelper.error(f"Cannot create schema loader: {e}", parent=self)
             return None
 
-        # Load metadata - retry once if the FK query comes back empty (cold connection)
+        # A stored snapshot with keys is used at once and checked against the
+        # live catalog in the background; only the first load waits for it.
+        store = get_schema_snapshot_store()
         table_names = diagram.get_table_names()
-        foreign_keys = loader.load_foreign_keys(table_names, diagram.database_name)
-        if not foreign_keys and table_names:
+        wanted = set(table_names)
+        try:
+            snapshot = store.get_cached(db_conn.id, diagram.database_name or "")
+            if (snapshot is not None and snapshot.foreign_keys is not None
+                    and snapshot.primary_keys is not None):
+                self._revalidate_snapshot(diagram, db_conn, connection)
+            else:
+                snapshot = store.load(loader, db_conn.id, diagram.database_name, with_keys=True)
+        except Exception as e:
+            logger.error(f"Schema snapshot load failed: {e}")
+            DialogHelper.error(f"Cannot load schema: {e}", parent=self)
+            return None
+
+        # Retry once if a freshly loaded FK list comes back empty (cold connection)
+        if not snapshot.foreign_keys and table_names and not snapshot.is_cached:
             logger.warning("FK query returned empty - retrying after reconnect")
             connection = self._database_manager.reconnect_database(diagram.connection_id)
             if connection:
@@ -1029,11 +1092,17 @@ class ERDiagramManager(QWidget):
                         db_conn.db_type, connection, db_conn.id,
                         diagram.database_name or db_conn.name
                     )
-                    foreign_keys = loader.load_foreign_keys(table_names, diagram.database_name)
+                    store.refresh_keys(loader, snapshot)
                 except Exception as e:
                     logger.error(f"FK retry failed: {e}")
-        logger.info(f"FK loaded: {len(foreign_keys)} entries")
-        primary_keys = loader.load_primary_keys(table_names, diagram.database_name)
+
+        foreign_keys = [fk for fk in snapshot.foreign_keys or []
+                        if fk.from_table in wanted or fk.to_table in wanted]
+        primary_keys = [pk for pk in snapshot.primary_keys or []
+                        if pk.table_name in wanted]
+        logger.info(f"FK loaded: {len(foreign_keys)} entries"
+                    f"{' (snapshot)' if snapshot.is_cached else ''}")
+        columns_by_table = snapshot.table_columns()
 
         pk_by_table: Dict[str, List[str]] = {}
         for pk in primary_keys:
@@ -1049,11 +1118,17 @@ class ERDiagramManager(QWidget):
         scene.set_group_fks(diagram.group_fks)
 
         for dt in diagram.tables:
-            try:
-                col_nodes = loader.load_columns(dt.table_name)
+            qualified = f"{dt.schema_name}.{dt.table_name}" if dt.schema_name else ""
+            col_nodes = columns_by_table.get(qualified) or columns_by_table.get(dt.table_name)
+            if col_nodes is None:
+                try:
+                    col_nodes = loader.load_columns(dt.table_name)
+                except Exception:
+                    col_nodes = None
+            if col_nodes is not None:
                 columns = [{'name': c.name, 'type': c.metadata.get('type', '')}
                            for c in col_nodes]
-            except Exception:
+            else:
                 columns = [{'name': '(error loading columns)', 'type': ''}]
 
             scene.add_table(
@@ -1064,6 +1139,7 @@ class ERDiagramManager(QWidget):
                 schema_name=dt.schema_name,
                 pos_x=dt.pos_x, pos_y=dt.pos_y,
                 width=dt.width, height=dt.height,
+                pinned=dt.pinned,
             )
 
         scene.add_relationships(foreign_keys)
@@ -1085,6 +1161,35 @@ class ERDiagramManager(QWidget):
 
         return scene
 
+    def _revalidate_snapshot(self, diagram: ERDiagram, db_conn, connection):
+        """Rebuild the open diagram if its catalog changed since the stored snapshot."""
+        from .database.connection_worker import SchemaRevalidateWorker
+
+        worker = SchemaRevalidateWorker(db_conn, connection, diagram.database_name or "",
+                                        with_keys=True, parent=self)
+        # Keep a reference: a QThread garbage-collected mid-run takes the app with it
+        self._revalidate_workers.append(worker)
+
+        def changed(_snapshot):
+            current = self._current_diagram
+            if current is None or current.id != diagram.id or self._layout_worker is not None:
+                return
+            logger.info(f"Catalog changed - rebuilding diagram '{current.name}'")
+            dirty = self._dirty
+            self._collect_scene_state()
+            self._load_diagram(current.id, model=current)
+            if dirty:
+                self.mark_dirty()
+
+        def finished():
+            if worker in self._revalidate_workers:
+                self._revalidate_workers.remove(worker)
+            worker.deleteLater()
+
+        worker.snapshot_changed.connect(changed)
+        worker.finished.connect(finished)
+        worker.start()
+
     def _load_diagram_impl(self, diagram_id: str, model: Optional[ERDiagram] = None):
         """Build the scene for a diagram and attach it to the editing view."""
         config_db = get_config_db()
@@ -1297,6 +1402,10 @@ class ERDiagramManager(QWidget):
         for table_name, (w, h) in sizes.items():
             self._current_diagram.update_table_size(table_name, w, h)
 
+        pinned = set(self._scene.get_pinned_tables())
+        for t in self._current_diagram.tables:
+            t.pinned = t.table_name in pinned
+
         # Save FK midpoints
         from ...database.models import ERDiagramFKMidpoint, ERDiagramGroup
         midpoints_data = self._scene.get_fk_midpoints()
@@ -1409,6 +1518,83 @@ class ERDiagramManager(QWidget):
         except Exception:
             pass
 
+    def _auto_layout(self):
+        """Ask for a layout mode and arrange the tables in a LayoutWorker.
+
+        Pinned tables stay where they are and grouped tables are kept
+        together. Like Reset Layout, the result is not saved until the user
+        saves the diagram.
+        """
+        if not self._current_diagram or not self._scene:
+            DialogHelper.warning(tr("er_no_diagram_selected"), parent=self)
+            return
+        if self._layout_worker is not None:
+            return
+
+        from PySide6.QtWidgets import QMenu
+        from PySide6.QtGui import QCursor
+        menu = QMenu(self)
+        force_action = menu.addAction(tr("er_layout_force"))
+        layered_action = menu.addAction(tr("er_layout_layered"))
+        chosen = menu.exec(QCursor.pos())
+        if chosen is None:
+            return
+        mode = "layered" if chosen is layered_action else "force"
+
+        from PySide6.QtWidgets import QProgressDialog
+        from .er_diagram.layout_worker import LayoutWorker
+        scene = self._scene
+        graph = scene.layout_graph()
+
+        progress = QProgressDialog(tr("er_layout_running"), tr("btn_cancel"), 0, 100, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.setValue(0)
+
+        worker = LayoutWorker(graph, mode, parent=self)
+        self._layout_worker = worker
+
+        def cleanup():
+            # Closing the dialog emits canceled: detach first so that is a no-op
+            progress.canceled.disconnect(on_canceled)
+            progress.close()
+
+        def on_layout_ready(positions):
+            cleanup()
+            self._on_auto_layout_done(scene, positions, graph.groups)
+
+        def on_error(message):
+            cleanup()
+            DialogHelper.warning(tr("er_layout_failed").format(error=message), parent=self)
+
+        def on_canceled():
+            worker.cancel()
+
+        def on_thread_finished():
+            # The thread is released once run() has returned - never waited on
+            if self._layout_worker is worker:
+                self._layout_worker = None
+            progress.close()
+            progress.deleteLater()
+            worker.deleteLater()
+
+        worker.progress.connect(
+            lambda current, total, _step: progress.setValue(int(current * 100 / max(total, 1)))
+        )
+        worker.layout_ready.connect(on_layout_ready)
+        worker.error.connect(on_error)
+        worker.finished.connect(on_thread_finished)
+        progress.canceled.connect(on_canceled)
+        worker.start()
+
+    def _on_auto_layout_done(self, scene, positions: Dict[str, tuple], groups: Dict[str, str]):
+        """Apply a computed layout if its diagram is still the one displayed."""
+        if scene is not self._scene:
+            return
+        scene.apply_layout(positions, groups)
+        self.mark_dirty()
+        self._fit_view()
+
     def _add_group(self):
         """Create a new visual group frame centered in the current viewport."""
         if not self._current_diagram or not self._scene:
@@ -12,7 +12,7 @@ import logging
 import subprocess
 import platform
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Set, Tuple
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
@@ -21,7 +21,7 @@ from PySide6.QtWidgets import (
     QScrollArea, QGroupBox, QFormLayout, QFrame,
     QMenu, QApplication, QFileDialog, QInputDialog
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer, QSize
 from PySide6.QtGui import QPixmap, QAction, QIcon
 
 from ..core.i18n_bridge import tr
@@ -33,12 +33,26 @@ from ...database.config_db import (
     get_config_db, ImageRootfolder, SavedImage
 )
 from ...utils.image_scanner import ImageScanner, create_rootfolder_and_scan
+from ...utils.thumbnail_cache import Thumbnail, get_thumbnail_cache
 
 logger = logging.getLogger(__name__)
 
 # Supported image extensions for display
 IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp", ".ico", ".svg"}
 
+# Image items added per event-loop turn when a folder is expanded
+TREE_CHUNK_SIZE = 500
+
+# Preview box of the details page
+PREVIEW_SIZE = QSize(600, 400)
+
+# Images decoded ahead of the selection, on each side
+PREFETCH_NEIGHBORS = 2
+
+# Search results fetched per page, and typing pause before searching (ms)
+SEARCH_PAGE_SIZE = 200
+SEARCH_DELAY_MS = 250
+
 
 class ImageLibraryManager(QWidget):
     """
@@ -65,6 +79,17 @@ class ImageLibraryManager(QWidget):
         self._tree_items: Dict[str, QTreeWidgetItem] = {}
         self._workspace_filter: Optional[str] = None
 
+        # Tree data from the last refresh, keyed by (rootfolder_id, physical_path)
+        self._folder_images: Dict[Tuple[str, str], List[Tuple[SavedImage, bool]]] = {}
+        self._folder_children: Dict[Tuple[str, str], Set[str]] = {}
+        self._category_images: Dict[str, List[Tuple[SavedImage, bool]]] = {}
+        self._tree_generation = 0
+        self._search_active = False
+        self._search_shown = 0
+
+        self._thumbnails = get_thumbnail_cache()
+        self._thumbnails.thumbnail_ready.connect(self._on_thumbnail_ready)
+
         self._setup_ui()
         self._setup_connections()
         self.refresh()
@@ -278,10 +303,20 @@ class ImageLibraryManager(QWidget):
         self.tree.itemClicked.connect(self._on_tree_item_clicked)
         self.tree.itemDoubleClicked.connect(self._on_tree_item_double_clicked)
         self.tree.customContextMenuRequested.connect(self._on_context_menu)
+        self.tree.itemExpanded.connect(self._on_item_expanded)
 
         self.search_input.returnPressed.connect(self._perform_search)
         self.search_btn.clicked.connect(self._perform_search)
 
+        # Search as you type, once typing pauses
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self._perform_search)
+        self.search_input.textChanged.connect(self._search_timer.start)
+        for checkbox in (self.search_name_cb, self.search_category_cb, self.search_tag_cb):
+            checkbox.toggled.connect(self._search_timer.start)
+
     # ==================== ManagerProtocol Implementation ====================
 
     def set_workspace_filter(self, workspace_id: Optional[str]) -> None:
@@ -313,6 +348,7 @@ class ImageLibraryManager(QWidget):
         """Refresh the entire tree."""
         self.tree.clear()
         self._tree_items.clear()
+        self._tree_generation += 1
 
         self._load_folders_section()
         self._load_categories_section()
@@ -326,6 +362,9 @@ class ImageLibraryManager(QWidget):
         folders_item.setExpanded(True)
         self._tree_items["folders_root"] = folders_item
 
+        # One query for every image; folders are filled when expanded
+        self._build_folder_index(self.config_db.get_image_tree_entries())
+
         # Load rootfolders
         rootfolders = self.config_db.get_all_image_rootfolders()
         for rf in rootfolders:
@@ -338,8 +377,28 @@ class ImageLibraryManager(QWidget):
         })
         add_item.setForeground(0, Qt.GlobalColor.gray)
 
+    def _build_folder_index(self, entries: List[Tuple[SavedImage, bool]]):
+        """Group (image, has_metadata) entries by folder and list each folder's subfolders."""
+        self._folder_images = {}
+        self._folder_children = {}
+        for image, has_metadata in entries:
+            path = image.physical_path or ""
+            self._folder_images.setdefault((image.rootfolder_id, path), []).append(
+                (image, has_metadata))
+
+            # Register the folder chain up to the rootfolder
+            parent = ""
+            for part in path.split("/") if path else []:
+                current = f"{parent}/{part}" if parent else part
+                self._folder_children.setdefault((image.rootfolder_id, parent), set()).add(part)
+                parent = current
+
+    def _folder_has_content(self, rootfolder_id: str, physical_path: str) -> bool:
+        key = (rootfolder_id, physical_path)
+        return key in self._folder_images or key in self._folder_children
+
     def _add_rootfolder_to_tree(self, rootfolder: ImageRootfolder, parent_item: QTreeWidgetItem):
-        """Add a rootfolder and its physical structure to the tree."""
+        """Add a rootfolder to the tree (its content loads on expand)."""
         rf_item = QTreeWidgetItem(parent_item, [f"📁 {rootfolder.name}"])
         rf_item.setData(0, Qt.ItemDataRole.UserRole, {
             "type": "image_rootfolder",
@@ -347,58 +406,48 @@ class ImageLibraryManager(QWidget):
         })
         self._tree_items[f"rf_{rootfolder.id}"] = rf_item
 
-        # Get physical paths and build tree structure
-        physical_paths = self.config_db.get_image_physical_paths(rootfolder.id)
-
-        # Build hierarchical structure
-        path_items = {}
-        for path in physical_paths:
-            if not path:  # Images at root level
-                continue
-
-            parts = path.split("/")
-            current_parent = rf_item
-            current_path = ""
-
-            for part in parts:
-                current_path = f"{current_path}/{part}" if current_path else part
-                item_key = f"rf_{rootfolder.id}_{current_path}"
-
-                if item_key not in path_items:
-                    folder_item = QTreeWidgetItem(current_parent, [f"📁 {part}"])
-                    folder_item.setData(0, Qt.ItemDataRole.UserRole, {
-                        "type": "physical_folder",
-                        "rootfolder": rootfolder,
-                        "physical_path": current_path
-                    })
-                    path_items[item_key] = folder_item
-                    self._tree_items[item_key] = folder_item
-
-                current_parent = path_items[item_key]
-
-        # Add images at each level
-        self._add_images_to_folder(rootfolder.id, "", rf_item)
-        for path in physical_paths:
-            if path:
-                item_key = f"rf_{rootfolder.id}_{path}"
-                if item_key in path_items:
-                    self._add_images_to_folder(rootfolder.id, path, path_items[item_key])
-
-    def _add_images_to_folder(self, rootfolder_id: str, physical_path: str, parent_item: QTreeWidgetItem):
-        """Add images to a folder item."""
-        images = self.config_db.get_images_by_physical_path(rootfolder_id, physical_path)
-        for img in images:
-            self._add_image_to_tree(img, parent_item)
-
-    def _add_image_to_tree(self, image: SavedImage, parent_item: QTreeWidgetItem):
+        if self._folder_has_content(rootfolder.id, ""):
+            self._add_dummy_child(rf_item)
+
+    def _populate_folder(self, rootfolder: ImageRootfolder, physical_path: str,
+                         folder_item: QTreeWidgetItem):
+        """Add the subfolders and images of one physical folder."""
+        for name in sorted(self._folder_children.get((rootfolder.id, physical_path), ())):
+            child_path = f"{physical_path}/{name}" if physical_path else name
+            child_item = QTreeWidgetItem(folder_item, [f"📁 {name}"])
+            child_item.setData(0, Qt.ItemDataRole.UserRole, {
+                "type": "physical_folder",
+                "rootfolder": rootfolder,
+                "physical_path": child_path
+            })
+            self._tree_items[f"rf_{rootfolder.id}_{child_path}"] = child_item
+            if self._folder_has_content(rootfolder.id, child_path):
+                self._add_dummy_child(child_item)
+
+        self._add_images_chunked(self._folder_images.get((rootfolder.id, physical_path), []),
+                                 folder_item)
+
+    def _add_images_chunked(self, entries: List[Tuple[SavedImage, bool]],
+                            parent_item: QTreeWidgetItem, start: int = 0):
+        """Add image items, yielding to the event loop between chunks."""
+        generation = self._tree_generation
+        for image, has_metadata in entries[start:start + TREE_CHUNK_SIZE]:
+            self._add_image_to_tree(image, parent_item, has_metadata)
+
+        next_start = start + TREE_CHUNK_SIZE
+        if next_start < len(entries):
+            def add_next_chunk():
+                # Items of a cleared tree are gone
+                if generation == self._tree_generation:
+                    self._add_images_chunked(entries, parent_item, next_start)
+            QTimer.singleShot(0, add_next_chunk)
+
+    def _add_image_to_tree(self, image: SavedImage, parent_item: QTreeWidgetItem,
+                           has_metadata: bool = False):
         """Add an image item to the tree."""
-        # Check if image has categories or tags
-        categories = self.config_db.get_image_categories(image.id)
-        tags = self.config_db.get_image_tags(image.id)
-
         # Icon based on having categories/tags
         icon = "🖼️"
-        if categories or tags:
+        if has_metadata:
             icon = "🖼️⭐"  # Star indicates it has metadata
 
         img_item = QTreeWidgetItem(parent_item, [f"{icon} {image.name}"])
@@ -408,6 +457,11 @@ class ImageLibraryManager(QWidget):
         })
         self._tree_items[f"img_{image.id}"] = img_item
 
+    @staticmethod
+    def _add_dummy_child(item: QTreeWidgetItem):
+        dummy = QTreeWidgetItem(item, [tr("loading")])
+        dummy.setData(0, Qt.ItemDataRole.UserRole, {"type": "dummy"})
+
     def _load_categories_section(self):
         """Load the Catégories (logical categories) section."""
         cat_item = QTreeWidgetItem(self.tree, ["🏷️ " + tr("image_categories")])
@@ -417,22 +471,19 @@ class ImageLibraryManager(QWidget):
         cat_item.setExpanded(True)
         self._tree_items["categories_root"] = cat_item
 
-        # Load logical categories
-        category_names = self.config_db.get_all_image_category_names()
-        for cat_name in category_names:
-            images = self.config_db.get_images_by_category(cat_name)
-            count = len(images)
+        # Load logical categories (images are added when a category is expanded)
+        self._category_images = {}
+        for cat_name, image, has_metadata in self.config_db.get_image_category_entries():
+            self._category_images.setdefault(cat_name, []).append((image, has_metadata))
 
-            cat_folder = QTreeWidgetItem(cat_item, [f"📁 {cat_name} ({count})"])
+        for cat_name, entries in self._category_images.items():
+            cat_folder = QTreeWidgetItem(cat_item, [f"📁 {cat_name} ({len(entries)})"])
             cat_folder.setData(0, Qt.ItemDataRole.UserRole, {
                 "type": "logical_category",
                 "name": cat_name
             })
             self._tree_items[f"cat_{cat_name}"] = cat_folder
-
-            # Add images in this category
-            for img in images:
-                self._add_image_to_tree(img, cat_folder)
+            self._add_dummy_child(cat_folder)
 
         # Add "Create category" item
         add_item = QTreeWidgetItem(cat_item, ["+" + tr("image_create_category")])
@@ -443,6 +494,25 @@ class ImageLibraryManager(QWidget):
 
     # ==================== Tree Interactions ====================
 
+    def _on_item_expanded(self, item: QTreeWidgetItem):
+        """Fill a folder or category the first time it is expanded."""
+        if item.childCount() != 1:
+            return
+        first_child = item.child(0)
+        child_data = first_child.data(0, Qt.ItemDataRole.UserRole) or {}
+        if child_data.get("type") != "dummy":
+            return
+        item.removeChild(first_child)
+
+        data = item.data(0, Qt.ItemDataRole.UserRole) or {}
+        item_type = data.get("type", "")
+        if item_type == "image_rootfolder":
+            self._populate_folder(data["obj"], "", item)
+        elif item_type == "physical_folder":
+            self._populate_folder(data["rootfolder"], data["physical_path"], item)
+        elif item_type == "logical_category":
+            self._add_images_chunked(self._category_images.get(data["name"], []), item)
+
     def _on_tree_item_clicked(self, item: QTreeWidgetItem, column: int):
         """Handle tree item click."""
         data = item.data(0, Qt.ItemDataRole.UserRole) or {}
@@ -460,6 +530,11 @@ class ImageLibraryManager(QWidget):
 
         if item_type == "add_rootfolder":
             self._add_rootfolder()
+        elif item_type == "search_more":
+            self._load_more_search_results(item)
+        elif item_type == "clear_search":
+            self.search_input.clear()
+            self._perform_search()
         elif item_type == "add_category":
             self._create_category()
         elif item_type in ("image_rootfolder", "physical_folder", "logical_category",
@@ -553,26 +628,19 @@ class ImageLibraryManager(QWidget):
         format_str = "-"
         modified_str = "-"
 
-        # Load image and get metadata
+        # Load image (decoded in the background unless cached) and get metadata
         if not filepath.exists():
             self.preview_label.setText(tr("image_file_not_found") + f":\n{image.filepath}")
             self.preview_label.setStyleSheet("QLabel { color: red; background-color: #2d2d2d; }")
         else:
-            pixmap = QPixmap(str(filepath))
-            if pixmap.isNull():
-                self.preview_label.setText(tr("image_cannot_load"))
+            thumbnail = self._thumbnails.request(image.filepath, PREVIEW_SIZE)
+            if thumbnail is None:
+                self.preview_label.setText(tr("loading"))
+                self.preview_label.setStyleSheet("QLabel { color: gray; background-color: #2d2d2d; }")
             else:
-                # Scale to fit
-                scaled = pixmap.scaled(
-                    600, 400,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                self.preview_label.setPixmap(scaled)
-                self.preview_label.setStyleSheet("QLabel { background-color: #2d2d2d; }")
-
-                # Image dimensions
-                dimensions_str = f"{pixmap.width()} x {pixmap.height()} px"
+                self._set_preview(thumbnail)
+                dimensions_str = self._format_dimensions(thumbnail)
+            self._prefetch_neighbors(image)
 
             # File size
             try:
@@ -629,6 +697,34 @@ class ImageLibraryManager(QWidget):
 
         self.image_selected.emit(image)
 
+    def _set_preview(self, thumbnail: Thumbnail):
+        self.preview_label.setPixmap(QPixmap.fromImage(thumbnail.image))
+        self.preview_label.setStyleSheet("QLabel { background-color: #2d2d2d; }")
+
+    @staticmethod
+    def _format_dimensions(thumbnail: Thumbnail) -> str:
+        return f"{thumbnail.source_size.width()} x {thumbnail.source_size.height()} px"
+
+    def _on_thumbnail_ready(self, path: str, box: QSize, thumbnail: Optional[Thumbnail]):
+        """Show a preview decoded in the background if it is still the selected image."""
+        if box != PREVIEW_SIZE or not self._current_image or self._current_image.filepath != path:
+            return
+        if thumbnail is None:
+            self.preview_label.setText(tr("image_cannot_load"))
+            return
+        self._set_preview(thumbnail)
+        self.detail_dimensions.setText(self._format_dimensions(thumbnail))
+
+    def _prefetch_neighbors(self, image: SavedImage):
+        """Decode the images around the selection so arrow-key browsing is instant."""
+        images = self._build_image_list()
+        index = next((i for i, img in enumerate(images) if img.id == image.id), None)
+        if index is None:
+            return
+        neighbors = images[index + 1:index + 1 + PREFETCH_NEIGHBORS] + \
+            images[max(0, index - PREFETCH_NEIGHBORS):index][::-1]
+        self._thumbnails.prefetch([img.filepath for img in neighbors], PREVIEW_SIZE)
+
     # ==================== Actions ====================
 
     def _add_rootfolder(self):
@@ -955,38 +1051,78 @@ class ImageLibraryManager(QWidget):
     # ==================== Search ====================
 
     def _perform_search(self):
-        """Perform image search."""
+        """Perform image search (first page of ranked results)."""
+        self._search_timer.stop()
         query = self.search_input.text().strip()
         if not query:
-            self.refresh()
+            if self._search_active:
+                self._search_active = False
+                self.refresh()
             return
 
         # Search with selected filters
-        results = self.config_db.search_images(
-            query,
-            search_name=self.search_name_cb.isChecked(),
-            search_categories=self.search_category_cb.isChecked(),
-            search_tags=self.search_tag_cb.isChecked()
-        )
+        filters = self._search_filters()
+        total = self.config_db.count_image_search(query, **filters)
+        results = self.config_db.search_images(query, limit=SEARCH_PAGE_SIZE, **filters)
 
         # Display results
         self.tree.clear()
         self._tree_items.clear()
+        self._tree_generation += 1
+        self._search_active = True
+        self._search_shown = 0
 
-        results_item = QTreeWidgetItem(self.tree, ["🔍 " + tr("image_search_results", count=len(results))])
+        results_item = QTreeWidgetItem(self.tree, ["🔍 " + tr("image_search_results", count=total)])
         results_item.setData(0, Qt.ItemDataRole.UserRole, {"type": "search_results"})
         results_item.setExpanded(True)
 
-        for img in results:
-            self._add_image_to_tree(img, results_item)
+        self._add_search_results(results_item, query, results, total)
 
         # Add "Clear search" item
         clear_item = QTreeWidgetItem(results_item, ["✕ " + tr("image_clear_search")])
         clear_item.setData(0, Qt.ItemDataRole.UserRole, {"type": "clear_search"})
         clear_item.setForeground(0, Qt.GlobalColor.gray)
 
+    def _search_filters(self) -> dict:
+        return {
+            "search_name": self.search_name_cb.isChecked(),
+            "search_categories": self.search_category_cb.isChecked(),
+            "search_tags": self.search_tag_cb.isChecked(),
+        }
+
+    def _add_search_results(self, results_item: QTreeWidgetItem, query: str,
+                            results: List[SavedImage], total: int):
+        """Add a page of results, followed by a "more" item if some are left."""
+        with_metadata = self.config_db.get_image_ids_with_metadata([img.id for img in results])
+        insert_at = self._search_shown
+        for img in results:
+            self._add_image_to_tree(img, results_item, img.id in with_metadata)
+            # Keep the page before the trailing "more"/"clear" items
+            item = results_item.takeChild(results_item.childCount() - 1)
+            results_item.insertChild(insert_at, item)
+            insert_at += 1
+        self._search_shown += len(results)
+
+        remaining = total - self._search_shown
+        if remaining > 0 and results:
+            more_item = QTreeWidgetItem(["… " + tr("image_search_more", remaining=remaining)])
+            more_item.setData(0, Qt.ItemDataRole.UserRole, {"type": "search_more", "query": query,
+                                                            "total": total})
+            more_item.setForeground(0, Qt.GlobalColor.gray)
+            results_item.insertChild(insert_at, more_item)
+
+    def _load_more_search_results(self, more_item: QTreeWidgetItem):
+        """Replace the "more" item with the next page of results."""
+        data = more_item.data(0, Qt.ItemDataRole.UserRole) or {}
+        results_item = more_item.parent()
+        results_item.removeChild(more_item)
+        results = self.config_db.search_images(data["query"], limit=SEARCH_PAGE_SIZE,
+                                               offset=self._search_shown, **self._search_filters())
+        self._add_search_results(results_item, data["query"], results, data["total"])
+
     def cleanup(self):
         """Release held references."""
         self._current_image = None
+        self._tree_generation += 1
         if hasattr(self, '_tree_items'):
             self._tree_items.clear()
@@ -22,6 +22,8 @@ from ..widgets.workspace_menu_builder import build_workspace_menu
 from ..utils.ui_helper import UIHelper
 from ..core.i18n_bridge import tr
 from ...database.config_db import get_config_db, Job
+from ...core.job_runner import build_job_plan, JobPlanError, STATUS_SUCCESS, STATUS_FAILED
+from ..workers.job_workers import JobRunWorker, log_job_outcome
 from ...utils.image_loader import get_icon
 from ..dialogs.job_dialog import JobDialog
 
@@ -48,6 +50,7 @@ class JobsManager(HierarchicalManagerView):
 
     def __init__(self, parent=None):
         self._workspace_manager: Optional["WorkspaceManager"] = None
+        self._run_worker: Optional[JobRunWorker] = None
         super().__init__(parent)
 
     def set_workspace_manager(self, workspace_manager: "WorkspaceManager"):
@@ -267,9 +270,7 @@ class JobsManager(HierarchicalManagerView):
             DialogHelper.warning(tr("select_job_first"), tr("run_job_title"), self)
             return
 
-        self.log_panel.clear()
-        self.log_panel.add_message(tr("job_execution_started"), "INFO")
-        DialogHelper.info(tr("feature_coming_soon"), tr("run_job_title"), self)
+        self.run_job_by_obj(self._current_item)
 
     def _toggle_job(self):
         """Toggle job enabled/disabled status."""
@@ -308,12 +309,84 @@ class JobsManager(HierarchicalManagerView):
         """
         Run a specific job immediately.
 
+        Atomic jobs and every job of a workflow run in a process pool;
+        progress streams to the log panel.
+
         Args:
             job: Job object to run
         """
+        if self._run_worker is not None:
+            DialogHelper.warning(tr("job_already_running"), tr("run_job_title"), self)
+            return
+
         self.log_panel.clear()
+        try:
+            tasks = build_job_plan(job, get_config_db())
+        except JobPlanError as e:
+            self.log_panel.add_message(str(e), "ERROR")
+            DialogHelper.error(str(e), tr("run_job_title"), self)
+            return
+        if not tasks:
+            self.log_panel.add_message(tr("job_nothing_to_run"), "WARNING")
+            return
+
         self.log_panel.add_message(tr("job_execution_started"), "INFO")
-        DialogHelper.info(tr("feature_coming_soon"), tr("run_job_title"), self)
+        worker = JobRunWorker(tasks)
+        worker.job_started.connect(
+            lambda _job_id, name: self.log_panel.add_message(tr("job_task_started", name=name), "INFO")
+        )
+        worker.job_finished.connect(self._on_job_task_finished)
+        worker.run_finished.connect(lambda outcomes: self._on_job_run_finished(job, outcomes))
+        worker.error.connect(self._on_job_run_error)
+        worker.finished.connect(self._release_run_worker)
+        self._run_worker = worker
+        worker.start()
+
+    def _on_job_task_finished(self, outcome):
+        """Log a finished task and record its run."""
+        log_job_outcome(self.log_panel, outcome)
+        if outcome.status in (STATUS_SUCCESS, STATUS_FAILED):
+            get_config_db().update_job_last_run(outcome.job_id)
+
+    def _on_job_run_finished(self, job: Job, outcomes: Dict):
+        """Summarize a run and refresh the displayed last run time."""
+        if job.is_workflow():
+            get_config_db().update_job_last_run(job.id)
+
+        statuses = [o.status for o in outcomes.values()]
+        succeeded = statuses.count(STATUS_SUCCESS)
+        failed = statuses.count(STATUS_FAILED)
+        self.log_panel.add_message(
+            tr("job_run_summary", succeeded=succeeded, failed=failed,
+               not_run=len(statuses) - succeeded - failed),
+            "ERROR" if failed else "IMPORTANT"
+        )
+
+        if self._current_item is not None:
+            current = get_config_db().get_job(self._current_item.id)
+            if current is not None:
+                self._current_item.last_run_at = current.last_run_at
+                self.details_form.set_value("last_run", current.last_run_at or "")
+
+    def _on_job_run_error(self, message: str):
+        self.log_panel.add_message(message, "ERROR")
+
+    def _release_run_worker(self):
+        """Drop the run worker once its thread has finished (QThread.finished)."""
+        if self._run_worker is not None:
+            self._run_worker.deleteLater()
+            self._run_worker = None
+
+    def stop_run(self):
+        """Stop a running job and wait (bounded) for its thread; GUI thread, at app close."""
+        if self._run_worker is not None:
+            self._run_worker.stop()
+
+    def cleanup(self):
+        """Stop starting new jobs; the worker releases itself when its thread ends."""
+        if self._run_worker is not None:
+            self._run_worker.cancel()
+        self._workspace_manager = None
 
     def toggle_job_by_obj(self, job: Job):
         """
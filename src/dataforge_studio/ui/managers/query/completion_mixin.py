@@ -166,37 +166,34 @@ class QueryCompletionMixin:
         if context is None:
             context, prefix, table_name = self._get_context()
 
-        suggestions = []
-
         try:
             if force:
                 # Show everything
-                tables = self.schema_cache.get_tables(self.connection, self.db_type)
-                columns = self.schema_cache.get_all_columns(self.connection, self.db_type)
-                suggestions = sorted(set(tables + columns))
-
-            elif context == "table":
-                # After FROM/JOIN - show tables
-                suggestions = self.schema_cache.get_tables(self.connection, self.db_type)
+                index = self.schema_cache.get_completion_index(self.connection, self.db_type)
 
-            elif context == "column":
-                # After SELECT/WHERE - show all columns
-                suggestions = self.schema_cache.get_all_columns(self.connection, self.db_type)
+            elif context in ("table", "column"):
+                # After FROM/JOIN - tables; after SELECT/WHERE - all columns
+                index = self.schema_cache.get_completion_index(
+                    self.connection, self.db_type, context
+                )
 
             elif context == "table_column" and table_name:
                 # After table. - show columns for that table
-                suggestions = self.schema_cache.get_columns(
-                    self.connection, self.db_type, table_name
+                index = self.schema_cache.get_completion_index(
+                    self.connection, self.db_type, context, table_name
                 )
 
+            else:
+                return
+
         except Exception as e:
             logger.error(f"Error getting suggestions: {e}")
             return
 
-        if suggestions:
+        if len(index):
             self._completer_prefix = prefix
             cursor_rect = self.sql_editor.cursorRect()
-            self.completer.show_completions(suggestions, prefix, cursor_rect)
+            self.completer.show_completions(index, prefix, cursor_rect)
 
     def _get_context(self) -> Tuple[Optional[str], str, Optional[str]]:
         """
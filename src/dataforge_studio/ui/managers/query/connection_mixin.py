@@ -298,7 +298,7 @@ class QueryConnectionMixin:
         # Try auto-reconnect if server is reachable
         db_manager = self._database_manager
         if db_manager and self.db_connection and hasattr(db_manager, '_is_server_reachable'):
-            if db_manager._is_server_reachable(self.db_connection):
+            if db_manager._is_server_reachable(self.db_connection, max_age=0):
                 self._append_message("-- Connection lost, auto-reconnecting...")
                 self._attempt_reconnection()
                 return
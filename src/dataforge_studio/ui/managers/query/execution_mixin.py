@@ -311,6 +311,74 @@ class QueryExecutionMixin:
 
         self._finalize_execution(stmt_count, select_count, error_occurred)
 
+    # =========================================================================
+    # Batch execution (see SavedQueryBatchExecutor)
+    # =========================================================================
+
+    def _prepare_batch_execution(self):
+        """
+        Split the editor SQL for a run on a batch worker.
+
+        Returns:
+            Statements to run, or None if the query must run in this tab
+            (nothing to run, or session variables that need the tab's connection)
+        """
+        query = self._get_executable_sql()
+        statements = split_sql_statements(query, self.db_type) if query else []
+        if not statements or self._has_session_variables(statements):
+            return None
+
+        self._clear_result_tabs()
+        self.original_query = query
+        self._loading_start_time = time.time()
+        self.load_more_btn.setVisible(False)
+        self.stop_loading_btn.setVisible(False)
+        self.result_info_label.setText(tr("query_executing_statements", count=len(statements)))
+        self.result_info_label.setStyleSheet("color: orange;")
+        self._append_message(f"-- [Batch] Queued {len(statements)} statement(s)...")
+        return statements
+
+    def _apply_batch_result(self, result):
+        """Show the outcome of a batch run (BatchQueryResult) in this tab."""
+        if result.cancelled:
+            self._append_message("-- [Batch] Cancelled before execution", is_error=True)
+            self.result_info_label.setText("✗ Cancelled")
+            self.result_info_label.setStyleSheet("color: red;")
+            return
+
+        for message in result.messages:
+            self._append_message(f"  → {message}")
+
+        for select_count, result_set in enumerate(result.result_sets, start=1):
+            tab_name = self._generate_result_tab_name(result_set.statement.text, select_count)
+            tab_state = self._create_result_tab(result_set.statement_index, tab_name)
+            self._setup_result_grid(tab_state, result_set.columns)
+            tab_state.total_rows_fetched = len(result_set.rows)
+            self._load_data_to_grid(tab_state.grid, result_set.rows)
+
+            if result_set.cursor is not None:
+                # Keep the dedicated connection alive while rows are loading
+                tab_state.grid.setProperty("_parallel_connection", result.connection)
+                tab_state.cursor = result_set.cursor
+                tab_state.has_more_rows = True
+                self._start_background_loading_for_tab(tab_state)
+                self._append_message(f"  → Loading results (first {tab_state.total_rows_fetched} rows)...")
+            else:
+                self._append_message(f"  → {tab_state.total_rows_fetched:,} row(s) returned")
+
+            if select_count == 1:
+                self.results_tab_widget.setCurrentIndex(0)
+                self.results_grid = tab_state.grid
+
+        if result.error is not None:
+            where = (f"statement {result.error_statement + 1}"
+                     if result.error_statement is not None else "connection")
+            self._append_message(f"Error in {where}: {result.error}", is_error=True)
+            self.results_tab_widget.setCurrentIndex(self.results_tab_widget.count() - 1)
+
+        self._finalize_execution(result.statement_count, len(result.result_sets),
+                                 result.error is not None)
+
     def _create_parallel_connection(self):
         """Create a new connection for parallel query execution."""
         try:
@@ -362,6 +430,13 @@ class QueryExecutionMixin:
 
         self._update_loading_buttons()
 
+    def _setup_result_grid(self, tab_state: ResultTabState, columns: list):
+        """Set the columns and context of a result tab's grid."""
+        tab_state.columns = columns
+        tab_state.grid.set_columns(columns)
+        db_name = self.current_database or (self.db_connection.name if self.db_connection else None)
+        tab_state.grid.set_context(db_name=db_name, table_name=f"Query {tab_state.statement_index + 1}")
+
     def _execute_select_statement(self, tab_state: ResultTabState, cursor, stmt: SQLStatement,
                                      is_multi_statement: bool = False):
         """Execute a SELECT statement and load results into its tab.
@@ -373,13 +448,7 @@ class QueryExecutionMixin:
             is_multi_statement: If True, fetch all rows synchronously (no background loading)
                                to avoid "connection busy" errors with SQL Server
         """
-        columns = [column[0] for column in cursor.description]
-        tab_state.columns = columns
-
-        # Setup grid
-        tab_state.grid.set_columns(columns)
-        db_name = self.current_database or (self.db_connection.name if self.db_connection else None)
-        tab_state.grid.set_context(db_name=db_name, table_name=f"Query {tab_state.statement_index + 1}")
+        self._setup_result_grid(tab_state, [column[0] for column in cursor.description])
 
         if is_multi_statement:
             # Multi-statement mode: fetch ALL rows synchronously to free the connection
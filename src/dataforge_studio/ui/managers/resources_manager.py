@@ -24,6 +24,7 @@ from ..widgets.dialog_helper import DialogHelper
 from ..core.i18n_bridge import tr
 from ...database.config_db import get_config_db
 from ...utils.image_loader import get_icon, get_database_icon, get_database_icon_with_dot, get_auto_color
+from ...utils.file_index import get_file_index
 from ..utils.tree_item_builders import (
     get_database_display_icon, get_database_display_name,
     get_rootfolder_display_icon, get_rootfolder_display_name,
@@ -93,6 +94,9 @@ class ResourcesManager(BaseManagerView):
         # Initialize tree configuration
         self._init_tree_config()
 
+        # Rootfolder file count follows the background file index
+        get_file_index().index_updated.connect(self._on_file_index_updated)
+
     # ==================== Workspace Filtering ====================
 
     def set_workspace_filter(self, workspace_id: Optional[str]):
@@ -508,21 +512,25 @@ class ResourcesManager(BaseManagerView):
             else:
                 count = self._count_leaf_items(item)
             text = item.text(0).split(" (")[0]
-            item.setText(0, f"{text} ({count})")
+            item.setText(0, f"{text} ({'…' if count is None else count})")
 
-    def _count_rootfolder_files(self, category_item: QTreeWidgetItem) -> int:
+    def _count_rootfolder_files(self, category_item: QTreeWidgetItem) -> Optional[int]:
         """
         Count total files (not folders) in all root folders.
 
-        Scans the filesystem recursively for each rootfolder to count files.
+        Counts come from the background file index; the category label is
+        updated again by _on_file_index_updated once pending roots are indexed.
 
         Args:
             category_item: The Rootfolders category item
 
         Returns:
-            Total count of files across all root folders
+            Total count of files across all root folders, or None while a
+            root folder is still being indexed
         """
+        index = get_file_index()
         total_files = 0
+        pending = False
 
         for i in range(category_item.childCount()):
             child = category_item.child(i)
@@ -531,20 +539,22 @@ class ResourcesManager(BaseManagerView):
             if data.get("type") == "rootfolder":
                 path_str = data.get("path")
                 if path_str:
-                    root_path = Path(path_str)
-                    if root_path.exists() and root_path.is_dir():
-                        try:
-                            # Count files recursively (not directories)
-                            for _ in root_path.rglob("*"):
-                                if _.is_file():
-                                    total_files += 1
-                        except PermissionError:
-                            # Skip folders we can't access
-                            pass
-                        except Exception as e:
-                            logger.warning(f"Error counting files in {root_path}: {e}")
-
-        return total_files
+                    count = index.file_count(path_str)
+                    if count is None:
+                        pending = pending or Path(path_str).is_dir()
+                    else:
+                        total_files += count
+
+        return None if pending else total_files
+
+    def _on_file_index_updated(self, root_path: str):
+        """Refresh the Rootfolders category count from the file index."""
+        item = self._category_items.get("rootfolders")
+        if item is None:
+            return
+        count = self._count_rootfolder_files(item)
+        text = item.text(0).split(" (")[0]
+        item.setText(0, f"{text} ({'…' if count is None else count})")
 
     def _count_leaf_items(self, item: QTreeWidgetItem) -> int:
         """
@@ -1000,10 +1010,12 @@ class ResourcesManager(BaseManagerView):
             return
 
         try:
-            entries = sorted(path.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower()))
+            folders, files = get_file_index().read_folder(path)
+            entries = [(path / name, True) for name in folders]
+            entries += [(path / name, False) for name in files]
 
-            for entry in entries:
-                if entry.is_dir():
+            for entry, is_dir in entries:
+                if is_dir:
                     folder_item = self.tree_view.add_item(
                         parent=parent_item,
                         text=[entry.name],
@@ -24,11 +24,12 @@ from ..widgets.object_viewer_widget import ObjectViewerWidget
 from ..core.i18n_bridge import tr
 from ..utils.tree_helpers import (
     get_file_icon,
-    count_files_recursive,
     populate_tree_with_local_folder,
+    update_folder_counts,
     add_dummy_child,
 )
 from ...database.config_db import get_config_db, FileRoot
+from ...utils.file_index import get_file_index
 from ...utils.image_loader import get_icon
 
 logger = logging.getLogger(__name__)
@@ -53,6 +54,7 @@ class RootFolderManager(QWidget):
         self._current_item: Optional[FileRoot] = None
 
         self._setup_ui()
+        get_file_index().index_updated.connect(self._on_index_updated)
 
     def showEvent(self, event):
         """Override showEvent to lazy-load data on first show"""
@@ -175,9 +177,11 @@ class RootFolderManager(QWidget):
         if root_icon:
             root_item.setIcon(0, root_icon)
 
-        file_count = count_files_recursive(root_path)
+        file_count = get_file_index().file_count(root_path)
         display_name = root_folder.name or root_path.name
-        root_item.setText(0, f"{display_name} ({file_count})")
+        if file_count is not None:
+            display_name = f"{display_name} ({file_count})"
+        root_item.setText(0, display_name)
         root_item.setData(0, Qt.ItemDataRole.UserRole, {
             "type": "rootfolder",
             "rootfolder_obj": root_folder,
@@ -191,6 +195,10 @@ class RootFolderManager(QWidget):
 
     # Note: Folder loading is now handled by tree_helpers.populate_tree_with_local_folder
 
+    def _on_index_updated(self, root_path: str):
+        """Show file counts computed by the background file index"""
+        update_folder_counts(self.file_tree.invisibleRootItem())
+
     # ==================== Tree Event Handlers ====================
 
     def _on_item_expanded(self, item: QTreeWidgetItem):
@@ -533,7 +541,14 @@ class RootFolderManager(QWidget):
         return self.file_tree
 
     def _refresh(self):
-        """Refresh the tree"""
+        """
+        Refresh the tree.
+
+        Listings are read now (read_folder lists changed folders from
+        disk); file counts follow in _on_index_updated once the rescan
+        started here finishes.
+        """
+        get_file_index().refresh()
         self._load_root_folders()
         self.object_viewer.clear()
 
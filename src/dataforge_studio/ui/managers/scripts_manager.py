@@ -28,6 +28,10 @@ from ..widgets.dialog_helper import DialogHelper
 from ..core.i18n_bridge import tr
 from ...database.config_db import get_config_db, Script
 from ...core.script_template_loader import get_template_loader
+from ...core.job_runner import (
+    JobTask, JobPlanError, resolve_job_parameters, resolve_script_entry
+)
+from ..workers.job_workers import JobRunWorker, log_job_outcome
 from ..dialogs.script_dialog import ScriptDialog
 
 import logging
@@ -47,6 +51,7 @@ class ScriptsManager(HierarchicalManagerView):
 
     def __init__(self, parent=None):
         self._workspace_manager: Optional["WorkspaceManager"] = None
+        self._run_worker: Optional[JobRunWorker] = None
         super().__init__(parent)
 
     def set_workspace_manager(self, workspace_manager: "WorkspaceManager"):
@@ -468,12 +473,53 @@ class ScriptsManager(HierarchicalManagerView):
         """
         Run a specific script.
 
+        The script runs once with its default parameter values, in the job
+        process pool. Scripts with required parameters need a Job.
+
         Args:
             script: Script object to run
         """
+        if self._run_worker is not None:
+            DialogHelper.warning(tr("job_already_running"), tr("run_script_title"), self)
+            return
+
+        schema = script.get_parameters()
+        missing = [p.get("label") or p.get("name") for p in script.get_required_parameters()
+                   if p.get("default") in (None, "")]
+        if missing:
+            DialogHelper.warning(tr("script_run_needs_job", params=", ".join(missing)),
+                                 tr("run_script_title"), self)
+            return
+
         self.log_panel.clear()
+        try:
+            file_path, entry_point = resolve_script_entry(script)
+        except JobPlanError as e:
+            self.log_panel.add_message(str(e), "ERROR")
+            DialogHelper.error(str(e), tr("run_script_title"), self)
+            return
+
+        task = JobTask(
+            job_id=script.id, name=script.name,
+            file_path=file_path, entry_point=entry_point,
+            kwargs=resolve_job_parameters({}, schema, get_config_db()),
+        )
         self.log_panel.add_message(tr("script_execution_started"), "INFO")
-        DialogHelper.info(tr("feature_coming_soon"), tr("run_script_title"), self)
+        worker = JobRunWorker([task], max_workers=1)
+        worker.job_finished.connect(lambda outcome: log_job_outcome(self.log_panel, outcome))
+        worker.error.connect(self._on_script_run_error)
+        worker.finished.connect(self._release_run_worker)
+        self._run_worker = worker
+        worker.start()
+
+    def _on_script_run_error(self, message: str):
+        self.log_panel.add_message(message, "ERROR")
+
+    def _release_run_worker(self):
+        """Drop the run worker once its thread has finished (QThread.finished)."""
+        if self._run_worker is not None:
+            self._run_worker.deleteLater()
+            self._run_worker = None
 
     def edit_script_by_obj(self, script: Script):
         """
@@ -548,6 +594,13 @@ class ScriptsManager(HierarchicalManagerView):
 
         return actions
 
+    def stop_run(self):
+        """Stop a running job and wait (bounded) for its thread; GUI thread, at app close."""
+        if self._run_worker is not None:
+            self._run_worker.stop()
+
     def cleanup(self):
-        """Release external references."""
+        """Release external references and stop a running script."""
+        if self._run_worker is not None:
+            self._run_worker.cancel()
         self._workspace_manager = None
@@ -22,10 +22,13 @@ from ..core.i18n_bridge import tr
 from ..utils.tree_helpers import (
     populate_tree_with_local_folder,
     populate_tree_with_remote_files,
+    update_folder_counts,
 )
 from ...database.config_db import get_config_db, Workspace, Script
 from ...database.models.workspace_resource import WorkspaceFileRoot, WorkspaceDatabase
 from ...utils.image_loader import get_icon, get_database_icon, get_database_icon_with_dot, get_auto_color, get_accent_color
+from ...utils.file_index import get_file_index
+from ...utils.workspace_sharing import get_shared_folder_index
 from ..utils.tree_item_builders import (
     get_database_display_icon, get_database_display_name,
     get_rootfolder_display_icon,
@@ -87,6 +90,8 @@ class WorkspaceManager(QWidget):
         self._filter_debounce_timer: Optional["QTimer"] = None  # Debounce timer for filter input
 
         self._setup_ui()
+        get_file_index().index_updated.connect(self._on_file_index_updated)
+        get_shared_folder_index().index_updated.connect(self._on_shared_index_updated)
 
     def set_managers(
         self,
@@ -326,6 +331,8 @@ class WorkspaceManager(QWidget):
         """Expand all items that have dummy children (trigger lazy loading)."""
         for i in range(parent.childCount()):
             child = parent.child(i)
+            if self._is_pruned_by_index(child):
+                continue
             # Check if has dummy child
             if TreePopulator.has_dummy_child(child):
                 child.setExpanded(True)  # Triggers _on_item_expanded
@@ -368,12 +375,35 @@ class WorkspaceManager(QWidget):
         """Check if any items still have dummy children."""
         for i in range(parent.childCount()):
             child = parent.child(i)
+            if self._is_pruned_by_index(child):
+                continue
             if TreePopulator.has_dummy_child(child):
                 return True
             if self._has_lazy_items(child):
                 return True
         return False
 
+    def _is_pruned_by_index(self, item: QTreeWidgetItem) -> bool:
+        """
+        Check if a local folder has nothing matching the pending filter.
+
+        The file index answers without loading the folder, so such folders
+        are not expanded. Folders not indexed yet are expanded as before.
+        """
+        if not self._filter_pending_pattern:
+            return False
+        data = item.data(0, Qt.ItemDataRole.UserRole)
+        if not data or data.get("type") not in ("folder", "rootfolder"):
+            return False
+        path = data.get("path") or data.get("full_path")
+        if not path:
+            return False
+        return get_file_index().contains_match(path, self._filter_pending_pattern) is False
+
+    def _on_file_index_updated(self, root_path: str):
+        """Show file counts computed by the background file index."""
+        update_folder_counts(self.workspace_tree.invisibleRootItem())
+
     def _filter_tree_recursive(self, parent: QTreeWidgetItem, pattern: str) -> bool:
         """
         Recursively filter tree items.
@@ -550,6 +580,13 @@ class WorkspaceManager(QWidget):
             db_cat = self._create_category_item(ws_item, "Databases", "database.png", len(ws_databases))
             self._populate_workspace_databases(db_cat, ws_databases)
 
+            # Probe every server at once and pre-open the reachable ones
+            # while the rest of the tree is built
+            if self._database_manager:
+                self._database_manager.warm_up_connections(
+                    [conn for conn, _ in self._group_databases_by_connection(ws_databases)]
+                )
+
         # Queries
         queries = self.config_db.get_workspace_queries(workspace_id)
         if queries:
@@ -637,6 +674,76 @@ class WorkspaceManager(QWidget):
                 })
                 TreePopulator.add_dummy_child(ftp_item)
 
+        # Resources published to the workspace's shared folder
+        workspace = ws_item.data(0, Qt.ItemDataRole.UserRole).get("workspace_obj")
+        self._add_shared_category(ws_item, getattr(workspace, 'shared_path', "") or "")
+
+    def _add_shared_category(self, ws_item: QTreeWidgetItem, shared_path: str):
+        """
+        Add the diagrams and queries published to a shared folder.
+
+        Reads the shared folder index, so the share is never listed from the
+        GUI thread; _on_shared_index_updated rebuilds the category when a
+        background refresh finds changes.
+        """
+        if not shared_path:
+            return None
+        index = get_shared_folder_index()
+        diagrams = index.diagrams(shared_path)
+        queries = index.queries(shared_path)
+        if not diagrams and not queries:
+            return None
+
+        sh_cat = self._create_category_item(
+            ws_item, "Shared", "folder.png", len(diagrams) + len(queries))
+        for diagram in diagrams:
+            d_item = QTreeWidgetItem(sh_cat)
+            d_icon = get_icon("diagram.png", size=16)
+            if d_icon:
+                d_item.setIcon(0, d_icon)
+            d_item.setText(0, diagram.name)
+            d_item.setToolTip(0, diagram.description or diagram.name)
+            d_item.setData(0, Qt.ItemDataRole.UserRole, {
+                "type": "er_diagram",
+                "id": diagram.id,
+                "resource_obj": diagram
+            })
+        for query in queries:
+            name = query.get("name", "")
+            q_item = QTreeWidgetItem(sh_cat)
+            q_icon = get_icon("query.png", size=16)
+            if q_icon:
+                q_item.setIcon(0, q_icon)
+            q_item.setText(0, name)
+            q_item.setToolTip(0, query.get("description") or name)
+            q_item.setData(0, Qt.ItemDataRole.UserRole, {
+                "type": "shared_query",
+                "id": query.get("id", ""),
+                "resource_obj": query
+            })
+        return sh_cat
+
+    def _on_shared_index_updated(self, shared_path: str):
+        """Rebuild the Shared category of loaded workspaces using this folder."""
+        for i in range(self.workspace_tree.topLevelItemCount()):
+            ws_item = self.workspace_tree.topLevelItem(i)
+            data = ws_item.data(0, Qt.ItemDataRole.UserRole) or {}
+            workspace = data.get("workspace_obj")
+            if getattr(workspace, 'shared_path', None) != shared_path:
+                continue
+            if TreePopulator.has_dummy_child(ws_item):
+                continue  # Not loaded yet: expanding it reads the fresh index
+
+            expanded = ws_item.isExpanded()
+            for j in reversed(range(ws_item.childCount())):
+                child_data = ws_item.child(j).data(0, Qt.ItemDataRole.UserRole) or {}
+                if child_data.get("type") == "resource_category" and child_data.get("name") == "Shared":
+                    expanded = ws_item.child(j).isExpanded()
+                    ws_item.takeChild(j)
+            sh_cat = self._add_shared_category(ws_item, shared_path)
+            if sh_cat is not None:
+                sh_cat.setExpanded(expanded)
+
     def _create_category_item(self, parent: QTreeWidgetItem, name: str, icon_name: str, count: int) -> QTreeWidgetItem:
         """Create a category grouping item under a workspace."""
         cat_item = QTreeWidgetItem(parent)
@@ -1152,6 +1259,17 @@ class WorkspaceManager(QWidget):
                 self.object_viewer.show_details(display_name, f"{protocol} Connection", f"{ftp.host}:{ftp.port}" if ftp else "")
             self.tab_widget.setCurrentIndex(0)  # Switch to Preview tab
 
+        elif item_type == "shared_query":
+            query = data.get("resource_obj") or {}
+            self.object_viewer.show_details(
+                name=query.get("name", ""),
+                obj_type="Shared Query",
+                description=query.get("description") or query.get("query_text", ""),
+                created=query.get("created_at", ""),
+                updated=query.get("updated_at", "")
+            )
+            self.tab_widget.setCurrentIndex(0)  # Switch to Preview tab
+
         elif item_type == "folder":
             path = data.get("path", "")
             if self._rootfolder_manager:
@@ -1766,7 +1884,7 @@ class WorkspaceManager(QWidget):
             ws_name = import_data.get("workspace", {}).get("name", "Imported Workspace")
             conflict = check_workspace_conflict(ws_name)
 
-            mode = ImportConflictMode.CREATE_NEW
+            mode = ImportConflictMode.RENAME
             if conflict:
                 from PySide6.QtWidgets import QMessageBox
                 result = QMessageBox.question(
@@ -1779,7 +1897,18 @@ class WorkspaceManager(QWidget):
                 elif result == QMessageBox.StandardButton.No:
                     mode = ImportConflictMode.MERGE
 
-            result = import_workspace_from_json(import_data, mode)
+            from PySide6.QtWidgets import QProgressDialog
+            progress = QProgressDialog("Import...", None, 0, 100, self)
+            progress.setWindowModality(Qt.WindowModality.WindowModal)
+            progress.setMinimumDuration(300)
+            try:
+                result = import_workspace_from_json(
+                    import_data, mode,
+                    existing_workspace_id=conflict.id if conflict else None,
+                    progress=lambda done, total, _step: progress.setValue(int(done * 100 / max(total, 1)))
+                )
+            finally:
+                progress.close()
             summary = get_import_summary(result)
             DialogHelper.info(f"Import successful!\n\n{summary}")
             self._refresh()
@@ -1798,6 +1927,16 @@ class WorkspaceManager(QWidget):
                 pass
             self._filter_debounce_timer = None
 
+        try:
+            get_file_index().index_updated.disconnect(self._on_file_index_updated)
+        except Exception:
+            pass
+
+        try:
+            get_shared_folder_index().index_updated.disconnect(self._on_shared_index_updated)
+        except Exception:
+            pass
+
         if self._ftproot_manager is not None:
             try:
                 self._ftproot_manager.connection_established.disconnect(
@@ -14,6 +14,7 @@ from .tree_helpers import (
     format_file_size,
     # File counting
     count_files_recursive,
+    update_folder_counts,
     # Tree item helpers
     add_dummy_child,
     has_dummy_child,
@@ -39,6 +40,7 @@ __all__ = [
     "FILE_ICON_MAP",
     "format_file_size",
     "count_files_recursive",
+    "update_folder_counts",
     "add_dummy_child",
     "has_dummy_child",
     "remove_dummy_children",
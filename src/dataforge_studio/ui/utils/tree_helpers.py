@@ -16,6 +16,7 @@ from PySide6.QtWidgets import QTreeWidgetItem
 from PySide6.QtGui import QIcon
 
 from ...utils.image_loader import get_icon
+from ...utils.file_index import get_file_index
 
 import logging
 logger = logging.getLogger(__name__)
@@ -152,6 +153,28 @@ def count_files_recursive(folder_path: Path) -> int:
     return count
 
 
+def update_folder_counts(parent_item: QTreeWidgetItem):
+    """
+    Refresh the "name (count)" labels of folder items from the file index.
+
+    Connect get_file_index().index_updated to this (on the tree's root
+    item) so counts appear once a root folder is indexed. Only items whose
+    data holds both "path" and "name" are relabeled.
+
+    Args:
+        parent_item: Item whose descendants are updated
+    """
+    index = get_file_index()
+    for i in range(parent_item.childCount()):
+        child = parent_item.child(i)
+        data = child.data(0, 256)
+        if data and data.get("type") in ("folder", "rootfolder") and data.get("path") and data.get("name"):
+            count = index.file_count(data["path"])
+            if count is not None:
+                child.setText(0, f"{data['name']} ({count})")
+        update_folder_counts(child)
+
+
 # ==================== Tree Population - Local Files ====================
 
 def add_dummy_child(parent_item: QTreeWidgetItem, text: str = "Loading..."):
@@ -202,7 +225,9 @@ def add_folder_to_tree(
     Args:
         parent_item: Parent tree item
         folder_path: Path to the folder
-        show_file_count: Whether to show recursive file count
+        show_file_count: Whether to show recursive file count (from the
+                         file index; added by update_folder_counts() if
+                         the folder is not indexed yet)
         lazy_load: Whether to add dummy child for lazy loading
 
     Returns:
@@ -216,8 +241,9 @@ def add_folder_to_tree(
 
     display_name = folder_path.name
     if show_file_count:
-        file_count = count_files_recursive(folder_path)
-        display_name = f"{folder_path.name} ({file_count})"
+        file_count = get_file_index().file_count(folder_path)
+        if file_count is not None:
+            display_name = f"{folder_path.name} ({file_count})"
 
     folder_item.setText(0, display_name)
     folder_item.setData(0, 256, {
@@ -273,7 +299,8 @@ def populate_tree_with_local_folder(
     Populate a tree item with local folder contents.
 
     This is the main function for loading local file system contents
-    into any tree widget, without any plugin dependency.
+    into any tree widget, without any plugin dependency. Listings come
+    from the file index when the folder is indexed and unchanged since.
 
     Args:
         parent_item: Parent tree item to populate
@@ -292,14 +319,13 @@ def populate_tree_with_local_folder(
         # Remove any dummy/loading items first
         remove_dummy_children(parent_item)
 
-        # Sort entries: directories first, then files (case-insensitive)
-        entries = sorted(
-            folder_path.iterdir(),
-            key=lambda p: (not p.is_dir(), p.name.lower())
-        )
+        # Directories first, then files (each sorted case-insensitively)
+        folders, files = get_file_index().read_folder(folder_path)
+        entries = [(folder_path / name, True) for name in folders]
+        entries += [(folder_path / name, False) for name in files]
 
-        for entry in entries:
-            if entry.is_dir():
+        for entry, is_dir in entries:
+            if is_dir:
                 folder_item = add_folder_to_tree(
                     parent_item,
                     entry,
@@ -314,7 +340,7 @@ def populate_tree_with_local_folder(
                         show_file_count=show_file_count
                     )
 
-            elif entry.is_file():
+            else:
                 add_file_to_tree(parent_item, entry)
 
         return True
@@ -9,14 +9,16 @@ Usage:
     viewer.set_code(code_text, language="python")
 """
 
-from typing import Optional, Dict, Type
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Tuple, Type
 import logging
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QLabel, QHBoxLayout
 from PySide6.QtGui import (
     QSyntaxHighlighter, QTextCharFormat, QColor, QFont, QTextDocument
 )
-from PySide6.QtCore import QRegularExpression
+from PySide6.QtCore import QRegularExpression, QTimer, Signal
 
 logger = logging.getLogger(__name__)
 
@@ -391,18 +393,111 @@ class JavaScriptHighlighter(BaseCodeHighlighter):
 # Pygments Fallback Highlighter
 # =============================================================================
 
+# Documents with more lines than this are lexed off the GUI thread
+BACKGROUND_LEX_LINES = 2000
+
+# Lines lexed past an edit before checking again whether the lexer settled
+SETTLE_WINDOW_LINES = 50
+
+_lex_pool: Optional[ThreadPoolExecutor] = None
+
+
+@dataclass(frozen=True)
+class LexedLine:
+    """
+    Pygments tokens of one line.
+
+    Attributes:
+        spans: (start, length, token type) within the line
+        continued: True if a token runs on past the end of the line
+                   (multi-line string or comment)
+    """
+    spans: Tuple[Tuple[int, int, object], ...]
+    continued: bool
+
+
+def lex_lines(lexer, lines: List[str]) -> List[LexedLine]:
+    """
+    Lex consecutive lines as one text and split the tokens per line.
+
+    Args:
+        lexer: Pygments lexer
+        lines: Line texts, without newlines
+
+    Returns:
+        One LexedLine per line
+    """
+    text = "\n".join(lines) + "\n"
+    result: List[LexedLine] = []
+    spans = []
+    line_start = 0
+    for index, token_type, value in lexer.get_tokens_unprocessed(text):
+        pos, end = index, index + len(value)
+        while pos < end:
+            newline = text.find("\n", pos, end)
+            segment_end = end if newline == -1 else newline
+            if segment_end > pos:
+                spans.append((pos - line_start, segment_end - pos, token_type))
+            if newline == -1:
+                break
+            result.append(LexedLine(tuple(spans), newline + 1 < end))
+            spans = []
+            line_start = pos = newline + 1
+    # A lexer skipping characters must not shift the following lines
+    result.extend(LexedLine((), False) for _ in range(len(lines) - len(result)))
+    return result[:len(lines)]
+
+
 class PygmentsHighlighter(QSyntaxHighlighter):
     """
     Syntax highlighter using Pygments library.
     Used for languages without native highlighter (e.g., PowerShell).
+
+    The whole document is lexed once (in the background above
+    BACKGROUND_LEX_LINES) into a per-line token cache, so multi-line
+    strings and comments are highlighted correctly and highlightBlock only
+    applies cached formats. An edit re-lexes from the start of the
+    construct it falls in until the tokens match the cache again. Every
+    re-lexed line gets a new block state, so Qt rehighlights exactly the
+    lines whose cache entry was replaced.
     """
 
+    # Background lex result: (generation, List[LexedLine])
+    _lexed = Signal(int, object)
+
     def __init__(self, document: QTextDocument, language: str):
-        super().__init__(document)
+        super().__init__(None)
         self.language = language
         self._lexer = None
         self._styles: Dict[str, QTextCharFormat] = {}
+        self._formats: Dict[object, Optional[QTextCharFormat]] = {}
+        self._lines: List[LexedLine] = []
+        self._states: List[int] = []
+        self._next_state = 0
+        self._generation = 0
+        self._pending = False
+        self._document: Optional[QTextDocument] = None
         self._setup_lexer()
+        self._lexed.connect(self._on_lexed)
+        self.setDocument(document)
+
+    def setDocument(self, document: Optional[QTextDocument]):
+        """Attach to a document (None detaches) and lex it."""
+        if document is self._document:
+            return
+        if self._document is not None:
+            self._document.contentsChange.disconnect(self._on_contents_change)
+        self._document = document
+        self._generation += 1  # drop background results for the old document
+        self._pending = False
+        self._lines, self._states = [], []
+        if document is not None:
+            # Connected before Qt's own slot, so the cache is updated
+            # before Qt rehighlights the changed blocks
+            document.contentsChange.connect(self._on_contents_change)
+        super().setDocument(document)
+        if document is not None:
+            self._lex_document()
 
     def _setup_lexer(self):
         """Setup Pygments lexer for the language."""
@@ -473,35 +568,140 @@ class PygmentsHighlighter(QSyntaxHighlighter):
                 fmt.setFontItalic(True)
             self._styles[str(token_type)] = fmt
 
-    def highlightBlock(self, text: str):
-        """Apply Pygments syntax highlighting."""
+    # ==================== Token Cache ====================
+
+    def _line_texts(self, first: int = 0, stop: Optional[int] = None) -> List[str]:
+        document = self._document
+        stop = document.blockCount() if stop is None else stop
+        block = document.findBlockByNumber(first)
+        texts = []
+        while block.isValid() and len(texts) < stop - first:
+            texts.append(block.text())
+            block = block.next()
+        return texts
+
+    def _new_states(self, count: int) -> List[int]:
+        """Block states never used before (Qt continues while states change)."""
+        start = self._next_state
+        self._next_state = (start + count) % 0x7FFFFFFF
+        return [(start + i) % 0x7FFFFFFF for i in range(count)]
+
+    def _install(self, lines: List[LexedLine]):
+        self._lines = lines
+        self._states = self._new_states(len(lines))
+
+    def _lex_document(self):
+        """Lex the whole document, in the background if it is large."""
         if not self._lexer:
             return
+        self._generation += 1
+        texts = self._line_texts()
+        if len(texts) <= BACKGROUND_LEX_LINES:
+            self._pending = False
+            self._install(lex_lines(self._lexer, texts))
+            return
 
-        try:
-            from pygments import lex
-            from pygments.token import Token
-
-            tokens = list(lex(text, self._lexer))
-            position = 0
-
-            for token_type, token_value in tokens:
-                length = len(token_value)
+        global _lex_pool
+        if _lex_pool is None:
+            _lex_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pygments")
+        self._pending = True
+        self._lines, self._states = [], []
+        generation = self._generation
+        future = _lex_pool.submit(lex_lines, self._lexer, texts)
+
+        def done(f):
+            if f.cancelled() or f.exception() is not None:
+                logger.debug(f"Error lexing with Pygments: {None if f.cancelled() else f.exception()}")
+                return
+            try:
+                self._lexed.emit(generation, f.result())
+            except RuntimeError:
+                pass  # Highlighter deleted meanwhile
+
+        future.add_done_callback(done)
+
+    def _on_lexed(self, generation: int, lines: List[LexedLine]):
+        if generation != self._generation:
+            return
+        self._pending = False
+        self._install(lines)
+        self.rehighlight()
+
+    def _on_contents_change(self, position: int, removed: int, added: int):
+        """Update the token cache for an edit, before Qt rehighlights it."""
+        document = self._document
+        if not self._lexer or document is None:
+            return
+        if self._pending or not self._lines:
+            self._lex_document()
+            return
 
-                # Find the best matching style
-                fmt = None
-                token = token_type
-                while token and fmt is None:
-                    fmt = self._styles.get(str(token))
-                    token = token.parent
+        old_lines, old_states = self._lines, self._states
+        line_count = document.blockCount()
+        delta = line_count - len(old_lines)
+        first = document.findBlock(position).blockNumber()
+        last = max(document.findBlock(position + added).blockNumber(), first)
+        if first > len(old_lines) or last - first > BACKGROUND_LEX_LINES:
+            self._lex_document()
+            return
 
-                if fmt:
-                    self.setFormat(position, length, fmt)
+        # Restart at the first line of the multi-line construct holding the edit
+        restart = min(first, len(old_lines))
+        while restart > 0 and old_lines[restart - 1].continued:
+            restart -= 1
+
+        window = SETTLE_WINDOW_LINES
+        while True:
+            stop = min(line_count, last + 1 + window)
+            lexed = lex_lines(self._lexer, self._line_texts(restart, stop))
+            # The last line of a partial window may be cut short: not a settle point
+            check_stop = stop if stop == line_count else stop - 1
+            settled = next(
+                (i for i in range(last + 1, check_stop)
+                 if 0 <= i - delta < len(old_lines)
+                 and lexed[i - restart] == old_lines[i - delta]
+                 and not lexed[i - restart].continued),
+                None
+            )
+            if settled is not None or stop == line_count:
+                break
+            window *= 4
+
+        keep_from = settled if settled is not None else line_count
+        relexed = lexed[:keep_from - restart]
+        self._lines = old_lines[:restart] + relexed + old_lines[keep_from - delta:]
+        self._states = (old_states[:restart] + self._new_states(len(relexed))
+                        + old_states[keep_from - delta:])
+
+        # Lines before the edit are not rehighlighted by Qt: do it if they changed
+        for i in range(restart, first):
+            if relexed[i - restart] != old_lines[i]:
+                block = document.findBlockByNumber(i)
+                QTimer.singleShot(0, lambda block=block: self.rehighlightBlock(block))
+
+    def _format_for(self, token_type) -> Optional[QTextCharFormat]:
+        """Style of a token type, or of its closest styled parent."""
+        if token_type not in self._formats:
+            fmt = None
+            token = token_type
+            while token and fmt is None:
+                fmt = self._styles.get(str(token))
+                token = token.parent
+            self._formats[token_type] = fmt
+        return self._formats[token_type]
 
-                position += length
+    def highlightBlock(self, text: str):
+        """Apply the cached Pygments tokens of this line."""
+        line = self.currentBlock().blockNumber()
+        if not self._lexer or line >= len(self._lines):
+            self.setCurrentBlockState(-1)
+            return
 
-        except Exception as e:
-            logger.debug(f"Error highlighting with Pygments: {e}")
+        for start, length, token_type in self._lines[line].spans:
+            fmt = self._format_for(token_type)
+            if fmt:
+                self.setFormat(start, length, fmt)
+        self.setCurrentBlockState(self._states[line])
 
 
 # =============================================================================
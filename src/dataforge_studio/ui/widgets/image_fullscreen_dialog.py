@@ -8,10 +8,14 @@ from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QScrollArea, QApplication
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QSize
 from PySide6.QtGui import QPixmap, QKeyEvent
 
 from ...database.config_db import SavedImage
+from ...utils.thumbnail_cache import Thumbnail, get_thumbnail_cache
+
+# Images decoded ahead of the current one, on each side
+PREFETCH_NEIGHBORS = 2
 
 
 class ImageFullscreenDialog(QDialog):
@@ -58,6 +62,14 @@ class ImageFullscreenDialog(QDialog):
         )
         self.setMinimumSize(800, 600)
 
+        # One preview size per screen, so the disk cache is reused across sessions
+        screen = (parent.screen() if parent else None) or QApplication.primaryScreen()
+        self._preview_box = screen.availableSize() if screen else QSize(1920, 1080)
+        self._thumbnails = get_thumbnail_cache()
+        self._thumbnails.thumbnail_ready.connect(self._on_thumbnail_ready)
+        # The cache outlives the dialog: drop the connection and the widget on close
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+
         self._setup_ui()
 
         if image:
@@ -130,26 +142,38 @@ class ImageFullscreenDialog(QDialog):
             self.info_label.setText("")
             return
 
-        pixmap = QPixmap(str(filepath))
-        if pixmap.isNull():
-            self.preview_label.setText("Cannot load image")
-            self.preview_label.setStyleSheet("QLabel { color: red; background-color: #1a1a1a; }")
+        thumbnail = self._thumbnails.request(image.filepath, self._preview_box)
+        if thumbnail is None:
+            self.preview_label.setText("Loading...")
+            self.preview_label.setStyleSheet("QLabel { color: gray; background-color: #1a1a1a; }")
             self.info_label.setText("")
-            return
+        else:
+            self._show_thumbnail(thumbnail)
+
+        self._prefetch_neighbors()
+        self._update_navigation_buttons()
+        self.image_changed.emit(image)
+
+    def _show_thumbnail(self, thumbnail: Thumbnail):
+        """Fit a decoded preview of the current image to the available space."""
+        filepath = Path(self.current_image.filepath)
+        pixmap = QPixmap.fromImage(thumbnail.image)
 
-        # Scale to fit the available space
         available_size = self.preview_label.parent().size()
-        scaled = pixmap.scaled(
-            available_size.width() - 20,
-            available_size.height() - 20,
+        target = QSize(available_size.width() - 20, available_size.height() - 20)
+        pixmap = pixmap.scaled(
+            target,
             Qt.AspectRatioMode.KeepAspectRatio,
             Qt.TransformationMode.SmoothTransformation
         )
-        self.preview_label.setPixmap(scaled)
+        self.preview_label.setPixmap(pixmap)
         self.preview_label.setStyleSheet("QLabel { background-color: #1a1a1a; }")
 
         # Update info
-        size_bytes = filepath.stat().st_size
+        try:
+            size_bytes = filepath.stat().st_size
+        except OSError:
+            size_bytes = 0
         if size_bytes < 1024:
             size_str = f"{size_bytes} B"
         elif size_bytes < 1024 * 1024:
@@ -157,12 +181,26 @@ class ImageFullscreenDialog(QDialog):
         else:
             size_str = f"{size_bytes / (1024 * 1024):.2f} MB"
 
+        source = thumbnail.source_size
         self.info_label.setText(
-            f"{pixmap.width()} x {pixmap.height()} px  |  {size_str}  |  {filepath.suffix.upper()}"
+            f"{source.width()} x {source.height()} px  |  {size_str}  |  {filepath.suffix.upper()}"
         )
 
-        self._update_navigation_buttons()
-        self.image_changed.emit(image)
+    def _on_thumbnail_ready(self, path: str, box: QSize, thumbnail):
+        """Show a preview decoded in the background if it is still the current image."""
+        if box != self._preview_box or not self.current_image or self.current_image.filepath != path:
+            return
+        if thumbnail is None:
+            self.preview_label.setText("Cannot load image")
+            self.preview_label.setStyleSheet("QLabel { color: red; background-color: #1a1a1a; }")
+            return
+        self._show_thumbnail(thumbnail)
+
+    def _prefetch_neighbors(self):
+        index = self.current_index
+        neighbors = self.image_list[index + 1:index + 1 + PREFETCH_NEIGHBORS] + \
+            self.image_list[max(0, index - PREFETCH_NEIGHBORS):index][::-1]
+        self._thumbnails.prefetch([img.filepath for img in neighbors], self._preview_box)
 
     def _update_navigation_buttons(self):
         """Update navigation button states."""
@@ -187,6 +225,14 @@ class ImageFullscreenDialog(QDialog):
             self.current_index += 1
             self._display_image(self.image_list[self.current_index])
 
+    def done(self, result: int):
+        """Disconnect from the shared thumbnail cache before closing."""
+        try:
+            self._thumbnails.thumbnail_ready.disconnect(self._on_thumbnail_ready)
+        except (RuntimeError, TypeError):
+            pass
+        super().done(result)
+
     def keyPressEvent(self, event: QKeyEvent):
         """Handle key press events."""
         if event.key() == Qt.Key.Key_Left:
@@ -19,7 +19,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import (
     Qt, Signal, QTimer, QEvent, QSize
 )
-from PySide6.QtGui import QCursor, QEnterEvent
+from PySide6.QtGui import QColor, QCursor, QEnterEvent
 
 from ..core.theme_bridge import ThemeBridge
 from ...utils.image_loader import get_icon
@@ -3,25 +3,67 @@ SQL Auto-Completer Popup Widget
 Non-blocking suggestion listbox for SQL editors.
 """
 
-from typing import List, Optional
-from PySide6.QtWidgets import QListWidget, QListWidgetItem, QTextEdit
-from PySide6.QtCore import Qt, Signal, QPoint
+from typing import List, Optional, Sequence, Union
+from PySide6.QtWidgets import QListView, QTextEdit
+from PySide6.QtCore import Qt, Signal, QPoint, QAbstractListModel, QModelIndex
 from PySide6.QtGui import QKeyEvent, QFocusEvent
 
 from ..core.theme_bridge import ThemeBridge
+from ...utils.completion_index import CompletionIndex, DEFAULT_LIMIT
 
 import logging
 logger = logging.getLogger(__name__)
 
 
-class SQLCompleterPopup(QListWidget):
+class CompletionListModel(QAbstractListModel):
+    """
+    Lightweight list model holding the currently visible suggestions.
+
+    Replaces per-keystroke QListWidgetItem creation: updating the popup
+    is a single model reset over a plain list of strings.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items: List[str] = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._items)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._items):
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self._items[index.row()]
+        return None
+
+    def set_items(self, items: List[str]):
+        """Replace the visible suggestions."""
+        self.beginResetModel()
+        self._items = items
+        self.endResetModel()
+
+    def item_text(self, row: int) -> Optional[str]:
+        """Get suggestion text at row, or None if out of range."""
+        if 0 <= row < len(self._items):
+            return self._items[row]
+        return None
+
+    @property
+    def items(self) -> List[str]:
+        return self._items
+
+
+class SQLCompleterPopup(QListView):
     """
     Floating suggestion listbox for SQL auto-completion.
 
     Features:
     - Non-blocking popup positioned below cursor
     - Keyboard navigation (Up/Down, Tab/Enter to select, Escape to close)
-    - Real-time filtering as user types
+    - Real-time filtering as user types, backed by a prebuilt CompletionIndex
     """
 
     # Emitted when a completion is selected
@@ -37,9 +79,13 @@ class SQLCompleterPopup(QListWidget):
         super().__init__(parent_editor)
 
         self.parent_editor = parent_editor
-        self._all_suggestions: List[str] = []
+        self._index: Optional[CompletionIndex] = None
         self._filter_text: str = ""
 
+        self._model = CompletionListModel(self)
+        self.setModel(self._model)
+        self.setUniformItemSizes(True)
+
         self._setup_ui()
 
     def _setup_ui(self):
@@ -76,57 +122,52 @@ class SQLCompleterPopup(QListWidget):
         hover_bg = colors.get('dd_menu_hover_bg', '#E5F3FF')
 
         self.setStyleSheet(f"""
-            QListWidget {{
+            QListView {{
                 background-color: {bg};
                 border: 1px solid {border};
                 font-family: Consolas, monospace;
                 font-size: 10pt;
             }}
-            QListWidget::item {{
+            QListView::item {{
                 padding: 2px 5px;
                 color: {fg};
             }}
-            QListWidget::item:selected {{
+            QListView::item:selected {{
                 background-color: {selected_bg};
                 color: {selected_fg};
             }}
-            QListWidget::item:hover {{
+            QListView::item:hover {{
                 background-color: {hover_bg};
             }}
         """)
 
         # Single selection
-        self.setSelectionMode(QListWidget.SelectionMode.SingleSelection)
+        self.setSelectionMode(QListView.SelectionMode.SingleSelection)
 
         # Connect double-click
-        self.itemDoubleClicked.connect(self._on_item_double_clicked)
+        self.doubleClicked.connect(self._on_item_double_clicked)
 
         # Hide initially
         self.hide()
 
-    def show_completions(self, suggestions: List[str], filter_text: str = "",
+    def show_completions(self, suggestions: Union[CompletionIndex, Sequence[str]],
+                         filter_text: str = "",
                          cursor_rect: Optional[object] = None):
         """
         Show the popup with filtered suggestions.
 
         Args:
-            suggestions: All available suggestions
+            suggestions: Prebuilt CompletionIndex, or a plain list of suggestions
             filter_text: Current text to filter by
             cursor_rect: QRect from parent_editor.cursorRect() for positioning
         """
-        self._all_suggestions = suggestions
-        self._filter_text = filter_text.lower()
-
-        # Filter suggestions - prioritize "starts with", then "contains"
-        if self._filter_text:
-            # First: items that start with the filter text
-            starts_with = [s for s in suggestions if s.lower().startswith(self._filter_text)]
-            # Second: items that contain the filter text (but don't start with it)
-            contains = [s for s in suggestions
-                       if self._filter_text in s.lower() and not s.lower().startswith(self._filter_text)]
-            filtered = starts_with + contains
-        else:
-            filtered = suggestions
+        if not isinstance(suggestions, CompletionIndex):
+            suggestions = CompletionIndex(suggestions)
+        self._index = suggestions
+        self._filter_text = filter_text
+
+        # Ranked lookup: prefix (bisect) first, then word/substring/fuzzy
+        filtered = suggestions.search(filter_text, DEFAULT_LIMIT)
 
         # Nothing to show
         if not filtered:
@@ -134,14 +175,10 @@ class SQLCompleterPopup(QListWidget):
             return
 
         # Populate list
-        self.clear()
-        for suggestion in filtered[:50]:  # Limit to 50 items
-            item = QListWidgetItem(suggestion)
-            self.addItem(item)
+        self._model.set_items(filtered)
 
         # Select first item
-        if self.count() > 0:
-            self.setCurrentRow(0)
+        self.setCurrentRow(0)
 
         # Calculate size
         self._adjust_size()
@@ -161,17 +198,30 @@ class SQLCompleterPopup(QListWidget):
         Args:
             filter_text: New filter text
         """
-        if self._all_suggestions:
-            self.show_completions(self._all_suggestions, filter_text)
+        if self._index is not None:
+            self.show_completions(self._index, filter_text)
+
+    def count(self) -> int:
+        """Number of visible suggestions."""
+        return self._model.rowCount()
+
+    def currentRow(self) -> int:
+        """Row of the selected suggestion, or -1."""
+        index = self.currentIndex()
+        return index.row() if index.isValid() else -1
+
+    def setCurrentRow(self, row: int):
+        """Select the suggestion at row."""
+        if 0 <= row < self.count():
+            self.setCurrentIndex(self._model.index(row, 0))
 
     def _adjust_size(self):
         """Adjust popup size based on content."""
         # Width based on longest item
+        metrics = self.fontMetrics()
         max_width = 150
-        for i in range(self.count()):
-            item = self.item(i)
-            width = self.fontMetrics().horizontalAdvance(item.text()) + 30
-            max_width = max(max_width, width)
+        for text in self._model.items:
+            max_width = max(max_width, metrics.horizontalAdvance(text) + 30)
 
         self.setFixedWidth(min(max_width, 400))
 
@@ -206,15 +256,15 @@ class SQLCompleterPopup(QListWidget):
 
         self.move(cursor_pos)
 
-    def _on_item_double_clicked(self, item: QListWidgetItem):
+    def _on_item_double_clicked(self, index: QModelIndex):
         """Handle double-click on item."""
         self._apply_selection()
 
     def _apply_selection(self):
         """Apply the current selection."""
-        current = self.currentItem()
+        current = self.get_selected_text()
         if current:
-            self.completion_selected.emit(current.text())
+            self.completion_selected.emit(current)
         self.hide()
 
     def navigate_up(self):
@@ -236,7 +286,7 @@ class SQLCompleterPopup(QListWidget):
         Returns:
             True if completion was applied, False otherwise
         """
-        if self.isVisible() and self.currentItem():
+        if self.isVisible() and self.currentRow() >= 0:
             self._apply_selection()
             return True
         return False
@@ -247,8 +297,7 @@ class SQLCompleterPopup(QListWidget):
 
     def get_selected_text(self) -> Optional[str]:
         """Get currently selected suggestion text."""
-        current = self.currentItem()
-        return current.text() if current else None
+        return self._model.item_text(self.currentRow())
 
     def check_editor_focus(self):
         """
@@ -9,11 +9,13 @@ from .ftp_workers import (
     FTPDeleteWorker,
     FTPCreateDirectoryWorker
 )
+from .job_workers import JobRunWorker
 
 __all__ = [
     "FTPConnectionWorker",
     "FTPListDirectoryWorker",
     "FTPTransferWorker",
     "FTPDeleteWorker",
-    "FTPCreateDirectoryWorker"
+    "FTPCreateDirectoryWorker",
+    "JobRunWorker",
 ]
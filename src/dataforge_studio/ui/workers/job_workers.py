@@ -0,0 +1,99 @@
+"""
+Job Workers - Background execution of script jobs and workflows.
+
+The worker thread only drives the JobRunner; the scripts themselves run in
+its process pool, so the GUI stays responsive during pandas-heavy loads.
+"""
+
+from typing import List
+
+from PySide6.QtCore import QThread, Signal
+
+from ...core.job_runner import (
+    JobEvent, JobOutcome, JobRunner, JobTask, STATUS_SUCCESS, STATUS_FAILED
+)
+from ..core.i18n_bridge import tr
+
+import logging
+logger = logging.getLogger(__name__)
+
+# How long closing the app waits for a run to stop (the runner polls every 0.5 s)
+STOP_TIMEOUT_MS = 2000
+
+
+class JobRunWorker(QThread):
+    """
+    Worker running a task DAG (see core.job_runner.build_job_plan).
+
+    Signals:
+        job_started: Emitted with (job_id, name) when a task is submitted
+        job_finished: Emitted with a JobOutcome when a task ends
+        run_finished: Emitted with {job_id: JobOutcome} when the run is over
+        error: Emitted with an error message if the run itself fails
+
+    QThread.finished follows either run_finished or error: release the
+    worker from it rather than waiting on the thread.
+    """
+
+    job_started = Signal(str, str)  # job_id, name
+    job_finished = Signal(object)  # JobOutcome
+    run_finished = Signal(dict)  # job_id -> JobOutcome
+    error = Signal(str)  # error message
+
+    def __init__(self, tasks: List[JobTask], max_workers: int = None):
+        super().__init__()
+        self.tasks = tasks
+        self._runner = JobRunner(max_workers=max_workers)
+
+    def run(self):
+        """Execute the tasks."""
+        try:
+            outcomes = self._runner.run(self.tasks, on_event=self._on_event)
+            self.run_finished.emit(outcomes)
+        except Exception as e:
+            logger.error(f"Job run failed: {e}")
+            self.error.emit(str(e))
+
+    def _on_event(self, event: JobEvent):
+        if event.kind == "started":
+            self.job_started.emit(event.task.job_id, event.task.name)
+        else:
+            self.job_finished.emit(event.outcome)
+
+    def cancel(self):
+        """Stop starting new tasks; running scripts finish."""
+        self._runner.cancel()
+
+    def stop(self, timeout_ms: int = STOP_TIMEOUT_MS) -> bool:
+        """
+        Cancel the run without waiting for running scripts, then wait for the thread.
+
+        Called from the GUI thread when the app closes, so Qt never destroys
+        a running QThread. Running scripts finish in their pool processes.
+
+        Returns:
+            True if the thread has stopped
+        """
+        self._runner.cancel(abandon_running=True)
+        if self.wait(timeout_ms):
+            return True
+        logger.warning(f"Job run did not stop within {timeout_ms} ms")
+        return False
+
+
+def log_job_outcome(log_panel, outcome: JobOutcome):
+    """Write one task outcome (timing, status, result or error) to a LogPanel."""
+    duration = f"{outcome.duration:.1f}"
+    if outcome.status == STATUS_SUCCESS:
+        log_panel.add_message(
+            tr("job_task_succeeded", name=outcome.name, duration=duration), "IMPORTANT")
+        if outcome.result:
+            log_panel.add_message(f"{outcome.name}: {outcome.result}", "INFO")
+    elif outcome.status == STATUS_FAILED:
+        last_line = outcome.error.strip().splitlines()[-1] if outcome.error.strip() else ""
+        log_panel.add_message(
+            tr("job_task_failed", name=outcome.name, duration=duration, error=last_line), "ERROR")
+        log_panel.add_message(outcome.error, "DEBUG")
+    else:
+        log_panel.add_message(
+            tr("job_task_not_run", name=outcome.name, status=outcome.status), "WARNING")
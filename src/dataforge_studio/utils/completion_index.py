@@ -0,0 +1,269 @@
+"""
+Completion Index for SQL Auto-completion
+Prebuilt, case-folded lookup structure over schema names (tables, columns).
+
+Built once per schema/context and reused on every keystroke:
+- Prefix matches use bisect over a sorted array of case-folded keys
+- Substring and subsequence (fuzzy) matches run as C-level scans
+  (str.find / regex) over a single newline-joined blob of keys, and
+  only when the cheaper strategies did not fill the result list
+- Results of the previous query are reused when the user keeps typing
+  (the new filter extends the old one), so the candidate set only shrinks
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+# Maximum number of suggestions returned by search()
+DEFAULT_LIMIT = 50
+
+# Upper bounds on candidates scored per query (bound typing latency).
+# Subsequence matches are the weakest and the most expensive to find.
+MAX_CANDIDATES = 2000
+MAX_FUZZY_CANDIDATES = 300
+
+# Rank buckets (lower is better)
+_RANK_PREFIX = 0
+_RANK_WORD_PREFIX = 1
+_RANK_SUBSTRING = 2
+_RANK_FUZZY = 3
+
+_WORD_SEPARATORS = "_. $#"
+
+
+class CompletionIndex:
+    """
+    Immutable index over a list of completion candidates.
+
+    Candidates are deduplicated and sorted case-insensitively. search()
+    returns at most `limit` suggestions ranked as:
+    prefix > word-prefix (after '_' or '.') > substring > subsequence.
+    """
+
+    def __init__(self, items: Iterable[str]):
+        """
+        Build the index.
+
+        Args:
+            items: Candidate strings (duplicates are removed)
+        """
+        pairs = sorted({(s.casefold(), s) for s in items if s})
+        self._keys: List[str] = [k for k, _ in pairs]
+        self._items: List[str] = [s for _, s in pairs]
+
+        # Newline-joined blob + start offsets for C-speed scans
+        self._blob: str = "\n".join(self._keys)
+        self._offsets: List[int] = []
+        pos = 0
+        for key in self._keys:
+            self._offsets.append(pos)
+            pos += len(key) + 1
+
+        # Incremental narrowing state: {kind: (last query, candidate indices)}
+        self._last: Dict[str, Tuple[str, List[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def items(self) -> List[str]:
+        """All candidates, sorted case-insensitively."""
+        return self._items
+
+    def prefix_range(self, prefix: str) -> Tuple[int, int]:
+        """
+        Get the [start, end) range of keys starting with prefix.
+
+        Args:
+            prefix: Prefix to look up (case-insensitive)
+
+        Returns:
+            Tuple (start, end) into the sorted candidate array
+        """
+        key = prefix.casefold()
+        start = bisect_left(self._keys, key)
+        end = bisect_right(self._keys, key + "\U0010ffff", lo=start)
+        return start, end
+
+    def prefix_matches(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Get candidates starting with prefix, in sorted order.
+
+        Args:
+            prefix: Prefix to look up (case-insensitive)
+            limit: Maximum number of results (None for all)
+        """
+        start, end = self.prefix_range(prefix)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self._items[start:end]
+
+    def search(self, text: str, limit: int = DEFAULT_LIMIT) -> List[str]:
+        """
+        Find ranked suggestions for the typed text.
+
+        Cheaper strategies run first and later ones only when the limit
+        is not reached yet: prefix (bisect), then substring (str.find over
+        the blob), then subsequence (regex over the blob).
+
+        Args:
+            text: Filter text typed by the user (case-insensitive)
+            limit: Maximum number of suggestions
+
+        Returns:
+            Ranked list of candidates
+        """
+        if not text:
+            return self._items[:limit]
+
+        query = text.casefold()
+        start, end = self.prefix_range(query)
+        results = self._items[start:min(end, start + limit)]
+        if len(results) >= limit:
+            return results
+
+        seen = set(range(start, end))
+        substring = [i for i in self._candidates("substring", query) if i not in seen]
+        results.extend(self._ranked(query, substring, limit - len(results)))
+        if len(results) >= limit:
+            return results
+
+        seen.update(substring)
+        fuzzy = [i for i in self._candidates("subsequence", query) if i not in seen]
+        results.extend(self._ranked(query, fuzzy, limit - len(results)))
+        return results
+
+    def _ranked(self, query: str, candidates: List[int], count: int) -> List[str]:
+        """Score candidates with fuzzy_score() and return the best `count`."""
+        if count <= 0 or not candidates:
+            return []
+        keys = self._keys
+        scored = []
+        for idx in candidates:
+            score = fuzzy_score(query, keys[idx])
+            if score is not None:
+                scored.append((score, len(keys[idx]), keys[idx], idx))
+        scored.sort()
+        return [self._items[idx] for *_, idx in scored[:count]]
+
+    def _candidates(self, kind: str, query: str) -> List[int]:
+        """
+        Get indices of keys matching query ("substring" or "subsequence").
+
+        When query extends the previous query of the same kind and that scan
+        was not truncated, only the previous candidates are re-checked.
+        Both match kinds are monotonic: a key matching "abc" matches "ab".
+        """
+        previous = self._last.get(kind)
+        if previous is not None:
+            last_query, last_candidates = previous
+            if query == last_query:
+                return last_candidates
+            if (query.startswith(last_query)
+                    and len(last_candidates) < _max_candidates(kind)):
+                keys = self._keys
+                if kind == "substring":
+                    candidates = [i for i in last_candidates if query in keys[i]]
+                else:
+                    pattern = _subsequence_regex(query)
+                    candidates = [i for i in last_candidates if pattern.search(keys[i])]
+                self._last[kind] = (query, candidates)
+                return candidates
+
+        if kind == "substring":
+            candidates = self._scan_substring(query)
+        else:
+            candidates = self._scan_subsequence(query)
+        self._last[kind] = (query, candidates)
+        return candidates
+
+    def _scan_substring(self, query: str) -> List[int]:
+        """str.find scan of the joined keys blob for substring matches."""
+        blob = self._blob
+        offsets = self._offsets
+        count = len(offsets)
+        candidates: List[int] = []
+        pos = blob.find(query)
+        while pos >= 0:
+            idx = bisect_right(offsets, pos) - 1
+            candidates.append(idx)
+            if len(candidates) >= MAX_CANDIDATES or idx + 1 >= count:
+                break
+            pos = blob.find(query, offsets[idx + 1])
+        return candidates
+
+    def _scan_subsequence(self, query: str) -> List[int]:
+        """Regex scan of the joined keys blob for subsequence matches."""
+        pattern = _subsequence_regex(query)
+        candidates: List[int] = []
+        offsets = self._offsets
+        for match in pattern.finditer(self._blob):
+            idx = bisect_right(offsets, match.start()) - 1
+            if not candidates or candidates[-1] != idx:
+                candidates.append(idx)
+            if len(candidates) >= MAX_FUZZY_CANDIDATES:
+                break
+        return candidates
+
+
+def _max_candidates(kind: str) -> int:
+    """Scan truncation limit for a match kind."""
+    return MAX_CANDIDATES if kind == "substring" else MAX_FUZZY_CANDIDATES
+
+
+def _subsequence_regex(query: str) -> re.Pattern:
+    """
+    Compile a regex matching query as a subsequence within a single line.
+
+    Uses greedy negated classes ("a[^\\nb]*b") so the engine never backtracks.
+    """
+    parts = [re.escape(query[0])]
+    for ch in query[1:]:
+        esc = re.escape(ch)
+        parts.append(f"[^\\n{esc}]*{esc}")
+    return re.compile("".join(parts))
+
+
+def fuzzy_score(query: str, key: str) -> Optional[Tuple[int, int]]:
+    """
+    Score how well query matches key (both case-folded).
+
+    Args:
+        query: Case-folded filter text
+        key: Case-folded candidate
+
+    Returns:
+        Sortable (rank, penalty) tuple, lower is better,
+        or None when query is not a subsequence of key
+    """
+    if key.startswith(query):
+        return (_RANK_PREFIX, 0)
+
+    pos = key.find(query)
+    if pos > 0:
+        if key[pos - 1] in _WORD_SEPARATORS:
+            return (_RANK_WORD_PREFIX, pos)
+        return (_RANK_SUBSTRING, pos)
+
+    # Subsequence: penalize gaps, reward matches at word starts
+    penalty = 0
+    k = 0
+    prev = -1
+    for ch in query:
+        k = key.find(ch, k)
+        if k < 0:
+            return None
+        if prev >= 0:
+            penalty += k - prev - 1
+        if k > 0 and key[k - 1] in _WORD_SEPARATORS:
+            penalty -= 1
+        prev = k
+        k += 1
+    return (_RANK_FUZZY, penalty)
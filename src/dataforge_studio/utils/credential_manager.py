@@ -1,9 +1,16 @@
 """
 Credential Manager - Secure storage for database credentials using system keyring
+
+Lookups are cached in memory for the session: on Linux every keyring call is
+a D-Bus round-trip to the Secret Service (and may prompt for unlock), so a
+connection is only looked up once until its credentials are saved or deleted.
+Nothing is ever written to disk by the cache.
 """
 
 import keyring
 import logging
+import threading
+from typing import Dict, Iterable, Optional, Tuple
 
 try:
     from keyring.errors import KeyringError
@@ -24,6 +31,76 @@ class CredentialManager:
 
     SERVICE_NAME = "dataforge-studio"
 
+    # connection_id -> (username, password) as returned by keyring (None = not stored)
+    _cache: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    _cache_lock = threading.Lock()
+
+    @staticmethod
+    def _fetch(connection_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """Read both entries from the keyring and cache them (raises KeyringError)."""
+        username = keyring.get_password(
+            CredentialManager.SERVICE_NAME,
+            f"db:{connection_id}:username"
+        )
+        password = keyring.get_password(
+            CredentialManager.SERVICE_NAME,
+            f"db:{connection_id}:password"
+        )
+        with CredentialManager._cache_lock:
+            CredentialManager._cache[connection_id] = (username, password)
+        return username, password
+
+    @staticmethod
+    def _lookup(connection_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """Cached credentials, read from the keyring on first use (raises KeyringError)."""
+        with CredentialManager._cache_lock:
+            cached = CredentialManager._cache.get(connection_id)
+        if cached is not None:
+            return cached
+        return CredentialManager._fetch(connection_id)
+
+    @staticmethod
+    def invalidate(connection_id: Optional[str] = None) -> None:
+        """
+        Forget cached credentials so the next lookup reads the keyring again.
+
+        Args:
+            connection_id: Connection to forget (None = the whole cache)
+        """
+        with CredentialManager._cache_lock:
+            if connection_id is None:
+                CredentialManager._cache.clear()
+            else:
+                CredentialManager._cache.pop(connection_id, None)
+
+    @staticmethod
+    def prefetch(connection_ids: Iterable[str]) -> int:
+        """
+        Load the credentials of several connections into the cache at once.
+
+        Used when a workspace opens so that its connections are built without
+        further keyring calls. Stops at the first keyring error (locked or
+        unavailable keyring) instead of failing once per connection.
+
+        Args:
+            connection_ids: Connection IDs to load
+
+        Returns:
+            Number of connections read from the keyring
+        """
+        with CredentialManager._cache_lock:
+            missing = [cid for cid in dict.fromkeys(connection_ids)
+                       if cid not in CredentialManager._cache]
+        fetched = 0
+        for connection_id in missing:
+            try:
+                CredentialManager._fetch(connection_id)
+            except KeyringError as e:
+                logger.warning(f"Credential prefetch stopped: {e}")
+                break
+            fetched += 1
+        return fetched
+
     @staticmethod
     def save_credentials(connection_id: str, username: str, password: str) -> bool:
         """
@@ -48,9 +125,12 @@ class CredentialManager:
                 f"db:{connection_id}:password",
                 password
             )
+            with CredentialManager._cache_lock:
+                CredentialManager._cache[connection_id] = (username, password)
             logger.info(f"Credentials saved securely for connection {connection_id}")
             return True
         except KeyringError as e:
+            CredentialManager.invalidate(connection_id)
             logger.error(f"Failed to save credentials: {e}")
             return False
 
@@ -66,14 +146,7 @@ class CredentialManager:
             Tuple of (username, password). Returns ("", "") if not found.
         """
         try:
-            username = keyring.get_password(
-                CredentialManager.SERVICE_NAME,
-                f"db:{connection_id}:username"
-            )
-            password = keyring.get_password(
-                CredentialManager.SERVICE_NAME,
-                f"db:{connection_id}:password"
-            )
+            username, password = CredentialManager._lookup(connection_id)
             return (username or "", password or "")
         except KeyringError as e:
             logger.error(f"Failed to retrieve credentials: {e}")
@@ -90,6 +163,7 @@ class CredentialManager:
         Returns:
             True if deleted successfully, False otherwise
         """
+        CredentialManager.invalidate(connection_id)
         try:
             try:
                 keyring.delete_password(
@@ -125,10 +199,7 @@ class CredentialManager:
             True if credentials are stored, False otherwise
         """
         try:
-            username = keyring.get_password(
-                CredentialManager.SERVICE_NAME,
-                f"db:{connection_id}:username"
-            )
+            username, _ = CredentialManager._lookup(connection_id)
             return username is not None
         except KeyringError as e:
             logger.error(f"Failed to check credentials: {e}")
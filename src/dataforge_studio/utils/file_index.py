@@ -0,0 +1,288 @@
+"""
+File Index - Background index of the folders under configured root folders.
+
+Root folders are scanned off the GUI thread with os.scandir. Trees keep
+their file counts, folder listings and filter searches on this index
+instead of walking the disk again (rglob over network shares froze the
+UI). Rescans are incremental: a folder whose mtime has not changed keeps
+its previous listing, so only the folders that gained or lost entries are
+listed again. The index is refreshed when it is read and older than
+REFRESH_INTERVAL_S.
+
+Usage:
+    index = get_file_index()
+    index.index_updated.connect(on_updated)   # (root path)
+    count = index.file_count(path)            # None until indexed
+    names = index.list_folder(path)           # (folders, files) or None
+    names = index.read_folder(path)           # (folders, files), checked against disk
+"""
+
+import fnmatch
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from PySide6.QtCore import QObject, Signal
+
+logger = logging.getLogger(__name__)
+
+# Seconds after which reading a root schedules an incremental rescan
+REFRESH_INTERVAL_S = 30
+
+# Roots scanned at once
+MAX_WORKERS = 2
+
+
+@dataclass(frozen=True)
+class IndexedFolder:
+    """
+    One folder of the index.
+
+    Attributes:
+        path: Folder path, as found on disk
+        mtime_ns: Folder mtime when it was listed
+        folders: Subfolder names, sorted case-insensitively
+        files: File names, sorted case-insensitively
+        file_count: Files in this folder and all its subfolders
+    """
+    path: str
+    mtime_ns: int
+    folders: Tuple[str, ...]
+    files: Tuple[str, ...]
+    file_count: int
+
+
+def _key(path: Union[str, Path]) -> str:
+    return os.path.normcase(os.path.normpath(str(path)))
+
+
+def _list_folder(path: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    folders, files = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        folders.append(entry.name)
+                    elif entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError as e:
+        logger.debug(f"Cannot list {path}: {e}")
+    return tuple(sorted(folders, key=str.lower)), tuple(sorted(files, key=str.lower))
+
+
+def scan_folder_tree(root: Union[str, Path],
+                     previous: Optional[Dict[str, IndexedFolder]] = None) -> Dict[str, IndexedFolder]:
+    """
+    Index every folder under root.
+
+    Args:
+        root: Folder to scan
+        previous: Earlier result for the same root; folders whose mtime is
+                  unchanged reuse their listing
+
+    Returns:
+        Folders by normalized path (empty if root is not a folder)
+    """
+    previous = previous or {}
+    listed: List[Tuple[str, str, int, Tuple[str, ...], Tuple[str, ...]]] = []
+    stack = [str(root)]
+    while stack:
+        path = stack.pop()
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        key = _key(path)
+        known = previous.get(key)
+        if known is not None and known.mtime_ns == mtime_ns:
+            folders, files = known.folders, known.files
+        else:
+            folders, files = _list_folder(path)
+        listed.append((key, path, mtime_ns, folders, files))
+        stack.extend(os.path.join(path, name) for name in folders)
+
+    # Children are listed after their parent: total the counts bottom-up
+    index: Dict[str, IndexedFolder] = {}
+    for key, path, mtime_ns, folders, files in reversed(listed):
+        count = len(files) + sum(
+            child.file_count for child in
+            (index.get(_key(os.path.join(path, name))) for name in folders) if child
+        )
+        index[key] = IndexedFolder(path, mtime_ns, folders, files, count)
+    return index
+
+
+class FileIndex(QObject):
+    """
+    Folder index of several roots, scanned by a thread pool.
+
+    All methods are called from the GUI thread. Apart from read_folder(),
+    which stats the one folder it lists, they never touch the disk and
+    return None for folders that are not indexed yet (a scan is then
+    scheduled and index_updated follows).
+    """
+
+    # Root folder whose index changed
+    index_updated = Signal(str)
+
+    # Worker -> GUI thread hand-off: (root key, index, scan start time)
+    _scanned = Signal(str, object, float)
+
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL_S,
+                 max_workers: int = MAX_WORKERS, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.refresh_interval = refresh_interval
+        self._roots: Dict[str, str] = {}                    # root key -> root path
+        self._indexes: Dict[str, Dict[str, IndexedFolder]] = {}
+        self._scanned_at: Dict[str, float] = {}
+        self._scanning: Set[str] = set()
+        self._match_cache: Dict[str, Set[str]] = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="file-index")
+        self._scanned.connect(self._on_scanned)
+
+    def add_root(self, path: Union[str, Path]) -> None:
+        """Index a folder (and keep it fresh)."""
+        key = _key(path)
+        if key not in self._roots:
+            self._roots[key] = str(path)
+            self._schedule(key)
+
+    def refresh(self, path: Union[str, Path, None] = None) -> None:
+        """Rescan the root holding path now (every root if None)."""
+        if path is None:
+            for key in self._roots:
+                self._schedule(key)
+            return
+        root = self._root_of(_key(path))
+        if root is not None:
+            self._schedule(root)
+        else:
+            self.add_root(path)
+
+    def file_count(self, path: Union[str, Path]) -> Optional[int]:
+        """Files in a folder and its subfolders, or None if not indexed yet."""
+        folder = self._folder(path)
+        return folder.file_count if folder else None
+
+    def list_folder(self, path: Union[str, Path]) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...]]]:
+        """(subfolder names, file names) of a folder, or None if not indexed yet."""
+        folder = self._folder(path)
+        return (folder.folders, folder.files) if folder else None
+
+    def read_folder(self, path: Union[str, Path]) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """
+        (subfolder names, file names) of a folder, never stale.
+
+        The indexed listing is used when the folder's mtime still matches
+        the one it was listed with; otherwise the folder is listed with
+        os.scandir and its root is rescanned.
+        """
+        folder = self._folder(path)
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if folder is not None and folder.mtime_ns == mtime_ns:
+            return folder.folders, folder.files
+        if folder is not None:
+            self._schedule(self._root_of(_key(path)))
+        return _list_folder(str(path))
+
+    def contains_match(self, path: Union[str, Path], pattern: str) -> Optional[bool]:
+        """
+        Whether a file or folder below path matches a lowercase fnmatch pattern.
+
+        Returns:
+            True/False, or None if path is not indexed yet
+        """
+        key = _key(path)
+        if self._folder(path) is None:
+            return None
+        matches = self._match_cache.get(pattern)
+        if matches is None:
+            matches = self._match_cache[pattern] = self._folders_with_matches(pattern)
+        return key in matches
+
+    def shutdown(self) -> None:
+        """Stop scanning (pending scans are dropped)."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _folder(self, path: Union[str, Path]) -> Optional[IndexedFolder]:
+        key = _key(path)
+        root = self._root_of(key)
+        if root is None:
+            self.add_root(path)
+            return None
+        if time.monotonic() - self._scanned_at.get(root, 0) > self.refresh_interval:
+            self._schedule(root)
+        index = self._indexes.get(root)
+        return index.get(key) if index else None
+
+    def _root_of(self, key: str) -> Optional[str]:
+        """Deepest indexed root holding key."""
+        best = None
+        for root in self._roots:
+            if key == root or key.startswith(root.rstrip(os.sep) + os.sep):
+                if best is None or len(root) > len(best):
+                    best = root
+        return best
+
+    def _folders_with_matches(self, pattern: str) -> Set[str]:
+        """Keys of the folders having a matching entry somewhere below."""
+        result: Set[str] = set()
+        for root, index in self._indexes.items():
+            for key, folder in index.items():
+                if key in result:
+                    continue
+                if any(fnmatch.fnmatch(name.lower(), pattern) for name in folder.folders + folder.files):
+                    # Mark the folder and its ancestors up to the root
+                    while key not in result:
+                        result.add(key)
+                        if key == root:
+                            break
+                        key = _key(os.path.dirname(key))
+        return result
+
+    def _schedule(self, root: str) -> None:
+        if root in self._scanning:
+            return
+        self._scanning.add(root)
+        started_at = time.monotonic()
+        future = self._pool.submit(scan_folder_tree, self._roots[root], self._indexes.get(root))
+
+        def done(f, root=root, started_at=started_at):
+            if f.cancelled():
+                return
+            if f.exception() is not None:
+                logger.warning(f"File index scan failed for {self._roots.get(root)}: {f.exception()}")
+                self._scanned.emit(root, None, started_at)
+            else:
+                self._scanned.emit(root, f.result(), started_at)
+
+        future.add_done_callback(done)
+
+    def _on_scanned(self, root: str, index: Optional[Dict[str, IndexedFolder]], started_at: float) -> None:
+        self._scanning.discard(root)
+        self._scanned_at[root] = started_at
+        if index is None or root not in self._roots:
+            return
+        changed = self._indexes.get(root) != index
+        self._indexes[root] = index
+        if changed:
+            self._match_cache.clear()
+            self.index_updated.emit(self._roots[root])
+
+
+def get_file_index() -> FileIndex:
+    """Get the global file index instance"""
+    global _file_index_instance
+    if '_file_index_instance' not in globals():
+        _file_index_instance = FileIndex()
+    return _file_index_instance
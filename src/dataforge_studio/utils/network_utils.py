@@ -1,5 +1,10 @@
 """
 Network utilities for connection testing.
+
+Probe results are cached per endpoint for a short time (REACHABLE_TTL_S /
+UNREACHABLE_TTL_S), and concurrent probes of one endpoint share a single
+attempt. probe_connections() checks many connections in parallel, so a
+workspace of unreachable servers costs one timeout instead of one each.
 """
 
 import socket
@@ -7,8 +12,13 @@ import subprocess
 import platform
 import re
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Iterable, Optional, Tuple
+
+from ..constants import REACHABLE_TTL_S, UNREACHABLE_TTL_S, PROBE_WORKERS
 
 import logging
 logger = logging.getLogger(__name__)
@@ -233,7 +243,90 @@ def extract_host_from_connection_string(connection_string: str, db_type: str = N
     return extract_host_port_from_connection_string(connection_string, db_type)[0]
 
 
-def check_server_reachable(connection_string: str, db_type: str = None, timeout: int = 3) -> Tuple[bool, Optional[str]]:
+# ==================== Reachability cache ====================
+
+# (host, port, icmp) -> (checked_at, reachable, message)
+_probe_cache: Dict[Tuple[str, Optional[int], bool], Tuple[float, bool, str]] = {}
+_probe_inflight: Dict[Tuple[str, Optional[int], bool], Future] = {}
+_probe_lock = threading.Lock()
+
+
+def probe_endpoint(host: str, port: int = None, timeout: int = 3, icmp: bool = True,
+                   max_age: float = None) -> Tuple[bool, str]:
+    """
+    Cached reachability probe of one endpoint.
+
+    Args:
+        host: Hostname or IP address
+        port: Port to check (None = common database ports)
+        timeout: Timeout in seconds
+        icmp: Fall back to ICMP ping when the port does not answer
+        max_age: Oldest cached result accepted, in seconds (None = the
+                 REACHABLE_TTL_S / UNREACHABLE_TTL_S defaults, 0 = probe again)
+
+    Returns:
+        Tuple of (success: bool, message: str)
+    """
+    key = (host.lower(), port, icmp)
+    with _probe_lock:
+        cached = _probe_cache.get(key)
+        if cached is not None:
+            checked_at, reachable, message = cached
+            ttl = max_age if max_age is not None else (REACHABLE_TTL_S if reachable else UNREACHABLE_TTL_S)
+            if time.monotonic() - checked_at <= ttl:
+                return reachable, message
+        future = _probe_inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _probe_inflight[key] = Future()
+
+    if not owner:
+        return future.result()
+
+    try:
+        if icmp:
+            result = ping_host(host, timeout, port=port)
+        else:
+            result = _check_host_socket(host, timeout, port=port)
+    except Exception as e:
+        result = (False, str(e))
+    with _probe_lock:
+        _probe_cache[key] = (time.monotonic(), *result)
+        _probe_inflight.pop(key, None)
+    future.set_result(result)
+    return result
+
+
+def clear_reachability_cache() -> None:
+    """Forget every cached probe result."""
+    with _probe_lock:
+        _probe_cache.clear()
+
+
+def probe_connections(db_conns: Iterable, timeout: int = 3,
+                      max_workers: int = PROBE_WORKERS) -> Dict[str, Tuple[bool, Optional[str]]]:
+    """
+    Check several database connections in parallel (see is_connection_reachable).
+
+    Args:
+        db_conns: DatabaseConnection objects
+        timeout: Timeout in seconds, per probe
+        max_workers: Probes run at once
+
+    Returns:
+        {connection id: (reachable, error_message or None)}
+    """
+    db_conns = list(db_conns)
+    if not db_conns:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(db_conns)),
+                            thread_name_prefix="probe") as pool:
+        results = pool.map(lambda db_conn: is_connection_reachable(db_conn, timeout), db_conns)
+        return {db_conn.id: result for db_conn, result in zip(db_conns, results)}
+
+
+def check_server_reachable(connection_string: str, db_type: str = None, timeout: int = 3,
+                           max_age: float = None) -> Tuple[bool, Optional[str]]:
     """
     Check if the server in a connection string is reachable.
 
@@ -241,6 +334,7 @@ def check_server_reachable(connection_string: str, db_type: str = None, timeout:
         connection_string: Database connection string
         db_type: Database type hint
         timeout: Timeout in seconds
+        max_age: Oldest cached probe accepted (see probe_endpoint)
 
     Returns:
         Tuple of (reachable: bool, error_message: str or None)
@@ -257,7 +351,7 @@ def check_server_reachable(connection_string: str, db_type: str = None, timeout:
     if host.lower() in ('localhost', '127.0.0.1', '::1', '.'):
         return True, None
 
-    success, message = ping_host(host, timeout, port=port)
+    success, message = probe_endpoint(host, port, timeout, max_age=max_age)
 
     if success:
         return True, None
@@ -11,6 +11,8 @@ try:
 except ImportError:
     pyodbc = None
 
+from .completion_index import CompletionIndex
+
 import logging
 logger = logging.getLogger(__name__)
 
@@ -99,6 +101,11 @@ class SchemaCache:
         Returns:
             List of unique column names
         """
+        conn_id = self._get_connection_id(connection)
+        cached = self._cache.get(conn_id, {}).get("all_columns")
+        if cached is not None:
+            return cached
+
         tables = self.get_tables(connection, db_type)
         all_columns = set()
 
@@ -106,7 +113,49 @@ class SchemaCache:
             columns = self.get_columns(connection, db_type, table)
             all_columns.update(columns)
 
-        return sorted(list(all_columns))
+        result = sorted(all_columns)
+        self._cache.setdefault(conn_id, {})["all_columns"] = result
+        return result
+
+    def get_completion_index(self, connection: Union[sqlite3.Connection, pyodbc.Connection],
+                             db_type: str, context: Optional[str] = None,
+                             table_name: Optional[str] = None) -> CompletionIndex:
+        """
+        Get a prebuilt completion index for a completion context.
+
+        The index is built once per connection and context, then reused
+        on every keystroke.
+
+        Args:
+            connection: Database connection
+            db_type: "sqlite", "sqlserver", "postgresql", "mysql", "oracle", or other
+            context: "table", "column", "table_column", or None for everything
+            table_name: Table name for "table_column" context
+
+        Returns:
+            CompletionIndex over the matching names
+        """
+        conn_id = self._get_connection_id(connection)
+        indexes = self._cache.setdefault(conn_id, {}).setdefault("indexes", {})
+
+        key = (context, table_name) if context == "table_column" else (context, None)
+        index = indexes.get(key)
+        if index is not None:
+            return index
+
+        if context == "table":
+            names = self.get_tables(connection, db_type)
+        elif context == "column":
+            names = self.get_all_columns(connection, db_type)
+        elif context == "table_column":
+            names = self.get_columns(connection, db_type, table_name) if table_name else []
+        else:
+            names = (self.get_tables(connection, db_type)
+                     + self.get_all_columns(connection, db_type))
+
+        index = CompletionIndex(names)
+        indexes[key] = index
+        return index
 
     def invalidate(self, connection: Optional[Union[sqlite3.Connection, pyodbc.Connection]] = None):
         """
@@ -9,6 +9,8 @@ Provides multiple formatting styles:
 """
 
 import re
+from functools import lru_cache
+
 import sqlparse
 
 import logging
@@ -32,12 +34,21 @@ JOIN_TYPES = frozenset({
     'CROSS JOIN', 'CROSS APPLY', 'OUTER APPLY', 'JOIN',
 })
 
+# SQL Server batch separator: a line holding only GO
+_GO_SEPARATOR = re.compile(r'(?mi)^\s*GO\s*$')
+
+# Top-level scanning: a single quote opens a string that runs to the next
+# quote (or the end of the text); the rest is parentheses and plain runs.
+_SCAN_TOKEN = re.compile(r"'[^']*'?|[()]|[^'()]+")
+
 
 class _TopLevelScanner:
-    """Iterate over SQL text tracking parenthesis depth and string literals.
+    """Scan SQL text tracking parenthesis depth and string literals.
 
-    Yields (index, char, depth, in_string) for each character.
-    Provides utility methods for common top-level operations.
+    tokens() cuts the text into strings, parentheses and plain runs in one
+    linear pass; the utility methods for common top-level operations work
+    on that token stream instead of walking the text character by character.
+    iter() yields (index, char, depth, in_string) for each character.
     """
 
     @staticmethod
@@ -57,124 +68,158 @@ class _TopLevelScanner:
                     depth -= 1
             yield i, ch, depth, in_single
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def tokens(text: str) -> tuple:
+        """Tokens of text as (start, end, kind, depth) tuples.
+
+        kind is "'" for a string, '(' or ')' for a parenthesis and '' for
+        other text; depth is the parenthesis depth after the token. Cached,
+        as the same column or line is often scanned by several helpers.
+        """
+        return tuple(_TopLevelScanner._scan(text, 0))
+
+    @staticmethod
+    def _scan(text: str, pos: int):
+        depth = 0
+        for match in _SCAN_TOKEN.finditer(text, pos):
+            start = match.start()
+            kind = text[start]
+            if kind == '(':
+                depth += 1
+            elif kind == ')':
+                depth -= 1
+            elif kind != "'":
+                kind = ''
+            yield start, match.end(), kind, depth
+
     @staticmethod
     def paren_delta(text: str) -> int:
         """Count net parenthesis depth change, ignoring parens inside strings."""
-        depth = 0
-        in_single = False
-        for ch in text:
-            if ch == "'" and not in_single:
-                in_single = True
-            elif ch == "'" and in_single:
-                in_single = False
-            elif not in_single:
-                if ch == '(':
-                    depth += 1
-                elif ch == ')':
-                    depth -= 1
-        return depth
+        tokens = _TopLevelScanner.tokens(text)
+        return tokens[-1][3] if tokens else 0
 
     @staticmethod
     def split_by_comma(text: str) -> list:
         """Split text by commas at top level only (not inside parentheses or strings)."""
         parts = []
-        current: list[str] = []
-        for _i, ch, depth, in_string in _TopLevelScanner.iter(text):
-            if ch == ',' and depth == 0 and not in_string:
-                parts.append(''.join(current))
-                current = []
-            else:
-                current.append(ch)
-        if current:
-            parts.append(''.join(current))
+        part_start = 0
+        for start, end, kind, depth in _TopLevelScanner.tokens(text):
+            if kind or depth != 0:
+                continue
+            comma = text.find(',', start, end)
+            while comma >= 0:
+                parts.append(text[part_start:comma])
+                part_start = comma + 1
+                comma = text.find(',', part_start, end)
+        if part_start < len(text):
+            parts.append(text[part_start:])
         return parts
 
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _keyword_pattern(keywords: tuple):
+        """Zero-width match before any of the keywords, on word boundaries."""
+        alternatives = '|'.join(re.escape(kw) for kw in keywords)
+        return re.compile(rf'(?<!\w)(?=(?:{alternatives})(?!\w))')
+
+    @staticmethod
+    def keyword_positions(text: str, keywords) -> list:
+        """Positions of the keywords at top level (depth 0, word boundaries)."""
+        upper = text.upper()
+        if len(upper) != len(text):
+            # Uppercasing changed the length (e.g. 'ß' -> 'SS'): keep the
+            # character-indexed comparison the formatter has always made
+            return _TopLevelScanner._keyword_positions_by_char(text, upper, keywords)
+        pattern = _TopLevelScanner._keyword_pattern(tuple(keywords))
+        positions = []
+        for start, end, kind, depth in _TopLevelScanner.tokens(text):
+            if not kind and depth == 0:
+                positions.extend(m.start() for m in pattern.finditer(upper, start, end))
+        return positions
+
+    @staticmethod
+    def _keyword_positions_by_char(text: str, upper: str, keywords) -> list:
+        positions = []
+        length = len(text)
+        for i, _ch, depth, in_string in _TopLevelScanner.iter(text):
+            if depth != 0 or in_string:
+                continue
+            for kw in keywords:
+                kw_len = len(kw)
+                if upper[i:i + kw_len] == kw:
+                    before_ok = (i == 0 or not (upper[i - 1].isalnum() or upper[i - 1] == '_'))
+                    after_ok = (i + kw_len >= length or not (upper[i + kw_len].isalnum() or upper[i + kw_len] == '_'))
+                    if before_ok and after_ok:
+                        positions.append(i)
+                        break
+        return positions
+
     @staticmethod
     def find_keyword(text: str, keyword: str) -> int:
         """Find position of a keyword at top level (depth 0, word boundaries).
         Returns index or -1 if not found."""
-        upper = text.upper()
-        kw_len = len(keyword)
-        for i, _ch, depth, in_string in _TopLevelScanner.iter(text):
-            if depth == 0 and not in_string and upper[i:i + kw_len] == keyword:
-                before_ok = (i == 0 or not (upper[i - 1].isalnum() or upper[i - 1] == '_'))
-                after_ok = (i + kw_len >= len(text) or not (upper[i + kw_len].isalnum() or upper[i + kw_len] == '_'))
-                if before_ok and after_ok:
-                    return i
-        return -1
+        positions = _TopLevelScanner.keyword_positions(text, (keyword,))
+        return positions[0] if positions else -1
 
     @staticmethod
     def find_last_keyword(text: str, keyword: str):
         """Find last occurrence of keyword at top level. Returns (start, end) or None."""
-        upper = text.upper()
-        kw_len = len(keyword)
-        result = None
-        for i, _ch, depth, in_string in _TopLevelScanner.iter(text):
-            if depth == 0 and not in_string and upper[i:i + kw_len] == keyword:
-                before_ok = (i == 0 or not (upper[i - 1].isalnum() or upper[i - 1] == '_'))
-                after_ok = (i + kw_len >= len(text) or not (upper[i + kw_len].isalnum() or upper[i + kw_len] == '_'))
-                if before_ok and after_ok:
-                    result = (i, i + kw_len)
-        return result
+        positions = _TopLevelScanner.keyword_positions(text, (keyword,))
+        return (positions[-1], positions[-1] + len(keyword)) if positions else None
 
     @staticmethod
     def find_equals(text: str) -> int:
         """Find first '=' at top level, ignoring >=, <=, !=. Returns index or -1."""
         length = len(text)
-        for i, ch, depth, in_string in _TopLevelScanner.iter(text):
-            if depth == 0 and not in_string and ch == '=':
-                if i > 0 and text[i - 1] in ('>', '<', '!'):
-                    continue
-                if i + 1 < length and text[i + 1] in ('>', '<'):
-                    continue
-                return i
+        for start, end, kind, depth in _TopLevelScanner.tokens(text):
+            if kind or depth != 0:
+                continue
+            i = text.find('=', start, end)
+            while i >= 0:
+                if not (i > 0 and text[i - 1] in '><!') and not (i + 1 < length and text[i + 1] in '><'):
+                    return i
+                i = text.find('=', i + 1, end)
         return -1
 
+    @staticmethod
+    def matching_paren(text: str, open_pos: int) -> int:
+        """Index of the ')' closing the '(' at open_pos, or -1 if unmatched."""
+        for start, _end, kind, depth in _TopLevelScanner._scan(text, open_pos):
+            if kind == ')' and depth == 0:
+                return start
+        return -1
+
+    @staticmethod
+    def last_close(text: str) -> int:
+        """Index of the last ')' that closes a top-level parenthesis, or -1."""
+        last = -1
+        for start, _end, kind, depth in _TopLevelScanner.tokens(text):
+            if kind == ')' and depth == 0:
+                last = start
+        return last
+
     @staticmethod
     def extract_paren_content(text: str, open_pos: int) -> str:
         """Extract content between '(' at open_pos and its matching ')'.
         Returns content without outer parens, or None if unmatched."""
         if open_pos >= len(text) or text[open_pos] != '(':
             return None
-        depth = 0
-        in_single = False
-        for i in range(open_pos, len(text)):
-            ch = text[i]
-            if ch == "'" and not in_single:
-                in_single = True
-            elif ch == "'" and in_single:
-                in_single = False
-            elif not in_single:
-                if ch == '(':
-                    depth += 1
-                elif ch == ')':
-                    depth -= 1
-                    if depth == 0:
-                        return text[open_pos + 1:i]
-        return None
+        close = _TopLevelScanner.matching_paren(text, open_pos)
+        return text[open_pos + 1:close] if close >= 0 else None
 
     @staticmethod
     def split_on_keywords(text: str, keywords: list) -> list:
         """Split text on keyword boundaries at top level.
         Returns list of (keyword_or_empty, text_chunk) tuples for clauses like WHEN/ELSE."""
-        upper = text.upper()
-        length = len(text)
         splits = []
         current_start = 0
-
-        for i, _ch, depth, in_string in _TopLevelScanner.iter(text):
-            if depth == 0 and not in_string:
-                for kw in keywords:
-                    kw_len = len(kw)
-                    if upper[i:i + kw_len] == kw:
-                        before_ok = (i == 0 or not (upper[i - 1].isalnum() or upper[i - 1] == '_'))
-                        after_ok = (i + kw_len >= length or not (upper[i + kw_len].isalnum() or upper[i + kw_len] == '_'))
-                        if before_ok and after_ok and i > current_start:
-                            chunk = text[current_start:i].strip()
-                            if chunk:
-                                splits.append(chunk)
-                            current_start = i
-                            break
+        for i in _TopLevelScanner.keyword_positions(text, keywords):
+            if i > current_start:
+                chunk = text[current_start:i].strip()
+                if chunk:
+                    splits.append(chunk)
+                current_start = i
 
         remaining = text[current_start:].strip()
         if remaining:
@@ -274,7 +319,7 @@ def format_sql(sql_text: str, style: str = "compact") -> str:
 
     try:
         # Split by GO batch separators (SQL Server), format each batch separately
-        batches = re.split(r'(?mi)^\s*GO\s*$', sql_text)
+        batches = _GO_SEPARATOR.split(sql_text)
         has_go = len(batches) > 1
 
         formatted_batches = []
@@ -458,24 +503,8 @@ def _extract_ctes_from_text(text: str):
         paren_pos = i + as_match.end() - 1  # position of '('
 
         # Find matching closing paren
-        depth = 0
         body_start = paren_pos + 1
-        close_pos = -1
-        in_single = False
-        for j in range(paren_pos, length):
-            ch = text[j]
-            if ch == "'" and not in_single:
-                in_single = True
-            elif ch == "'" and in_single:
-                in_single = False
-            elif not in_single:
-                if ch == '(':
-                    depth += 1
-                elif ch == ')':
-                    depth -= 1
-                    if depth == 0:
-                        close_pos = j
-                        break
+        close_pos = _TopLevelScanner.matching_paren(text, paren_pos)
 
         if close_pos < 0:
             body = text[body_start:].strip()
@@ -513,6 +542,13 @@ def _try_format_cte_ultimate(sql_text: str) -> str | None:
 
     base_indent is 4 if there's a preamble (CREATE VIEW), 0 otherwise.
     """
+    # Most statements have no top-level WITH: skip the sqlparse pass below.
+    # (Upper-casing keywords and spacing operators does not move a WITH.)
+    upper_text = sql_text.upper()
+    if 'WITH' not in upper_text or (len(upper_text) == len(sql_text)
+                                    and _find_top_level_with(sql_text) < 0):
+        return None
+
     # Uppercase keywords without reindenting (preserve structure for CTE parsing)
     upper_sql = _sqlparse_format(sql_text, keyword_case='upper',
                                 use_space_around_operators=True)
@@ -715,6 +751,7 @@ def _parse_sql_sections(lines: list, main_keywords: list) -> list:
     sections = []
     current_section = None
     paren_depth = 0
+    keywords = sorted(main_keywords, key=len, reverse=True)
 
     for line in expanded_lines:
         stripped = line.strip()
@@ -724,8 +761,9 @@ def _parse_sql_sections(lines: list, main_keywords: list) -> list:
         # Only check for keywords at paren depth 0
         keyword_found = None
         if paren_depth == 0:
-            for keyword in sorted(main_keywords, key=len, reverse=True):
-                if stripped.upper().startswith(keyword + ' ') or stripped.upper() == keyword:
+            stripped_upper = stripped.upper()
+            for keyword in keywords:
+                if stripped_upper.startswith(keyword + ' ') or stripped_upper == keyword:
                     keyword_found = keyword
                     break
 
@@ -871,21 +909,7 @@ def _split_table_and_alias(table_part: str):
         return table_part, None
 
     # Has parens — find the end of the last closing paren, then the alias after it
-    depth = 0
-    last_close = -1
-    in_single = False
-    for i, ch in enumerate(table_part):
-        if ch == "'" and not in_single:
-            in_single = True
-        elif ch == "'" and in_single:
-            in_single = False
-        elif not in_single:
-            if ch == '(':
-                depth += 1
-            elif ch == ')':
-                depth -= 1
-                if depth == 0:
-                    last_close = i
+    last_close = _TopLevelScanner.last_close(table_part)
 
     if last_close >= 0 and last_close < len(table_part) - 1:
         # There's content after the last closing paren — that's the alias
@@ -930,22 +954,7 @@ def _preparse_from_join_section(section: dict):
 def _preparse_subquery_join(section: dict, content: str):
     """Pre-parse a JOIN with a subquery table source: (SELECT ... ) alias ON ..."""
     # Find matching closing paren
-    depth = 0
-    subquery_end = -1
-    in_single = False
-    for i, ch in enumerate(content):
-        if ch == "'" and not in_single:
-            in_single = True
-        elif ch == "'" and in_single:
-            in_single = False
-        elif not in_single:
-            if ch == '(':
-                depth += 1
-            elif ch == ')':
-                depth -= 1
-                if depth == 0:
-                    subquery_end = i
-                    break
+    subquery_end = _TopLevelScanner.matching_paren(content, 0)
 
     if subquery_end < 0:
         # Malformed - treat as regular table
@@ -1039,24 +1048,8 @@ def _parse_cte_definitions(content_lines: list) -> list:
         paren_pos = i + as_match.end() - 1  # position of '('
 
         # Find matching closing paren
-        depth = 0
         body_start = paren_pos + 1
-        close_pos = -1
-        in_single = False
-        for j in range(paren_pos, length):
-            ch = full[j]
-            if ch == "'" and not in_single:
-                in_single = True
-            elif ch == "'" and in_single:
-                in_single = False
-            elif not in_single:
-                if ch == '(':
-                    depth += 1
-                elif ch == ')':
-                    depth -= 1
-                    if depth == 0:
-                        close_pos = j
-                        break
+        close_pos = _TopLevelScanner.matching_paren(full, paren_pos)
 
         if close_pos < 0:
             body = full[body_start:].strip()
@@ -1,18 +1,22 @@
 """
 SQL Splitter - Split SQL text into individual statements for batch execution.
 
-Handles:
-- Standard semicolon-delimited statements
-- T-SQL GO batch separator
-- Comments (single-line -- and multi-line /* */)
-- Strings with embedded semicolons (via sqlparse)
+A single linear scan finds statement boundaries, T-SQL GO separators, line
+numbers and whether each statement returns rows. The scanner understands:
+- Semicolon-delimited statements
+- T-SQL GO batch separator (on its own line)
+- Comments (single-line -- and multi-line /* */, nested for SQL Server and PostgreSQL)
+- Strings and quoted identifiers ('...', "...", [...], `...`) with embedded semicolons
+- PostgreSQL dollar quoting ($$...$$, $tag$...$tag$) and E'...' escape strings
+- BEGIN ... END and CASE ... END blocks (BEGIN TRAN/TRANSACTION is not a block);
+  END IF/WHILE/LOOP/REPEAT close statements that never opened a block, and
+  keywords after a dot (p.begin) are names
 """
 
 import re
 from dataclasses import dataclass
-from typing import List, Tuple
-
-import sqlparse
+from functools import lru_cache
+from typing import List, Optional, Pattern, Tuple
 
 import logging
 logger = logging.getLogger(__name__)
@@ -27,91 +31,250 @@ class SQLStatement:
     is_select: bool     # True if SELECT statement that returns results
 
 
-def split_sql_statements(sql_text: str, db_type: str = "sqlserver") -> List[SQLStatement]:
-    """
-    Split SQL text into individual statements.
+# Words after BEGIN that start a transaction rather than a block
+_TRANSACTION_WORDS = frozenset({
+    'TRAN', 'TRANSACTION', 'WORK', 'DISTRIBUTED',
+    'DEFERRED', 'IMMEDIATE', 'EXCLUSIVE', 'ISOLATION', 'READ',
+})
 
-    Args:
-        sql_text: Full SQL text with multiple statements
-        db_type: Database type ("sqlserver", "sqlite", etc.)
+# Words after END that close IF/WHILE/LOOP/REPEAT (MySQL, PL/pgSQL), not a block
+_COMPOUND_END_WORDS = frozenset({'IF', 'WHILE', 'LOOP', 'REPEAT'})
 
-    Returns:
-        List of SQLStatement objects
-    """
-    if not sql_text or not sql_text.strip():
-        return []
-
-    statements = []
-
-    # For SQL Server, first split on GO statements
-    if db_type == "sqlserver":
-        batches = _split_on_go(sql_text)
-    else:
-        batches = [(sql_text, 1)]
+# Leading keywords of statements that return results
+_SELECT_KEYWORDS = frozenset({'SELECT', 'WITH', 'EXEC', 'EXECUTE'})
 
-    # Then use sqlparse for each batch
-    for batch_text, batch_start_line in batches:
-        parsed = sqlparse.split(batch_text)
+_BRACKET_DIALECTS = frozenset({'sqlserver', 'sqlite', 'access'})
+_BACKTICK_DIALECTS = frozenset({'mysql', 'sqlite'})
+_NESTED_COMMENT_DIALECTS = frozenset({'sqlserver', 'postgresql'})
 
-        current_line = batch_start_line
-        for stmt_text in parsed:
-            stmt_text = stmt_text.strip()
-            if not stmt_text:
-                continue
+_TRAILING_COMMENT = re.compile(r'[ \t]*--[^\n]*')
+_COMMENT_DELIMITERS = re.compile(r'/\*|\*/')
 
-            # Count lines in this statement
-            stmt_lines = stmt_text.count('\n') + 1
 
-            # Determine if SELECT
-            is_select = _is_select_statement(stmt_text)
+@lru_cache(maxsize=None)
+def _token_pattern(db_type: str) -> Pattern:
+    """Tokenizer for a dialect: one alternative per token kind."""
+    parts = []
+    if db_type == 'sqlserver':
+        parts.append(r'(?P<go>^[ \t]*GO[ \t]*\r?(?:\n|\Z))')
+    parts += [
+        r'(?P<space>[^\S\n]*\n|[^\S\n]+)',   # at most one newline, so GO is seen at line start
+        r'(?P<line_comment>--[^\n]*)',
+        r'(?P<block_comment>/\*)',
+    ]
+    if db_type == 'mysql':
+        parts.append(r"(?P<string>'[^'\\]*(?:(?:''|\\.)[^'\\]*)*'?)")
+    else:
+        parts.append(r"(?P<string>'[^']*(?:''[^']*)*'?)")
+    parts.append(r'(?P<quoted>"[^"]*(?:""[^"]*)*"?)')
+    if db_type in _BRACKET_DIALECTS:
+        parts.append(r'(?P<bracket>\[[^\]]*(?:\]\][^\]]*)*\]?)')
+    if db_type in _BACKTICK_DIALECTS:
+        parts.append(r'(?P<backtick>`[^`]*(?:``[^`]*)*`?)')
+    if db_type == 'postgresql':
+        parts.append(r'(?P<dollar>\$(?:[^\W\d]\w*)?\$)')
+        parts.append(r"(?P<escape_string>E'[^'\\]*(?:(?:''|\\.)[^'\\]*)*'?)")
+    parts += [
+        r'(?P<word>[^\W\d][\w@#$]*|[@#][\w@#$]*)',
+        r'(?P<semicolon>;)',
+        r'(?P<open>\()',
+        r'(?P<close>\))',
+        r'(?P<other>[^\s\w\'"\[`$@#;()/-]+|\w+|.)',
+    ]
+    return re.compile('|'.join(parts), re.MULTILINE | re.IGNORECASE | re.DOTALL)
+
+
+def _block_comment_end(sql_text: str, pos: int, nested: bool) -> int:
+    """Offset just past the comment opened before pos (end of text if unclosed)."""
+    if not nested:
+        end = sql_text.find('*/', pos)
+        return len(sql_text) if end < 0 else end + 2
+    depth = 1
+    for m in _COMMENT_DELIMITERS.finditer(sql_text, pos):
+        depth += 1 if m.group() == '/*' else -1
+        if depth == 0:
+            return m.end()
+    return len(sql_text)
+
+
+def _scan(sql_text: str, db_type: str) -> Tuple[List[SQLStatement], List[Tuple[int, int]]]:
+    """
+    Scan SQL text once.
 
+    Returns:
+        (statements, separators) where separators are the (start, end)
+        offsets of GO lines
+    """
+    statements: List[SQLStatement] = []
+    separators: List[Tuple[int, int]] = []
+    match = _token_pattern(db_type).match
+    nested_comments = db_type in _NESTED_COMMENT_DIALECTS
+    # T-SQL has no END IF: there "END\nIF ..." ends a block and starts a statement
+    compound_end = db_type != 'sqlserver'
+    length = len(sql_text)
+
+    # Incremental line counting (offsets only move forward)
+    counted_offset, counted_line = 0, 1
+
+    def line_at(offset: int) -> int:
+        nonlocal counted_offset, counted_line
+        counted_line += sql_text.count('\n', counted_offset, offset)
+        counted_offset = offset
+        return counted_line
+
+    # Current statement
+    start: Optional[int] = None
+    has_code = False
+    first_word: Optional[str] = None
+    select_into = seen_from = False
+    depth = parens = 0
+    pending_begin = pending_end = after_dot = False
+    prev_word = ''
+
+    def finish(end: int) -> None:
+        nonlocal start, has_code, first_word, select_into, seen_from, depth, parens
+        nonlocal pending_begin, pending_end, after_dot, prev_word
+        if start is not None and has_code:
+            text = sql_text[start:end].rstrip()
+            line_start = line_at(start)
+            is_select = first_word in _SELECT_KEYWORDS and not select_into
             statements.append(SQLStatement(
-                text=stmt_text,
-                line_start=current_line,
-                line_end=current_line + stmt_lines - 1,
+                text=text,
+                line_start=line_start,
+                line_end=line_at(start + len(text)),
                 is_select=is_select
             ))
+        start, has_code, first_word = None, False, None
+        select_into = seen_from = pending_begin = pending_end = after_dot = False
+        depth = parens = 0
+        prev_word = ''
+
+    pos = 0
+    while pos < length:
+        m = match(sql_text, pos)
+        kind = m.lastgroup
+        end = m.end()
+
+        if kind == 'space':
+            pos = end
+            continue
+        if kind == 'go':
+            finish(pos)
+            separators.append((pos, end))
+            pos = end
+            continue
+
+        if start is None:
+            start = pos
+        if kind == 'line_comment':
+            pos = end
+            continue
+        if kind == 'block_comment':
+            pos = _block_comment_end(sql_text, end, nested_comments)
+            continue
+
+        if pending_begin:
+            # BEGIN TRAN / BEGIN; start a transaction, anything else opens a block
+            pending_begin = False
+            if not (kind == 'semicolon' or
+                    (kind == 'word' and m.group().upper() in _TRANSACTION_WORDS)):
+                depth += 1
+        if pending_end:
+            # END IF / END WHILE / ... close a statement; END, END CASE, END label close a block
+            pending_end = False
+            if not (kind == 'word' and m.group().upper() in _COMPOUND_END_WORDS):
+                depth -= 1
+        dotted, after_dot = after_dot, False
+
+        if kind == 'semicolon':
+            if depth == 0:
+                trailing = _TRAILING_COMMENT.match(sql_text, end)
+                if trailing:
+                    end = trailing.end()
+                finish(end)
+            pos = end
+            continue
+
+        has_code = True
+        if kind == 'word':
+            word = m.group().upper()
+            if first_word is None:
+                first_word = word
+            if dotted:
+                pass  # qualified name (p.begin, t.end), not a keyword
+            elif word == 'BEGIN':
+                pending_begin = True
+            elif word == 'CASE':
+                if prev_word != 'END':  # END CASE closes, it does not open
+                    depth += 1
+            elif word == 'END':
+                if depth:
+                    if compound_end:
+                        pending_end = True
+                    else:
+                        depth -= 1
+            elif parens == 0 and first_word == 'SELECT' and not seen_from:
+                # SELECT ... INTO <table> FROM ... is DDL (creates a table), not a query
+                if word == 'FROM':
+                    seen_from = True
+                elif word == 'INTO':
+                    select_into = True
+            prev_word = word
+        elif kind == 'dollar':
+            closing = sql_text.find(m.group(), end)
+            end = length if closing < 0 else closing + len(m.group())
+        elif kind == 'open':
+            parens += 1
+        elif kind == 'close':
+            parens = max(parens - 1, 0)
+        elif kind == 'other':
+            after_dot = m.group().endswith('.')
+        pos = end
+
+    finish(length)
+    return statements, separators
+
+
+def split_sql_statements(sql_text: str, db_type: str = "sqlserver") -> List[SQLStatement]:
+    """
+    Split SQL text into individual statements.
 
-            current_line += stmt_lines
+    Statements keep their terminating semicolon and the comments before
+    them; comment-only fragments are dropped.
+
+    Args:
+        sql_text: Full SQL text with multiple statements
+        db_type: Database type ("sqlserver", "sqlite", etc.); GO batch
+                 separators are only recognized for "sqlserver"
 
-    return statements
+    Returns:
+        List of SQLStatement objects
+    """
+    if not sql_text or not sql_text.strip():
+        return []
+    return _scan(sql_text, db_type)[0]
 
 
 def _split_on_go(sql_text: str) -> List[Tuple[str, int]]:
     """
     Split T-SQL text on GO batch separators.
 
-    GO must be on its own line (possibly with whitespace).
+    GO must be on its own line (possibly with whitespace), outside
+    strings and comments.
 
     Returns:
         List of (batch_text, start_line) tuples
     """
-    # Pattern: GO on its own line (case-insensitive)
-    # Matches: "GO", "  GO  ", "go", but not "GOING" or "ERGO"
-    go_pattern = re.compile(r'^\s*GO\s*$', re.MULTILINE | re.IGNORECASE)
-
+    _, separators = _scan(sql_text, 'sqlserver')
     batches = []
-    lines = sql_text.split('\n')
-
-    current_batch_lines = []
-    current_start_line = 1
-
-    for i, line in enumerate(lines, 1):
-        if go_pattern.match(line):
-            # End current batch
-            if current_batch_lines:
-                batch_text = '\n'.join(current_batch_lines)
-                batches.append((batch_text, current_start_line))
-            current_batch_lines = []
-            current_start_line = i + 1
-        else:
-            current_batch_lines.append(line)
-
-    # Add final batch
-    if current_batch_lines:
-        batch_text = '\n'.join(current_batch_lines)
-        batches.append((batch_text, current_start_line))
-
+    batch_start = 0
+    for go_start, go_end in separators + [(len(sql_text), len(sql_text))]:
+        batch_text = sql_text[batch_start:go_start]
+        if batch_text.strip():
+            if batch_text.endswith('\n'):
+                batch_text = batch_text[:-1]
+            batches.append((batch_text, sql_text.count('\n', 0, batch_start) + 1))
+        batch_start = go_end
     return batches
 
 
@@ -125,53 +288,13 @@ def _is_select_statement(stmt_text: str) -> bool:
     - EXEC/EXECUTE that might return results
 
     Returns False for:
+    - SELECT ... INTO (creates a table)
     - INSERT/UPDATE/DELETE
     - CREATE/ALTER/DROP
     - DECLARE, SET, USE, etc.
     """
-    # Normalize: remove comments and extra whitespace
-    try:
-        cleaned = sqlparse.format(stmt_text, strip_comments=True).strip().upper()
-    except ValueError:
-        cleaned = stmt_text.strip().upper()
-
-    if not cleaned:
-        return False
-
-    # Get first word (skip any leading whitespace)
-    words = cleaned.split()
-    first_word = words[0] if words else ""
-
-    select_keywords = {'SELECT', 'WITH'}
-    non_select_keywords = {
-        'INSERT', 'UPDATE', 'DELETE', 'MERGE',
-        'CREATE', 'ALTER', 'DROP', 'TRUNCATE',
-        'DECLARE', 'SET', 'USE', 'PRINT', 'RAISERROR',
-        'BEGIN', 'END', 'IF', 'WHILE', 'GOTO',
-        'GRANT', 'REVOKE', 'DENY'
-    }
-
-    if first_word == 'SELECT':
-        # SELECT ... INTO <table> FROM ... is DDL (creates a table), not a query
-        try:
-            into_pos = words.index('INTO')
-            from_pos = words.index('FROM') if 'FROM' in words else len(words)
-            if into_pos < from_pos:
-                return False
-        except ValueError:
-            pass
-        return True
-
-    if first_word == 'WITH':
-        return True
-    if first_word in non_select_keywords:
-        return False
-
-    # EXEC/EXECUTE could return results
-    if first_word in {'EXEC', 'EXECUTE'}:
-        return True  # Assume it might return results
-
-    return False
+    statements = _scan(stmt_text, '')[0] if stmt_text else []
+    return bool(statements) and statements[0].is_select
 
 
 def needs_script_mode(sql: str, db_type: str = "sqlserver") -> bool:
@@ -0,0 +1,258 @@
+"""
+Thumbnail Cache - Downscaled image previews decoded off the GUI thread.
+
+Previews are decoded with QImageReader.setScaledSize (JPEG decodes straight
+at the reduced size), written to _AppConfig/thumbnails/ and kept in a
+memory LRU bounded by decoded size. Entries are keyed by file path, mtime, file size and preview
+box, so an edited image gets a new thumbnail and stale files are never
+served.
+
+Usage:
+    cache = get_thumbnail_cache()
+    cache.thumbnail_ready.connect(on_ready)   # (path, box, Thumbnail)
+    thumb = cache.request(path, QSize(600, 400))  # None until decoded
+    cache.prefetch([next_path, previous_path], QSize(600, 400))
+"""
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional, Set, Union
+
+from PySide6.QtCore import QObject, QSize, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader
+
+logger = logging.getLogger(__name__)
+
+# Decoded previews kept in memory: an 800x600 preview is about 2 MB, a
+# 4K fullscreen preview about 32 MB - room for the shown image and the
+# two neighbours prefetched on each side.
+MEMORY_BYTES = 192 * 1024 * 1024
+
+# Decoding threads
+MAX_WORKERS = 2
+
+# Disk cache budget; least recently written thumbnails go first
+DISK_CACHE_BYTES = 256 * 1024 * 1024
+
+CACHE_DIR = Path(__file__).parent.parent.parent.parent / "_AppConfig" / "thumbnails"
+
+
+@dataclass(frozen=True)
+class Thumbnail:
+    """
+    A decoded preview.
+
+    Attributes:
+        image: Preview, no larger than the requested box
+        source_size: Dimensions of the original image
+    """
+    image: QImage
+    source_size: QSize
+
+
+def thumbnail_key(path: Union[str, Path], box: QSize) -> Optional[str]:
+    """Cache key of a file's preview (None if the file is missing)."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    identity = f"{Path(path).resolve()}|{stat.st_mtime_ns}|{stat.st_size}|{box.width()}x{box.height()}"
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()
+
+
+def decode_thumbnail(path: Union[str, Path], box: QSize,
+                     cache_dir: Optional[Path] = None) -> Optional[Thumbnail]:
+    """
+    Decode a preview of an image, from the disk cache when possible.
+
+    Safe to call from any thread (QImage, not QPixmap).
+
+    Args:
+        path: Image file
+        box: Largest preview size (aspect ratio is kept, never upscaled)
+        cache_dir: Disk cache folder (no disk cache if None)
+
+    Returns:
+        Thumbnail, or None if the file cannot be read
+    """
+    reader = QImageReader(str(path))
+    reader.setAutoTransform(True)
+    source_size = reader.size()
+
+    key = thumbnail_key(path, box) if cache_dir else None
+    if key:
+        for suffix in (".jpg", ".png"):
+            cached = cache_dir / f"{key}{suffix}"
+            if cached.exists():
+                image = QImage(str(cached))
+                if not image.isNull():
+                    return Thumbnail(image, source_size if source_size.isValid() else image.size())
+
+    if source_size.isValid() and (source_size.width() > box.width() or source_size.height() > box.height()):
+        reader.setScaledSize(source_size.scaled(box, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    if image.isNull():
+        logger.debug(f"Cannot decode {path}: {reader.errorString()}")
+        return None
+    if not source_size.isValid():
+        source_size = image.size()
+
+    if key:
+        _write_cache_file(cache_dir, key, image)
+    return Thumbnail(image, source_size)
+
+
+def _write_cache_file(cache_dir: Path, key: str, image: QImage) -> None:
+    """Save a preview (JPEG unless it has transparency) under a temp name, then rename."""
+    suffix = ".png" if image.hasAlphaChannel() else ".jpg"
+    target = cache_dir / f"{key}{suffix}"
+    staging = cache_dir / f".{key}.{os.getpid()}{suffix}"
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        if image.save(str(staging), suffix[1:].upper(), 90):
+            os.replace(staging, target)
+    except OSError as e:
+        logger.debug(f"Cannot write thumbnail {target}: {e}")
+        staging.unlink(missing_ok=True)
+
+
+def prune_disk_cache(cache_dir: Path, max_bytes: int = DISK_CACHE_BYTES) -> int:
+    """Delete the oldest thumbnails until the folder fits max_bytes. Returns files deleted."""
+    try:
+        entries = [(e.stat().st_mtime, e.stat().st_size, e.path)
+                   for e in os.scandir(cache_dir) if e.is_file()]
+    except OSError:
+        return 0
+    total = sum(size for _, size, _ in entries)
+    deleted = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            deleted += 1
+        except OSError:
+            continue
+    return deleted
+
+
+class ThumbnailCache(QObject):
+    """
+    Memory LRU over the disk cache, fed by a decoding thread pool.
+
+    All methods are called from the GUI thread; decoded previews come back
+    through thumbnail_ready.
+    """
+
+    # (image path, preview box, Thumbnail or None if the file cannot be read)
+    thumbnail_ready = Signal(str, QSize, object)
+
+    # Worker -> GUI thread hand-off: (key, path, box, Thumbnail or None)
+    _decoded = Signal(str, str, QSize, object)
+
+    def __init__(self, cache_dir: Optional[Path] = CACHE_DIR,
+                 memory_bytes: int = MEMORY_BYTES, max_workers: int = MAX_WORKERS,
+                 parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.memory_bytes = memory_bytes
+        self._memory: "OrderedDict[str, Thumbnail]" = OrderedDict()
+        self._memory_used = 0
+        self._pending: Set[str] = set()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbnails")
+        self._decoded.connect(self._on_decoded)
+
+    def get(self, path: Union[str, Path], box: QSize) -> Optional[Thumbnail]:
+        """Return a preview already in memory, without decoding."""
+        key = thumbnail_key(path, box)
+        thumbnail = self._memory.get(key) if key else None
+        if thumbnail is not None:
+            self._memory.move_to_end(key)
+        return thumbnail
+
+    def request(self, path: Union[str, Path], box: QSize) -> Optional[Thumbnail]:
+        """
+        Return the preview if it is in memory, else decode it in the background.
+
+        Returns:
+            Thumbnail, or None (thumbnail_ready follows unless the file is missing)
+        """
+        key = thumbnail_key(path, box)
+        if key is None:
+            return None
+        thumbnail = self._memory.get(key)
+        if thumbnail is not None:
+            self._memory.move_to_end(key)
+            return thumbnail
+        self._schedule(key, str(path), box)
+        return None
+
+    def prefetch(self, paths: Iterable[Union[str, Path]], box: QSize) -> None:
+        """Decode previews that are likely to be shown next."""
+        for path in paths:
+            key = thumbnail_key(path, box)
+            if key and key not in self._memory:
+                self._schedule(key, str(path), box)
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
+        self._memory_used = 0
+
+    @property
+    def memory_used(self) -> int:
+        """Bytes of decoded previews held in memory."""
+        return self._memory_used
+
+    def prune(self, max_bytes: int = DISK_CACHE_BYTES) -> None:
+        """Trim the disk cache in the background."""
+        if self.cache_dir:
+            self._pool.submit(prune_disk_cache, self.cache_dir, max_bytes)
+
+    def shutdown(self) -> None:
+        """Stop decoding (pending requests are dropped)."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule(self, key: str, path: str, box: QSize) -> None:
+        if key in self._pending:
+            return
+        self._pending.add(key)
+        box = QSize(box)
+        future = self._pool.submit(decode_thumbnail, path, box, self.cache_dir)
+        future.add_done_callback(lambda f: self._decoded.emit(
+            key, path, box, None if f.cancelled() or f.exception() else f.result()))
+
+    def _on_decoded(self, key: str, path: str, box: QSize, thumbnail: Optional[Thumbnail]) -> None:
+        self._pending.discard(key)
+        if thumbnail is not None:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_used -= previous.image.sizeInBytes()
+            self._memory[key] = thumbnail
+            self._memory_used += thumbnail.image.sizeInBytes()
+            # Oldest first; the preview just decoded stays even if it alone is over budget
+            while self._memory_used > self.memory_bytes and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= evicted.image.sizeInBytes()
+        self.thumbnail_ready.emit(path, box, thumbnail)
+
+
+def get_thumbnail_cache() -> ThumbnailCache:
+    """Get the global thumbnail cache instance"""
+    global _thumbnail_cache_instance
+    if '_thumbnail_cache_instance' not in globals():
+        _thumbnail_cache_instance = ThumbnailCache()
+        _thumbnail_cache_instance.prune()
+    return _thumbnail_cache_instance
+
+
+def shutdown_thumbnail_cache() -> None:
+    """Stop the global cache's decoding threads, if the cache was ever created."""
+    instance = globals().get('_thumbnail_cache_instance')
+    if instance is not None:
+        instance.shutdown()
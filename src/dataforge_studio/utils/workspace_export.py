@@ -8,7 +8,7 @@ Supports exporting:
 
 import json
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Callable, Optional, List, Dict, Any
 from dataclasses import asdict
 
 from ..database.config_db import get_config_db, DatabaseConnection, Workspace
@@ -16,6 +16,7 @@ from ..database.models.saved_query import SavedQuery
 from ..database.models.script import Script
 from ..database.models.job import Job
 from ..database.models.file_root import FileRoot
+from ..database.cached_config import invalidate_config_cache
 
 import logging
 logger = logging.getLogger(__name__)
@@ -23,6 +24,9 @@ logger = logging.getLogger(__name__)
 # Export format version
 EXPORT_VERSION = "1.0"
 
+# Import progress: (items done, total items, step)
+ImportProgressCallback = Callable[[int, int, str], None]
+
 
 def export_connections_to_json(
     connection_ids: Optional[List[str]] = None,
@@ -346,13 +350,17 @@ def check_workspace_conflict(workspace_name: str) -> Optional[Workspace]:
 
 
 def import_connections_from_json(
-    import_data: Dict[str, Any]
+    import_data: Dict[str, Any],
+    progress: Optional[ImportProgressCallback] = None
 ) -> Dict[str, Any]:
     """
     Import database connections from JSON data.
 
+    Connections are written in one transaction: on error nothing is imported.
+
     Args:
         import_data: Dictionary with import data
+        progress: Called with (items done, total items, step)
 
     Returns:
         Dictionary with import results:
@@ -360,36 +368,35 @@ def import_connections_from_json(
         - existing: list of reused existing connection names
         - errors: list of error messages
     """
-    config_db = get_config_db()
     results = {"created": [], "existing": [], "errors": []}
+    plan = _ImportPlan(get_config_db(), import_data, progress)
 
-    databases = import_data.get("databases", [])
-
-    for db_data in databases:
-        try:
-            conn, is_new = _import_or_match_connection(db_data, config_db)
-            if is_new:
-                results["created"].append(conn.name)
-            else:
-                results["existing"].append(conn.name)
-        except Exception as e:
-            results["errors"].append(f"{db_data.get('name', 'Unknown')}: {str(e)}")
+    for db_data in import_data.get("databases", []):
+        conn, is_new = plan.match_connection(db_data)
+        results["created" if is_new else "existing"].append(conn.name)
 
+    plan.commit()
     return results
 
 
 def import_workspace_from_json(
     import_data: Dict[str, Any],
     conflict_mode: str = ImportConflictMode.RENAME,
-    existing_workspace_id: Optional[str] = None
+    existing_workspace_id: Optional[str] = None,
+    progress: Optional[ImportProgressCallback] = None
 ) -> Dict[str, Any]:
     """
     Import a complete workspace from JSON data.
 
+    Existing connections and rootfolders are matched against lookup maps
+    loaded once, then everything is inserted in a single transaction: if
+    any item fails, the whole import is rolled back and the error raised.
+
     Args:
         import_data: Dictionary with import data
         conflict_mode: How to handle workspace name conflicts
         existing_workspace_id: If merging, the ID of existing workspace
+        progress: Called with (items done, total items, step)
 
     Returns:
         Dictionary with import results:
@@ -397,9 +404,11 @@ def import_workspace_from_json(
         - workspace_name: Final name of workspace
         - resources: dict with counts per resource type
         - errors: list of error messages
+
+    Raises:
+        sqlite3.Error, ValueError, TypeError: Nothing was imported
     """
     import uuid
-    from datetime import datetime
 
     config_db = get_config_db()
     results = {
@@ -417,6 +426,7 @@ def import_workspace_from_json(
 
     ws_data = import_data.get("workspace", {})
     ws_name = ws_data.get("name", "Imported Workspace")
+    plan = _ImportPlan(config_db, import_data, progress)
 
     # Handle workspace creation based on conflict mode
     if conflict_mode == ImportConflictMode.MERGE and existing_workspace_id:
@@ -425,16 +435,13 @@ def import_workspace_from_json(
         results["workspace_name"] = workspace.name if workspace else ws_name
     elif conflict_mode == ImportConflictMode.RENAME:
         # Find unique name
-        base_name = ws_name
-        counter = 1
-        while check_workspace_conflict(ws_name):
-            ws_name = f"{base_name} (importé {counter})"
-            counter += 1
+        taken = {ws.name.lower() for ws in config_db.get_all_workspaces()}
+        ws_name = _unique_name(ws_name, lambda name: name.lower() in taken)
 
         # Create new workspace
         workspace_id = str(uuid.uuid4())
         now = datetime.now().isoformat()
-        workspace = Workspace(
+        plan.new_workspace = Workspace(
             id=workspace_id,
             name=ws_name,
             description=ws_data.get("description", ""),
@@ -443,7 +450,6 @@ def import_workspace_from_json(
             updated_at=now,
             last_used_at=now
         )
-        config_db.add_workspace(workspace)
         results["workspace_name"] = ws_name
     else:
         # Cancel mode - should not reach here
@@ -451,269 +457,238 @@ def import_workspace_from_json(
         return results
 
     results["workspace_id"] = workspace_id
+    plan.workspace_id = workspace_id
+    counts = results["resources"]
 
-    # Import databases and attach to workspace
     for db_data in import_data.get("databases", []):
-        try:
-            conn, is_new = _import_or_match_connection(db_data, config_db)
-            context = db_data.get("workspace_context", {})
-            database_name = context.get("database_name", "")
-
-            # Attach to workspace
-            config_db.add_database_to_workspace(workspace_id, conn.id, database_name or None)
-
-            if is_new:
-                results["resources"]["databases"]["created"] += 1
-            else:
-                results["resources"]["databases"]["existing"] += 1
-        except Exception as e:
-            results["errors"].append(f"Database {db_data.get('name', '?')}: {str(e)}")
-
-    # Import rootfolders and attach to workspace
+        conn, is_new = plan.match_connection(db_data)
+        context = db_data.get("workspace_context", {})
+        plan.links["databases"].append((conn.id, context.get("database_name", "") or ""))
+        counts["databases"]["created" if is_new else "existing"] += 1
+
     for rf_data in import_data.get("rootfolders", []):
-        try:
-            fileroot, is_new = _import_or_match_fileroot(rf_data, config_db)
-            context = rf_data.get("workspace_context", {})
-            subfolder_path = context.get("subfolder_path", "")
-
-            # Attach to workspace
-            config_db.add_file_root_to_workspace(workspace_id, fileroot.id, subfolder_path or None)
-
-            if is_new:
-                results["resources"]["rootfolders"]["created"] += 1
-            else:
-                results["resources"]["rootfolders"]["existing"] += 1
-        except Exception as e:
-            results["errors"].append(f"Rootfolder {rf_data.get('path', '?')}: {str(e)}")
-
-    # Import queries and attach to workspace
+        fileroot, is_new = plan.match_fileroot(rf_data)
+        context = rf_data.get("workspace_context", {})
+        plan.links["file_roots"].append((fileroot.id, context.get("subfolder_path", "") or ""))
+        counts["rootfolders"]["created" if is_new else "existing"] += 1
+
+    # Exports do not carry query targets: use the workspace's first connection
+    databases = plan.links["databases"]
+    target_id = databases[0][0] if databases else config_db.CONFIG_DB_ID
     for q_data in import_data.get("queries", []):
-        try:
-            query, is_new = _import_query(q_data, config_db)
-
-            # Attach to workspace
-            config_db.add_query_to_workspace(workspace_id, query.id)
-
-            if is_new:
-                results["resources"]["queries"]["created"] += 1
-            else:
-                results["resources"]["queries"]["existing"] += 1
-        except Exception as e:
-            results["errors"].append(f"Query {q_data.get('name', '?')}: {str(e)}")
+        plan.links["queries"].append((plan.new_query(q_data, target_id).id,))
+        counts["queries"]["created"] += 1
 
-    # Import scripts and attach to workspace
     for s_data in import_data.get("scripts", []):
-        try:
-            script, is_new = _import_script(s_data, config_db)
-
-            # Attach to workspace
-            config_db.add_script_to_workspace(workspace_id, script.id)
-
-            if is_new:
-                results["resources"]["scripts"]["created"] += 1
-            else:
-                results["resources"]["scripts"]["existing"] += 1
-        except Exception as e:
-            results["errors"].append(f"Script {s_data.get('name', '?')}: {str(e)}")
+        plan.links["scripts"].append((plan.new_script(s_data).id,))
+        counts["scripts"]["created"] += 1
 
-    # Import jobs and attach to workspace
     for j_data in import_data.get("jobs", []):
-        try:
-            job, is_new = _import_job(j_data, config_db, workspace_id)
+        plan.links["jobs"].append((plan.new_job(j_data, workspace_id).id,))
+        counts["jobs"]["created"] += 1
 
-            # Attach to workspace
-            config_db.add_job_to_workspace(workspace_id, job.id)
+    plan.commit()
+    return results
 
-            if is_new:
-                results["resources"]["jobs"]["created"] += 1
-            else:
-                results["resources"]["jobs"]["existing"] += 1
-        except Exception as e:
-            results["errors"].append(f"Job {j_data.get('name', '?')}: {str(e)}")
 
-    return results
+def _unique_name(name: str, is_taken: Callable[[str], bool]) -> str:
+    """Suffix a name with " (importé N)" until it is free."""
+    original_name = name
+    counter = 1
+    while is_taken(name):
+        name = f"{original_name} (importé {counter})"
+        counter += 1
+    return name
 
 
-def _import_or_match_connection(db_data: Dict[str, Any], config_db) -> tuple:
+class _ImportPlan:
     """
-    Import a connection or match an existing one.
+    Records to insert for one import, written by commit() in one transaction.
 
-    Returns:
-        Tuple of (DatabaseConnection, is_new)
-    """
-    import uuid
-    from datetime import datetime
-
-    name = db_data.get("name", "")
-    db_type = db_data.get("db_type", "")
-    conn_string = db_data.get("connection_string", "")
-
-    # Check for existing connection with same name and type
-    existing = config_db.get_all_database_connections()
-    for conn in existing:
-        if conn.name.lower() == name.lower() and conn.db_type == db_type:
-            # Match found - reuse existing
-            return (conn, False)
-
-    # Create new connection
-    now = datetime.now().isoformat()
-    new_conn = DatabaseConnection(
-        id=str(uuid.uuid4()),
-        name=name,
-        db_type=db_type,
-        connection_string=conn_string,
-        description=db_data.get("description", ""),
-        created_at=now,
-        updated_at=now
-    )
-    config_db.add_database_connection(new_conn)
-    return (new_conn, True)
-
-
-def _import_or_match_fileroot(rf_data: Dict[str, Any], config_db) -> tuple:
+    Existing connections, rootfolders and resource names are loaded once
+    into lookup maps; records planned earlier in the same import are added
+    to the maps, so duplicates within the file are matched too.
     """
-    Import a file root or match an existing one.
 
-    Returns:
-        Tuple of (FileRoot, is_new)
-    """
-    import uuid
-    from datetime import datetime
-
-    path = rf_data.get("path", "")
-
-    # Check for existing fileroot with same path
-    existing = config_db.get_all_file_roots()
-    for root in existing:
-        if root.path.lower() == path.lower():
-            # Match found - reuse existing
-            return (root, False)
-
-    # Create new fileroot
-    now = datetime.now().isoformat()
-    new_root = FileRoot(
-        id=str(uuid.uuid4()),
-        path=path,
-        name=rf_data.get("name", ""),
-        description=rf_data.get("description", ""),
-        created_at=now,
-        updated_at=now
-    )
-    config_db.add_file_root(new_root)
-    return (new_root, True)
-
-
-def _import_query(q_data: Dict[str, Any], config_db) -> tuple:
-    """
-    Import a query (always creates new with suffix if conflict).
+    def __init__(self, config_db, import_data: Dict[str, Any],
+                 progress: Optional[ImportProgressCallback] = None):
+        self.config_db = config_db
+        self.progress = progress
+        self.workspace_id: Optional[str] = None
+        self.new_workspace: Optional[Workspace] = None
+        self.connections: List[DatabaseConnection] = []
+        self.file_roots: List[FileRoot] = []
+        self.queries: List[SavedQuery] = []
+        self.scripts: List[Script] = []
+        self.jobs: List[Job] = []
+        self.links: Dict[str, List[tuple]] = {
+            "databases": [], "file_roots": [], "queries": [], "scripts": [], "jobs": []
+        }
+        self.total = sum(len(import_data.get(key, []))
+                         for key in ("databases", "rootfolders", "queries", "scripts", "jobs"))
+        self.done = 0
+
+        self._connections = {(c.name.lower(), c.db_type): c
+                             for c in config_db.get_all_database_connections()}
+        self._file_roots = {r.path.lower(): r for r in config_db.get_all_file_roots()}
+        self._query_names = {(q.name.lower(), q.category or "") for q in config_db.get_all_saved_queries()}
+        self._script_names = {(s.name.lower(), s.script_type or "") for s in config_db.get_all_scripts()}
+        self._job_names = {j.name.lower() for j in config_db.get_all_jobs()}
+
+    def _step(self, step: str) -> None:
+        self.done += 1
+        if self.progress:
+            self.progress(self.done, self.total, step)
+
+    def match_connection(self, db_data: Dict[str, Any]) -> tuple:
+        """
+        Plan a connection or match an existing one (same name and type).
+
+        Returns:
+            Tuple of (DatabaseConnection, is_new)
+        """
+        import uuid
+
+        name = db_data.get("name", "")
+        db_type = db_data.get("db_type", "")
+        self._step("databases")
+
+        existing = self._connections.get((name.lower(), db_type))
+        if existing is not None:
+            return (existing, False)
 
-    Returns:
-        Tuple of (SavedQuery, is_new)
-    """
-    import uuid
-    from datetime import datetime
+        now = datetime.now().isoformat()
+        new_conn = DatabaseConnection(
+            id=str(uuid.uuid4()),
+            name=name,
+            db_type=db_type,
+            connection_string=db_data.get("connection_string", ""),
+            description=db_data.get("description", ""),
+            created_at=now,
+            updated_at=now
+        )
+        self._connections[(name.lower(), db_type)] = new_conn
+        self.connections.append(new_conn)
+        return (new_conn, True)
 
-    name = q_data.get("name", "")
-    category = q_data.get("category", "")
+    def match_fileroot(self, rf_data: Dict[str, Any]) -> tuple:
+        """
+        Plan a file root or match an existing one (same path).
 
-    # Check for conflict and rename if needed
-    existing = config_db.get_all_saved_queries()
-    original_name = name
-    counter = 1
-    while any(q.name.lower() == name.lower() and (q.category or "") == category for q in existing):
-        name = f"{original_name} (importé {counter})"
-        counter += 1
+        Returns:
+            Tuple of (FileRoot, is_new)
+        """
+        import uuid
 
-    # Create new query
-    now = datetime.now().isoformat()
-    new_query = SavedQuery(
-        id=str(uuid.uuid4()),
-        name=name,
-        query_text=q_data.get("query_text", ""),
-        target_database_id=None,  # Will need to be linked manually
-        category=category,
-        description=q_data.get("description", ""),
-        created_at=now,
-        updated_at=now
-    )
-    config_db.add_saved_query(new_query)
-    return (new_query, True)
-
-
-def _import_script(s_data: Dict[str, Any], config_db) -> tuple:
-    """
-    Import a script (always creates new with suffix if conflict).
+        path = rf_data.get("path", "")
+        self._step("rootfolders")
 
-    Returns:
-        Tuple of (Script, is_new)
-    """
-    import uuid
-    from datetime import datetime
+        existing = self._file_roots.get(path.lower())
+        if existing is not None:
+            return (existing, False)
 
-    name = s_data.get("name", "")
-    script_type = s_data.get("script_type", "")
+        now = datetime.now().isoformat()
+        new_root = FileRoot(
+            id=str(uuid.uuid4()),
+            path=path,
+            name=rf_data.get("name", ""),
+            description=rf_data.get("description", ""),
+            created_at=now,
+            updated_at=now
+        )
+        self._file_roots[path.lower()] = new_root
+        self.file_roots.append(new_root)
+        return (new_root, True)
 
-    # Check for conflict and rename if needed
-    existing = config_db.get_all_scripts()
-    original_name = name
-    counter = 1
-    while any(s.name.lower() == name.lower() and (s.script_type or "") == script_type for s in existing):
-        name = f"{original_name} (importé {counter})"
-        counter += 1
+    def new_query(self, q_data: Dict[str, Any], target_database_id: str) -> SavedQuery:
+        """Plan a query (renamed with a suffix if the name is taken)."""
+        import uuid
 
-    # Create new script
-    now = datetime.now().isoformat()
-    new_script = Script(
-        id=str(uuid.uuid4()),
-        name=name,
-        script_type=script_type,
-        parameters_schema=s_data.get("parameters_schema", ""),
-        description=s_data.get("description", ""),
-        created_at=now,
-        updated_at=now
-    )
-    config_db.add_script(new_script)
-    return (new_script, True)
-
-
-def _import_job(j_data: Dict[str, Any], config_db, project_id: str) -> tuple:
-    """
-    Import a job (always creates new with suffix if conflict).
+        category = q_data.get("category", "")
+        name = _unique_name(q_data.get("name", ""),
+                            lambda n: (n.lower(), category) in self._query_names)
+        self._query_names.add((name.lower(), category))
+        self._step("queries")
 
-    Returns:
-        Tuple of (Job, is_new)
-    """
-    import uuid
-    from datetime import datetime
+        now = datetime.now().isoformat()
+        new_query = SavedQuery(
+            id=str(uuid.uuid4()),
+            name=name,
+            query_text=q_data.get("query_text", ""),
+            target_database_id=target_database_id,  # May need to be relinked manually
+            category=category,
+            description=q_data.get("description", ""),
+            created_at=now,
+            updated_at=now
+        )
+        self.queries.append(new_query)
+        return new_query
 
-    name = j_data.get("name", "")
+    def new_script(self, s_data: Dict[str, Any]) -> Script:
+        """Plan a script (renamed with a suffix if the name is taken)."""
+        import uuid
 
-    # Check for conflict and rename if needed
-    existing = config_db.get_all_jobs()
-    original_name = name
-    counter = 1
-    while any(j.name.lower() == name.lower() for j in existing):
-        name = f"{original_name} (importé {counter})"
-        counter += 1
+        script_type = s_data.get("script_type", "")
+        name = _unique_name(s_data.get("name", ""),
+                            lambda n: (n.lower(), script_type) in self._script_names)
+        self._script_names.add((name.lower(), script_type))
+        self._step("scripts")
 
-    # Create new job
-    now = datetime.now().isoformat()
-    new_job = Job(
-        id=str(uuid.uuid4()),
-        name=name,
-        job_type=j_data.get("job_type", "script"),
-        script_id=None,  # Will need to be linked manually
-        project_id=project_id,
-        parameters=j_data.get("parameters", ""),
-        enabled=j_data.get("enabled", True),
-        last_run_at=None,
-        parent_job_id=None,
-        previous_job_id=None,
-        created_at=now,
-        updated_at=now
-    )
-    config_db.add_job(new_job)
-    return (new_job, True)
+        now = datetime.now().isoformat()
+        new_script = Script(
+            id=str(uuid.uuid4()),
+            name=name,
+            script_type=script_type,
+            parameters_schema=s_data.get("parameters_schema", ""),
+            description=s_data.get("description", ""),
+            created_at=now,
+            updated_at=now
+        )
+        self.scripts.append(new_script)
+        return new_script
+
+    def new_job(self, j_data: Dict[str, Any], project_id: str) -> Job:
+        """Plan a job (renamed with a suffix if the name is taken)."""
+        import uuid
+
+        name = _unique_name(j_data.get("name", ""), lambda n: n.lower() in self._job_names)
+        self._job_names.add(name.lower())
+        self._step("jobs")
+
+        now = datetime.now().isoformat()
+        new_job = Job(
+            id=str(uuid.uuid4()),
+            name=name,
+            description=j_data.get("description", ""),
+            job_type=j_data.get("job_type", "script"),
+            script_id=None,  # Will need to be linked manually
+            project_id=project_id,
+            parameters=j_data.get("parameters", ""),
+            enabled=j_data.get("enabled", True),
+            last_run_at=None,
+            parent_job_id=None,
+            previous_job_id=None,
+            created_at=now,
+            updated_at=now
+        )
+        self.jobs.append(new_job)
+        return new_job
+
+    def commit(self) -> None:
+        """Insert every planned record and link (all or nothing)."""
+        if self.progress:
+            self.progress(self.done, self.total, "saving")
+        self.config_db.import_resources(
+            workspace_id=self.workspace_id,
+            new_workspace=self.new_workspace,
+            connections=self.connections,
+            file_roots=self.file_roots,
+            queries=self.queries,
+            scripts=self.scripts,
+            jobs=self.jobs,
+            links=self.links,
+        )
+        invalidate_config_cache()
 
 
 def get_import_summary(results: Dict[str, Any]) -> str:
@@ -9,18 +9,47 @@ Shared resources are stored as JSON files in a folder structure:
     │   └── query-name.json
     └── connections/
         └── connection-name.json  (without credentials)
+
+Shared folders usually live on a network share, so reads go through a
+local index (SharedFolderCache) keyed by file name, size and mtime: a
+refresh lists the folder once and only parses the files that changed.
+The index is saved under _AppConfig/shared_index/ and survives restarts.
+From the GUI thread, use get_shared_folder_index(), which refreshes in
+the background:
+
+    index = get_shared_folder_index()
+    index.index_updated.connect(on_updated)     # (shared path)
+    diagrams = index.diagrams(shared_path)      # cached, refresh scheduled
+
+The workspace tree reads a workspace's shared folder this way (the
+"Shared" category of WorkspaceManager).
 """
 
+import hashlib
 import json
 import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
-from dataclasses import asdict
+from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import asdict, dataclass
+
+from PySide6.QtCore import QObject, Signal
 
 from ..database.models import ERDiagram, ERDiagramTable, ERDiagramFKMidpoint, SavedQuery
 
 logger = logging.getLogger(__name__)
 
+# Shared resource folders indexed by SharedFolderCache
+SHARED_KINDS = ("diagrams", "queries")
+
+# Seconds after which reading the index schedules a background refresh
+REFRESH_INTERVAL_S = 60
+
+INDEX_DIR = Path(__file__).parent.parent.parent.parent / "_AppConfig" / "shared_index"
+
 
 def is_shared_path_accessible(shared_path: str) -> bool:
     """Check if the shared folder is accessible."""
@@ -90,37 +119,45 @@ def publish_diagram(shared_path: str, diagram: ERDiagram) -> bool:
         return False
 
 
+def _diagram_from_data(filename: str, data: dict) -> Optional[ERDiagram]:
+    """Build an ERDiagram from a published JSON document (None if malformed)."""
+    try:
+        return ERDiagram(
+            id=data.get('id', ''),
+            name=data.get('name', Path(filename).stem),
+            connection_id=data.get('connection_id', ''),
+            database_name=data.get('database_name', ''),
+            description=data.get('description', ''),
+            zoom_level=data.get('zoom_level', 1.0),
+            tables=[
+                ERDiagramTable(**t) for t in data.get('tables', [])
+            ],
+            fk_midpoints=[
+                ERDiagramFKMidpoint(**m) for m in data.get('fk_midpoints', [])
+            ],
+            created_at=data.get('created_at', ''),
+            updated_at=data.get('updated_at', ''),
+        )
+    except (AttributeError, KeyError, TypeError) as e:
+        logger.warning(f"Failed to load shared diagram {filename}: {e}")
+        return None
+
+
 def load_shared_diagrams(shared_path: str) -> List[ERDiagram]:
-    """Load all shared diagrams from the shared folder."""
-    diagrams = []
-    diagrams_dir = Path(shared_path) / "diagrams"
-    if not diagrams_dir.exists():
-        return diagrams
+    """
+    Load all shared diagrams from the shared folder.
 
-    for filepath in sorted(diagrams_dir.glob("*.json")):
-        try:
-            data = json.loads(filepath.read_text(encoding='utf-8'))
-            diagram = ERDiagram(
-                id=data.get('id', ''),
-                name=data.get('name', filepath.stem),
-                connection_id=data.get('connection_id', ''),
-                database_name=data.get('database_name', ''),
-                description=data.get('description', ''),
-                zoom_level=data.get('zoom_level', 1.0),
-                tables=[
-                    ERDiagramTable(**t) for t in data.get('tables', [])
-                ],
-                fk_midpoints=[
-                    ERDiagramFKMidpoint(**m) for m in data.get('fk_midpoints', [])
-                ],
-                created_at=data.get('created_at', ''),
-                updated_at=data.get('updated_at', ''),
-            )
-            diagrams.append(diagram)
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
-            logger.warning(f"Failed to load shared diagram {filepath.name}: {e}")
-
-    return diagrams
+    Only files changed since the last call are read (see SharedFolderCache).
+    Blocking: call it off the GUI thread, or use get_shared_folder_index().
+    """
+    cache = get_shared_cache(shared_path)
+    cache.refresh()
+    return _diagrams_of(cache)
+
+
+def _diagrams_of(cache: "SharedFolderCache") -> List[ERDiagram]:
+    diagrams = (_diagram_from_data(name, data) for name, data in cache.items("diagrams"))
+    return [d for d in diagrams if d is not None]
 
 
 # ==================== Queries ====================
@@ -155,17 +192,218 @@ def load_shared_queries(shared_path: str) -> List[dict]:
     """Load all shared queries from the shared folder.
 
     Returns list of dicts (not SavedQuery objects) to avoid dependency on target_database_id.
+    Only files changed since the last call are read (see SharedFolderCache).
+    Blocking: call it off the GUI thread, or use get_shared_folder_index().
+    """
+    cache = get_shared_cache(shared_path)
+    cache.refresh()
+    return [dict(data) for _, data in cache.items("queries")]
+
+
+# ==================== Shared Folder Index ====================
+
+@dataclass(frozen=True)
+class _IndexedFile:
+    """A parsed shared file (data is None if it is not valid JSON)."""
+    size: int
+    mtime_ns: int
+    data: Optional[dict]
+
+
+class SharedFolderCache:
     """
-    queries = []
-    queries_dir = Path(shared_path) / "queries"
-    if not queries_dir.exists():
-        return queries
+    Local index of one shared folder, keyed by file name, size and mtime.
+
+    Thread-safe; refresh() does blocking I/O on the share.
+    """
+
+    def __init__(self, shared_path: str, index_dir: Optional[Path] = INDEX_DIR):
+        self.shared_path = shared_path
+        key = hashlib.sha1(os.path.normcase(os.path.abspath(shared_path)).encode("utf-8")).hexdigest()
+        self.index_file = Path(index_dir) / f"{key}.json" if index_dir else None
+        self.refreshed_at = 0.0
+        self._files: Dict[str, Dict[str, _IndexedFile]] = {kind: {} for kind in SHARED_KINDS}
+        self._lock = threading.Lock()
+        self._load_index_file()
+
+    def items(self, kind: str) -> List[Tuple[str, dict]]:
+        """(file name, parsed JSON) of the indexed files of a kind, by file name."""
+        with self._lock:
+            files = self._files[kind]
+            return [(name, files[name].data) for name in sorted(files)
+                    if isinstance(files[name].data, dict)]
+
+    def refresh(self) -> bool:
+        """
+        List the shared folder and parse the files that changed.
+
+        Returns:
+            True if the index changed
+        """
+        with self._lock:
+            changed = False
+            for kind in SHARED_KINDS:
+                changed |= self._refresh_kind(kind)
+            self.refreshed_at = time.monotonic()
+            if changed:
+                self._save_index_file()
+            return changed
+
+    def _refresh_kind(self, kind: str) -> bool:
+        folder = Path(self.shared_path) / kind
+        stats: Dict[str, Tuple[int, int]] = {}
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        stat = entry.stat()
+                        stats[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Share unreachable: keep serving the last known index
+            logger.warning(f"Cannot list shared folder {folder}: {e}")
+            return False
+
+        files = self._files[kind]
+        changed = False
+        for name in set(files) - set(stats):
+            del files[name]
+            changed = True
+        for name, (size, mtime_ns) in stats.items():
+            known = files.get(name)
+            if known is not None and known.size == size and known.mtime_ns == mtime_ns:
+                continue
+            files[name] = _IndexedFile(size, mtime_ns, self._parse(folder / name))
+            changed = True
+        return changed
+
+    @staticmethod
+    def _parse(filepath: Path) -> Optional[dict]:
+        try:
+            return json.loads(filepath.read_text(encoding='utf-8'))
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+            logger.warning(f"Failed to load shared file {filepath.name}: {e}")
+            return None
 
-    for filepath in sorted(queries_dir.glob("*.json")):
+    def _load_index_file(self):
+        if not self.index_file or not self.index_file.exists():
+            return
         try:
-            data = json.loads(filepath.read_text(encoding='utf-8'))
-            queries.append(data)
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.warning(f"Failed to load shared query {filepath.name}: {e}")
+            saved = json.loads(self.index_file.read_text(encoding='utf-8'))
+            for kind in SHARED_KINDS:
+                self._files[kind] = {
+                    name: _IndexedFile(size, mtime_ns, data)
+                    for name, (size, mtime_ns, data) in saved.get(kind, {}).items()
+                }
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"Ignoring shared folder index {self.index_file}: {e}")
+            self._files = {kind: {} for kind in SHARED_KINDS}
+
+    def _save_index_file(self):
+        """Write the index under a temp name, then rename."""
+        if not self.index_file:
+            return
+        saved = {
+            kind: {name: [f.size, f.mtime_ns, f.data] for name, f in files.items()}
+            for kind, files in self._files.items()
+        }
+        staging = self.index_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            staging.write_text(json.dumps(saved, ensure_ascii=False), encoding='utf-8')
+            os.replace(staging, self.index_file)
+        except OSError as e:
+            logger.debug(f"Cannot write shared folder index {self.index_file}: {e}")
+            staging.unlink(missing_ok=True)
+
+
+_caches: Dict[str, SharedFolderCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_shared_cache(shared_path: str) -> SharedFolderCache:
+    """Get the index of a shared folder (one per folder)."""
+    key = os.path.normcase(os.path.abspath(shared_path))
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = SharedFolderCache(shared_path, INDEX_DIR)
+        return _caches[key]
+
+
+class SharedFolderIndex(QObject):
+    """
+    GUI-thread access to shared folder indexes.
+
+    Getters never touch the share: they return the indexed resources and
+    schedule a refresh in the background when the index is older than
+    REFRESH_INTERVAL_S; index_updated follows if anything changed.
+    """
+
+    # Shared folder whose index changed
+    index_updated = Signal(str)
+
+    # Worker -> GUI thread hand-off: (shared path, changed)
+    _refreshed = Signal(str, bool)
+
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL_S, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.refresh_interval = refresh_interval
+        self._refreshing: Set[str] = set()
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared-index")
+        self._refreshed.connect(self._on_refreshed)
+
+    def diagrams(self, shared_path: str) -> List[ERDiagram]:
+        """Indexed shared diagrams of a folder."""
+        return _diagrams_of(self._cache(shared_path))
+
+    def queries(self, shared_path: str) -> List[dict]:
+        """Indexed shared queries of a folder (see load_shared_queries)."""
+        return [dict(data) for _, data in self._cache(shared_path).items("queries")]
+
+    def refresh(self, shared_path: str) -> None:
+        """Refresh a folder's index in the background now."""
+        if not shared_path or shared_path in self._refreshing:
+            return
+        self._refreshing.add(shared_path)
+
+        def done(f, shared_path=shared_path):
+            if f.cancelled():
+                return
+            if f.exception() is not None:
+                logger.warning(f"Shared folder refresh failed for {shared_path}: {f.exception()}")
+                self._refreshed.emit(shared_path, False)
+            else:
+                self._refreshed.emit(shared_path, f.result())
+
+        self._pool.submit(lambda: get_shared_cache(shared_path).refresh()).add_done_callback(done)
+
+    def shutdown(self) -> None:
+        """Stop refreshing (pending refreshes are dropped)."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _cache(self, shared_path: str) -> SharedFolderCache:
+        cache = get_shared_cache(shared_path)
+        if time.monotonic() - cache.refreshed_at > self.refresh_interval or not cache.refreshed_at:
+            self.refresh(shared_path)
+        return cache
+
+    def _on_refreshed(self, shared_path: str, changed: bool) -> None:
+        self._refreshing.discard(shared_path)
+        if changed:
+            self.index_updated.emit(shared_path)
+
+
+def get_shared_folder_index() -> SharedFolderIndex:
+    """Get the global shared folder index instance (GUI thread)"""
+    global _shared_folder_index_instance
+    if '_shared_folder_index_instance' not in globals():
+        _shared_folder_index_instance = SharedFolderIndex()
+    return _shared_folder_index_instance
+
 
-    return queries
+def shutdown_shared_folder_index() -> None:
+    """Stop the global index's refreshes, if the index was ever created."""
+    instance = globals().get('_shared_folder_index_instance')
+    if instance is not None:
+        instance.shutdown()
@@ -0,0 +1,254 @@
+"""
+Offline benchmark suite for the hot paths, checked against stored baselines.
+
+Every benchmark runs on synthetic data generated with a fixed seed, so the
+numbers are reproducible without any database server or sample files:
+    dataframe_model_*   DataFrameTableModel on a 1M-row frame
+    split_sql/format_sql  a 10k-statement script
+    sqlite_schema       SQLiteSchemaLoader on a 5k-table catalog
+    csv_load            csv_to_dataframe on a 500k-row file
+
+Timings are the best of a few repeats, divided by a fixed pure-Python
+calibration loop so that baselines recorded on one machine stay meaningful
+on another. A benchmark slower than its baseline by more than the tolerance
+is reported as a REGRESSION and the script exits with status 1.
+
+Not collected by pytest. Run from the repository root:
+    python tests/bench_hot_paths.py                   # check against baselines
+    python tests/bench_hot_paths.py --update          # record new baselines
+    python tests/bench_hot_paths.py format_sql --scale 0.1   # quick run, no check
+"""
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from PySide6.QtCore import QCoreApplication, Qt  # noqa: E402
+
+from bench_sql_splitter import make_script  # noqa: E402
+from dataforge_studio.core.data_loader import csv_to_dataframe  # noqa: E402
+from dataforge_studio.database.schema_loaders.sqlite_loader import SQLiteSchemaLoader  # noqa: E402
+from dataforge_studio.ui.widgets.dataframe_model import DataFrameTableModel  # noqa: E402
+from dataforge_studio.utils.sql_formatter import format_sql  # noqa: E402
+from dataforge_studio.utils.sql_splitter import split_sql_statements  # noqa: E402
+
+BASELINE_FILE = Path(__file__).parent / "bench_baselines.json"
+DEFAULT_TOLERANCE = 1.3
+SEED = 20240601
+
+
+# ==================== Synthetic data ====================
+
+def make_frame(rows: int) -> pd.DataFrame:
+    """Result-grid-like frame: ints, floats with NaN, short strings, dates, booleans."""
+    rng = np.random.default_rng(SEED)
+    values = rng.normal(1000, 250, rows)
+    values[rng.random(rows) < 0.05] = np.nan
+    return pd.DataFrame({
+        "id": np.arange(rows),
+        "customer": pd.Series(rng.integers(0, 5000, rows)).map("customer_{}".format),
+        "amount": values,
+        "quantity": rng.integers(1, 100, rows),
+        "created": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 10**8, rows), unit="s"),
+        "active": rng.random(rows) < 0.5,
+    })
+
+
+def make_catalog(path: Path, tables: int) -> None:
+    """SQLite catalog with tables of 4 to 12 columns, foreign keys and one view per 10 tables."""
+    conn = sqlite3.connect(path)
+    for i in range(tables):
+        columns = ", ".join(f"col_{c} TEXT" for c in range(i % 9 + 2))
+        parent = f", parent_id INTEGER REFERENCES t{i - 1}(id)" if i else ""
+        conn.execute(f"CREATE TABLE t{i} (id INTEGER PRIMARY KEY, {columns}{parent})")
+        if i % 10 == 0:
+            conn.execute(f"CREATE VIEW v{i} AS SELECT id, col_0 FROM t{i}")
+    conn.commit()
+    conn.close()
+
+
+def make_csv(path: Path, rows: int) -> None:
+    """Semicolon-separated CSV with quoted text, as exported by spreadsheets."""
+    frame = make_frame(rows).drop(columns=["active"])
+    frame["customer"] = frame["customer"] + "; ltd"
+    frame.to_csv(path, sep=";", index=False)
+
+
+# ==================== Benchmarks ====================
+
+def _bench_dataframe_model(rows: int):
+    frame = make_frame(rows)
+    model = DataFrameTableModel()
+    rng = np.random.default_rng(SEED)
+    # 100 scroll positions x a 40-row by 6-column viewport
+    starts = rng.integers(0, max(1, rows - 40), 100)
+    indexes = [model.index(start + r, c) for start in starts for r in range(40) for c in range(6)]
+
+    def set_frame():
+        model.set_dataframe(frame.copy())
+
+    def viewport():
+        for index in indexes:
+            model.data(index, Qt.ItemDataRole.DisplayRole)
+            model.data(index, Qt.ItemDataRole.TextAlignmentRole)
+
+    def sort():
+        model.set_dataframe(frame.copy())
+        model.sort_by_columns([1, 2], [Qt.SortOrder.AscendingOrder, Qt.SortOrder.DescendingOrder])
+
+    set_frame()
+    indexes = [model.index(start + r, c) for start in starts for r in range(40) for c in range(6)]
+    return {"dataframe_model_set": set_frame, "dataframe_model_viewport": viewport,
+            "dataframe_model_sort": sort}
+
+
+def _bench_sql(statements: int):
+    script = make_script(statements)
+    return {"split_sql": lambda: split_sql_statements(script, "sqlserver"),
+            "format_sql": lambda: format_sql(script)}
+
+
+def _bench_schema(workdir: Path, tables: int):
+    path = workdir / "catalog.db"
+    make_catalog(path, tables)
+
+    def load():
+        conn = sqlite3.connect(path)
+        try:
+            SQLiteSchemaLoader(conn, "bench", "catalog").load_schema()
+        finally:
+            conn.close()
+    return {"sqlite_schema": load}
+
+
+def _bench_csv(workdir: Path, rows: int):
+    path = workdir / "data.csv"
+    make_csv(path, rows)
+
+    def load():
+        result = csv_to_dataframe(path, skip_large_warning=True)
+        assert result.success, result.warning_message
+    return {"csv_load": load}
+
+
+# Benchmark -> repeats (format_sql is slow enough that one run is stable)
+REPEATS = {"format_sql": 1}
+
+
+def build_benchmarks(workdir: Path, scale: float) -> dict:
+    """All benchmark callables, keyed by name, at the given data scale."""
+    def size(n):
+        return max(10, int(n * scale))
+    benchmarks = {}
+    benchmarks.update(_bench_dataframe_model(size(1_000_000)))
+    benchmarks.update(_bench_sql(size(10_000)))
+    benchmarks.update(_bench_schema(workdir, size(5_000)))
+    benchmarks.update(_bench_csv(workdir, size(500_000)))
+    return benchmarks
+
+
+def calibrate() -> float:
+    """Time of a fixed pure-Python loop, used to normalise timings across machines."""
+    def loop():
+        total = 0
+        for i in range(2_000_000):
+            total += i % 7
+        return total
+    return min(timeit.repeat(loop, number=1, repeat=5))
+
+
+def measure(func, repeat: int) -> float:
+    func()  # warm-up: imports, caches, lazy initialisation
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+# ==================== Baselines ====================
+
+def load_baselines() -> dict:
+    if BASELINE_FILE.exists():
+        return json.loads(BASELINE_FILE.read_text(encoding="utf-8"))
+    return {"calibration": None, "benchmarks": {}}
+
+
+def save_baselines(calibration: float, timings: dict) -> None:
+    baselines = load_baselines()
+    baselines["calibration"] = round(calibration, 6)
+    baselines["benchmarks"].update({name: round(t, 6) for name, t in timings.items()})
+    BASELINE_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def compare(calibration: float, timings: dict, baselines: dict, tolerance: float) -> list:
+    """Print each timing against its baseline; return the names of the regressions."""
+    regressions = []
+    base_calibration = baselines.get("calibration")
+    for name, seconds in timings.items():
+        base = baselines["benchmarks"].get(name)
+        if base is None or not base_calibration:
+            print(f"{name:26s} {seconds * 1000:10.1f} ms   (no baseline)")
+            continue
+        ratio = (seconds / calibration) / (base / base_calibration)
+        status = "ok"
+        if ratio > tolerance:
+            status = "REGRESSION"
+            regressions.append(name)
+        print(f"{name:26s} {seconds * 1000:10.1f} ms   baseline {base * 1000:10.1f} ms   "
+              f"x{ratio:5.2f}   {status}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the hot paths against stored baselines.")
+    parser.add_argument("names", nargs="*", help="benchmarks to run (default: all)")
+    parser.add_argument("--update", action="store_true", help="record the timings as new baselines")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"allowed slowdown factor (default: {DEFAULT_TOLERANCE})")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="data size factor; baselines are only checked at 1.0")
+    parser.add_argument("--repeat", type=int, default=3, help="repeats per benchmark (best is kept)")
+    args = parser.parse_args(argv)
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])  # noqa: F841
+    with tempfile.TemporaryDirectory(prefix="dfs-bench-") as workdir:
+        benchmarks = build_benchmarks(Path(workdir), args.scale)
+        unknown = set(args.names) - set(benchmarks)
+        if unknown:
+            parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+        selected = {name: func for name, func in benchmarks.items()
+                    if not args.names or name in args.names}
+
+        calibration = calibrate()
+        print(f"calibration: {calibration * 1000:.1f} ms, scale: {args.scale}")
+        timings = {name: measure(func, REPEATS.get(name, args.repeat))
+                   for name, func in selected.items()}
+
+    if args.scale != 1.0:
+        for name, seconds in timings.items():
+            print(f"{name:26s} {seconds * 1000:10.1f} ms")
+        if args.update:
+            print("Baselines are only recorded at --scale 1.0")
+        return 0
+
+    if args.update:
+        save_baselines(calibration, timings)
+        print(f"Baselines written to {BASELINE_FILE.name}")
+        return 0
+
+    regressions = compare(calibration, timings, load_baselines(), args.tolerance)
+    if regressions:
+        print(f"\n*** PERFORMANCE REGRESSION: {', '.join(regressions)} "
+              f"(slower than baseline x{args.tolerance}) ***")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Benchmark of split_sql_statements() against the previous implementation
+(GO regex pass, then sqlparse.split and sqlparse.format on every batch).
+
+Not collected by pytest. Run from the repository root:
+    python tests/bench_sql_splitter.py [statement_count]
+"""
+import re
+import sys
+import timeit
+from pathlib import Path
+
+import sqlparse
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from dataforge_studio.utils.sql_splitter import split_sql_statements  # noqa: E402
+
+_GO = re.compile(r'^\s*GO\s*$', re.MULTILINE | re.IGNORECASE)
+
+
+def legacy_split(sql_text: str) -> list:
+    """Statement texts and SELECT flags as the sqlparse-based splitter produced them."""
+    batches, lines = [], []
+    for line in sql_text.split('\n'):
+        if _GO.match(line):
+            if lines:
+                batches.append('\n'.join(lines))
+            lines = []
+        else:
+            lines.append(line)
+    if lines:
+        batches.append('\n'.join(lines))
+
+    result = []
+    for batch in batches:
+        for stmt in sqlparse.split(batch):
+            stmt = stmt.strip()
+            if stmt:
+                cleaned = sqlparse.format(stmt, strip_comments=True).strip().upper()
+                result.append((stmt, cleaned.split()[:1] in (['SELECT'], ['WITH'])))
+    return result
+
+
+def make_script(statement_count: int) -> str:
+    """Synthetic migration script mixing DDL, DML, queries, comments and GO batches."""
+    templates = [
+        "-- step {i}\nCREATE TABLE dbo.t{i} (id INT PRIMARY KEY, label NVARCHAR(50) DEFAULT 'a;b');",
+        "INSERT INTO dbo.t{i} (id, label) VALUES ({i}, 'it''s row {i}; ok');",
+        "UPDATE [dbo].[t{i}] SET label = /* inline; comment */ 'x' WHERE id = {i};",
+        "SELECT id, CASE WHEN id > {i} THEN 'big' ELSE 'small' END AS size\nFROM dbo.t{i}\nWHERE label <> ';';",
+        "IF OBJECT_ID('dbo.t{i}') IS NOT NULL\nBEGIN\n    DELETE FROM dbo.t{i} WHERE id < 0;\nEND",
+    ]
+    parts = []
+    for i in range(statement_count):
+        parts.append(templates[i % len(templates)].format(i=i))
+        if i % 50 == 49:
+            parts.append("GO")
+    return "\n".join(parts)
+
+
+def main(statement_count: int = 2000, repeat: int = 3) -> None:
+    script = make_script(statement_count)
+    print(f"{statement_count} statements, {len(script) / 1024:.0f} KB")
+
+    new_count = len(split_sql_statements(script))
+    old_count = len(legacy_split(script))
+    print(f"statements found: scanner={new_count} sqlparse={old_count}")
+
+    new = min(timeit.repeat(lambda: split_sql_statements(script), number=1, repeat=repeat))
+    old = min(timeit.repeat(lambda: legacy_split(script), number=1, repeat=repeat))
+    print(f"scanner:  {new * 1000:8.1f} ms")
+    print(f"sqlparse: {old * 1000:8.1f} ms")
+    print(f"speedup:  {old / new:8.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,140 @@
+"""
+Unit tests for the saved query batch executor.
+Tests statement execution on a dedicated connection and the parallel,
+per-database limited scheduling of SavedQueryBatchExecutor.
+"""
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from dataforge_studio.ui.managers.database.batch_executor import (
+    SavedQueryBatchExecutor, run_statements,
+)
+from dataforge_studio.utils.sql_splitter import split_sql_statements
+
+
+def _wait(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    assert condition()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "batch.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE t (id INTEGER)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(i,) for i in range(25)])
+    conn.commit()
+    conn.close()
+    return path
+
+
+class _TrackedConnection:
+    """sqlite3 connection that counts the connections open per database."""
+
+    def __init__(self, path, db_id, active, peaks, lock):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._db_id, self._active, self._lock = db_id, active, lock
+        with lock:
+            active[db_id] = active.get(db_id, 0) + 1
+            peaks[db_id] = max(peaks.get(db_id, 0), active[db_id])
+        time.sleep(0.02)
+
+    def cursor(self):
+        return self._conn.cursor()
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._active[self._db_id] -= 1
+        self._conn.close()
+
+
+class TestRunStatements:
+    """Tests for run_statements()."""
+
+    def test_last_result_set_keeps_cursor(self, db_path):
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        statements = split_sql_statements(
+            "UPDATE t SET id = id WHERE id < 3; SELECT COUNT(*) FROM t; SELECT id FROM t", "sqlite")
+
+        result = run_statements(conn, statements, batch_size=10)
+
+        assert result.error is None
+        assert result.messages == ["Statement 1: 3 row(s) affected"]
+        first, last = result.result_sets
+        assert first.rows == [[25]] and first.cursor is None
+        assert len(last.rows) == 10 and last.cursor is not None
+        assert result.connection is conn
+        assert len(last.cursor.fetchall()) == 15
+
+    def test_error_stops_and_closes(self, db_path):
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        statements = split_sql_statements("SELECT 1; SELECT * FROM missing; SELECT 2", "sqlite")
+
+        result = run_statements(conn, statements)
+
+        assert result.error_statement == 1
+        assert "missing" in str(result.error)
+        assert [rs.rows for rs in result.result_sets] == [[[1]]]
+        assert result.connection is None
+
+
+class TestSavedQueryBatchExecutor:
+    """Tests for SavedQueryBatchExecutor."""
+
+    def test_runs_in_parallel_within_database_limit(self, qapp, db_path):
+        active, peaks, lock = {}, {}, threading.Lock()
+        executor = SavedQueryBatchExecutor(
+            per_database=2, max_workers=6,
+            connect=lambda db_conn: _TrackedConnection(db_path, db_conn.id, active, peaks, lock))
+        statements = split_sql_statements("SELECT COUNT(*) FROM t", "sqlite")
+        databases = [SimpleNamespace(id=f"db{i}", name=f"DB {i}", db_type="sqlite") for i in range(3)]
+        for n in range(12):
+            executor.add(n, databases[n % 3], statements)
+
+        results, progress, finished = {}, [], []
+        executor.query_finished.connect(lambda key, result: results.__setitem__(key, result))
+        executor.progress.connect(lambda done, total: progress.append((done, total)))
+        executor.finished.connect(lambda: finished.append(True))
+        executor.start()
+        _wait(qapp, lambda: finished)
+
+        assert sorted(results) == list(range(12))
+        assert all(r.result_sets[0].rows == [[25]] for r in results.values())
+        assert progress[0] == (0, 12) and progress[-1] == (12, 12)
+        assert max(peaks.values()) == 2
+        assert len(peaks) == 3
+
+    def test_cancel_drops_queued_queries(self, qapp, db_path):
+        gate = threading.Event()
+
+        def connect(db_conn):
+            gate.wait(5)
+            return sqlite3.connect(db_path, check_same_thread=False)
+
+        executor = SavedQueryBatchExecutor(per_database=1, connect=connect)
+        db = SimpleNamespace(id="db", name="DB", db_type="sqlite")
+        for n in range(3):
+            executor.add(n, db, split_sql_statements("SELECT 1", "sqlite"))
+        results, finished = {}, []
+        executor.query_finished.connect(lambda key, result: results.__setitem__(key, result))
+        executor.finished.connect(lambda: finished.append(True))
+
+        executor.start()
+        executor.cancel()
+        assert results[1].cancelled and results[2].cancelled
+        assert not finished
+
+        gate.set()
+        _wait(qapp, lambda: finished)
+        assert not results[0].cancelled
+        assert results[0].result_sets[0].rows == [[1]]
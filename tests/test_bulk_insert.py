@@ -0,0 +1,241 @@
+"""
+Unit tests for the bulk insert layer and the data_loader script.
+Tests type inference, dialect detection, the SQLite multi-row path, the
+python-tds bulk copy call, COPY text rendering, and end-to-end file loads.
+"""
+import sqlite3
+import datetime
+
+import pandas as pd
+import pytest
+
+from dataforge_studio.database.bulk_insert import (
+    BulkWriter,
+    copy_text_buffer,
+    detect_dialect,
+    infer_column_kinds,
+    kind_from_type_name,
+    KIND_TEXT,
+    KIND_INTEGER,
+    KIND_FLOAT,
+    KIND_DATETIME,
+)
+from dataforge_studio.plugins.scripts.available.data_loader import DataLoader
+
+
+@pytest.fixture
+def sqlite_writer(tmp_path):
+    writer = BulkWriter(sqlite3.connect(tmp_path / "bulk.db"), "sqlite")
+    yield writer
+    writer.close()
+
+
+class TestTypes:
+    """Tests for infer_column_kinds() and kind_from_type_name()."""
+
+    def test_infer_kinds(self):
+        df = pd.DataFrame({
+            "id": ["1", "-20", ""],
+            "price": ["1.5", "2", "3e2"],
+            "day": ["2024-01-31", "2024-02-01 10:30:00", ""],
+            "zip": ["00123", "75001", "13001"],
+            "name": ["a", "1", "b"],
+            "empty": ["", "", ""],
+        })
+        assert infer_column_kinds(df) == {
+            "id": KIND_INTEGER, "price": KIND_FLOAT, "day": KIND_DATETIME,
+            "zip": KIND_TEXT, "name": KIND_TEXT, "empty": KIND_TEXT,
+        }
+
+    def test_invalid_date_stays_text(self):
+        df = pd.DataFrame({"day": ["2024-02-31"]})
+        assert infer_column_kinds(df) == {"day": KIND_TEXT}
+
+    @pytest.mark.parametrize("type_name,kind", [
+        ("BIGINT", KIND_INTEGER), ("int(11) unsigned", KIND_INTEGER), ("INTEGER", KIND_INTEGER),
+        ("INTERVAL", KIND_TEXT), ("POINT", KIND_TEXT), ("DOUBLE PRECISION", KIND_FLOAT),
+        ("DATETIME2", KIND_DATETIME), ("timestamp without time zone", KIND_DATETIME),
+        ("NVARCHAR", KIND_TEXT), ("DECIMAL(10,2)", KIND_TEXT),
+    ])
+    def test_kind_from_type_name(self, type_name, kind):
+        assert kind_from_type_name(type_name) == kind
+
+
+class TestDetectDialect:
+    """Tests for detect_dialect()."""
+
+    @pytest.mark.parametrize("conn_str,dialect", [
+        ("postgresql://u:p@host/db", "postgresql"),
+        ("mysql+pymysql://u:p@host/db", "mysql"),
+        ("sqlite:///C:/data/app.db", "sqlite"),
+        ("/data/app.sqlite", "sqlite"),
+        ("Driver={ODBC Driver 17 for SQL Server};Server=srv;Database=db;", "sqlserver"),
+    ])
+    def test_detect(self, conn_str, dialect):
+        assert detect_dialect(conn_str) == dialect
+
+    def test_access_rejected(self):
+        with pytest.raises(ValueError):
+            detect_dialect("Driver={Microsoft Access Driver (*.mdb)};Dbq=C:/x.mdb;")
+
+
+class TestSqliteWriter:
+    """Tests for the SQLite multi-row path."""
+
+    def test_create_insert_typed(self, sqlite_writer):
+        n = 1234
+        df = pd.DataFrame({
+            "id": [str(i) for i in range(n)],
+            "amount": ["" if i % 10 == 0 else f"{i}.5" for i in range(n)],
+            "label": [f"row {i}" for i in range(n)],
+        })
+        sqlite_writer.create_table("t", list(df.columns), infer_column_kinds(df))
+        kinds = sqlite_writer.column_kinds("t")
+        assert kinds == {"id": KIND_INTEGER, "amount": KIND_FLOAT, "label": KIND_TEXT}
+
+        assert sqlite_writer.insert("t", df, kinds) == n
+        sqlite_writer.commit()
+        conn = sqlite_writer.connection
+        assert conn.execute("SELECT COUNT(*), SUM(id), COUNT(amount) FROM t").fetchone() == (
+            n, n * (n - 1) // 2, n - 124)
+        assert conn.execute("SELECT typeof(id), label FROM t WHERE id = 7").fetchone() == (
+            "integer", "row 7")
+
+    def test_truncate_and_add_columns(self, sqlite_writer):
+        sqlite_writer.create_table("t", ["a"])
+        sqlite_writer.insert("t", pd.DataFrame({"a": ["x"]}))
+        sqlite_writer.truncate("t")
+        sqlite_writer.add_columns("t", ["b"], {"b": KIND_INTEGER})
+        assert [c.name for c in sqlite_writer.table_columns("t")] == ["a", "b"]
+        assert sqlite_writer.connection.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+        assert not sqlite_writer.table_exists("missing")
+
+
+class TestSqlServerPaths:
+    """Tests for the SQL Server bulk paths, with recording connections."""
+
+    def test_tds_bulk_copy(self):
+        calls = []
+
+        class RawCursor:
+            def copy_to(self, **kwargs):
+                calls.append(kwargs)
+
+        class Cursor:
+            def execute(self, *args):
+                pass
+
+            def fetchone(self):
+                return ("db",)
+
+        class Conn:
+            raw_connection = type("Raw", (), {"cursor": lambda self: RawCursor()})()
+
+            def cursor(self):
+                return Cursor()
+
+        writer = BulkWriter(Conn(), "sqlserver")
+        df = pd.DataFrame({"n": ["1", ""], "when": ["2024-01-01", "2024-01-02 03:04:05"],
+                           "txt": ["a", "x" * 5000]})
+        writer.insert("dest", df, {"n": KIND_INTEGER, "when": KIND_DATETIME})
+
+        call = calls[0]
+        assert call["table_or_view"] == "dest"
+        assert call["data"] == [
+            (1, datetime.datetime(2024, 1, 1), "a"),
+            (None, datetime.datetime(2024, 1, 2, 3, 4, 5), "x" * 5000),
+        ]
+        declarations = [c.type.get_declaration() for c in call["columns"]]
+        assert declarations == ["BIGINT", "DATETIME2(7)", "NVARCHAR(MAX)"]
+
+
+class TestCopyText:
+    """Tests for the PostgreSQL COPY rendering."""
+
+    def test_escaping_and_nulls(self):
+        df = pd.DataFrame({"txt": ["a\tb", "c\\d\ne", ""], "n": ["1", "", "3"]})
+        text = copy_text_buffer(df, {"n": KIND_INTEGER}).getvalue()
+        assert text == "a\\tb\t1\nc\\\\d\\ne\t\\N\n\t3\n"
+
+
+class TestDataLoaderScript:
+    """End-to-end tests of the data_loader script against SQLite."""
+
+    @pytest.fixture
+    def landing(self, tmp_path):
+        dataset = tmp_path / "root" / "acme" / "sales"
+        dataset.mkdir(parents=True)
+        return tmp_path, dataset
+
+    def test_load_in_chunks_then_reload(self, landing):
+        tmp_path, dataset = landing
+        db_path = tmp_path / "target.db"
+        rows = "\n".join(f"{i};{i * 1.5};name {i}" for i in range(250))
+        (dataset / "first.csv").write_text("id;amount;name\n" + rows, encoding="utf-8")
+
+        loader = DataLoader(f"sqlite:///{db_path}", infer_types=True, chunk_rows=100)
+        stats = loader.load_all_files(tmp_path / "root")
+        assert stats["files_imported"] == 1 and stats["tables_created"] == 1
+        assert (dataset / "_Imported" / "first.csv").exists()
+
+        (dataset / "second.csv").write_text("id;amount;name;extra\n1;2;x;y", encoding="utf-8")
+        stats = loader.load_all_files(tmp_path / "root")
+        assert stats["tables_updated"] == 1
+
+        conn = sqlite3.connect(db_path)
+        try:
+            assert conn.execute("SELECT id, amount, name, extra FROM acme_sales").fetchall() == [
+                (1, 2.0, "x", "y")]
+        finally:
+            conn.close()
+
+    def test_failed_file_rolled_back_and_moved(self, landing):
+        tmp_path, dataset = landing
+        db_path = tmp_path / "target.db"
+        (dataset / "good.csv").write_text("id;name\n1;a\n2;b", encoding="utf-8")
+        loader = DataLoader(f"sqlite:///{db_path}", infer_types=True)
+        loader.load_all_files(tmp_path / "root")
+
+        # "id" is INTEGER now: a text value fails after the truncate
+        (dataset / "bad.csv").write_text("id;name\nnot a number;c", encoding="utf-8")
+        stats = loader.load_all_files(tmp_path / "root")
+        assert stats["files_failed"] == 1
+        assert (dataset / "_Error" / "bad.csv").exists()
+
+        conn = sqlite3.connect(db_path)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM acme_sales").fetchone() == (2,)
+        finally:
+            conn.close()
+
+    def test_late_cp1252_bytes_reloaded_not_replaced(self, landing, monkeypatch):
+        from dataforge_studio.core import csv_sniffer
+        monkeypatch.setattr(csv_sniffer, "SAMPLE_BYTES", 32)
+        tmp_path, dataset = landing
+        db_path = tmp_path / "target.db"
+        rows = "".join(f"{i};ligne {i}\n" for i in range(20)) + "20;Crème brûlée\n"
+        (dataset / "fr.csv").write_bytes(("id;libelle\n" + rows).encode("cp1252"))
+
+        loader = DataLoader(f"sqlite:///{db_path}", chunk_rows=5)
+        stats = loader.load_all_files(tmp_path / "root")
+        assert stats["files_imported"] == 1 and stats["files_failed"] == 0
+        assert (dataset / "_Imported" / "fr.csv").exists()
+
+        conn = sqlite3.connect(db_path)
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM acme_sales").fetchone() == (21,)
+            assert conn.execute("SELECT libelle FROM acme_sales WHERE id = '20'").fetchone() == (
+                "Crème brûlée",)
+        finally:
+            conn.close()
+
+    def test_undecodable_bom_file_goes_to_error(self, landing, monkeypatch):
+        from dataforge_studio.core import csv_sniffer
+        monkeypatch.setattr(csv_sniffer, "SAMPLE_BYTES", 32)
+        tmp_path, dataset = landing
+        rows = "".join(f"{i};ligne {i}\n" for i in range(20)).encode("utf-8")
+        (dataset / "bad.csv").write_bytes(b"\xef\xbb\xbfid;libelle\n" + rows + b"20;Cr\xe8me\n")
+
+        stats = DataLoader(f"sqlite:///{tmp_path / 'target.db'}").load_all_files(tmp_path / "root")
+        assert stats["files_failed"] == 1
+        assert (dataset / "_Error" / "bad.csv").exists()
@@ -0,0 +1,105 @@
+"""
+Unit tests for the Pygments highlighter of CodeViewerWidget.
+Tests per-line token splitting, multi-line constructs, incremental
+re-lexing after edits and background lexing of large documents.
+"""
+import threading
+import time
+
+import pytest
+
+from PySide6.QtGui import QTextCursor, QTextDocument
+
+from dataforge_studio.ui.widgets import code_viewer
+from dataforge_studio.ui.widgets.code_viewer import PygmentsHighlighter, lex_lines
+
+SNIPPET = "let a = 1;\n/* start\n still comment\n end */\nlet b = 'x';\n"
+
+
+def _document(qapp, text):
+    document = QTextDocument()
+    document.documentLayout()  # contentsChange is only emitted with a layout
+    document.setPlainText(text)
+    return document
+
+
+def _colors(document, line):
+    layout = document.findBlockByNumber(line).layout()
+    return [(r.start, r.length, r.format.foreground().color().name()) for r in layout.formats()]
+
+
+def _wait(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    assert condition()
+
+
+class TestLexLines:
+    """Tests for lex_lines()."""
+
+    def test_multiline_comment_split_per_line(self):
+        from pygments.lexers import get_lexer_by_name
+        from pygments.token import Comment
+
+        lines = lex_lines(get_lexer_by_name("typescript"), SNIPPET.split("\n")[:5])
+
+        assert len(lines) == 5
+        assert lines[1].continued and lines[2].continued
+        assert not lines[3].continued
+        assert lines[2].spans == ((0, 14, Comment.Multiline),)
+        assert lines[3].spans[0][:2] == (0, 7)
+
+
+class TestPygmentsHighlighter:
+    """Tests for PygmentsHighlighter."""
+
+    def test_multiline_comment_highlighted(self, qapp):
+        document = _document(qapp, SNIPPET)
+        highlighter = PygmentsHighlighter(document, "typescript")
+        qapp.processEvents()
+
+        comment = highlighter._styles["Token.Comment"].foreground().color().name()
+        assert _colors(document, 2) == [(0, 14, comment)]
+        assert comment not in [color for _, _, color in _colors(document, 4)]
+
+    def test_edit_relexes_until_tokens_settle(self, qapp, monkeypatch):
+        document = _document(qapp, SNIPPET * 100)
+        highlighter = PygmentsHighlighter(document, "typescript")
+        qapp.processEvents()
+
+        lexed = []
+        monkeypatch.setattr(code_viewer, "lex_lines",
+                            lambda lexer, lines: lexed.append(len(lines)) or lex_lines(lexer, lines))
+
+        # Drop the "*/" closing the first comment: the comment now runs to the next one
+        cursor = QTextCursor(document.findBlockByNumber(3))
+        cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock)
+        cursor.deletePreviousChar()
+        cursor.deletePreviousChar()
+        qapp.processEvents()
+
+        assert lexed and max(lexed) < 100
+        assert highlighter._lines == lex_lines(highlighter._lexer, highlighter._line_texts())
+        comment = highlighter._styles["Token.Comment"].foreground().color().name()
+        assert _colors(document, 4) == [(0, 12, comment)]
+
+        cursor.insertText("*/\nlet c;")
+        qapp.processEvents()
+        assert document.blockCount() == len(highlighter._lines)
+        assert highlighter._lines == lex_lines(highlighter._lexer, highlighter._line_texts())
+        assert comment not in [color for _, _, color in _colors(document, 4)]
+
+    def test_large_document_lexed_in_background(self, qapp, monkeypatch):
+        monkeypatch.setattr(code_viewer, "BACKGROUND_LEX_LINES", 10)
+        threads = []
+        monkeypatch.setattr(code_viewer, "lex_lines", lambda lexer, lines: (
+            threads.append(threading.current_thread()) or lex_lines(lexer, lines)))
+        document = _document(qapp, SNIPPET * 10)
+        highlighter = PygmentsHighlighter(document, "typescript")
+
+        _wait(qapp, lambda: not highlighter._pending)
+        assert threads and threading.main_thread() not in threads
+        assert len(highlighter._lines) == document.blockCount()
+        assert _colors(document, 2)
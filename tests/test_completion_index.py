@@ -0,0 +1,139 @@
+"""
+Unit tests for CompletionIndex and the SQL completer popup.
+Tests prefix lookups, fuzzy ranking, incremental narrowing
+and the model-backed SQLCompleterPopup.
+"""
+import pytest
+
+from dataforge_studio.utils.completion_index import (
+    CompletionIndex,
+    fuzzy_score,
+    MAX_FUZZY_CANDIDATES,
+)
+
+
+class TestCompletionIndex:
+    """Tests for CompletionIndex."""
+
+    @pytest.fixture
+    def index(self):
+        return CompletionIndex([
+            "customer_id", "CustomerName", "order_id", "OrderDate",
+            "dbo.Customers", "dbo.Orders", "created_at", "last_customer_id",
+            "customer_id",
+        ])
+
+    def test_deduplicates_and_sorts(self, index):
+        """Items are unique and sorted case-insensitively."""
+        assert len(index) == 8
+        assert index.items == sorted(index.items, key=str.casefold)
+
+    def test_empty_filter_returns_first_items(self, index):
+        """search('') returns the first items up to limit."""
+        assert index.search("", limit=3) == index.items[:3]
+
+    def test_prefix_is_case_insensitive(self, index):
+        """prefix_matches() ignores case and keeps original casing."""
+        assert index.prefix_matches("CUST") == ["customer_id", "CustomerName"]
+
+    def test_prefix_matches_rank_first(self, index):
+        """Prefix matches come before substring matches."""
+        results = index.search("customer")
+        assert results[:2] == ["customer_id", "CustomerName"]
+        assert "dbo.Customers" in results
+        assert "last_customer_id" in results
+
+    def test_word_prefix_before_substring(self):
+        """Matches at a word boundary outrank mid-word substrings."""
+        index = CompletionIndex(["xxidxx", "user_id"])
+        assert index.search("id") == ["user_id", "xxidxx"]
+
+    def test_fuzzy_subsequence(self, index):
+        """Subsequence matches are returned after substring matches."""
+        results = index.search("ordt")
+        assert results == ["OrderDate"]
+
+    def test_no_match(self, index):
+        """search() returns an empty list when nothing matches."""
+        assert index.search("zzz") == []
+
+    def test_limit(self):
+        """search() never returns more than limit items."""
+        index = CompletionIndex(f"col_{i}" for i in range(500))
+        assert len(index.search("col", limit=50)) == 50
+        assert len(index.search("c9", limit=10)) == 10
+
+    def test_incremental_narrowing_matches_full_scan(self):
+        """Typing more characters gives the same results as a fresh index."""
+        names = [f"table_{i}_col_{j}" for i in range(50) for j in range(20)]
+        index = CompletionIndex(names)
+        for query in ("t", "t1", "t1c", "t1c9"):
+            incremental = index.search(query)
+        fresh = CompletionIndex(names).search("t1c9")
+        assert incremental == fresh
+
+    def test_candidate_scan_is_bounded(self):
+        """Fuzzy scanning stops after MAX_FUZZY_CANDIDATES candidates."""
+        index = CompletionIndex(f"name_{i}" for i in range(MAX_FUZZY_CANDIDATES * 2))
+        assert len(index._scan_subsequence("a")) == MAX_FUZZY_CANDIDATES
+
+
+class TestFuzzyScore:
+    """Tests for fuzzy_score()."""
+
+    def test_ranks(self):
+        """Prefix < word prefix < substring < subsequence."""
+        prefix = fuzzy_score("id", "id_user")
+        word = fuzzy_score("id", "user_id")
+        sub = fuzzy_score("id", "userid")
+        fuzzy = fuzzy_score("id", "i_d")
+        assert prefix < word < sub < fuzzy
+
+    def test_not_a_subsequence(self):
+        """fuzzy_score() returns None when characters are missing."""
+        assert fuzzy_score("xyz", "abc") is None
+
+    def test_tighter_match_scores_better(self):
+        """Fewer gaps between matched characters give a better score."""
+        assert fuzzy_score("abc", "a_b_c") < fuzzy_score("abc", "axxxbxxxc")
+
+
+class TestSQLCompleterPopup:
+    """Tests for the model-backed completer popup."""
+
+    @pytest.fixture
+    def popup(self, qapp):
+        from PySide6.QtWidgets import QTextEdit
+        from dataforge_studio.ui.widgets.sql_completer import SQLCompleterPopup
+        editor = QTextEdit()
+        popup = SQLCompleterPopup(editor)
+        yield popup
+        editor.deleteLater()
+
+    def test_show_completions_from_list(self, popup):
+        """A plain list is accepted and filtered."""
+        popup.show_completions(["alpha", "beta", "alphabet"], "alp")
+        assert popup.count() == 2
+        assert popup.get_selected_text() == "alpha"
+
+    def test_update_filter_reuses_index(self, popup):
+        """update_filter() narrows the current suggestions."""
+        index = CompletionIndex(["alpha", "beta", "alphabet"])
+        popup.show_completions(index, "a")
+        popup.update_filter("alphab")
+        assert popup.count() == 1
+        assert popup.get_selected_text() == "alphabet"
+
+    def test_navigation_and_accept(self, popup):
+        """Navigation moves the selection and accept emits the text."""
+        popup.show_completions(["a1", "a2", "a3"], "a")
+        popup.navigate_down()
+        popup.navigate_down()
+        popup.navigate_down()
+        assert popup.get_selected_text() == "a3"
+        popup.navigate_up()
+
+        selected = []
+        popup.completion_selected.connect(selected.append)
+        popup._apply_selection()
+        assert selected == ["a2"]
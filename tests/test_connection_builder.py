@@ -8,9 +8,10 @@ silently diverge.
 import pytest
 
 from dataforge_studio.database.connection_builder import (
-    build_connection, ConnectionConfigError,
+    build_connection, connection_string_with_credentials, ConnectionConfigError,
 )
 from dataforge_studio.database.models import DatabaseConnection
+from dataforge_studio.utils.credential_manager import CredentialManager
 
 
 def _conn(db_type, connection_string=""):
@@ -58,3 +59,33 @@ class TestConnectionBuilder:
         with pytest.raises(ConnectionConfigError) as ei:
             build_connection(_conn("postgres", "not-a-pg-url"))
         assert ei.value.key == "db_pg_format_unsupported"
+
+
+class TestConnectionStringWithCredentials:
+    @pytest.fixture(autouse=True)
+    def stored(self, monkeypatch):
+        monkeypatch.setattr(CredentialManager, "get_credentials",
+                            staticmethod(lambda conn_id: ("etl", "p@ss:w/rd")))
+
+    def test_sqlserver_sql_auth(self):
+        result = connection_string_with_credentials(_conn("sqlserver", "SERVER=db;DATABASE=x"))
+        assert result == "SERVER=db;DATABASE=x;UID=etl;PWD=p@ss:w/rd;"
+
+    def test_sqlserver_windows_auth_unchanged(self):
+        conn_str = "SERVER=db;Trusted_Connection=yes;"
+        assert connection_string_with_credentials(_conn("sqlserver", conn_str)) == conn_str
+
+    def test_postgres_url(self):
+        result = connection_string_with_credentials(
+            _conn("postgresql", "postgresql://old@db:5432/sales"))
+        assert result == "postgresql://etl:p%40ss%3Aw%2Frd@db:5432/sales"
+        from dataforge_studio.utils.connection_helpers import parse_postgresql_url
+        parsed = parse_postgresql_url(result)
+        assert (parsed["user"], parsed["password"], parsed["host"]) == ("etl", "p@ss:w/rd", "db")
+
+    def test_mysql_url_without_userinfo(self):
+        result = connection_string_with_credentials(_conn("mariadb", "mysql+pymysql://db/sales"))
+        assert result == "mysql+pymysql://etl:p%40ss%3Aw%2Frd@db/sales"
+
+    def test_sqlite_unchanged(self):
+        assert connection_string_with_credentials(_conn("sqlite", "sqlite:///a.db")) == "sqlite:///a.db"
@@ -0,0 +1,95 @@
+"""
+Unit tests for CredentialManager.
+Tests the in-memory credential cache: single keyring lookup per connection,
+invalidation on save and delete, and bulk prefetch.
+"""
+import pytest
+from keyring.errors import KeyringError, PasswordDeleteError
+
+from dataforge_studio.utils import credential_manager
+from dataforge_studio.utils.credential_manager import CredentialManager
+
+
+class _FakeKeyring:
+    """Dict-backed keyring that counts get_password calls."""
+
+    def __init__(self):
+        self.store = {}
+        self.gets = 0
+        self.locked = False
+
+    def get_password(self, service, key):
+        self.gets += 1
+        if self.locked:
+            raise KeyringError("locked")
+        return self.store.get((service, key))
+
+    def set_password(self, service, key, value):
+        self.store[(service, key)] = value
+
+    def delete_password(self, service, key):
+        if (service, key) not in self.store:
+            raise PasswordDeleteError(key)
+        del self.store[(service, key)]
+
+
+@pytest.fixture
+def fake_keyring(monkeypatch):
+    fake = _FakeKeyring()
+    for name in ("get_password", "set_password", "delete_password"):
+        monkeypatch.setattr(credential_manager.keyring, name, getattr(fake, name))
+    CredentialManager.invalidate()
+    yield fake
+    CredentialManager.invalidate()
+
+
+class TestCredentialCache:
+    """Tests for the session credential cache."""
+
+    def test_keyring_read_once_per_connection(self, fake_keyring):
+        CredentialManager.save_credentials("c1", "alice", "secret")
+        CredentialManager.invalidate()
+
+        for _ in range(3):
+            assert CredentialManager.get_credentials("c1") == ("alice", "secret")
+        assert CredentialManager.has_credentials("c1")
+        assert not CredentialManager.has_credentials("c2")
+        assert CredentialManager.get_credentials("c2") == ("", "")
+        assert fake_keyring.gets == 4
+
+    def test_save_and_delete_update_cache(self, fake_keyring):
+        CredentialManager.save_credentials("c1", "alice", "old")
+        assert CredentialManager.get_credentials("c1") == ("alice", "old")
+
+        CredentialManager.save_credentials("c1", "alice", "new")
+        assert CredentialManager.get_credentials("c1") == ("alice", "new")
+
+        CredentialManager.delete_credentials("c1")
+        assert CredentialManager.get_credentials("c1") == ("", "")
+        assert fake_keyring.gets == 2  # only the lookup after delete
+
+    def test_errors_are_not_cached(self, fake_keyring):
+        CredentialManager.save_credentials("c1", "alice", "secret")
+        CredentialManager.invalidate()
+        fake_keyring.locked = True
+        assert CredentialManager.get_credentials("c1") == ("", "")
+
+        fake_keyring.locked = False
+        assert CredentialManager.get_credentials("c1") == ("alice", "secret")
+
+    def test_prefetch(self, fake_keyring):
+        CredentialManager.save_credentials("c1", "alice", "secret")
+        CredentialManager.invalidate()
+
+        assert CredentialManager.prefetch(["c1", "c2", "c1"]) == 2
+        gets = fake_keyring.gets
+        assert CredentialManager.get_credentials("c1") == ("alice", "secret")
+        assert CredentialManager.get_credentials("c2") == ("", "")
+        assert CredentialManager.prefetch(["c1", "c2"]) == 0
+        assert fake_keyring.gets == gets
+
+    def test_prefetch_stops_on_locked_keyring(self, fake_keyring):
+        fake_keyring.locked = True
+
+        assert CredentialManager.prefetch(["c1", "c2", "c3"]) == 0
+        assert fake_keyring.gets == 1
@@ -0,0 +1,110 @@
+"""
+Unit tests for the CSV sniffer.
+Tests encoding, delimiter, quote and header detection, caching, and the
+single C-engine parse.
+"""
+import os
+
+import pytest
+
+from dataforge_studio.core import csv_sniffer
+from dataforge_studio.core.csv_sniffer import (
+    CsvDialect,
+    count_lines,
+    detect_encoding,
+    read_csv,
+    sniff_csv,
+)
+
+
+def _write(tmp_path, content, name="data.csv", encoding="utf-8"):
+    path = tmp_path / name
+    data = content if isinstance(content, bytes) else content.encode(encoding)
+    path.write_bytes(data)
+    return path
+
+
+class TestEncoding:
+    """Tests for encoding detection."""
+
+    def test_bom(self, tmp_path):
+        path = _write(tmp_path, b"\xef\xbb\xbfa;b\n1;2\n")
+        assert sniff_csv(path).encoding == "utf-8-sig"
+
+    def test_utf16(self, tmp_path):
+        path = _write(tmp_path, "a\tb\n1\t2\n", encoding="utf-16")
+        dialect = sniff_csv(path)
+        assert (dialect.encoding, dialect.delimiter) == ("utf-16", "\t")
+
+    def test_cp1252(self, tmp_path):
+        path = _write(tmp_path, "nom;ville\nFrançois;Besançon €\n", encoding="cp1252")
+        assert detect_encoding(path) == "cp1252"
+
+    def test_multibyte_char_cut_by_sample(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(csv_sniffer, "SAMPLE_BYTES", 12)
+        path = _write(tmp_path, "a,b\nxxxxxxé,1\n" * 3)  # é straddles byte 12
+        assert sniff_csv(path).encoding == "utf-8"
+
+
+class TestDialect:
+    """Tests for delimiter, quote and header detection."""
+
+    @pytest.mark.parametrize("content,delimiter", [
+        ("a,b,c\n1,2,3\n4,5,6\n", ","),
+        ("a;b\n1,5;2,5\n3,5;4,5\n", ";"),  # decimal commas
+        ("a|b\n\"x,y\"|2\n", "|"),
+        ("single\nvalue\n", ","),
+    ])
+    def test_delimiter(self, tmp_path, content, delimiter):
+        assert sniff_csv(_write(tmp_path, content)).delimiter == delimiter
+
+    def test_single_quotes(self, tmp_path):
+        path = _write(tmp_path, "a,b\n'x, y',1\n'z',2\n")
+        dialect = sniff_csv(path)
+        assert dialect.quotechar == "'"
+        assert read_csv(path, dialect)["a"].tolist() == ["x, y", "z"]
+
+    @pytest.mark.parametrize("content,has_header", [
+        ("id,name\n1,a\n2,b\n", True),
+        ("1,a,2.5\n2,b,3.5\n", False),
+        ("region;2023;2024\nNorth;10;12\n", True),  # years as column names
+        ("a,b\nx,y\n", True),
+    ])
+    def test_header(self, tmp_path, content, has_header):
+        assert sniff_csv(_write(tmp_path, content)).has_header is has_header
+
+
+class TestCacheAndParse:
+    """Tests for caching and parsing."""
+
+    def test_cached_until_file_changes(self, tmp_path, monkeypatch):
+        path = _write(tmp_path, "a,b\n1,2\n")
+        reads = []
+        original = csv_sniffer._read_sample
+        monkeypatch.setattr(csv_sniffer, "_read_sample", lambda p: reads.append(p) or original(p))
+
+        sniff_csv(path)
+        sniff_csv(path)
+        assert len(reads) == 1
+
+        path.write_text("a;b;c\n1;2;3\n", encoding="utf-8")
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+        assert sniff_csv(path).delimiter == ";"
+        assert len(reads) == 2
+
+    def test_read_csv_headerless(self, tmp_path):
+        path = _write(tmp_path, "1,a\n2,b\n")
+        df = read_csv(path)
+        assert df.shape == (2, 2)
+        assert df.iloc[0].tolist() == [1, "a"]
+
+    def test_read_csv_replaces_bad_bytes_after_sample(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(csv_sniffer, "SAMPLE_BYTES", 16)
+        path = _write(tmp_path, b"a,b\n1,2\n3,4\n5,6\n7,\xff\n")
+        df = read_csv(path, CsvDialect(), dtype=str)
+        assert len(df) == 4
+
+    def test_count_lines(self, tmp_path):
+        assert count_lines(_write(tmp_path, "a\nb\nc")) == 3
+        assert count_lines(_write(tmp_path, "a\nb\n", name="b.csv")) == 2
+        assert count_lines(_write(tmp_path, "", name="c.csv")) == 0
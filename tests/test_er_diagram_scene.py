@@ -0,0 +1,131 @@
+"""
+Unit tests for ERDiagramScene.
+Tests incremental rerouting around moved tables, the adjacency index
+and level-of-detail rendering.
+"""
+import pytest
+from PySide6.QtCore import QRectF
+
+from dataforge_studio.database.schema_loaders.base import ForeignKeyInfo
+
+
+def _build_scene(n_tables=30, cols=6):
+    from dataforge_studio.ui.managers.er_diagram.scene import ERDiagramScene
+    scene = ERDiagramScene()
+    for i in range(n_tables):
+        scene.add_table(
+            f"t{i}", [{'name': 'id', 'type': 'int'}, {'name': 'parent_id', 'type': 'int'}],
+            ['id'], ['parent_id'],
+            pos_x=(i % cols) * 300 + 50, pos_y=(i // cols) * 350 + 50,
+        )
+    fks = [ForeignKeyInfo(f"fk_{i}", f"t{i}", "parent_id", f"t{i // 2}", "id")
+           for i in range(1, n_tables)]
+    fks += [ForeignKeyInfo(f"fk_x{i}", f"t{i}", "parent_id", f"t{i + cols}", "id")
+            for i in range(0, n_tables - cols, 3)]
+    scene.add_relationships(fks)
+    return scene
+
+
+def _paths(scene):
+    return [[(round(v.x(), 3), round(v.y(), 3)) for v in ln._vertices]
+            for ln in scene._relationship_lines]
+
+
+class TestIncrementalRouting:
+    """Tests for coalesced, neighbourhood-limited rerouting."""
+
+    @pytest.fixture
+    def scene(self, qapp):
+        scene = _build_scene()
+        yield scene
+        scene.clear_all()
+
+    def test_moves_are_coalesced(self, scene, monkeypatch):
+        """Several moves before a frame produce a single reroute."""
+        calls = []
+        original = scene._compute_line_offsets
+        monkeypatch.setattr(scene, "_compute_line_offsets",
+                            lambda tables=None: calls.append(tables) or original(tables))
+        table = scene.get_table_item("t3")
+        for dx in range(5):
+            table.setPos(table.pos().x() + 10, table.pos().y())
+        assert scene._reroute_timer.isActive()
+        scene._flush_reroute()
+        assert len(calls) == 1
+        assert calls[0] == [table]
+
+    def test_only_neighbourhood_is_rerouted(self, scene):
+        """Lines far from the moved table keep their geometry."""
+        table = scene.get_table_item("t20")
+        near = {id(ln) for ln in scene.lines_of(table)}
+        for ln in scene.lines_of(table):
+            for end in (ln.from_table, ln.to_table):
+                near.update(id(x) for x in scene.lines_of(end))
+        before = {id(ln): list(ln._vertices) for ln in scene._relationship_lines}
+
+        table.setPos(table.pos().x() + 120, table.pos().y() + 40)
+        scene._flush_reroute()
+
+        for ln in scene._relationship_lines:
+            if id(ln) not in near:
+                assert ln._vertices == before[id(ln)]
+        for ln in scene.lines_of(table):
+            assert ln._vertices != before[id(ln)]
+
+    def test_settled_layout_matches_full_reroute(self, scene, qapp):
+        """After the settle pass the layout equals a from-scratch reroute."""
+        table = scene.get_table_item("t7")
+        table.setPos(table.pos().x() + 500, table.pos().y() + 220)
+        scene._flush_reroute()
+        scene._compute_line_offsets()
+        settled = _paths(scene)
+
+        reference = _build_scene()
+        ref_table = reference.get_table_item("t7")
+        ref_table.setPos(table.pos())
+        reference._compute_line_offsets()
+        assert settled == _paths(reference)
+        reference.clear_all()
+
+    def test_adjacency_index_follows_removal(self, scene):
+        """remove_table() drops the table's lines from the index."""
+        t1 = scene.get_table_item("t1")
+        t0 = scene.get_table_item("t0")
+        assert any(ln.from_table is t1 for ln in scene.lines_of(t0))
+        scene.remove_table("t1")
+        assert not any(ln.from_table is t1 for ln in scene.lines_of(t0))
+
+    def test_tables_in_rect(self, scene):
+        """tables_in_rect() only returns tables intersecting the rect."""
+        names = {t.table_name for t in scene.tables_in_rect(QRectF(0, 0, 260, 260))}
+        assert names == {"t0"}
+
+
+class TestLevelOfDetail:
+    """Tests for viewport culling and zoomed-out rendering."""
+
+    @pytest.fixture
+    def scene(self, qapp):
+        scene = _build_scene()
+        yield scene
+        scene.clear_all()
+
+    def test_offscreen_tables_become_boxes(self, scene):
+        scene.update_visible_detail(QRectF(0, 0, 400, 400), 1.0)
+        assert scene.get_table_item("t0")._detailed
+        assert not scene.get_table_item("t29")._detailed
+
+    def test_zoomed_out_hides_labels(self, scene):
+        scene.set_show_fk_names(True)
+        scene.update_visible_detail(scene.itemsBoundingRect(), 0.2)
+        assert scene.low_detail
+        assert not any(t._detailed for t in scene._table_items.values())
+        assert not any(ln._label.isVisible() for ln in scene._relationship_lines if ln._label)
+
+    def test_full_detail_restores(self, scene):
+        scene.update_visible_detail(QRectF(0, 0, 400, 400), 0.2)
+        with scene.full_detail():
+            assert all(t._detailed for t in scene._table_items.values())
+            assert not scene.low_detail
+        assert scene.low_detail
+        assert not scene.get_table_item("t0")._detailed
@@ -0,0 +1,216 @@
+"""
+Unit tests for the ER diagram layout engine.
+Tests force-directed and layered layouts (overlaps, pins, groups,
+hierarchy, cancellation, speed) and their application to a scene.
+"""
+import time
+
+import numpy as np
+import pytest
+
+from dataforge_studio.ui.managers.er_diagram.layout_engine import (
+    LayoutGraph,
+    LayoutCancelled,
+    compute_layout,
+    force_directed_layout,
+    layered_layout,
+    remove_overlaps,
+    _repulsion_exact,
+    _repulsion_barnes_hut,
+    TABLE_GAP,
+)
+
+
+def _graph(n=40, **kwargs):
+    """Binary-tree-like schema with a few cross links, all tables at (0, 0)."""
+    sizes = {f"t{i}": (220.0, 160.0 + (i % 4) * 30) for i in range(n)}
+    edges = [(f"t{i}", f"t{(i - 1) // 2}") for i in range(1, n)]
+    edges += [(f"t{i}", f"t{(i * 7) % n}") for i in range(0, n, 6) if (i * 7) % n != i]
+    positions = {name: (0.0, 0.0) for name in sizes}
+    return LayoutGraph(sizes=sizes, edges=edges, positions=positions, **kwargs)
+
+
+def _overlapping_pairs(graph, result):
+    names = list(graph.sizes)
+    pos = np.array([result[n] for n in names])
+    size = np.array([graph.sizes[n] for n in names])
+    pairs = []
+    for i in range(len(names)):
+        for j in range(i + 1, len(names)):
+            ox = min(pos[i, 0] + size[i, 0], pos[j, 0] + size[j, 0]) - max(pos[i, 0], pos[j, 0])
+            oy = min(pos[i, 1] + size[i, 1], pos[j, 1] + size[j, 1]) - max(pos[i, 1], pos[j, 1])
+            if ox > 0 and oy > 0:
+                pairs.append((names[i], names[j]))
+    return pairs
+
+
+@pytest.mark.parametrize("mode", ["force", "layered"])
+class TestBothModes:
+    """Guarantees shared by every layout mode."""
+
+    def test_every_table_placed_without_overlap(self, mode):
+        graph = _graph()
+        result = compute_layout(graph, mode)
+        assert set(result) == set(graph.sizes)
+        assert _overlapping_pairs(graph, result) == []
+
+    def test_pinned_tables_do_not_move(self, mode):
+        graph = _graph(pinned={"t0", "t5"})
+        graph.positions["t0"] = (1000.0, 1000.0)
+        graph.positions["t5"] = (1500.0, 400.0)
+        result = compute_layout(graph, mode)
+        assert result["t0"] == (1000.0, 1000.0)
+        assert result["t5"] == (1500.0, 400.0)
+        assert _overlapping_pairs(graph, result) == []
+
+    def test_cancel_raises(self, mode):
+        with pytest.raises(LayoutCancelled):
+            compute_layout(_graph(), mode, is_cancelled=lambda: True)
+
+    def test_progress_reported(self, mode):
+        steps = []
+        compute_layout(_graph(), mode, progress=lambda c, t, m: steps.append((c, t)))
+        assert steps and steps[-1][0] == steps[-1][1]
+
+    def test_empty_and_single(self, mode):
+        assert compute_layout(LayoutGraph(sizes={}), mode) == {}
+        single = compute_layout(LayoutGraph(sizes={"a": (100, 100)}), mode)
+        assert set(single) == {"a"}
+
+    def test_hundreds_of_tables_fast(self, mode):
+        graph = _graph(300)
+        start = time.perf_counter()
+        result = compute_layout(graph, mode)
+        assert time.perf_counter() - start < 1.0
+        assert _overlapping_pairs(graph, result) == []
+
+
+class TestForceDirected:
+    """Tests specific to the force-directed mode."""
+
+    def test_linked_tables_closer_than_unlinked(self):
+        graph = _graph(30)
+        result = force_directed_layout(graph)
+        pos = {n: np.array(p) for n, p in result.items()}
+        linked = np.mean([np.linalg.norm(pos[a] - pos[b]) for a, b in graph.edges])
+        names = list(graph.sizes)
+        everything = np.mean([np.linalg.norm(pos[a] - pos[b])
+                              for a in names for b in names if a < b])
+        assert linked < everything
+
+    def test_groups_stay_together(self):
+        graph = _graph(30, groups={f"t{i}": "g" for i in (3, 11, 17, 25)})
+        result = force_directed_layout(graph)
+        centre = lambda n: np.array(result[n]) + np.array(graph.sizes[n]) / 2
+        members = [centre(f"t{i}") for i in (3, 11, 17, 25)]
+        spread = max(np.linalg.norm(a - b) for a in members for b in members)
+        everything = [centre(n) for n in graph.sizes]
+        diameter = max(np.linalg.norm(a - b) for a in everything for b in everything)
+        assert spread < diameter * 0.6
+
+    def test_barnes_hut_matches_exact(self):
+        pos = np.random.default_rng(3).uniform(0, 8000, size=(600, 2))
+        exact = _repulsion_exact(pos, 1e5)
+        approx = _repulsion_barnes_hut(pos, 1e5)
+        error = np.linalg.norm(exact - approx) / np.linalg.norm(exact)
+        assert error < 0.05
+
+    def test_blocked_exact_matches_float64(self):
+        pos = np.random.default_rng(4).uniform(0, 5000, size=(150, 2))
+        d = pos[:, None, :] - pos[None, :, :]
+        dist2 = np.maximum((d ** 2).sum(axis=2), 1e-6)
+        np.fill_diagonal(dist2, np.inf)
+        reference = (d * (1e5 / dist2)[:, :, None]).sum(axis=1)
+        error = np.linalg.norm(_repulsion_exact(pos, 1e5) - reference) / np.linalg.norm(reference)
+        assert error < 1e-4
+
+
+class TestLayered:
+    """Tests specific to the layered mode."""
+
+    def test_referenced_tables_above(self):
+        graph = _graph(20)
+        result = layered_layout(graph)
+        for child, parent in graph.edges[:19]:  # tree links only
+            assert result[parent][1] < result[child][1]
+
+    def test_cycle_is_handled(self):
+        sizes = {n: (200.0, 150.0) for n in "abc"}
+        graph = LayoutGraph(sizes=sizes, edges=[("a", "b"), ("b", "c"), ("c", "a")])
+        result = layered_layout(graph)
+        assert len({y for _, y in result.values()}) == 3
+        assert _overlapping_pairs(graph, result) == []
+
+    def test_unlinked_tables_below(self):
+        graph = _graph(10)
+        graph.sizes["lonely"] = (200.0, 150.0)
+        result = layered_layout(graph)
+        assert result["lonely"][1] > max(y for n, (_, y) in result.items() if n != "lonely")
+
+
+class TestRemoveOverlaps:
+    """Tests for the overlap-removal pass."""
+
+    def test_fixed_tables_keep_their_place(self):
+        centres = np.zeros((5, 2))
+        sizes = np.full((5, 2), 100.0)
+        fixed = np.array([True, False, False, False, False])
+        out = remove_overlaps(centres, sizes, fixed)
+        assert tuple(out[0]) == (0.0, 0.0)
+        for i in range(5):
+            for j in range(i + 1, 5):
+                d = np.abs(out[i] - out[j])
+                assert d[0] >= 100 + TABLE_GAP - 1e-6 or d[1] >= 100 + TABLE_GAP - 1e-6
+
+
+class TestSceneLayout:
+    """Tests for ERDiagramScene.auto_layout() / apply_layout()."""
+
+    @pytest.fixture
+    def scene(self, qapp):
+        from dataforge_studio.database.schema_loaders.base import ForeignKeyInfo
+        from dataforge_studio.ui.managers.er_diagram.scene import ERDiagramScene
+        scene = ERDiagramScene()
+        for i in range(12):
+            scene.add_table(f"t{i}", [{'name': 'id', 'type': 'int'}], ['id'], [])
+        scene.add_relationships([ForeignKeyInfo(f"fk_{i}", f"t{i}", "id", f"t{i // 2}", "id")
+                                 for i in range(1, 12)])
+        yield scene
+        scene.clear_all()
+
+    def test_pinned_table_kept_and_group_refitted(self, scene):
+        scene.get_table_item("t3").setPos(900, 900)
+        scene.set_table_pinned("t3", True)
+        group = scene.add_group("g1", "Group", 880, 860, 400, 400)
+        scene.auto_layout("layered")
+
+        assert scene.get_table_item("t3").pos().x() == 900
+        assert scene.get_pinned_tables() == ["t3"]
+        table = scene.get_table_item("t3")
+        assert group.pos().x() <= table.pos().x()
+        assert group.pos().x() + group.width >= table.pos().x() + table.width
+
+    def test_apply_layout_routes_once(self, scene, monkeypatch):
+        calls = []
+        original = scene._compute_line_offsets
+        monkeypatch.setattr(scene, "_compute_line_offsets",
+                            lambda tables=None: calls.append(tables) or original(tables))
+        graph = scene.layout_graph()
+        scene.apply_layout(compute_layout(graph, "force"), graph.groups)
+        assert calls == [None]
+        assert not scene._reroute_timer.isActive()
+
+
+class TestLayoutWorker:
+    """Tests for LayoutWorker."""
+
+    def test_layout_ready_then_thread_finished(self, qapp):
+        from dataforge_studio.ui.managers.er_diagram.layout_worker import LayoutWorker
+        worker = LayoutWorker(_graph(20), "force")
+        events = []
+        worker.layout_ready.connect(lambda positions: events.append(len(positions)))
+        worker.finished.connect(lambda: events.append("finished"))
+        worker.start()
+        assert worker.wait(5000)
+        qapp.processEvents()
+        assert events == [20, "finished"]
@@ -0,0 +1,158 @@
+"""
+Unit tests for the file_dispatcher and dispatch_and_load scripts.
+Tests the dispatch plan, dry runs, parallel moves, dataset readiness
+callbacks, the cross-volume fallback, resuming, and the load pipeline.
+"""
+import errno
+import os
+import shutil
+import sqlite3
+import threading
+
+import pytest
+
+from dataforge_studio.plugins.scripts.available import dispatch_and_load, file_dispatcher
+from dataforge_studio.plugins.scripts.available.file_dispatcher import FileDispatcher
+
+
+@pytest.fixture
+def root(tmp_path):
+    root = tmp_path / "root"
+    for folder in ("_InvalidFiles", "acme/sales", "acme/sales_eu", "acme/stock"):
+        (root / folder).mkdir(parents=True)
+    return root
+
+
+def _write(folder, *names):
+    for name in names:
+        (folder / name).write_text("id;name\n1;a\n2;b\n", encoding="utf-8")
+
+
+class TestPlan:
+    """Tests for build_plan() and dry runs."""
+
+    def test_plan_summary(self, root):
+        _write(root, "acme_sales_1.csv", "ACME_Sales_EU_2.csv", "acme_stock.csv", "other.csv")
+        summary = FileDispatcher(root).build_plan().summary()
+        assert summary == {
+            "dispatched": 3,
+            "invalid": 1,
+            "datasets": {"acme/sales": 1, "acme/sales_eu": 1, "acme/stock": 1},
+        }
+
+    def test_dry_run_moves_nothing(self, root):
+        _write(root, "acme_sales_1.csv", "junk.txt")
+        result = file_dispatcher.run(str(root), dry_run=True)
+        assert result["dry_run"] is True and result["dispatched"] == 1
+        assert sorted(p.name for p in root.iterdir() if p.is_file()) == ["acme_sales_1.csv", "junk.txt"]
+
+    def test_missing_invalid_folder(self, tmp_path):
+        with pytest.raises(ValueError):
+            FileDispatcher(tmp_path).build_plan()
+
+
+class TestExecute:
+    """Tests for execute_plan()."""
+
+    def test_parallel_dispatch(self, root):
+        names = [f"acme_sales_{i}.csv" for i in range(40)]
+        _write(root, *names, "bad.csv")
+        _write(root / "_InvalidFiles", "bad.csv", "bad_1.csv")
+
+        stats = FileDispatcher(root, max_workers=8).dispatch_files()
+        assert stats == {"dispatched": 40, "invalid": 1, "errors": 0}
+        assert sorted(p.name for p in (root / "acme" / "sales").iterdir()) == sorted(names)
+        assert (root / "_InvalidFiles" / "bad_2.csv").exists()
+        assert not any(p.is_file() for p in root.iterdir())
+
+    def test_dataset_ready_once_per_dataset(self, root):
+        _write(root, "acme_sales_1.csv", "acme_sales_2.csv", "acme_stock_1.csv")
+        _write(root / "acme" / "sales_eu", "left_over.csv")
+        ready = []
+        lock = threading.Lock()
+
+        def on_ready(contract, folder):
+            with lock:
+                ready.append((contract, folder.name, len(list(folder.iterdir()))))
+
+        FileDispatcher(root).dispatch_files(on_dataset_ready=on_ready)
+        assert sorted(ready) == [("acme", "sales", 2), ("acme", "sales_eu", 1), ("acme", "stock", 1)]
+
+    def test_cross_volume_fallback(self, root, monkeypatch):
+        _write(root, "acme_sales_1.csv")
+        source = root / "acme_sales_1.csv"
+        real_replace = os.replace
+
+        def replace(src, dst):
+            if os.fspath(src) == os.fspath(source):
+                raise OSError(errno.EXDEV, "Invalid cross-device link")
+            return real_replace(src, dst)
+
+        monkeypatch.setattr(file_dispatcher.os, "replace", replace)
+        stats = FileDispatcher(root).dispatch_files()
+        assert stats["dispatched"] == 1
+        assert [p.name for p in (root / "acme" / "sales").iterdir()] == ["acme_sales_1.csv"]
+        assert not source.exists()
+
+    def test_rerun_after_interruption(self, root):
+        _write(root, "acme_sales_1.csv", "acme_sales_2.csv")
+        # First run moved one file before stopping
+        os.replace(root / "acme_sales_1.csv", root / "acme" / "sales" / "acme_sales_1.csv")
+
+        dispatcher = FileDispatcher(root)
+        plan = dispatcher.build_plan()
+        assert [m.source.name for m in plan.moves] == ["acme_sales_2.csv"]
+        assert [folder.name for _, folder in plan.pending_datasets] == ["sales"]
+        dispatcher.execute_plan(plan)
+        assert dispatcher.build_plan().moves == []
+
+    def test_existing_file_not_overwritten(self, root):
+        dataset = root / "acme" / "sales"
+        (dataset / "acme_sales_1.csv").write_text("left over\n", encoding="utf-8")
+        (dataset / "acme_sales_1_1.csv").write_text("older\n", encoding="utf-8")
+        _write(root, "acme_sales_1.csv")
+
+        stats = FileDispatcher(root).dispatch_files()
+        assert stats["dispatched"] == 1
+        assert (dataset / "acme_sales_1.csv").read_text(encoding="utf-8") == "left over\n"
+        assert (dataset / "acme_sales_1_1.csv").read_text(encoding="utf-8") == "older\n"
+        assert (dataset / "acme_sales_1_2.csv").read_text(encoding="utf-8").startswith("id;name")
+
+    def test_interrupted_copy_is_replaced(self, root):
+        _write(root, "acme_sales_1.csv")
+        source = root / "acme_sales_1.csv"
+        # Cross-volume run stopped after the copy, before removing the source
+        shutil.copy2(source, root / "acme" / "sales" / "acme_sales_1.csv")
+
+        FileDispatcher(root).dispatch_files()
+        assert [p.name for p in (root / "acme" / "sales").iterdir()] == ["acme_sales_1.csv"]
+        assert not source.exists()
+
+
+class TestDispatchAndLoad:
+    """End-to-end tests of the dispatch_and_load script against SQLite."""
+
+    def test_pipeline(self, root, tmp_path):
+        _write(root, "acme_sales_1.csv", "acme_sales_2.csv", "acme_stock_1.csv", "junk.csv")
+        db_path = tmp_path / "target.db"
+
+        result = dispatch_and_load.run(str(root), f"sqlite:///{db_path}", dispatch_workers=4)
+        assert result["dispatch"] == {"dispatched": 3, "invalid": 1, "errors": 0}
+        assert result["load"]["files_imported"] == 3
+        assert (root / "acme" / "stock" / "_Imported" / "acme_stock_1.csv").exists()
+
+        conn = sqlite3.connect(db_path)
+        try:
+            # Each file replaces the table's content
+            assert conn.execute("SELECT COUNT(*) FROM acme_sales").fetchone() == (2,)
+            assert conn.execute("SELECT COUNT(*) FROM acme_stock").fetchone() == (2,)
+        finally:
+            conn.close()
+
+    def test_dry_run(self, root, tmp_path):
+        _write(root, "acme_sales_1.csv")
+        _write(root / "acme" / "stock", "left_over.csv")
+        result = dispatch_and_load.run(str(root), f"sqlite:///{tmp_path / 'x.db'}", dry_run=True)
+        assert result["dispatch"]["pending_datasets"] == ["acme/stock"]
+        assert (root / "acme_sales_1.csv").exists()
+        assert not (tmp_path / "x.db").exists()
@@ -0,0 +1,146 @@
+"""
+Unit tests for the background file index.
+Tests recursive counts, incremental rescans, and the FileIndex queries
+(counts, listings and filter matches) answered once a root is scanned,
+and listings checked against the folder's mtime.
+"""
+import os
+import time
+
+import pytest
+
+from dataforge_studio.utils import file_index as file_index_module
+from dataforge_studio.utils.file_index import FileIndex, scan_folder_tree
+
+
+def _make_tree(root):
+    (root / "data" / "2024").mkdir(parents=True)
+    (root / "empty").mkdir()
+    (root / "readme.txt").write_text("x")
+    (root / "data" / "a.csv").write_text("x")
+    (root / "data" / "B.csv").write_text("x")
+    (root / "data" / "2024" / "report.xlsx").write_text("x")
+    return root
+
+
+def _wait(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    assert condition()
+
+
+@pytest.fixture
+def index(qapp):
+    index = FileIndex(refresh_interval=3600)
+    yield index
+    index.shutdown()
+
+
+class TestScanFolderTree:
+    """Tests for scan_folder_tree()."""
+
+    def test_recursive_counts_and_listing(self, tmp_path):
+        root = _make_tree(tmp_path)
+        result = scan_folder_tree(root)
+
+        folder = result[file_index_module._key(root)]
+        assert folder.file_count == 4
+        assert folder.folders == ("data", "empty")
+        assert folder.files == ("readme.txt",)
+        data = result[file_index_module._key(root / "data")]
+        assert data.files == ("a.csv", "B.csv")
+        assert data.file_count == 3
+        assert result[file_index_module._key(root / "empty")].file_count == 0
+
+    def test_missing_root(self, tmp_path):
+        assert scan_folder_tree(tmp_path / "missing") == {}
+
+    def test_unchanged_folders_are_not_listed_again(self, tmp_path, monkeypatch):
+        root = _make_tree(tmp_path)
+        first = scan_folder_tree(root)
+
+        listed = []
+        original = file_index_module._list_folder
+        monkeypatch.setattr(file_index_module, "_list_folder",
+                            lambda path: listed.append(path) or original(path))
+
+        (root / "data" / "2024" / "new.xlsx").write_text("x")
+        stat = os.stat(root / "data" / "2024")
+        os.utime(root / "data" / "2024", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        second = scan_folder_tree(root, first)
+
+        assert [os.path.basename(p) for p in listed] == ["2024"]
+        assert second[file_index_module._key(root)].file_count == 5
+        assert second[file_index_module._key(root / "data")].file_count == 4
+
+
+class TestFileIndex:
+    """Tests for FileIndex."""
+
+    def test_count_is_none_until_indexed(self, qapp, index, tmp_path):
+        root = _make_tree(tmp_path)
+        updated = []
+        index.index_updated.connect(updated.append)
+
+        assert index.file_count(root) is None
+        _wait(qapp, lambda: updated)
+
+        assert updated == [str(root)]
+        assert index.file_count(root) == 4
+        assert index.file_count(root / "data") == 3
+
+    def test_list_folder(self, qapp, index, tmp_path):
+        root = _make_tree(tmp_path)
+        index.add_root(root)
+        _wait(qapp, lambda: index.list_folder(root) is not None)
+
+        assert index.list_folder(root / "data") == (("2024",), ("a.csv", "B.csv"))
+        assert index.list_folder(root / "missing") is None
+
+    def test_read_folder_never_stale(self, qapp, index, tmp_path):
+        root = _make_tree(tmp_path)
+        updated = []
+        index.index_updated.connect(updated.append)
+        index.add_root(root)
+        _wait(qapp, lambda: len(updated) == 1)
+        assert index.read_folder(root / "data") == (("2024",), ("a.csv", "B.csv"))
+
+        (root / "data" / "c.csv").write_text("x")
+        os.utime(root / "data", ns=(time.time_ns(), time.time_ns() + 10**9))
+        assert index.list_folder(root / "data") == (("2024",), ("a.csv", "B.csv"))
+        assert index.read_folder(root / "data") == (("2024",), ("a.csv", "B.csv", "c.csv"))
+
+        # The stale root is rescanned
+        _wait(qapp, lambda: len(updated) == 2)
+        assert index.list_folder(root / "data") == (("2024",), ("a.csv", "B.csv", "c.csv"))
+
+    def test_read_folder_before_indexing(self, qapp, index, tmp_path):
+        root = _make_tree(tmp_path)
+        assert index.read_folder(root) == (("data", "empty"), ("readme.txt",))
+
+    def test_contains_match(self, qapp, index, tmp_path):
+        root = _make_tree(tmp_path)
+        assert index.contains_match(root, "*.xlsx") is None
+        _wait(qapp, lambda: index.file_count(root) is not None)
+
+        assert index.contains_match(root, "*.xlsx") is True
+        assert index.contains_match(root / "data", "*.xlsx") is True
+        assert index.contains_match(root / "empty", "*.xlsx") is False
+        assert index.contains_match(root / "data", "*readme*") is False
+        assert index.contains_match(root, "*readme*") is True
+
+    def test_refresh_picks_up_changes(self, qapp, index, tmp_path):
+        root = _make_tree(tmp_path)
+        updated = []
+        index.index_updated.connect(updated.append)
+        index.add_root(root)
+        _wait(qapp, lambda: len(updated) == 1)
+
+        (root / "empty" / "new.txt").write_text("x")
+        index.refresh(root / "empty")
+        _wait(qapp, lambda: len(updated) == 2)
+
+        assert index.file_count(root) == 5
+        assert index.contains_match(root / "empty", "new*") is True
@@ -0,0 +1,172 @@
+"""
+Unit tests for the image library tree.
+Tests that the tree is built from aggregated queries, that folders and
+categories fill on expand, that large folders fill in chunks, and that
+previews are decoded in the background.
+"""
+import time
+
+import pytest
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QImage
+
+from dataforge_studio.database.models import ImageRootfolder, SavedImage
+from dataforge_studio.ui.managers import image_library_manager
+from dataforge_studio.ui.managers.image_library_manager import ImageLibraryManager
+
+
+ROOTFOLDER = ImageRootfolder(id="rf", path="/img", name="Pictures")
+
+
+def _image(name, path):
+    return SavedImage(id=name, name=name, filepath=f"/img/{path}/{name}",
+                      rootfolder_id="rf", physical_path=path)
+
+
+class FakeConfigDb:
+    """Only the aggregated queries: a per-image lookup would fail."""
+
+    def __init__(self, entries, category_entries=()):
+        self.entries = entries
+        self.category_entries = list(category_entries)
+
+    def get_all_image_rootfolders(self):
+        return [ROOTFOLDER]
+
+    def get_image_tree_entries(self):
+        return self.entries
+
+    def get_image_category_entries(self):
+        return self.category_entries
+
+    def get_image_categories(self, image_id):
+        return []
+
+    def get_image_tags(self, image_id):
+        return []
+
+    def count_image_search(self, query, **filters):
+        return len(self.entries)
+
+    def search_images(self, query, limit=None, offset=0, **filters):
+        return [image for image, _ in self.entries][offset:offset + limit]
+
+    def get_image_ids_with_metadata(self, image_ids):
+        return {image.id for image, flag in self.entries if flag and image.id in image_ids}
+
+
+def _children(item):
+    return [item.child(i).text(0) for i in range(item.childCount())]
+
+
+def _data_type(item):
+    return (item.data(0, Qt.ItemDataRole.UserRole) or {}).get("type")
+
+
+@pytest.fixture
+def make_manager(qapp, monkeypatch):
+    managers = []
+
+    def make(config_db):
+        monkeypatch.setattr(image_library_manager, "get_config_db", lambda: config_db)
+        manager = ImageLibraryManager()
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        manager.cleanup()
+        manager.deleteLater()
+
+
+class TestImageTree:
+    """Tests for lazy, chunked tree population."""
+
+    def test_folders_fill_on_expand(self, make_manager):
+        db = FakeConfigDb([
+            (_image("root.png", ""), False),
+            (_image("deep.png", "x/y"), True),
+        ])
+        manager = make_manager(db)
+        rf_item = manager._tree_items["rf_rf"]
+        assert _data_type(rf_item.child(0)) == "dummy"
+
+        rf_item.setExpanded(True)
+        assert _children(rf_item) == ["📁 x", "🖼️ root.png"]
+
+        x_item = rf_item.child(0)
+        x_item.setExpanded(True)
+        assert _children(x_item) == ["📁 y"]
+
+        y_item = x_item.child(0)
+        y_item.setExpanded(True)
+        assert _children(y_item) == ["🖼️⭐ deep.png"]
+
+    def test_categories_fill_on_expand(self, make_manager):
+        image = _image("logo.png", "")
+        manager = make_manager(FakeConfigDb([(image, True)], [("Logos", image, True)]))
+        cat_item = manager._tree_items["cat_Logos"]
+        assert cat_item.text(0) == "📁 Logos (1)"
+
+        cat_item.setExpanded(True)
+        assert _children(cat_item) == ["🖼️⭐ logo.png"]
+
+    def test_large_folder_fills_in_chunks(self, make_manager, monkeypatch, qapp):
+        monkeypatch.setattr(image_library_manager, "TREE_CHUNK_SIZE", 2)
+        manager = make_manager(FakeConfigDb([(_image(f"{i}.png", ""), False) for i in range(5)]))
+        rf_item = manager._tree_items["rf_rf"]
+
+        rf_item.setExpanded(True)
+        assert rf_item.childCount() == 2
+
+        for _ in range(5):
+            qapp.processEvents()
+        assert rf_item.childCount() == 5
+
+    def test_refresh_stops_pending_chunks(self, make_manager, monkeypatch, qapp):
+        monkeypatch.setattr(image_library_manager, "TREE_CHUNK_SIZE", 1)
+        manager = make_manager(FakeConfigDb([(_image(f"{i}.png", ""), False) for i in range(3)]))
+        manager._tree_items["rf_rf"].setExpanded(True)
+
+        manager.refresh()
+        for _ in range(5):
+            qapp.processEvents()
+        assert _data_type(manager._tree_items["rf_rf"].child(0)) == "dummy"
+
+    def test_preview_decoded_in_background(self, make_manager, qapp, tmp_path):
+        path = tmp_path / "shot.png"
+        source = QImage(1920, 1080, QImage.Format.Format_RGB32)
+        source.fill(QColor("blue"))
+        source.save(str(path))
+        image = SavedImage(id="shot", name="shot.png", filepath=str(path),
+                           rootfolder_id="rf", physical_path="")
+        manager = make_manager(FakeConfigDb([(image, False)]))
+
+        manager._show_image_preview(image)
+        deadline = time.monotonic() + 5
+        while manager.preview_label.pixmap().isNull() and time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.005)
+
+        assert manager.preview_label.pixmap().width() == 600
+        assert manager.detail_dimensions.text() == "1920 x 1080 px"
+
+    def test_search_pages(self, make_manager, monkeypatch):
+        monkeypatch.setattr(image_library_manager, "SEARCH_PAGE_SIZE", 2)
+        manager = make_manager(FakeConfigDb([(_image(f"{i}.png", ""), i == 0) for i in range(5)]))
+        manager.search_input.setText("png")
+        manager._perform_search()
+
+        results_item = manager.tree.topLevelItem(0)
+        assert _children(results_item)[:2] == ["🖼️⭐ 0.png", "🖼️ 1.png"]
+        assert [_data_type(results_item.child(i)) for i in (2, 3)] == ["search_more", "clear_search"]
+
+        manager._on_tree_item_double_clicked(results_item.child(2), 0)
+        manager._on_tree_item_double_clicked(results_item.child(4), 0)
+        assert [_data_type(results_item.child(i)) for i in range(results_item.childCount())] == \
+            ["image"] * 5 + ["clear_search"]
+
+        manager._on_tree_item_double_clicked(results_item.child(5), 0)
+        assert manager.search_input.text() == ""
+        assert "rf_rf" in manager._tree_items
@@ -0,0 +1,301 @@
+"""
+Unit tests for the job runner.
+Tests workflow planning (ordering, parallel branches, disabled jobs,
+cycles), parameter resolution and DAG execution on a pool.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dataforge_studio.core.job_runner import (
+    JobRunner,
+    JobTask,
+    JobPlanError,
+    build_job_plan,
+    resolve_job_parameters,
+    STATUS_SUCCESS,
+    STATUS_FAILED,
+    STATUS_SKIPPED,
+    STATUS_CANCELLED,
+)
+from dataforge_studio.database.models import DatabaseConnection, Job, Script
+from dataforge_studio.utils.credential_manager import CredentialManager
+
+
+SCRIPT_SOURCE = '''
+import time
+
+def run(name="", delay=0.0, fail=False):
+    time.sleep(delay)
+    if fail:
+        raise ValueError(f"{name} failed")
+    return f"{name} done"
+'''
+
+
+@pytest.fixture
+def script_file(tmp_path):
+    path = tmp_path / "job_script.py"
+    path.write_text(SCRIPT_SOURCE, encoding="utf-8")
+    return str(path)
+
+
+def _task(script_file, job_id, depends_on=(), **kwargs):
+    return JobTask(job_id=job_id, name=job_id, file_path=script_file,
+                   kwargs={"name": job_id, **kwargs}, depends_on=set(depends_on))
+
+
+def _thread_runner(max_workers=4):
+    return JobRunner(max_workers=max_workers, executor_factory=ThreadPoolExecutor)
+
+
+class FakeConfigDb:
+    """Minimal ConfigDatabase for planning."""
+
+    def __init__(self, jobs, script):
+        self.jobs = jobs
+        self.script = script
+
+    def get_all_jobs(self):
+        return self.jobs
+
+    def get_script(self, script_id):
+        return self.script if script_id == self.script.id else None
+
+    def get_file_root(self, root_id):
+        return None
+
+    def get_database_connection(self, conn_id):
+        return None
+
+    def get_saved_query(self, query_id):
+        return None
+
+
+def _job(job_id, parent=None, previous=None, workflow=False, enabled=True):
+    return Job(id=job_id, name=job_id, description="",
+               job_type="workflow" if workflow else "atomic",
+               script_id=None if workflow else "s1",
+               parent_job_id=parent, previous_job_id=previous, enabled=enabled)
+
+
+@pytest.fixture
+def script(script_file):
+    return Script(id="s1", name="Custom Script", description="", script_type="custom",
+                  file_path=script_file)
+
+
+class TestBuildJobPlan:
+    """Tests for workflow resolution."""
+
+    def _plan(self, root, jobs, script):
+        tasks = build_job_plan(root, FakeConfigDb([root] + jobs, script))
+        return {t.job_id: t.depends_on for t in tasks}
+
+    def test_atomic_job(self, script):
+        plan = self._plan(_job("a"), [], script)
+        assert plan == {"a": set()}
+
+    def test_sequence_and_parallel_branches(self, script):
+        root = _job("wf", workflow=True)
+        jobs = [
+            _job("extract", parent="wf"),
+            _job("load_a", parent="wf", previous="extract"),
+            _job("load_b", parent="wf", previous="extract"),
+            _job("other", parent="wf"),
+        ]
+        plan = self._plan(root, jobs, script)
+        assert plan == {"extract": set(), "other": set(),
+                        "load_a": {"extract"}, "load_b": {"extract"}}
+
+    def test_nested_workflow_waits_for_predecessor(self, script):
+        root = _job("wf", workflow=True)
+        jobs = [
+            _job("first", parent="wf"),
+            _job("sub", parent="wf", previous="first", workflow=True),
+            _job("x", parent="sub"),
+            _job("y", parent="sub", previous="x"),
+            _job("last", parent="wf", previous="sub"),
+        ]
+        plan = self._plan(root, jobs, script)
+        assert plan["x"] == {"first"}
+        assert plan["y"] == {"x"}
+        assert plan["last"] == {"y"}
+
+    def test_disabled_job_passes_its_dependencies_through(self, script):
+        root = _job("wf", workflow=True)
+        jobs = [
+            _job("a", parent="wf"),
+            _job("b", parent="wf", previous="a", enabled=False),
+            _job("c", parent="wf", previous="b"),
+        ]
+        plan = self._plan(root, jobs, script)
+        assert plan == {"a": set(), "c": {"a"}}
+
+    def test_cycle_raises(self, script):
+        root = _job("wf", workflow=True)
+        jobs = [_job("a", parent="wf", previous="b"), _job("b", parent="wf", previous="a")]
+        with pytest.raises(JobPlanError):
+            self._plan(root, jobs, script)
+
+    def test_unknown_script_raises(self, script):
+        job = _job("a")
+        job.script_id = "missing"
+        with pytest.raises(JobPlanError):
+            self._plan(job, [], script)
+
+
+class TestResolveParameters:
+    """Tests for resolve_job_parameters()."""
+
+    def test_defaults_and_reference_lookup(self, script):
+        class Db(FakeConfigDb):
+            def get_database_connection(self, conn_id):
+                return DatabaseConnection(id=conn_id, name="C", db_type="sqlite",
+                                          description="", connection_string=f"dsn-{conn_id}")
+
+        schema = [
+            {"name": "target", "type": "database"},
+            {"name": "mode", "type": "string", "default": "append"},
+        ]
+        kwargs = resolve_job_parameters({"target": "c1"}, schema, Db([], script))
+        assert kwargs == {"target": "dsn-c1", "mode": "append"}
+
+    def test_database_gets_stored_credentials(self, script, monkeypatch):
+        monkeypatch.setattr(CredentialManager, "get_credentials",
+                            staticmethod(lambda conn_id: ("etl", "s3cret")))
+
+        class Db(FakeConfigDb):
+            def get_database_connection(self, conn_id):
+                return DatabaseConnection(id=conn_id, name="C", db_type="sqlserver", description="",
+                                          connection_string="DRIVER={SQL Server};SERVER=db")
+
+        kwargs = resolve_job_parameters({"target": "c1"}, [{"name": "target", "type": "database"}],
+                                        Db([], script))
+        assert kwargs["target"] == "DRIVER={SQL Server};SERVER=db;UID=etl;PWD=s3cret;"
+
+
+class TestJobRunner:
+    """Tests for DAG execution."""
+
+    def test_dependencies_respected_and_branches_parallel(self, script_file):
+        tasks = [
+            _task(script_file, "a", delay=0.05),
+            _task(script_file, "b", ["a"], delay=0.3),
+            _task(script_file, "c", ["a"], delay=0.3),
+            _task(script_file, "d", ["b", "c"]),
+        ]
+        events = []
+        start = time.perf_counter()
+        outcomes = _thread_runner().run(tasks, on_event=lambda e: events.append((e.kind, e.task.job_id)))
+        elapsed = time.perf_counter() - start
+
+        assert all(o.status == STATUS_SUCCESS for o in outcomes.values())
+        assert outcomes["d"].result == "d done"
+        order = [job_id for kind, job_id in events if kind == "started"]
+        assert order[0] == "a" and order[-1] == "d"
+        assert elapsed < 0.55  # b and c overlapped
+
+    def test_failure_skips_dependents_only(self, script_file):
+        tasks = [
+            _task(script_file, "a", fail=True),
+            _task(script_file, "b", ["a"]),
+            _task(script_file, "c", ["b"]),
+            _task(script_file, "other"),
+        ]
+        outcomes = _thread_runner().run(tasks)
+        assert outcomes["a"].status == STATUS_FAILED
+        assert "ValueError: a failed" in outcomes["a"].error
+        assert outcomes["b"].status == STATUS_SKIPPED
+        assert outcomes["c"].status == STATUS_SKIPPED
+        assert outcomes["other"].status == STATUS_SUCCESS
+
+    def test_cancel_marks_pending_tasks(self, script_file):
+        runner = _thread_runner()
+        tasks = [_task(script_file, "a", delay=0.2), _task(script_file, "b", ["a"])]
+
+        def on_event(event):
+            if event.kind == "started" and event.task.job_id == "a":
+                runner.cancel()
+
+        outcomes = runner.run(tasks, on_event=on_event)
+        assert outcomes["a"].status == STATUS_SUCCESS
+        assert outcomes["b"].status == STATUS_CANCELLED
+
+    def test_cancel_before_start_settles_dependents_once(self, script_file):
+        runner = _thread_runner()
+        runner.cancel()
+        tasks = [_task(script_file, "a"), _task(script_file, "b", ["a"])]
+        finished = []
+
+        outcomes = runner.run(tasks, on_event=lambda e: finished.append(e.task.job_id))
+        assert outcomes["a"].status == STATUS_CANCELLED
+        assert outcomes["b"].status == STATUS_CANCELLED
+        assert sorted(finished) == ["a", "b"]
+
+    def test_cycle_with_dependent(self, script_file):
+        tasks = [
+            _task(script_file, "a", ["b"]),
+            _task(script_file, "b", ["a"]),
+            _task(script_file, "c", ["a"]),
+            _task(script_file, "other"),
+        ]
+        outcomes = _thread_runner().run(tasks)
+        assert outcomes["other"].status == STATUS_SUCCESS
+        assert {outcomes[j].status for j in "abc"} == {STATUS_SKIPPED}
+        assert outcomes["a"].error == "Circular dependency"
+
+    def test_cancel_abandoning_running_tasks(self, script_file):
+        runner = _thread_runner()
+        tasks = [_task(script_file, "a", delay=2.0), _task(script_file, "b", ["a"])]
+
+        def on_event(event):
+            if event.kind == "started":
+                runner.cancel(abandon_running=True)
+
+        start = time.perf_counter()
+        outcomes = runner.run(tasks, on_event=on_event)
+        assert time.perf_counter() - start < 1.5
+        assert outcomes["a"].status == STATUS_CANCELLED
+        assert outcomes["b"].status == STATUS_CANCELLED
+
+    def test_process_pool(self, script_file):
+        tasks = [_task(script_file, "a"), _task(script_file, "b", ["a"])]
+        outcomes = JobRunner(max_workers=2).run(tasks)
+        assert outcomes["b"].status == STATUS_SUCCESS
+        assert outcomes["b"].result == "b done"
+        assert outcomes["b"].duration >= 0
+
+
+class TestJobRunWorker:
+    """Tests for the JobRunWorker thread."""
+
+    def test_run_finished_then_thread_finished(self, qapp, script_file):
+        from dataforge_studio.ui.workers.job_workers import JobRunWorker
+        worker = JobRunWorker([_task(script_file, "a")])
+        worker._runner = _thread_runner()
+        events = []
+        worker.run_finished.connect(lambda outcomes: events.append(outcomes["a"].status))
+        worker.finished.connect(lambda: events.append("finished"))
+        worker.start()
+        assert worker.wait(5000)
+        qapp.processEvents()
+        assert events == [STATUS_SUCCESS, "finished"]
+
+    def test_stop_is_bounded(self, qapp, script_file):
+        from dataforge_studio.ui.workers.job_workers import JobRunWorker
+        worker = JobRunWorker([_task(script_file, "a", delay=2.0)])
+        worker._runner = _thread_runner()
+        started = []
+        worker.job_started.connect(lambda job_id, name: started.append(job_id))
+        worker.start()
+        deadline = time.monotonic() + 5
+        while not started and time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.01)
+
+        start = time.perf_counter()
+        assert worker.stop(timeout_ms=1500)
+        assert time.perf_counter() - start < 1.5
+        qapp.processEvents()
@@ -9,12 +9,21 @@ Regression cover for two production defects:
   target a nonexistent name and report the server as unreachable while the
   connection itself worked.
 """
+import threading
+import time
+from types import SimpleNamespace
+
 import pytest
 
+from dataforge_studio.utils import network_utils
 from dataforge_studio.utils.network_utils import (
     DEFAULT_PORTS,
+    check_server_reachable,
+    clear_reachability_cache,
     extract_host_from_connection_string,
     extract_host_port_from_connection_string,
+    probe_connections,
+    probe_endpoint,
 )
 
 
@@ -75,3 +84,76 @@ def test_legacy_host_only_helper_still_works():
     """The single-value helper is kept for existing callers."""
     assert extract_host_from_connection_string(
         f"mysql+pymysql://alice:P@ssw0rd@{HOST}:3306/ventes", "mysql") == HOST
+
+
+# ==================== Reachability cache ====================
+
+@pytest.fixture
+def fake_ping(monkeypatch):
+    """Replace the network probe: hosts starting with 'up' answer after 0.2 s."""
+    calls = []
+    lock = threading.Lock()
+
+    def ping(host, timeout=3, port=None):
+        with lock:
+            calls.append((host, port))
+        time.sleep(0.2)
+        return host.startswith("up"), host
+
+    clear_reachability_cache()
+    monkeypatch.setattr(network_utils, "ping_host", ping)
+    yield calls
+    clear_reachability_cache()
+
+
+def _mysql(host, conn_id=None):
+    return SimpleNamespace(id=conn_id or host, name=host, db_type="mysql",
+                           connection_string=f"mysql+pymysql://u:p@{host}/db")
+
+
+def test_probe_results_are_cached(fake_ping):
+    assert probe_endpoint("up1", 3306) == (True, "up1")
+    assert probe_endpoint("UP1", 3306) == (True, "up1")
+    assert len(fake_ping) == 1
+    probe_endpoint("up1", 3306, max_age=0)
+    assert len(fake_ping) == 2
+
+
+def test_unreachable_results_expire_sooner(fake_ping, monkeypatch):
+    monkeypatch.setattr(network_utils, "UNREACHABLE_TTL_S", 0)
+    reachable, message = check_server_reachable("mysql+pymysql://u:p@down1/db", "mysql")
+    assert not reachable and "down1" in message
+    check_server_reachable("mysql+pymysql://u:p@down1/db", "mysql")
+    assert len(fake_ping) == 2
+
+
+def test_concurrent_probes_of_one_endpoint_share_the_attempt(fake_ping):
+    threads = [threading.Thread(target=probe_endpoint, args=("up1", 3306)) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert fake_ping == [("up1", 3306)]
+
+
+def test_probe_connections_runs_in_parallel(fake_ping):
+    conns = [_mysql(f"up{i}") for i in range(6)] + [_mysql(f"down{i}") for i in range(6)]
+    conns.append(_mysql("up0", conn_id="same-server"))
+    started = time.monotonic()
+    results = probe_connections(conns, timeout=3)
+    assert time.monotonic() - started < 1.0   # 12 probes of 0.2 s
+    assert results["up3"] == (True, None)
+    assert results["same-server"] == (True, None)
+    assert results["down2"][0] is False
+    assert len(fake_ping) == 12
+
+
+
+def test_warmup_opens_reachable_servers_only(fake_ping, monkeypatch, qapp):
+    from dataforge_studio.ui.managers.database import connection_worker
+    monkeypatch.setattr(connection_worker, "build_connection", lambda c: f"conn-{c.id}")
+    worker = connection_worker.ConnectionWarmupWorker([_mysql("up1"), _mysql("down1"), _mysql("up2")])
+    ready = []
+    worker.connection_ready.connect(lambda db_id, conn: ready.append((db_id, conn)))
+    worker.run()
+    assert sorted(ready) == [("up1", "conn-up1"), ("up2", "conn-up2")]
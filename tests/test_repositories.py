@@ -3,10 +3,11 @@ Unit tests for the repository pattern implementation.
 Tests the new modular database access layer.
 """
 import pytest
+import sqlite3
 import tempfile
 from pathlib import Path
 
-from dataforge_studio.database.connection_pool import ConnectionPool
+from dataforge_studio.database.connection_pool import ConnectionPool, CACHE_SIZE_KB
 from dataforge_studio.database.schema_manager import SchemaManager
 from dataforge_studio.database.repositories import (
     DatabaseConnectionRepository,
@@ -16,6 +17,9 @@ from dataforge_studio.database.repositories import (
     ScriptRepository,
     JobRepository,
     UserPreferencesRepository,
+    ImageRootfolderRepository,
+    SavedImageRepository,
+    ERDiagramRepository,
 )
 from dataforge_studio.database.models import (
     DatabaseConnection,
@@ -24,6 +28,10 @@ from dataforge_studio.database.models import (
     FileRoot,
     Script,
     Job,
+    ImageRootfolder,
+    ERDiagram,
+    ERDiagramFKMidpoint,
+    ERDiagramGroup,
 )
 from dataforge_studio.utils.db_capabilities import is_multi_database_server
 
@@ -47,6 +55,84 @@ class TestDbCapabilities:
         assert is_multi_database_server(None) is False
 
 
+class TestSchemaManager:
+    """Test versioned migrations and connection settings."""
+
+    def _version(self, db_path):
+        conn = sqlite3.connect(db_path)
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_fresh_database_is_current_and_wal(self, tmp_path):
+        db_path = tmp_path / "test.db"
+        SchemaManager(db_path).initialize()
+
+        assert self._version(db_path) == SchemaManager.SCHEMA_VERSION
+        conn = sqlite3.connect(db_path)
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            conn.close()
+
+    def test_current_database_skips_migrations(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "test.db"
+        SchemaManager(db_path).initialize()
+
+        def fail(*args):
+            raise AssertionError("migration ran on a current database")
+
+        for name in SchemaManager.MIGRATIONS:
+            monkeypatch.setattr(SchemaManager, name, fail)
+        monkeypatch.setattr(SchemaManager, "_init_database", fail)
+        SchemaManager(db_path).initialize()
+
+    def test_only_pending_migrations_run(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "test.db"
+        SchemaManager(db_path).initialize()
+        conn = sqlite3.connect(db_path)
+        conn.execute(f"PRAGMA user_version = {SchemaManager.SCHEMA_VERSION - 2}")
+        conn.close()
+
+        ran = []
+        for name in SchemaManager.MIGRATIONS:
+            monkeypatch.setattr(SchemaManager, name,
+                                lambda self, cursor, conn, name=name: ran.append(name))
+        SchemaManager(db_path).initialize()
+
+        assert ran == list(SchemaManager.MIGRATIONS[-2:])
+        assert self._version(db_path) == SchemaManager.SCHEMA_VERSION
+
+    def test_unversioned_database_is_migrated(self, tmp_path):
+        db_path = tmp_path / "test.db"
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE scripts (id TEXT PRIMARY KEY, name TEXT NOT NULL)")
+        conn.close()
+
+        SchemaManager(db_path).initialize()
+
+        conn = sqlite3.connect(db_path)
+        try:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(scripts)")]
+        finally:
+            conn.close()
+        assert "file_path" in columns
+        assert self._version(db_path) == SchemaManager.SCHEMA_VERSION
+
+    def test_pooled_connection_settings(self, tmp_path):
+        db_path = tmp_path / "test.db"
+        SchemaManager(db_path).initialize()
+        pool = ConnectionPool(db_path)
+        try:
+            with pool.get_connection() as conn:
+                assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+                assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+                assert conn.execute("PRAGMA cache_size").fetchone()[0] == -CACHE_SIZE_KB
+        finally:
+            pool.close_all()
+
+
 class TestConnectionPool:
     """Test ConnectionPool functionality."""
 
@@ -418,3 +504,221 @@ class TestUserPreferencesRepository:
 
         value = repo.get("to_delete")
         assert value is None
+
+    def test_set_many(self, repo):
+        """Test writing several preferences at once."""
+        repo.set("theme", "dark")
+        assert repo.set_many({"theme": "light", "language": "en"})
+        assert repo.get_all() == {"theme": "light", "language": "en"}
+
+
+class TestSavedImageRepository:
+    """Test the aggregated SavedImageRepository queries used by the image tree."""
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        """Create repository with a rootfolder and three images."""
+        db_path = tmp_path / "test.db"
+        pool = ConnectionPool(db_path)
+        schema = SchemaManager(db_path)
+        schema.initialize()
+        ImageRootfolderRepository(pool).add(ImageRootfolder(id="rf", path="/img", name="img"))
+        repo = SavedImageRepository(pool)
+        self.ids = {
+            name: repo.add_image(name, f"/img/{path}/{name}", "rf", path)
+            for name, path in [("a.png", ""), ("b.png", "x/y"), ("c.png", "x/y")]
+        }
+        return repo
+
+    def test_tree_entries_flag_metadata(self, repo):
+        repo.add_category(self.ids["b.png"], "Logos")
+        repo.add_tag(self.ids["c.png"], "blue")
+
+        entries = repo.get_tree_entries()
+        assert [(img.name, img.physical_path, flag) for img, flag in entries] == [
+            ("a.png", "", False), ("b.png", "x/y", True), ("c.png", "x/y", True)]
+
+    def test_category_entries(self, repo):
+        repo.add_category(self.ids["c.png"], "Logos")
+        repo.add_category(self.ids["a.png"], "Logos")
+        repo.add_category(self.ids["a.png"], "Icons")
+
+        entries = repo.get_category_entries()
+        assert [(cat, img.name, flag) for cat, img, flag in entries] == [
+            ("Icons", "a.png", True), ("Logos", "a.png", True), ("Logos", "c.png", True)]
+
+    def test_ids_with_metadata(self, repo):
+        repo.add_tag(self.ids["a.png"], "red")
+        assert repo.get_ids_with_metadata(self.ids.values()) == {self.ids["a.png"]}
+        assert repo.get_ids_with_metadata([]) == set()
+
+
+class TestImageSearch:
+    """Test the image_search full-text index and SavedImageRepository.search()."""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        db_path = tmp_path / "test.db"
+        SchemaManager(db_path).initialize()
+        return db_path
+
+    @pytest.fixture
+    def repo(self, db_path):
+        pool = ConnectionPool(db_path)
+        ImageRootfolderRepository(pool).add(ImageRootfolder(id="rf", path="/img", name="img"))
+        repo = SavedImageRepository(pool)
+        self.ids = {
+            name: repo.add_image(name, f"/img/{folder}/{name}", "rf", folder)
+            for name, folder in [("sunset_beach.png", "holidays"), ("red-car.jpg", "cars"),
+                                 ("logo.svg", "brand"), ("beach_ball.png", "toys")]
+        }
+        return repo
+
+    def _names(self, repo, query, **kwargs):
+        return [img.name for img in repo.search(query, **kwargs)]
+
+    def test_prefix_and_phrase(self, repo):
+        assert self._names(repo, "sun") == ["sunset_beach.png"]
+        assert self._names(repo, "red car") == ["red-car.jpg"]
+        assert self._names(repo, '"car red"') == []
+        assert self._names(repo, "holiday") == ["sunset_beach.png"]  # path
+        assert self._names(repo, "AND") == []
+
+    def test_name_ranked_above_path(self, repo):
+        repo.add_image("photo.png", "/img/beach/photo.png", "rf", "beach")
+        names = self._names(repo, "beach")
+        assert set(names[:2]) == {"sunset_beach.png", "beach_ball.png"}
+        assert names[2] == "photo.png"
+
+    def test_triggers_follow_categories_tags_and_renames(self, repo):
+        logo = self.ids["logo.svg"]
+        repo.set_categories(logo, ["Branding", "Vectors"])
+        repo.add_tag(logo, "Corporate")
+        assert self._names(repo, "vector") == ["logo.svg"]
+        assert self._names(repo, "corp", search_name=False, search_categories=False) == ["logo.svg"]
+        assert self._names(repo, "corp", search_tags=False) == []
+
+        repo.remove_category(logo, "Vectors")
+        assert self._names(repo, "vector") == []
+
+        image = repo.get_by_id(logo)
+        image.name = "emblem.svg"
+        repo.update(image)
+        assert self._names(repo, "emblem") == ["emblem.svg"]
+
+        repo.delete(logo)
+        assert self._names(repo, "brand") == []
+
+    def test_pagination_and_count(self, repo):
+        for i in range(5):
+            repo.add_image(f"shot_{i}.png", f"/img/shots/shot_{i}.png", "rf", "shots")
+        assert repo.count_search("shot") == 5
+        first = self._names(repo, "shot", limit=2)
+        rest = self._names(repo, "shot", limit=10, offset=2)
+        assert len(first) == 2 and len(rest) == 3
+        assert set(first + rest) == {f"shot_{i}.png" for i in range(5)}
+
+    def test_index_rebuilt_when_out_of_sync(self, repo, db_path):
+        repo.add_category(self.ids["logo.svg"], "Branding")
+        with repo.pool.transaction() as conn:
+            conn.execute("DELETE FROM image_search")
+        assert self._names(repo, "logo") == []
+
+        # The consistency check runs with the image search migration
+        with repo.pool.transaction() as conn:
+            conn.execute(f"PRAGMA user_version = {SchemaManager.SCHEMA_VERSION - 1}")
+        SchemaManager(db_path).initialize()
+        assert self._names(repo, "branding") == ["logo.svg"]
+
+
+class TestERDiagramRepository:
+    """Test ERDiagramRepository save diffing and batched loading."""
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        db_path = tmp_path / "test.db"
+        SchemaManager(db_path).initialize()
+        pool = ConnectionPool(db_path)
+        for conn_id in ("c1", "c2"):
+            DatabaseConnectionRepository(pool).add(DatabaseConnection(
+                id=conn_id, name=conn_id, db_type="sqlite", description="",
+                connection_string="sqlite:///x.db"))
+        yield ERDiagramRepository(pool)
+        pool.close_all()
+
+    def _diagram(self, name="Sales", connection_id="c1", tables=3):
+        diagram = ERDiagram(name=name, connection_id=connection_id)
+        for i in range(tables):
+            diagram.add_table(f"t{i}", pos_x=i * 10.0, pos_y=5.0)
+        diagram.fk_midpoints.append(ERDiagramFKMidpoint("t0", "id", "t1", "t0_id", 1.0, 2.0))
+        diagram.groups.append(ERDiagramGroup(name="Core", x=1.0, y=1.0))
+        return diagram
+
+    def _statements(self, repo):
+        statements = []
+        with repo.pool.get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+        return statements
+
+    def _write_target(self, statement):
+        words = statement.split()
+        return f"{words[0]} {words[1] if words[0] == 'UPDATE' else words[2]}"
+
+    def test_save_and_reload(self, repo):
+        diagram = repo.save(self._diagram())
+        loaded = repo.get_with_tables(diagram.id)
+
+        assert [t.table_name for t in loaded.tables] == ["t0", "t1", "t2"]
+        assert loaded.tables[2].pos_x == 20.0
+        assert loaded.fk_midpoints[0].mid_y == 2.0
+        assert loaded.groups[0].name == "Core"
+        assert repo.get_with_tables("missing") is None
+
+    def test_save_writes_only_changes(self, repo):
+        diagram = repo.save(self._diagram())
+        diagram.update_table_position("t1", 99.0, 99.0)
+        diagram.remove_table("t2")
+        diagram.add_table("t3")
+        diagram.groups.clear()
+
+        statements = self._statements(repo)
+        repo.save(diagram)
+        writes = [self._write_target(s) for s in statements
+                  if s.split()[0] in ("INSERT", "UPDATE", "DELETE")]
+
+        assert sorted(writes) == sorted([
+            "UPDATE er_diagrams",
+            "DELETE er_diagram_tables",
+            "UPDATE er_diagram_tables",
+            "INSERT er_diagram_tables",
+            "DELETE er_diagram_groups",
+        ])
+        assert statements.count("COMMIT") == 1
+        loaded = repo.get_with_tables(diagram.id)
+        assert [(t.table_name, t.pos_x) for t in loaded.tables] == [("t0", 0.0), ("t1", 99.0), ("t3", 0.0)]
+        assert loaded.groups == []
+
+    def test_save_is_atomic(self, repo):
+        diagram = repo.save(self._diagram())
+        diagram.name = "Renamed"
+        diagram.groups.append(ERDiagramGroup(id=diagram.groups[0].id + "x", name=None))  # NOT NULL
+
+        with pytest.raises(sqlite3.IntegrityError):
+            repo.save(diagram)
+        assert repo.get_by_id(diagram.id).name == "Sales"
+
+    def test_listing_uses_fixed_query_count(self, repo):
+        for i in range(5):
+            repo.save(self._diagram(name=f"d{i}", connection_id="c1" if i < 3 else "c2"))
+
+        statements = self._statements(repo)
+        diagrams = repo.get_all_diagrams()
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+        assert [d.name for d in diagrams] == [f"d{i}" for i in range(5)]
+        assert all(len(d.tables) == 3 and len(d.groups) == 1 for d in diagrams)
+        assert len(selects) <= 5  # pool health check + diagrams + 3 child tables
+
+        by_connection = repo.get_by_connection("c2")
+        assert [d.name for d in by_connection] == ["d3", "d4"]
+        assert all(len(d.fk_midpoints) == 1 for d in by_connection)
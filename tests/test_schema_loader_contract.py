@@ -90,3 +90,165 @@ def test_extra_arguments_are_optional_everywhere(loader_cls):
         f"{loader_cls.__name__}.load_columns() requires {required}; only "
         "table_name may be mandatory."
     )
+
+
+# ---------------------------------------------------------------------------
+# Bulk catalog loading parity
+# ---------------------------------------------------------------------------
+
+def _columns_snapshot(table_nodes):
+    return {
+        t.name: [(c.name, c.metadata["type"], c.metadata["table"]) for c in t.children]
+        for t in table_nodes
+    }
+
+
+@pytest.fixture
+def sqlite_conn():
+    import sqlite3
+    conn = sqlite3.connect(":memory:")
+    conn.executescript("""
+        CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT NOT NULL, note);
+        CREATE TABLE orders (
+            id INTEGER, line INTEGER, customer_id INTEGER REFERENCES customers(id),
+            amount DECIMAL(10,2), PRIMARY KEY (id, line)
+        );
+        CREATE TABLE "odd]name" (x INT);
+        CREATE VIEW v_orders AS SELECT id, amount FROM orders;
+        CREATE VIEW v_empty AS SELECT 1 AS one;
+    """)
+    yield conn
+    conn.close()
+
+
+class TestSQLiteBulkParity:
+    """Bulk pragma_table_info() loading must match the per-table PRAGMA path."""
+
+    def test_tables_match_per_table_columns(self, sqlite_conn):
+        loader = SQLiteSchemaLoader(sqlite_conn, "db1", "test")
+        tables = loader.load_tables()
+        per_table = {t.name: loader.load_columns(t.name) for t in tables}
+
+        assert _columns_snapshot(tables) == {
+            name: [(c.name, c.metadata["type"], c.metadata["table"]) for c in cols]
+            for name, cols in per_table.items()
+        }
+        assert [t.display_name for t in tables][0] == "customers (3 cols)"
+
+    def test_fallback_when_bulk_unavailable(self, sqlite_conn, monkeypatch):
+        loader = SQLiteSchemaLoader(sqlite_conn, "db1", "test")
+        bulk = _columns_snapshot(loader.load_tables())
+        monkeypatch.setattr(loader, "_load_all_columns_bulk", lambda cursor: None)
+        assert _columns_snapshot(loader.load_tables()) == bulk
+
+    def test_view_column_counts(self, sqlite_conn):
+        loader = SQLiteSchemaLoader(sqlite_conn, "db1", "test")
+        views = {v.name: v.display_name for v in loader.load_views()}
+        assert views == {"v_empty": "v_empty (1 cols)", "v_orders": "v_orders (2 cols)"}
+
+    def test_broken_view_falls_back_per_view(self, sqlite_conn):
+        sqlite_conn.executescript("""
+            CREATE TABLE gone (a INT);
+            CREATE VIEW v_broken AS SELECT a FROM gone;
+            DROP TABLE gone;
+        """)
+        loader = SQLiteSchemaLoader(sqlite_conn, "db1", "test")
+        views = {v.name: v.display_name for v in loader.load_views()}
+        assert views["v_broken"] == "v_broken"
+        assert views["v_orders"] == "v_orders (2 cols)"
+
+    def test_foreign_keys(self, sqlite_conn):
+        loader = SQLiteSchemaLoader(sqlite_conn, "db1", "test")
+        fks = loader.load_foreign_keys()
+        assert [(f.from_table, f.from_column, f.to_table, f.to_column) for f in fks] == [
+            ("orders", "customer_id", "customers", "id")
+        ]
+        assert loader.load_foreign_keys(["customers"]) == []
+
+    def test_primary_keys(self, sqlite_conn):
+        loader = SQLiteSchemaLoader(sqlite_conn, "db1", "test")
+        pks = [(p.table_name, p.column_name) for p in loader.load_primary_keys()]
+        assert pks == [("customers", "id"), ("orders", "id"), ("orders", "line")]
+        assert [p.column_name for p in loader.load_primary_keys(["customers"])] == ["id"]
+
+
+class _FakeCursor:
+    """Minimal cursor answering SQL Server catalog queries from canned rows."""
+
+    def __init__(self, tables, columns):
+        self._tables = tables
+        self._columns = columns
+        self.queries = []
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        self.queries.append((sql, params))
+        if "sys.tables" in sql:
+            self._rows = self._tables
+        elif "sys.columns" in sql:
+            if params:
+                table, schema = params
+                self._rows = [r[2:] for r in self._columns if r[:2] == (schema, table)]
+            else:
+                self._rows = self._columns
+
+    def fetchall(self):
+        return self._rows
+
+
+class _FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+
+class TestSQLServerBulkParity:
+    """SQL Server tables must be built from one sys.columns query per database."""
+
+    TABLES = [("dbo", "Customers"), ("dbo", "Orders"), ("sales", "Empty")]
+    COLUMNS = [
+        ("dbo", "Customers", "id", "int", 4, 10, 0),
+        ("dbo", "Customers", "name", "nvarchar", 200, 0, 0),
+        ("dbo", "Orders", "id", "int", 4, 10, 0),
+        ("dbo", "Orders", "amount", "decimal", 9, 18, 2),
+        ("dbo", "Orders", "blob", "varbinary", -1, 0, 0),
+    ]
+
+    def test_single_columns_query(self):
+        cursor = _FakeCursor(self.TABLES, self.COLUMNS)
+        loader = SQLServerSchemaLoader(_FakeConnection(cursor), "db1", "server")
+        tables = loader.load_tables("Sales")
+
+        column_queries = [q for q, _ in cursor.queries if "sys.columns" in q]
+        assert len(column_queries) == 1
+        assert [t.name for t in tables] == ["dbo.Customers", "dbo.Orders", "sales.Empty"]
+        assert tables[2].children == []
+        assert all(t.metadata["db_name"] == "Sales" for t in tables)
+
+    def test_bulk_matches_load_columns(self):
+        cursor = _FakeCursor(self.TABLES, self.COLUMNS)
+        loader = SQLServerSchemaLoader(_FakeConnection(cursor), "db1", "server")
+        tables = loader.load_tables("Sales")
+
+        per_table = {
+            t.name: loader.load_columns(t.metadata["table"], t.metadata["schema"], "Sales")
+            for t in tables
+        }
+        assert _columns_snapshot(tables) == {
+            name: [(c.name, c.metadata["type"], c.metadata["table"]) for c in cols]
+            for name, cols in per_table.items()
+        }
+        assert _columns_snapshot(tables)["dbo.Orders"][1:] == [
+            ("amount", "decimal(18,2)", "dbo.Orders"),
+            ("blob", "varbinary(MAX)", "dbo.Orders"),
+        ]
+
+    def test_load_columns_is_parameterized(self):
+        cursor = _FakeCursor(self.TABLES, self.COLUMNS)
+        loader = SQLServerSchemaLoader(_FakeConnection(cursor), "db1", "server")
+        loader.load_columns("O'Brien", "dbo", "Sales")
+        sql, params = cursor.queries[-1]
+        assert "O'Brien" not in sql
+        assert params == ("O'Brien", "dbo")
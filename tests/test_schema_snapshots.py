@@ -0,0 +1,272 @@
+"""
+Unit tests for schema snapshots.
+Tests SchemaNode serialization, the snapshot repository, the PostgreSQL and
+SQL Server change markers, and the marker-based reuse in SchemaSnapshotStore
+(against a real SQLite catalog).
+"""
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from dataforge_studio.database.connection_pool import ConnectionPool
+from dataforge_studio.database.schema_manager import SchemaManager
+from dataforge_studio.database.models import DatabaseConnection, SchemaSnapshot
+from dataforge_studio.database.repositories import (
+    DatabaseConnectionRepository,
+    SchemaSnapshotRepository,
+)
+from dataforge_studio.database.schema_loaders import (
+    SchemaNode,
+    SchemaNodeType,
+    ForeignKeyInfo,
+    PrimaryKeyInfo,
+)
+from dataforge_studio.database.schema_loaders import postgresql_loader, sqlserver_loader
+from dataforge_studio.database.schema_loaders.sqlite_loader import SQLiteSchemaLoader
+from dataforge_studio.database.schema_snapshot_store import SchemaSnapshotStore
+from dataforge_studio.ui.managers.database import connection_worker
+from dataforge_studio.ui.managers.database.connection_worker import SchemaRevalidateWorker
+
+
+@pytest.fixture
+def pool(tmp_path):
+    """Config database with schema and one registered connection."""
+    db_path = tmp_path / "config.db"
+    SchemaManager(db_path).initialize()
+    pool = ConnectionPool(db_path, max_connections=2)
+    DatabaseConnectionRepository(pool).add(DatabaseConnection(
+        id="conn-1", name="Test", db_type="sqlite", description="",
+        connection_string="sqlite:///test.db",
+    ))
+    yield pool
+    pool.close_all()
+
+
+@pytest.fixture
+def sample_snapshot():
+    root = SchemaNode(SchemaNodeType.DATABASE, "main")
+    table = SchemaNode(SchemaNodeType.TABLE, "users", metadata={"table": "users"})
+    table.add_child(SchemaNode(SchemaNodeType.COLUMN, "id", metadata={"type": "INTEGER"}))
+    root.add_child(table)
+    return SchemaSnapshot(
+        connection_id="conn-1", marker="7", schema=root,
+        foreign_keys=[ForeignKeyInfo("fk_orders_users", "orders", "user_id", "users", "id")],
+        primary_keys=[PrimaryKeyInfo("users", "id")],
+    )
+
+
+class TestSchemaNodeSerialization:
+    """Tests for SchemaNode.to_dict() / from_dict()."""
+
+    def test_round_trip(self, sample_snapshot):
+        data = sample_snapshot.schema.to_dict()
+        node = SchemaNode.from_dict(data)
+        assert node.name == "main"
+        assert node.node_type == SchemaNodeType.DATABASE
+        assert node.children[0].children[0].metadata == {"type": "INTEGER"}
+
+
+class TestSchemaSnapshotRepository:
+    """Tests for SchemaSnapshotRepository."""
+
+    def test_save_and_get(self, pool, sample_snapshot):
+        repo = SchemaSnapshotRepository(pool)
+        assert repo.save(sample_snapshot)
+
+        loaded = repo.get("conn-1")
+        assert loaded == sample_snapshot
+        assert loaded.table_columns()["users"][0].name == "id"
+
+    def test_upsert_replaces(self, pool, sample_snapshot):
+        repo = SchemaSnapshotRepository(pool)
+        repo.save(sample_snapshot)
+        sample_snapshot.marker = "8"
+        repo.save(sample_snapshot)
+        assert repo.get("conn-1").marker == "8"
+
+    def test_missing(self, pool):
+        assert SchemaSnapshotRepository(pool).get("conn-1", "Sales") is None
+
+    def test_delete_and_cascade(self, pool, sample_snapshot):
+        repo = SchemaSnapshotRepository(pool)
+        repo.save(sample_snapshot)
+        DatabaseConnectionRepository(pool).delete("conn-1")
+        assert repo.get("conn-1") is None
+
+
+class _FakeConfigDb:
+    """Minimal ConfigDatabase stand-in backed by a real repository."""
+
+    def __init__(self, pool):
+        self.repo = SchemaSnapshotRepository(pool)
+
+    def get_schema_snapshot(self, connection_id, database_name=""):
+        return self.repo.get(connection_id, database_name)
+
+    def save_schema_snapshot(self, snapshot):
+        return self.repo.save(snapshot)
+
+    def delete_schema_snapshots(self, connection_id, database_name=None):
+        return self.repo.delete(connection_id, database_name)
+
+
+class _ScriptedCursor:
+    """DB-API cursor answering each statement with the first matching reply."""
+
+    def __init__(self, replies, executed):
+        self.replies = replies
+        self.executed = executed
+        self._row = None
+
+    def execute(self, sql):
+        self.executed.append(sql)
+        for needle, reply in self.replies:
+            if needle in sql:
+                if isinstance(reply, Exception):
+                    raise reply
+                self._row = reply
+                return
+        raise AssertionError(f"unexpected statement: {sql}")
+
+    def fetchone(self):
+        return self._row
+
+
+def _scripted_connection(replies):
+    executed = []
+    conn = SimpleNamespace(cursor=lambda: _ScriptedCursor(replies, executed),
+                           rollback=lambda: None)
+    return conn, executed
+
+
+class TestChangeMarkers:
+    """Tests for the server-side catalog change markers."""
+
+    def test_postgresql_marker_avoids_pg_attribute_scan(self):
+        conn, executed = _scripted_connection([("pg_stat_sys_tables", (42, 16500, 310, 2200, 16400))])
+        loader = postgresql_loader.PostgreSQLSchemaLoader(conn, "pg", "pg")
+        assert loader.get_change_marker() == "42:16500:310:2200:16400"
+        assert "pg_namespace" in executed[0]
+        assert "FROM pg_attribute" not in executed[0]
+
+    def test_sqlserver_offline_database_does_not_hide_others(self):
+        conn, executed = _scripted_connection([
+            ("[Sales].sys.objects", (12, "2026-01-02")),
+            ("[Archive].sys.objects", sqlserver_loader.DbError("database is offline")),
+            ("[HR].sys.objects", (3, "2026-01-01")),
+        ])
+        loader = sqlserver_loader.SQLServerSchemaLoader(conn, "mssql", "mssql")
+        loader.get_databases = lambda: ["Archive", "HR", "Sales"]
+        assert loader.get_change_marker() == "Archive:unavailable|HR:3:2026-01-01|Sales:12:2026-01-02"
+        assert len(executed) == 3
+        assert loader.get_change_marker("Sales") == "Sales:12:2026-01-02"
+        assert loader.get_change_marker("Archive") is None
+
+
+class TestSchemaSnapshotStore:
+    """Tests for marker-based reuse in SchemaSnapshotStore."""
+
+    @pytest.fixture
+    def live(self, tmp_path):
+        conn = sqlite3.connect(str(tmp_path / "live.db"))
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+        conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, "
+                     "user_id INTEGER REFERENCES users(id))")
+        conn.commit()
+        yield conn
+        conn.close()
+
+    @pytest.fixture
+    def store(self, pool):
+        return SchemaSnapshotStore(_FakeConfigDb(pool))
+
+    def test_reuses_until_catalog_changes(self, store, live):
+        loader = SQLiteSchemaLoader(live, "conn-1", "live")
+        first = store.load(loader, "conn-1", with_keys=True)
+        assert not first.is_cached
+        assert [fk.to_table for fk in first.foreign_keys] == ["users"]
+
+        assert store.load(loader, "conn-1").is_cached
+
+        live.execute("CREATE TABLE products (id INTEGER)")
+        live.commit()
+        reloaded = store.load(loader, "conn-1")
+        assert not reloaded.is_cached
+        assert "products" in reloaded.table_columns()
+
+    def test_cached_flag_is_per_caller(self, store, live):
+        loader = SQLiteSchemaLoader(live, "conn-1", "live")
+        first = store.load(loader, "conn-1")
+        assert store.load(loader, "conn-1").is_cached
+        assert store.get_cached("conn-1").is_cached
+        assert not first.is_cached
+
+        live.execute("CREATE TABLE products (id INTEGER)")
+        live.commit()
+        assert not store.load(loader, "conn-1").is_cached
+
+    def test_survives_restart(self, pool, live):
+        loader = SQLiteSchemaLoader(live, "conn-1", "live")
+        SchemaSnapshotStore(_FakeConfigDb(pool)).load(loader, "conn-1")
+
+        fresh_store = SchemaSnapshotStore(_FakeConfigDb(pool))
+        snapshot = fresh_store.load(loader, "conn-1")
+        assert snapshot.is_cached
+        assert [c.name for c in snapshot.table_columns()["users"]] == ["id", "name"]
+
+    def test_keys_added_on_demand(self, store, live):
+        loader = SQLiteSchemaLoader(live, "conn-1", "live")
+        store.load(loader, "conn-1")
+        snapshot = store.load(loader, "conn-1", with_keys=True)
+        assert snapshot.is_cached
+        assert {pk.table_name for pk in snapshot.primary_keys} == {"users", "orders"}
+
+    def test_invalidate_and_force(self, store, live):
+        loader = SQLiteSchemaLoader(live, "conn-1", "live")
+        store.load(loader, "conn-1")
+        assert not store.load(loader, "conn-1", force=True).is_cached
+        store.invalidate("conn-1")
+        assert store.get_cached("conn-1") is None
+
+    def test_unknown_marker_always_reloads(self, store, live, monkeypatch):
+        loader = SQLiteSchemaLoader(live, "conn-1", "live")
+        monkeypatch.setattr(loader, "get_change_marker", lambda database_name=None: None)
+        store.load(loader, "conn-1")
+        assert not store.load(loader, "conn-1").is_cached
+
+
+class TestSchemaRevalidateWorker:
+    """Tests for the background snapshot check."""
+
+    @pytest.fixture
+    def live(self, tmp_path):
+        conn = sqlite3.connect(str(tmp_path / "live.db"), check_same_thread=False)
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY)")
+        conn.commit()
+        yield conn
+        conn.close()
+
+    def _run(self, qapp, live):
+        db_conn = SimpleNamespace(id="conn-1", name="live", db_type="sqlite")
+        worker = SchemaRevalidateWorker(db_conn, live)
+        changed = []
+        worker.snapshot_changed.connect(changed.append)
+        worker.start()
+        assert worker.wait(5000)
+        qapp.processEvents()  # deliver the queued signal
+        return changed
+
+    def test_emits_only_when_catalog_changed(self, qapp, pool, live, monkeypatch):
+        store = SchemaSnapshotStore(_FakeConfigDb(pool))
+        monkeypatch.setattr(connection_worker, "get_schema_snapshot_store", lambda: store)
+        store.load(SQLiteSchemaLoader(live, "conn-1", "live"), "conn-1")
+
+        assert self._run(qapp, live) == []
+
+        live.execute("CREATE TABLE products (id INTEGER)")
+        live.commit()
+        changed = self._run(qapp, live)
+        assert len(changed) == 1
+        assert "products" in changed[0].table_columns()
+        assert store.get_cached("conn-1").marker == changed[0].marker
@@ -130,6 +130,20 @@ class TestTopLevelScanner:
         result = _TopLevelScanner.extract_paren_content("abc", 10)
         assert result is None
 
+    def test_matching_paren(self):
+        """matching_paren() skips nested parens and parens inside strings."""
+        text = "f(a, (b), ')') + 1"
+        assert _TopLevelScanner.matching_paren(text, 1) == 13
+        assert _TopLevelScanner.matching_paren(text, 5) == 7
+        assert _TopLevelScanner.matching_paren("(a, b", 0) == -1
+        assert _TopLevelScanner.matching_paren("abc", 0) == -1
+
+    def test_last_close(self):
+        """last_close() returns the last top-level closing paren."""
+        assert _TopLevelScanner.last_close("(SELECT 1) AS t") == 9
+        assert _TopLevelScanner.last_close("(a) x (b ')') y") == 12
+        assert _TopLevelScanner.last_close("t AS x") == -1
+
 
 class TestFormatSqlCompact:
     """Tests for format_sql() with compact style."""
@@ -271,6 +285,13 @@ class TestFormatSqlCTE:
         assert "cte1" in result
         assert "cte2" in result
 
+    def test_with_outside_cte_is_not_cte(self):
+        """format_sql() leaves WITH hints and strings out of CTE formatting."""
+        sql = "select 'with x as (y)' as a from t with (nolock)"
+        result = format_sql(sql, style="ultimate")
+        assert "'with x as (y)'" in result
+        assert "FROM" in result
+
 
 class TestFormatSqlWhereAlignment:
     """Tests for WHERE/AND alignment."""
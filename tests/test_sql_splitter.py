@@ -61,6 +61,84 @@ class TestSplitSqlStatements:
         # but GO won't be treated as a batch separator
         assert len(stmts) >= 1
 
+    def test_line_numbers_across_blank_lines(self):
+        """split_sql_statements() reports real line numbers, GO lines included."""
+        sql = "SELECT 1;\n\n\nSELECT 2\nGO\n\nUPDATE t\nSET a = 1"
+        stmts = split_sql_statements(sql)
+        assert [(s.line_start, s.line_end) for s in stmts] == [(1, 1), (4, 4), (7, 8)]
+
+    def test_semicolons_in_strings_comments_and_brackets(self):
+        """Semicolons inside literals, quoted identifiers and comments do not split."""
+        sql = "SELECT ';' AS [a;b], 'it''s;', \"c;d\" /* x; /* nested; */ y; */ FROM t; SELECT 2"
+        stmts = split_sql_statements(sql)
+        assert len(stmts) == 2
+        assert stmts[0].text.endswith("FROM t;")
+
+    def test_go_inside_string_or_comment(self):
+        """GO inside a multi-line string or comment is not a separator."""
+        sql = "SELECT 'a\nGO\nb'\n/*\nGO\n*/\nSELECT 2"
+        assert len(split_sql_statements(sql)) == 1
+
+    def test_begin_end_block(self):
+        """Semicolons inside BEGIN ... END (and CASE ... END) do not split."""
+        sql = ("CREATE PROCEDURE p AS BEGIN SELECT CASE WHEN a = 1 THEN 2 END FROM t; "
+               "UPDATE t SET a = 1; END; SELECT 3")
+        stmts = split_sql_statements(sql)
+        assert len(stmts) == 2
+        assert stmts[0].text.endswith("END;")
+        assert stmts[1].text == "SELECT 3"
+
+    def test_begin_transaction_is_not_a_block(self):
+        """BEGIN TRAN and BEGIN; start transactions, not blocks."""
+        sql = "BEGIN TRAN; UPDATE t SET a = 1; COMMIT;"
+        assert len(split_sql_statements(sql)) == 3
+        assert len(split_sql_statements("BEGIN;\nDELETE FROM t;\nCOMMIT;", "postgresql")) == 3
+
+    def test_sqlite_trigger(self):
+        """SQLite trigger bodies stay in one statement."""
+        sql = "CREATE TRIGGER tr AFTER INSERT ON a BEGIN INSERT INTO b VALUES (1); END; SELECT 1"
+        stmts = split_sql_statements(sql, db_type="sqlite")
+        assert [s.is_select for s in stmts] == [False, True]
+
+    def test_dollar_quoting(self):
+        """PostgreSQL dollar-quoted bodies stay in one statement."""
+        sql = ("CREATE FUNCTION f() RETURNS int AS $body$ BEGIN RETURN 1; END; $body$ "
+               "LANGUAGE plpgsql; SELECT $$a;b$$")
+        stmts = split_sql_statements(sql, db_type="postgresql")
+        assert len(stmts) == 2
+        assert stmts[1].text == "SELECT $$a;b$$"
+
+    def test_mysql_backslash_escape(self):
+        """MySQL strings may escape quotes with a backslash."""
+        stmts = split_sql_statements("SELECT 'a\\';b'; SELECT `x;y` FROM t", db_type="mysql")
+        assert len(stmts) == 2
+
+    def test_mysql_compound_end(self):
+        """END IF / END WHILE close statements inside a block, not the block."""
+        sql = ("CREATE PROCEDURE p() BEGIN IF a>1 THEN SELECT 1; END IF; "
+               "WHILE a<3 DO SET a = a + 1; END WHILE; SELECT 2; END;\nSELECT 3;")
+        stmts = split_sql_statements(sql, db_type="mysql")
+        assert len(stmts) == 2
+        assert stmts[0].text.endswith("SELECT 2; END;")
+        assert stmts[1].text == "SELECT 3;"
+
+    def test_keyword_after_dot_is_a_name(self):
+        """A column called begin or end does not open or close a block."""
+        sql = "SELECT p.begin FROM periods p;\nSELECT 2;"
+        for db_type in ("sqlserver", "postgresql", "mysql"):
+            stmts = split_sql_statements(sql, db_type=db_type)
+            assert [s.text for s in stmts] == ["SELECT p.begin FROM periods p;", "SELECT 2;"]
+
+    def test_postgresql_escape_string(self):
+        """PostgreSQL E'...' strings may escape quotes with a backslash."""
+        stmts = split_sql_statements("SELECT E'a\\';b'; SELECT 2;", db_type="postgresql")
+        assert [s.text for s in stmts] == ["SELECT E'a\\';b';", "SELECT 2;"]
+
+    def test_comments_kept_and_comment_only_dropped(self):
+        """Leading and same-line comments stay with their statement; comment-only text is dropped."""
+        stmts = split_sql_statements("-- head\nSELECT 1; -- tail\nSELECT 2;\n-- end")
+        assert [s.text for s in stmts] == ["-- head\nSELECT 1; -- tail", "SELECT 2;"]
+
 
 class TestSplitOnGo:
     """Tests for _split_on_go() GO batch separator handling."""
@@ -181,6 +259,14 @@ class TestIsSelectStatement:
         """GRANT is not a select statement."""
         assert _is_select_statement("GRANT SELECT ON t TO user1") is False
 
+    def test_select_into_after_subquery(self):
+        """A subquery's FROM does not hide SELECT ... INTO."""
+        assert _is_select_statement("SELECT (SELECT 1 FROM z) AS a INTO #t FROM w") is False
+
+    def test_leading_comment(self):
+        """Comments before the first keyword are skipped."""
+        assert _is_select_statement("/* report */ -- daily\nSELECT 1") is True
+
 
 class TestNeedsScriptMode:
     """Tests for needs_script_mode()."""
@@ -0,0 +1,159 @@
+"""
+Unit tests for the thumbnail cache.
+Tests scaled decoding, the disk cache keys, background requests with the
+memory LRU, prefetching, disk cache pruning and the fullscreen viewer's
+connection to the shared cache.
+"""
+import os
+import time
+
+import pytest
+
+from PySide6.QtCore import SIGNAL, QSize
+from PySide6.QtGui import QColor, QImage
+
+from dataforge_studio.database.models import SavedImage
+from dataforge_studio.ui.widgets import image_fullscreen_dialog
+from dataforge_studio.utils.thumbnail_cache import (
+    ThumbnailCache,
+    decode_thumbnail,
+    prune_disk_cache,
+    thumbnail_key,
+)
+
+
+BOX = QSize(200, 150)
+
+
+def _save_image(path, width, height, color="red"):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(color))
+    assert image.save(str(path))
+    return str(path)
+
+
+def _wait(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    assert condition()
+
+
+@pytest.fixture
+def cache(qapp, tmp_path):
+    # Two 150x150 RGB32 previews (90,000 bytes each)
+    cache = ThumbnailCache(cache_dir=tmp_path / "thumbs", memory_bytes=200_000)
+    yield cache
+    cache.shutdown()
+
+
+class TestDecode:
+    """Tests for decode_thumbnail() and thumbnail_key()."""
+
+    def test_large_image_scaled_and_cached(self, qapp, tmp_path):
+        path = _save_image(tmp_path / "big.jpg", 1600, 900)
+        cache_dir = tmp_path / "thumbs"
+
+        thumb = decode_thumbnail(path, BOX, cache_dir)
+        assert thumb.source_size == QSize(1600, 900)
+        assert thumb.image.width() == 200 and thumb.image.height() <= 150
+        assert (cache_dir / f"{thumbnail_key(path, BOX)}.jpg").exists()
+
+        again = decode_thumbnail(path, BOX, cache_dir)
+        assert again.image.size() == thumb.image.size()
+        assert again.source_size == QSize(1600, 900)
+
+    def test_small_image_not_upscaled(self, qapp, tmp_path):
+        path = _save_image(tmp_path / "icon.png", 32, 16)
+        thumb = decode_thumbnail(path, BOX)
+        assert thumb.image.size() == QSize(32, 16)
+
+    def test_key_follows_file_changes(self, qapp, tmp_path):
+        path = _save_image(tmp_path / "img.png", 40, 40)
+        key = thumbnail_key(path, BOX)
+        assert thumbnail_key(path, QSize(100, 100)) != key
+
+        _save_image(tmp_path / "img.png", 60, 40)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        assert thumbnail_key(path, BOX) != key
+        assert thumbnail_key(tmp_path / "missing.png", BOX) is None
+
+    def test_unreadable_file(self, qapp, tmp_path):
+        path = tmp_path / "broken.png"
+        path.write_bytes(b"not an image")
+        assert decode_thumbnail(path, BOX) is None
+
+
+class TestThumbnailCache:
+    """Tests for background requests and the memory LRU."""
+
+    def test_request_decodes_in_background(self, cache, qapp, tmp_path):
+        path = _save_image(tmp_path / "a.png", 800, 600)
+        ready = []
+        cache.thumbnail_ready.connect(lambda p, box, thumb: ready.append((p, box, thumb)))
+
+        assert cache.request(path, BOX) is None
+        _wait(qapp, lambda: ready)
+        assert ready[0][0] == path and ready[0][1] == BOX
+        assert cache.request(path, BOX) is ready[0][2]
+
+    def test_prefetch_and_lru_eviction(self, cache, qapp, tmp_path):
+        paths = [_save_image(tmp_path / f"{i}.png", 300, 300) for i in range(3)]
+        ready = []
+        cache.thumbnail_ready.connect(lambda p, box, thumb: ready.append(p))
+
+        cache.prefetch(paths, BOX)
+        _wait(qapp, lambda: len(ready) == 3)
+        in_memory = [p for p in paths if cache.get(p, BOX) is not None]
+        assert len(in_memory) == 2
+        assert cache.memory_used == 2 * 150 * 150 * 4
+
+    def test_memory_bounded_by_bytes(self, cache, qapp, tmp_path):
+        small = _save_image(tmp_path / "small.png", 100, 100)
+        large = _save_image(tmp_path / "large.png", 800, 800)
+        big_box = QSize(800, 800)
+        ready = []
+        cache.thumbnail_ready.connect(lambda p, box, thumb: ready.append(p))
+
+        cache.request(small, BOX)
+        _wait(qapp, lambda: len(ready) == 1)
+        cache.request(large, big_box)
+        _wait(qapp, lambda: len(ready) == 2)
+
+        # The 2.5 MB preview alone exceeds the budget: it stays, older entries go
+        assert cache.get(large, big_box) is not None
+        assert cache.get(small, BOX) is None
+        assert cache.memory_used == 800 * 800 * 4
+
+    def test_missing_file(self, cache, tmp_path):
+        assert cache.request(tmp_path / "missing.png", BOX) is None
+
+
+class TestFullscreenDialog:
+    """The viewer must not stay connected to the cache once closed."""
+
+    def test_close_disconnects_from_cache(self, cache, qapp, tmp_path, monkeypatch):
+        monkeypatch.setattr(image_fullscreen_dialog, "get_thumbnail_cache", lambda: cache)
+        path = _save_image(tmp_path / "a.png", 300, 200)
+        image = SavedImage(id="a", name="a.png", filepath=path)
+        ready_signal = SIGNAL("thumbnail_ready(QString,QSize,PyObject)")
+
+        dialog = image_fullscreen_dialog.ImageFullscreenDialog(image=image)
+        dialog.show()
+        assert cache.receivers(ready_signal) == 1
+        dialog.close()
+        assert cache.receivers(ready_signal) == 0
+
+
+class TestPrune:
+    """Tests for prune_disk_cache()."""
+
+    def test_oldest_files_removed_first(self, tmp_path):
+        for i in range(4):
+            path = tmp_path / f"{i}.jpg"
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (1000 + i, 1000 + i))
+
+        assert prune_disk_cache(tmp_path, max_bytes=250) == 2
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["2.jpg", "3.jpg"]
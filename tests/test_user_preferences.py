@@ -0,0 +1,128 @@
+"""
+Unit tests for UserPreferences.
+Tests the in-memory store, write-behind batching and change observers.
+"""
+import time
+
+import pytest
+
+from dataforge_studio.config.user_preferences import UserPreferences, DEFAULT_PREFERENCES
+
+
+class FakeConfigDb:
+    """Records preference reads and batched writes."""
+
+    def __init__(self, stored=None):
+        self.stored = dict(stored or {})
+        self.loads = 0
+        self.batches = []
+        self.fail = False
+
+    def get_all_preferences(self):
+        self.loads += 1
+        return dict(self.stored)
+
+    def set_preferences(self, values):
+        if self.fail:
+            return False
+        self.batches.append(dict(values))
+        self.stored.update(values)
+        return True
+
+
+@pytest.fixture
+def db():
+    return FakeConfigDb({"theme": "custom", "window_width": "1200", "window_maximized": "TRUE"})
+
+
+def make_prefs(db, write_delay=60):
+    return UserPreferences(config_db=db, write_delay=write_delay)
+
+
+class TestStore:
+    """Tests for loading and typed values."""
+
+    def test_single_load_and_typed_values(self, db):
+        prefs = make_prefs(db)
+        assert prefs.get("window_width") == 1200
+        assert prefs.get("window_maximized") is True
+        assert prefs.get("theme") == "custom"
+        assert prefs.get("missing", "x") == "x"
+        assert db.loads == 1
+
+    def test_defaults_written_once(self, db):
+        prefs = make_prefs(db)
+        assert prefs.flush()
+        assert db.batches == [{k: v for k, v in DEFAULT_PREFERENCES.items() if k != "theme"}]
+        assert db.stored["theme"] == "custom"
+
+    def test_set_is_visible_before_flush(self, db):
+        prefs = make_prefs(db)
+        prefs.set("window_maximized", False)
+        prefs.set("window_height", 800)
+        assert prefs.get("window_maximized") is False
+        assert prefs.get("window_height") == 800
+        assert "window_height" not in db.stored
+        assert prefs.get_all()["window_height"] == 800
+
+
+class TestWriteBehind:
+    """Tests for batched, debounced writes."""
+
+    def test_flush_batches_last_values(self, db):
+        prefs = make_prefs(db)
+        prefs.flush()
+        db.batches.clear()
+        for width in (100, 200, 300):
+            prefs.set("window_width", width)
+        prefs.set("window_maximized", True)
+        prefs.flush()
+        assert db.batches == [{"window_width": "300", "window_maximized": "true"}]
+        assert prefs.flush() and len(db.batches) == 1
+
+    def test_debounced_flush(self, db):
+        prefs = make_prefs(db, write_delay=0.05)
+        prefs.set("theme", "dark")
+        deadline = time.monotonic() + 5
+        while db.stored["theme"] != "dark" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert db.stored["theme"] == "dark"
+
+    def test_failed_flush_is_retried(self, db):
+        prefs = make_prefs(db)
+        db.fail = True
+        prefs.set("theme", "dark")
+        assert not prefs.flush()
+        db.fail = False
+        assert prefs.flush()
+        assert db.stored["theme"] == "dark"
+
+
+class TestObservers:
+    """Tests for change notifications."""
+
+    def test_notified_on_change_only(self, db):
+        prefs = make_prefs(db)
+        changes = []
+        prefs.register_observer(lambda key, value: changes.append((key, value)))
+        prefs.set("theme", "custom")
+        prefs.set("theme", "dark")
+        prefs.set("window_width", "1300")
+        assert changes == [("theme", "dark"), ("window_width", 1300)]
+
+    def test_failing_observer_and_unregister(self, db):
+        prefs = make_prefs(db)
+        changes = []
+
+        def failing(key, value):
+            raise RuntimeError("boom")
+
+        def record(key, value):
+            changes.append(key)
+
+        prefs.register_observer(failing)
+        prefs.register_observer(record)
+        prefs.set("theme", "dark")
+        prefs.unregister_observer(record)
+        prefs.set("theme", "light")
+        assert changes == ["theme"]
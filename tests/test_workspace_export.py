@@ -0,0 +1,112 @@
+"""
+Unit tests for workspace import.
+Tests matching against existing resources, renaming, progress reporting
+and the all-or-nothing transaction of import_workspace_from_json().
+"""
+import sqlite3
+
+import pytest
+
+from dataforge_studio.database.config_db import ConfigDatabase
+from dataforge_studio.database.models import DatabaseConnection, SavedQuery
+from dataforge_studio.database.repositories import JobRepository
+from dataforge_studio.utils import workspace_export
+from dataforge_studio.utils.workspace_export import (
+    ImportConflictMode, import_connections_from_json, import_workspace_from_json,
+)
+
+
+IMPORT_DATA = {
+    "export_type": "workspace",
+    "version": "1.0",
+    "workspace": {"name": "Team", "description": "Shared"},
+    "databases": [
+        {"name": "Sales", "db_type": "sqlite", "connection_string": "sqlite:///sales.db",
+         "workspace_context": {"database_name": "main"}},
+        {"name": "HR", "db_type": "postgresql", "connection_string": "postgresql://hr"},
+    ],
+    "rootfolders": [{"path": "C:/data", "name": "Data", "workspace_context": {"subfolder_path": "in"}}],
+    "queries": [{"name": "Top", "category": "kpi", "query_text": "SELECT 1"},
+                {"name": "Top", "category": "kpi", "query_text": "SELECT 2"}],
+    "scripts": [{"name": "Load", "script_type": "python"}],
+    "jobs": [{"name": "Nightly"}],
+}
+
+
+@pytest.fixture
+def config_db(tmp_path, monkeypatch):
+    db = ConfigDatabase(tmp_path / "configuration.db")
+    monkeypatch.setattr(workspace_export, "get_config_db", lambda: db)
+    return db
+
+
+def _workspace_names(db):
+    return sorted(ws.name for ws in db.get_all_workspaces())
+
+
+class TestImportWorkspace:
+    """Tests for import_workspace_from_json()."""
+
+    def test_import_links_resources(self, config_db):
+        config_db.add_database_connection(DatabaseConnection(
+            id="existing", name="sales", db_type="sqlite", description="",
+            connection_string="sqlite:///other.db"))
+        config_db.add_saved_query(SavedQuery(id="q0", name="Top", target_database_id="existing",
+                                             query_text="", category="kpi"))
+        progress = []
+
+        result = import_workspace_from_json(IMPORT_DATA, ImportConflictMode.RENAME,
+                                            progress=lambda *args: progress.append(args))
+
+        ws_id = result["workspace_id"]
+        assert result["workspace_name"] == "Team"
+        assert result["resources"]["databases"] == {"created": 1, "existing": 1}
+        assert result["resources"]["queries"] == {"created": 2, "existing": 0}
+        assert "existing" in config_db.get_workspace_database_ids(ws_id)
+        assert sorted(q.name for q in config_db.get_workspace_queries(ws_id)) == \
+            ["Top (importé 1)", "Top (importé 2)"]
+        assert [r.path for r in config_db.get_workspace_file_roots(ws_id)] == ["C:/data"]
+        assert [j.name for j in config_db.get_workspace_jobs(ws_id)] == ["Nightly"]
+        assert progress[-1] == (7, 7, "saving")
+
+    def test_name_conflict_renames_workspace(self, config_db):
+        import_workspace_from_json(IMPORT_DATA)
+        result = import_workspace_from_json(IMPORT_DATA)
+
+        assert result["workspace_name"] == "Team (importé 1)"
+        assert _workspace_names(config_db) == ["Team", "Team (importé 1)"]
+        assert len(config_db.get_business_database_connections()) == 2
+
+    def test_merge_into_existing_workspace(self, config_db):
+        first = import_workspace_from_json(IMPORT_DATA)
+        result = import_workspace_from_json(IMPORT_DATA, ImportConflictMode.MERGE,
+                                            existing_workspace_id=first["workspace_id"])
+
+        assert result["workspace_id"] == first["workspace_id"]
+        assert _workspace_names(config_db) == ["Team"]
+        assert len(config_db.get_workspace_queries(first["workspace_id"])) == 4
+
+    def test_failure_rolls_back_everything(self, config_db, monkeypatch):
+        def fail(self, cursor, models):
+            raise sqlite3.OperationalError("disk I/O error")
+        monkeypatch.setattr(JobRepository, "insert_many", fail)
+
+        with pytest.raises(sqlite3.OperationalError):
+            import_workspace_from_json(IMPORT_DATA)
+
+        assert config_db.get_all_workspaces() == []
+        assert config_db.get_all_saved_queries() == []
+        assert config_db.get_business_database_connections() == []
+
+
+class TestImportConnections:
+    """Tests for import_connections_from_json()."""
+
+    def test_duplicates_in_file_are_matched(self, config_db):
+        data = {"databases": IMPORT_DATA["databases"] + [dict(IMPORT_DATA["databases"][0])]}
+
+        results = import_connections_from_json(data)
+
+        assert results["created"] == ["Sales", "HR"]
+        assert results["existing"] == ["Sales"]
+        assert len(config_db.get_business_database_connections()) == 2
@@ -0,0 +1,197 @@
+"""
+Unit tests for workspace sharing.
+Tests publishing and loading shared resources through the shared folder
+index: incremental re-parsing, removals, persistence, background refresh and
+the workspace tree's Shared category.
+"""
+import json
+import os
+import time
+
+import pytest
+
+from PySide6.QtCore import Qt
+
+from dataforge_studio.database.models import ERDiagram, ERDiagramTable, Workspace
+from dataforge_studio.ui.managers import workspace_manager
+from dataforge_studio.ui.managers.workspace_manager import WorkspaceManager
+from dataforge_studio.utils import workspace_sharing
+from dataforge_studio.utils.workspace_sharing import (
+    SharedFolderCache, SharedFolderIndex, load_shared_diagrams, load_shared_queries,
+    publish_diagram,
+)
+
+
+def _wait(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    assert condition()
+
+
+def _write_query(shared, name, text):
+    path = shared / "queries" / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"name": name, "query_text": text}), encoding="utf-8")
+    # Make the change visible even on filesystems with coarse mtimes
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace_sharing, "INDEX_DIR", tmp_path / "index")
+    monkeypatch.setattr(workspace_sharing, "_caches", {})
+    return tmp_path / "index"
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Names of the files parsed by the index."""
+    names = []
+    original = SharedFolderCache._parse
+    monkeypatch.setattr(SharedFolderCache, "_parse",
+                        staticmethod(lambda path: names.append(path.name) or original(path)))
+    return names
+
+
+class TestLoadShared:
+    """Tests for load_shared_diagrams() and load_shared_queries()."""
+
+    def test_published_diagram_roundtrip(self, tmp_path):
+        shared = tmp_path / "shared"
+        diagram = ERDiagram(id="d1", name="Sales", connection_id="c1",
+                            tables=[ERDiagramTable(table_name="orders", pos_x=10, pos_y=20)])
+        assert publish_diagram(str(shared), diagram)
+
+        loaded = load_shared_diagrams(str(shared))
+
+        assert [d.name for d in loaded] == ["Sales"]
+        assert loaded[0].tables[0].table_name == "orders"
+        assert loaded[0].tables[0].pos_y == 20
+
+    def test_only_changed_files_are_parsed(self, tmp_path, parsed):
+        shared = tmp_path / "shared"
+        _write_query(shared, "a", "SELECT 1")
+        _write_query(shared, "b", "SELECT 2")
+        assert [q["name"] for q in load_shared_queries(str(shared))] == ["a", "b"]
+        assert sorted(parsed) == ["a.json", "b.json"]
+
+        parsed.clear()
+        _write_query(shared, "b", "SELECT 22")
+        queries = load_shared_queries(str(shared))
+
+        assert parsed == ["b.json"]
+        assert [q["query_text"] for q in queries] == ["SELECT 1", "SELECT 22"]
+
+    def test_removed_and_invalid_files(self, tmp_path, parsed):
+        shared = tmp_path / "shared"
+        _write_query(shared, "a", "SELECT 1")
+        bad = shared / "queries" / "bad.json"
+        bad.write_text("{not json", encoding="utf-8")
+        assert [q["name"] for q in load_shared_queries(str(shared))] == ["a"]
+
+        parsed.clear()
+        (shared / "queries" / "a.json").unlink()
+        assert load_shared_queries(str(shared)) == []
+        assert parsed == []
+
+    def test_missing_folder(self, tmp_path):
+        assert load_shared_diagrams(str(tmp_path / "missing")) == []
+
+
+class TestSharedFolderCache:
+    """Tests for SharedFolderCache."""
+
+    def test_index_survives_restart(self, tmp_path, index_dir, parsed):
+        shared = tmp_path / "shared"
+        _write_query(shared, "a", "SELECT 1")
+        assert SharedFolderCache(str(shared), index_dir).refresh()
+
+        parsed.clear()
+        cache = SharedFolderCache(str(shared), index_dir)
+        assert cache.items("queries")[0][1]["query_text"] == "SELECT 1"
+        assert not cache.refresh()
+        assert parsed == []
+
+
+class TestSharedFolderIndex:
+    """Tests for SharedFolderIndex."""
+
+    def test_background_refresh(self, qapp, tmp_path):
+        shared = tmp_path / "shared"
+        _write_query(shared, "a", "SELECT 1")
+        index = SharedFolderIndex(refresh_interval=3600)
+        updated = []
+        index.index_updated.connect(updated.append)
+        try:
+            index.queries(str(shared))  # not refreshed yet: schedules a refresh
+            _wait(qapp, lambda: updated)
+            assert updated == [str(shared)]
+            assert [q["name"] for q in index.queries(str(shared))] == ["a"]
+
+            _write_query(shared, "b", "SELECT 2")
+            index.refresh(str(shared))
+            _wait(qapp, lambda: len(updated) == 2)
+            assert [q["name"] for q in index.queries(str(shared))] == ["a", "b"]
+        finally:
+            index.shutdown()
+
+
+class FakeConfigDb:
+    """One workspace with no local resources."""
+
+    def __init__(self, workspace):
+        self.workspace = workspace
+
+    def get_all_workspaces(self):
+        return [self.workspace]
+
+    def __getattr__(self, name):
+        if name.startswith("get_workspace_"):
+            return lambda workspace_id: []
+        raise AttributeError(name)
+
+
+def _shared_children(ws_item):
+    for i in range(ws_item.childCount()):
+        child = ws_item.child(i)
+        if (child.data(0, Qt.ItemDataRole.UserRole) or {}).get("name") == "Shared":
+            return [child.child(j).text(0) for j in range(child.childCount())]
+    return None
+
+
+class TestWorkspaceSharedCategory:
+    """Tests for the Shared category of the workspace tree."""
+
+    @pytest.fixture
+    def index(self, monkeypatch):
+        index = SharedFolderIndex(refresh_interval=3600)
+        monkeypatch.setattr(workspace_sharing, "_shared_folder_index_instance", index, raising=False)
+        yield index
+        index.shutdown()
+
+    def test_category_follows_index(self, qapp, tmp_path, monkeypatch, index):
+        shared = tmp_path / "shared"
+        _write_query(shared, "a", "SELECT 1")
+        workspace = Workspace(id="w1", name="Team", description="", shared_path=str(shared))
+        monkeypatch.setattr(workspace_manager, "get_config_db", lambda: FakeConfigDb(workspace))
+        updated = []
+        index.index_updated.connect(updated.append)
+        manager = WorkspaceManager()
+        try:
+            manager._load_workspaces()
+            ws_item = manager.workspace_tree.topLevelItem(0)
+            # Never indexed: the tree is built first, the category follows the refresh
+            _wait(qapp, lambda: updated)
+            assert _shared_children(ws_item) == ["a"]
+
+            _write_query(shared, "b", "SELECT 2")
+            index.refresh(str(shared))
+            _wait(qapp, lambda: len(updated) == 2)
+            assert _shared_children(ws_item) == ["a", "b"]
+        finally:
+            manager.cleanup()
+            manager.deleteLater()